@@ -83,6 +83,8 @@ os.environ["EVENT_CONTENT_GROUP_INDEX"] = "SYSTEM_TABLE_NAME"
 os.environ["EVENT_PAGINATION_INDEX"] = "SYSTEM_TABLE_NAME"
 os.environ["WORKFLOW_EXECUTION_TABLE_NAME"] = "SYSTEM_TABLE_NAME"
 os.environ["REPLAY_REQUEST_TABLE_NAME"] = "SYSTEM_TABLE_NAME"
+os.environ["REPLAY_REQUEST_PAGINATION_INDEX"] = "SYSTEM_TABLE_NAME"
+os.environ["REPLAY_REQUEST_CATCHUP_INDEX"] = "SYSTEM_TABLE_NAME"
 os.environ["MEDIASOURCE_S3_BUCKET"] = "SYSTEM_TABLE_NAME"
 os.environ["PROBE_VIDEO_LAMBDA_ARN"] = "SYSTEM_TABLE_NAME"
 os.environ["MULTI_CHUNK_HELPER_LAMBDA_ARN"] = "SYSTEM_TABLE_NAME"
@@ -135,6 +137,7 @@ os.environ["PROGRAM_URL"] = "SYSTEM_URL"
 os.environ["WORKFLOW_URL"] = "SYSTEM_URL"
 os.environ["REPLAY_URL"] = "SYSTEM_URL"
 os.environ["EVENT_PROGRAM_INDEX"] = "EVENT_PROGRAM_INDEX"
+os.environ["EVENT_START_BUCKET_INDEX"] = "EVENT_START_BUCKET_INDEX"
 os.environ["TRANSITION_CLIP_S3_BUCKET"] = "TRANSITION_CLIP_S3_BUCKET"
 os.environ["TRANSITIONS_CONFIG_TABLE_NAME"] = "TRANSITIONS_CONFIG_TABLE_NAME"
 os.environ["PARTITION_KEY_CHUNK_NUMBER_INDEX"] = "PARTITION_KEY_CHUNK_NUMBER_INDEX"
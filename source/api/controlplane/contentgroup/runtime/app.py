@@ -7,6 +7,7 @@ import boto3
 from aws_lambda_powertools.utilities.validation import (SchemaValidationError,validate)
 from chalice import BadRequestError, Chalice, ChaliceViewError, IAMAuthorizer
 from chalicelib import load_api_schema
+from chalicelib.listing import get_page_params, get_page_response, list_items
 from aws_lambda_powertools import Logger
 
 app = Chalice(app_name='aws-mre-controlplane-contentgroup-api')
@@ -76,6 +77,9 @@ def list_content_groups():
     """
     List all the content groups stored in the system.
 
+    Optionally, the content groups can be paginated by passing the "limit" and "LastEvaluatedKey" query parameters
+    and projected by passing the "ProjectionExpression" query parameter.
+
     Returns:
 
         .. code-block:: python
@@ -88,33 +92,33 @@ def list_content_groups():
             ]
 
     Raises:
+        400 - BadRequestError
         500 - ChaliceViewError
     """
     try:
         logger.info(f"Listing all the content groups")
 
+        limit, exclusive_start_key, projection = get_page_params(app.current_request.query_params)
+
         content_group_table = ddb_resource.Table(CONTENT_GROUP_TABLE_NAME)
 
-        response = content_group_table.scan(
+        content_groups, last_evaluated_key = list_items(
+            content_group_table,
+            limit=limit,
+            exclusive_start_key=exclusive_start_key,
+            projection=projection,
             ConsistentRead=True
         )
 
-        content_groups = response["Items"]
-
-        while "LastEvaluatedKey" in response:
-            response = content_group_table.scan(
-                ExclusiveStartKey=response["LastEvaluatedKey"],
-                ConsistentRead=True
-            )
-
-            content_groups.extend(response["Items"])
+    except BadRequestError:
+        raise
 
     except Exception as e:
         logger.info(f"Unable to list all the content groups stored in the system: {str(e)}")
         raise ChaliceViewError(f"Unable to list all the content groups stored in the system: {str(e)}")
 
     else:
-        return content_groups
+        return get_page_response(content_groups, last_evaluated_key, limit)
 
 
 @app.route('/contentgroup/{content_group}', cors=True, methods=['DELETE'], authorizer=authorizer)
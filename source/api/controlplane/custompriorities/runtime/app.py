@@ -15,6 +15,7 @@ from botocore.client import ClientError
 from chalice import (BadRequestError, Chalice, ChaliceViewError, ConflictError,
                      IAMAuthorizer, NotFoundError)
 from chalicelib import DecimalEncoder, load_api_schema
+from chalicelib.listing import get_page_params, get_page_response, list_items
 from aws_lambda_powertools import Logger
 
 app = Chalice(app_name="aws-mre-controlplane-custompriorities-api")
@@ -135,6 +136,9 @@ def list_custompriorities():
     """
     List all the custom priorities engine configurations.
 
+    Optionally, the configurations can be paginated by passing the "limit" and "LastEvaluatedKey" query parameters
+    and projected by passing the "ProjectionExpression" query parameter.
+
     Returns:
 
         .. code-block:: python
@@ -151,23 +155,28 @@ def list_custompriorities():
         ]
 
     Raises:
+        400 - BadRequestError
         500 - ChaliceViewError
     """
     try:
         logger.info("Listing all the custom priorities engine")
 
-        custom_priorities_table = ddb_resource.Table(CUSTOM_PRIORITIES_TABLE_NAME)
-
-        response = custom_priorities_table.scan(ConsistentRead=True)
+        limit, exclusive_start_key, projection = get_page_params(
+            app.current_request.query_params
+        )
 
-        custom_priorities_engine = response["Items"]
+        custom_priorities_table = ddb_resource.Table(CUSTOM_PRIORITIES_TABLE_NAME)
 
-        while "LastEvaluatedKey" in response:
-            response = custom_priorities_table.scan(
-                ExclusiveStartKey=response["LastEvaluatedKey"], ConsistentRead=True
-            )
+        custom_priorities_engine, last_evaluated_key = list_items(
+            custom_priorities_table,
+            limit=limit,
+            exclusive_start_key=exclusive_start_key,
+            projection=projection,
+            ConsistentRead=True,
+        )
 
-            custom_priorities_engine.extend(response["Items"])
+    except BadRequestError:
+        raise
 
     except Exception as e:
         logger.error(f"Unable to list all the custom priorities engine: {str(e)}")
@@ -176,7 +185,7 @@ def list_custompriorities():
         )
 
     else:
-        return custom_priorities_engine
+        return get_page_response(custom_priorities_engine, last_evaluated_key, limit)
 
 
 @app.route(
@@ -0,0 +1,158 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+##############################################################################
+#
+# PURPOSE:
+# Common pagination of the "list all" APIs of the MRE Control plane.
+#
+# A listing is paginated when the caller passes the "limit" query parameter
+# and continues from the opaque cursor returned as "LastEvaluatedKey" in the
+# previous page. An optional "ProjectionExpression" query parameter holds a
+# comma separated list of the attributes to return. Without "limit", all the
+# items are returned as before.
+#
+# NOTE: This module is shared by the Control plane APIs. Keep all the copies
+# of it (in the chalicelib of each API) in sync.
+#
+##############################################################################
+
+import base64
+import binascii
+import json
+import re
+from decimal import Decimal
+
+from chalice import BadRequestError
+
+MAX_LIMIT = 1000
+
+ATTRIBUTE_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_\-]{1,255}$")
+
+
+def encode_cursor(last_evaluated_key):
+    """
+    Encode the LastEvaluatedKey of a DynamoDB Query or Scan as an opaque cursor.
+    """
+    if not last_evaluated_key:
+        return ""
+
+    return base64.urlsafe_b64encode(
+        json.dumps(
+            last_evaluated_key,
+            default=lambda obj: int(obj) if obj % 1 == 0 else float(obj),
+        ).encode()
+    ).decode()
+
+
+def decode_cursor(cursor):
+    """
+    Decode an opaque cursor (from encode_cursor) back to the ExclusiveStartKey of a DynamoDB Query or Scan.
+    """
+    try:
+        last_evaluated_key = json.loads(
+            base64.urlsafe_b64decode(cursor.encode()),
+            parse_float=Decimal,
+            parse_int=Decimal,
+        )
+
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise BadRequestError("Invalid LastEvaluatedKey")
+
+    if not isinstance(last_evaluated_key, dict):
+        raise BadRequestError("Invalid LastEvaluatedKey")
+
+    return last_evaluated_key
+
+
+def get_page_params(query_params):
+    """
+    Get the limit, ExclusiveStartKey and projected attributes of a listing from the query parameters.
+
+    Returns:
+
+        Tuple of limit (None when not paginated), ExclusiveStartKey (None for the first page)
+        and list of attributes to project (None for all the attributes)
+    """
+    query_params = query_params or {}
+    limit = None
+    exclusive_start_key = None
+    projection = None
+
+    if "limit" in query_params:
+        try:
+            limit = int(query_params["limit"])
+
+        except ValueError:
+            raise BadRequestError("limit must be an integer")
+
+        if limit < 1 or limit > MAX_LIMIT:
+            raise BadRequestError(f"limit must be between 1 and {MAX_LIMIT}")
+
+    if query_params.get("LastEvaluatedKey"):
+        exclusive_start_key = decode_cursor(query_params["LastEvaluatedKey"])
+
+    if query_params.get("ProjectionExpression"):
+        projection = [
+            attribute.strip()
+            for attribute in query_params["ProjectionExpression"].split(",")
+        ]
+
+        if not all(ATTRIBUTE_NAME_PATTERN.match(attribute) for attribute in projection):
+            raise BadRequestError("Invalid ProjectionExpression")
+
+    return limit, exclusive_start_key, projection
+
+
+def list_items(table, limit=None, exclusive_start_key=None, projection=None, **kwargs):
+    """
+    Query (when a KeyConditionExpression is given) or Scan the table up to limit items.
+
+    :param projection: Attributes to return
+    :param kwargs: Additional Query or Scan parameters (IndexName, KeyConditionExpression, ...)
+
+    Returns:
+
+        Tuple of the list of items and the LastEvaluatedKey (None when there are no more items)
+    """
+    request = dict(kwargs)
+
+    if projection:
+        request["ProjectionExpression"] = ", ".join(
+            [f"#p{index}" for index in range(len(projection))]
+        )
+        request["ExpressionAttributeNames"] = {
+            **request.get("ExpressionAttributeNames", {}),
+            **{f"#p{index}": attribute for index, attribute in enumerate(projection)},
+        }
+
+    if exclusive_start_key:
+        request["ExclusiveStartKey"] = exclusive_start_key
+
+    operation = table.query if "KeyConditionExpression" in request else table.scan
+    items = []
+
+    while True:
+        if limit:
+            request["Limit"] = limit - len(items)
+
+        response = operation(**request)
+        items.extend(response["Items"])
+
+        if "LastEvaluatedKey" not in response or (limit and len(items) >= limit):
+            return items, response.get("LastEvaluatedKey")
+
+        request["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def get_page_response(items, last_evaluated_key, limit):
+    """
+    Paginated response of a listing. Unpaginated listings (without limit) return just the items.
+    """
+    if limit is None:
+        return items
+
+    return {
+        "Items": items,
+        "LastEvaluatedKey": encode_cursor(last_evaluated_key),
+    }
@@ -0,0 +1,116 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+##############################################################################
+#
+# PURPOSE:
+# Custom Resource handler that sets the StartBucket attribute (UTC day of the
+# Start time) of the events created before the StartBucket GSI was added to
+# the Event table. Without it, those events are missing from the future and
+# date range event listings served by the GSI.
+#
+# The Event table is scanned in parallel segments and only the events missing
+# the attribute are updated, so running it again is a no-op.
+#
+##############################################################################
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import boto3
+from botocore.client import ClientError
+
+BACKFILL_TOTAL_SEGMENTS = int(os.getenv("BACKFILL_TOTAL_SEGMENTS", "8"))
+
+START_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+START_BUCKET_FORMAT = "%Y-%m-%d"
+
+# Unlike the resource, the low-level client is safe to share across threads
+ddb_client = boto3.client("dynamodb")
+
+
+def on_event(event, context):
+    print(event)
+    request_type = event["RequestType"]
+
+    if request_type in ["Create", "Update"]:
+        backfill_start_bucket(event["ResourceProperties"]["table_name"])
+
+    elif request_type != "Delete":
+        raise Exception(f"Invalid request type: {request_type}")
+
+    return {"PhysicalResourceId": "EventStartBucketBackfill"}
+
+
+def backfill_start_bucket(table_name):
+    with ThreadPoolExecutor(max_workers=BACKFILL_TOTAL_SEGMENTS) as executor:
+        updated_counts = list(
+            executor.map(
+                lambda segment: backfill_segment(table_name, segment),
+                range(BACKFILL_TOTAL_SEGMENTS),
+            )
+        )
+
+    print(f"Set the StartBucket of {sum(updated_counts)} events in table '{table_name}'")
+
+
+def backfill_segment(table_name, segment):
+    scan = {
+        "TableName": table_name,
+        "Segment": segment,
+        "TotalSegments": BACKFILL_TOTAL_SEGMENTS,
+        "FilterExpression": "attribute_not_exists(#StartBucket) AND attribute_exists(#Start)",
+        "ProjectionExpression": "#Name, #Program, #Start",
+        "ExpressionAttributeNames": {
+            "#Name": "Name",
+            "#Program": "Program",
+            "#Start": "Start",
+            "#StartBucket": "StartBucket",
+        },
+    }
+
+    updated_count = 0
+
+    while True:
+        response = ddb_client.scan(**scan)
+
+        for item in response["Items"]:
+            if update_start_bucket(table_name, item):
+                updated_count += 1
+
+        if "LastEvaluatedKey" not in response:
+            return updated_count
+
+        scan["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def update_start_bucket(table_name, item):
+    name = item["Name"]["S"]
+    program = item["Program"]["S"]
+
+    try:
+        start_bucket = datetime.strptime(item["Start"]["S"], START_FORMAT).strftime(START_BUCKET_FORMAT)
+
+    except ValueError as e:
+        print(f"Skipping the event '{name}' in program '{program}' as its Start time is invalid: {str(e)}")
+        return False
+
+    try:
+        ddb_client.update_item(
+            TableName=table_name,
+            Key={"Name": item["Name"], "Program": item["Program"]},
+            UpdateExpression="SET #StartBucket = :StartBucket",
+            # Skip the events deleted or updated (which sets the StartBucket) since the scan
+            ConditionExpression="attribute_exists(#Name) AND attribute_not_exists(#StartBucket)",
+            ExpressionAttributeNames={"#Name": "Name", "#StartBucket": "StartBucket"},
+            ExpressionAttributeValues={":StartBucket": {"S": start_bucket}},
+        )
+
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+            return False
+
+        raise
+
+    return True
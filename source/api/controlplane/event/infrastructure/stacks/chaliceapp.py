@@ -2,7 +2,16 @@
 #  SPDX-License-Identifier: Apache-2.0
 import os
 import sys
-from aws_cdk import CfnOutput, Fn, Stack, aws_lambda as aws_lambda, aws_iam as iam
+from aws_cdk import (
+    CfnOutput,
+    CustomResource,
+    Duration,
+    Fn,
+    Stack,
+    aws_lambda as aws_lambda,
+    aws_iam as iam,
+    custom_resources as cr,
+)
 from chalice.cdk import Chalice
 from cdk_nag import NagSuppressions
 
@@ -34,6 +43,9 @@ class ChaliceApp(Stack):
         )
         self.mre_api_gateway_logging_role_arn = Fn.import_value("mre-api-gateway-logging-role-arn")
         self.powertools_layer = common.MreCdkCommon.get_powertools_layer_from_arn(self)
+        self.mre_workflow_helper_layer = (
+            common.MreCdkCommon.get_mre_workflow_helper_layer_from_arn(self)
+        )
 
         # Get the Existing MRE EventBus as IEventBus
         self.event_bus = common.MreCdkCommon.get_event_bus(self)
@@ -41,6 +53,7 @@ class ChaliceApp(Stack):
 
         self.create_medialive_access_role()
         self.create_chalice_role()
+        self.create_start_bucket_backfill()
 
         # Enable API Gateway logging through Custom Resources
         api_logging_construct.ApiGatewayLogging(
@@ -54,6 +67,75 @@ class ChaliceApp(Stack):
 
         
 
+    def create_start_bucket_backfill(self):
+        # Role: EventStartBucketBackfillRole
+        self.start_bucket_backfill_role = iam.Role(
+            self,
+            "EventStartBucketBackfillRole",
+            assumed_by=iam.ServicePrincipal(service="lambda.amazonaws.com"),
+            description="Role used by the MRE Event StartBucket Backfill Custom Resource Lambda function",
+        )
+
+        # EventStartBucketBackfillRole: CloudWatch Logs permissions
+        self.start_bucket_backfill_role.add_to_policy(
+            iam.PolicyStatement(
+                effect=iam.Effect.ALLOW,
+                actions=["logs:CreateLogStream", "logs:PutLogEvents"],
+                resources=[
+                    f"arn:aws:logs:{Stack.of(self).region}:{Stack.of(self).account}:log-group:/aws/lambda/{Stack.of(self).stack_name}-*",
+                ],
+            )
+        )
+
+        self.start_bucket_backfill_role.add_to_policy(
+            iam.PolicyStatement(
+                effect=iam.Effect.ALLOW,
+                actions=["logs:CreateLogGroup"],
+                resources=[
+                    f"arn:aws:logs:{Stack.of(self).region}:{Stack.of(self).account}:log-group*"
+                ],
+            )
+        )
+
+        # EventStartBucketBackfillRole: DynamoDB permissions
+        self.start_bucket_backfill_role.add_to_policy(
+            iam.PolicyStatement(
+                effect=iam.Effect.ALLOW,
+                actions=["dynamodb:Scan", "dynamodb:UpdateItem"],
+                resources=[self.event_table_arn],
+            )
+        )
+
+        # Function: EventStartBucketBackfill
+        self.start_bucket_backfill_lambda = aws_lambda.Function(
+            self,
+            "EventStartBucketBackfill",
+            description="Set the StartBucket attribute of the events created before the StartBucket GSI was added to the Event table",
+            runtime=aws_lambda.Runtime.PYTHON_3_11,
+            code=aws_lambda.Code.from_asset("lambda/EventStartBucketBackfill"),
+            handler="lambda_function.on_event",
+            role=self.start_bucket_backfill_role,
+            memory_size=256,
+            timeout=Duration.minutes(15),
+        )
+
+        self.start_bucket_backfill_provider = cr.Provider(
+            self,
+            "EventStartBucketBackfillProvider",
+            on_event_handler=self.start_bucket_backfill_lambda,
+        )
+
+        # Runs once, when the StartBucket GSI is introduced. It waits for the Chalice app
+        # so that the events created after the scan already carry the StartBucket attribute.
+        self.start_bucket_backfill_cr = CustomResource(
+            self,
+            "EventStartBucketBackfillCR",
+            service_token=self.start_bucket_backfill_provider.service_token,
+            properties={"table_name": self.event_table_name},
+        )
+
+        self.start_bucket_backfill_cr.node.add_dependency(self.chalice)
+
     def create_medialive_access_role(self):
         # Create a MediaLive Access Role
         self.medialive_access_role = iam.Role(
@@ -378,6 +460,8 @@ class ChaliceApp(Stack):
                     "EVENT_PAGINATION_INDEX": constants.EVENT_PAGINATION_INDEX,
                     "EVENT_PROGRAMID_INDEX": constants.EVENT_PROGRAMID_INDEX,
                     "EVENT_PROGRAM_INDEX": constants.EVENT_PROGRAM_INDEX,
+                    "EVENT_START_BUCKET_INDEX": constants.EVENT_START_BUCKET_INDEX,
+                    "START_BUCKET_MAX_RANGE_DAYS": "366",
                     "EVENT_CHANNEL_INDEX": constants.EVENT_CHANNEL_INDEX,
                     "EVENT_BYOB_NAME_INDEX": constants.EVENT_BYOB_NAME_INDEX,
                     "EB_EVENT_BUS_NAME": self.event_bus.event_bus_name,
@@ -402,7 +486,10 @@ class ChaliceApp(Stack):
                 "tags": {"Project": "MRE"},
                 "manage_iam_role": False,
                 "iam_role_arn": self.chalice_role.role_arn,
-                "layers": [self.powertools_layer.layer_version_arn]
+                "layers": [
+                    self.powertools_layer.layer_version_arn,
+                    self.mre_workflow_helper_layer.layer_version_arn,
+                ]
             },
         )
 
@@ -491,7 +578,10 @@ class ChaliceApp(Stack):
                 {
                     "id": "AwsSolutions-IAM5",
                     "reason": "Custom resource provider needs to invoke the target Lambda function.",
-                    "appliesTo": ["Resource::<EventApiGatewayLoggingEnableLoggingHandler33B0CF1B.Arn>:*"]
+                    "appliesTo": [
+                        "Resource::<EventApiGatewayLoggingEnableLoggingHandler33B0CF1B.Arn>:*",
+                        {"regex": "/^Resource::<EventStartBucketBackfill[0-9A-F]+\\.Arn>:\\*$/"},
+                    ]
                 }
             ],
         )
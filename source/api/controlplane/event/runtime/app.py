@@ -20,13 +20,20 @@ from chalicelib import helpers
 from chalicelib import load_api_schema, replace_decimals, replace_floats
 from chalicelib.Schedule import Schedule
 from chalicelib.EventScheduler import EventScheduler
+from chalicelib.start_index import get_start_bucket, query_events_by_start
+from chalicelib.listing import get_page_params, get_page_response, list_items
+from chalicelib.etag import get_conditional_response
 from botocore.signers import CloudFrontSigner
 import rsa
 import functools
 import calendar
+import threading
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.utilities.validation import (SchemaValidationError,
                                                         validate)
+from MediaReplayEngineWorkflowHelper import RateLimiter
 
 app = Chalice(app_name="aws-mre-controlplane-event-api")
 logger = Logger(service="aws-mre-controlplane-event-api")
@@ -58,6 +65,11 @@ METADATA_TABLE_NAME = os.environ["METADATA_TABLE_NAME"]
 HLS_STREAMING_SIGNED_URL_EXPIRATION_HRS = os.environ[
     "HLS_STREAMING_SIGNED_URL_EXPIRATION_HRS"
 ]
+EVENT_BATCH_MAX_WORKERS = int(os.getenv("EVENT_BATCH_MAX_WORKERS", "8"))
+EVENT_SCHEDULER_MAX_TPS = float(os.getenv("EVENT_SCHEDULER_MAX_TPS", "20"))
+EVENT_MEDIALIVE_MAX_TPS = float(os.getenv("EVENT_MEDIALIVE_MAX_TPS", "10"))
+
+MAX_BATCH_EVENTS = 100
 
 metadata_table = ddb_resource.Table(METADATA_TABLE_NAME)
 
@@ -145,15 +157,7 @@ def create_event():
     try:
         event = json.loads(app.current_request.raw_body.decode(), parse_float=Decimal)
 
-        validate(
-            event=event,
-            schema=API_SCHEMA["create_event"]
-        )
-
-        # Validate that the Event Duration is not Negative
-        if "DurationMinutes" in event:
-            if event["DurationMinutes"] < 0:
-                raise ValidationError("Event duration cannot be a negative value.")
+        validate_new_event(event)
 
         logger.info("Got a valid event schema")
 
@@ -165,96 +169,11 @@ def create_event():
         # Add the program to Program DDB table
         program_table.put_item(Item={"Name": program})
 
-        is_vod_event = False
-
-        # The API caller sends the Start time in UTC format
-        start_utc_time = datetime.strptime(event["Start"], "%Y-%m-%dT%H:%M:%SZ")
-        logger.info(f"start_utc_time={start_utc_time}")
-
-        cur_utc_time = datetime.utcnow()
-
-        event["BootstrapTimeInMinutes"] = (
-            event["BootstrapTimeInMinutes"] if "BootstrapTimeInMinutes" in event else 0
-        )
-        event["Id"] = str(uuid.uuid4())
-        event["Status"] = "Queued"
-        event["Created"] = cur_utc_time.strftime("%Y-%m-%dT%H:%M:%SZ")
-        event["HlsMasterManifest"] = {}
-        event["EdlLocation"] = {}
-        event["PaginationPartition"] = "PAGINATION_PARTITION"
-        event["StartFilter"] = event["Start"]
-
-        event["GenerateOrigClips"] = (
-            True if "GenerateOrigClips" not in event else event["GenerateOrigClips"]
-        )
-        event["GenerateOptoClips"] = (
-            True if "GenerateOptoClips" not in event else event["GenerateOptoClips"]
-        )
-        event["GenerateOrigThumbNails"] = (
-            True
-            if "GenerateOrigThumbNails" not in event
-            else event["GenerateOrigThumbNails"]
-        )
-        event["GenerateOptoThumbNails"] = (
-            True
-            if "GenerateOptoThumbNails" not in event
-            else event["GenerateOptoThumbNails"]
-        )
-
-        event["TimecodeSource"] = (
-            "NOT_EMBEDDED" if "TimecodeSource" not in event else event["TimecodeSource"]
-        )
-        event["StopMediaLiveChannel"] = (
-            event["StopMediaLiveChannel"] if "StopMediaLiveChannel" in event else False
-        )
+        is_vod_event = init_new_event(event, datetime.utcnow())
 
         event_table = ddb_resource.Table(EVENT_TABLE_NAME)
 
-        # Check if the event start time is in the past
-        if cur_utc_time >= start_utc_time:
-            is_vod_event = True
-
-        # These are required to be passed to EventBridge for Event Life Cycle Management
-        if is_vod_event:
-            vod_schedule_id = f"mre-vod-end-{str(uuid.uuid4())}"
-            event["vod_schedule_id"] = vod_schedule_id
-        else:
-            live_start_schedule_id = f"mre-live-{str(uuid.uuid4())}-event-start"
-            live_end_schedule_id = f"mre-live-{str(uuid.uuid4())}-event-end"
-            event["live_start_schedule_id"] = live_start_schedule_id
-            event["live_end_schedule_id"] = live_end_schedule_id
-
-        # MediaLive
-        if "Channel" in event and event["Channel"]:
-            last_known_medialive_config, source_hls_manifest_location = (
-                helpers.add_or_update_medialive_output_group(
-                    name, program, event["Profile"], event["Channel"]
-                )
-            )
-            event["LastKnownMediaLiveConfig"] = last_known_medialive_config
-            event["SourceHlsMasterManifest"] = source_hls_manifest_location
-
-            # Add or Update the CW Alarm for the MediaLive channel
-            # helpers.create_cloudwatch_alarm_for_channel(event["Channel"])
-
-        # Harvester
-        if "SourceVideoAuth" in event:
-            response = sm_client.create_secret(
-                Name=f"/MRE/Event/{event['Id']}/SourceVideoAuth",
-                SecretString=json.dumps(event["SourceVideoAuth"]),
-                Tags=[
-                    {"Key": "Project", "Value": "MRE"},
-                    {"Key": "Program", "Value": program},
-                    {"Key": "Event", "Value": name},
-                ],
-            )
-
-            event["SourceVideoAuthSecretARN"] = response["ARN"]
-            event.pop("SourceVideoAuth", None)
-
-        # S3 bucket source
-        if "SourceVideoBucket" in event and event["SourceVideoBucket"]:
-            helpers.create_s3_bucket_trigger(event["SourceVideoBucket"])
+        setup_event_chunk_source(event, name, program)
 
         logger.info(f"Creating the event '{name}' in program '{program}'")
 
@@ -264,11 +183,8 @@ def create_event():
             ExpressionAttributeNames={"#Name": "Name", "#Program": "Program"},
         )
 
-        # If we have variables in the event, persist in the metadata table
-        if "Variables" in event and event["Variables"]:
-            metadata_table.put_item(
-                Item={"pk": f"EVENT#{program}#{name}", "data": event["Variables"]}
-            )
+        for item in get_event_metadata_items(event):
+            metadata_table.put_item(Item=item)
 
     except NotFoundError as e:
         logger.info(f"Got chalice NotFoundError: {str(e)}")
@@ -285,12 +201,7 @@ def create_event():
     except ClientError as e:
         logger.info(f"Got DynamoDB ClientError: {str(e)}")
 
-        if "LastKnownMediaLiveConfig" in event:
-            medialive_client.update_channel(
-                ChannelId=event["Channel"],
-                Destinations=event["LastKnownMediaLiveConfig"]["Destinations"],
-                EncoderSettings=event["LastKnownMediaLiveConfig"]["EncoderSettings"],
-            )
+        restore_medialive_channel(event)
 
         if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
             raise ConflictError(f"Event '{name}' in program '{program}' already exists")
@@ -300,12 +211,7 @@ def create_event():
     except Exception as e:
         logger.info(f"Unable to create the event '{name}' in program '{program}': {str(e)}")
 
-        if "LastKnownMediaLiveConfig" in event:
-            medialive_client.update_channel(
-                ChannelId=event["Channel"],
-                Destinations=event["LastKnownMediaLiveConfig"]["Destinations"],
-                EncoderSettings=event["LastKnownMediaLiveConfig"]["EncoderSettings"],
-            )
+        restore_medialive_channel(event)
 
         raise ChaliceViewError(
             f"Unable to create the event '{name}' in program '{program}': {str(e)}"
@@ -315,109 +221,240 @@ def create_event():
         logger.info(f"Successfully created the event: {json.dumps(event)}")
 
         try:
-            # HANDLE VOD EVENTS
-            if is_vod_event:
-
-                # Attempting to Start MediaLive Channel
-                start_medialive_channel(event, name, program)
-
-                # Create a EB Schedule for Ending this VOD Event
-                cur_utc_time = datetime.utcnow()
-                event_start_time = cur_utc_time.strftime("%Y-%m-%dT%H:%M:%S")
-                schedule = Schedule(
-                    schedule_name=vod_schedule_id,
-                    event_name=name,
-                    program_name=program,
-                    event_start_time=event_start_time,
-                    is_vod_event=True,
-                    bootstrap_time_in_mins=event["BootstrapTimeInMinutes"],
-                    event_duration_in_mins=event["DurationMinutes"],
-                    resource_arn=EB_EVENT_BUS_ARN,
-                    execution_role=EB_SCHEDULE_ROLE_ARN,
-                    input_payload="",
-                    stop_channel=(
-                        event["StopMediaLiveChannel"]
-                        if "StopMediaLiveChannel" in event
-                        else False
-                    ),
-                )
-                # Schedule with a Message Status of VOD_EVENT_END
-                EventScheduler().create_schedule_event_bridge_target(
-                    schedule, get_chunk_source_details(event)
-                )
-                logger.info(f"Created Schedule for VOD event {name}")
+            create_event_schedules(event, name, program, is_vod_event)
 
-            else:
-                eventScheduler = EventScheduler()
-                # HANDLE LIVE EVENTS
-                event_start_time_utc = datetime.strptime(
-                    event["Start"], "%Y-%m-%dT%H:%M:%SZ"
-                )
+        except Exception as e:
+            logger.info(
+                f"Error creating Schedules for event '{name}' in program '{program}': {str(e)}"
+            )
+            raise ChaliceViewError(
+                f"Error creating Schedules for event '{name}' in program '{program}': {str(e)}"
+            )
 
-                # Create two EB Schedules. One for Starting the Live Event and another to End it
-                schedule = Schedule(
-                    schedule_name=live_start_schedule_id,
-                    event_name=name,
-                    program_name=program,
-                    event_start_time=event_start_time_utc,
-                    is_vod_event=False,
-                    bootstrap_time_in_mins=event["BootstrapTimeInMinutes"],
-                    event_duration_in_mins=event["DurationMinutes"],
-                    resource_arn=EB_EVENT_BUS_ARN,
-                    execution_role=EB_SCHEDULE_ROLE_ARN,
-                    input_payload="",
-                    schedule_name_prefix="event-start",
-                    stop_channel=(
-                        event["StopMediaLiveChannel"]
-                        if "StopMediaLiveChannel" in event
-                        else False
-                    ),
-                )
+        return {}
 
-                eventScheduler.create_schedule_event_bridge_target(
-                    schedule, get_chunk_source_details(event)
-                )
 
-                # Create a EB Schedule for Ending this VOD Event
-                schedule = Schedule(
-                    schedule_name=live_end_schedule_id,
-                    event_name=name,
-                    program_name=program,
-                    event_start_time=event_start_time_utc,
-                    is_vod_event=False,
-                    bootstrap_time_in_mins=event["BootstrapTimeInMinutes"],
-                    event_duration_in_mins=event["DurationMinutes"],
-                    resource_arn=EB_EVENT_BUS_ARN,
-                    execution_role=EB_SCHEDULE_ROLE_ARN,
-                    input_payload="",
-                    schedule_name_prefix="event-end",
-                    stop_channel=(
-                        event["StopMediaLiveChannel"]
-                        if "StopMediaLiveChannel" in event
-                        else False
-                    ),
-                )
+def validate_new_event(event):
+    validate(
+        event=event,
+        schema=API_SCHEMA["create_event"]
+    )
 
-                eventScheduler.create_schedule_event_bridge_target(
-                    schedule, get_chunk_source_details(event)
-                )
+    # Validate that the Event Duration is not Negative
+    if "DurationMinutes" in event:
+        if event["DurationMinutes"] < 0:
+            raise ValidationError("Event duration cannot be a negative value.")
 
-                logger.info(f"Created Schedules for LIVE event {name}")
 
-            # Publishing message VOD_EVENT_START to Event Bridge.
-            # LIVE_EVENT_START events are sent via the Event Start EB Schedule when it gets triggered.
-            if is_vod_event:
-                put_event_start_to_event_bus(is_vod_event, name, program, event)
+def init_new_event(event, cur_utc_time):
+    """
+    Set the system-generated and default attributes of a new event.
 
-        except Exception as e:
-            logger.info(
-                f"Error creating Schedules for event '{name}' in program '{program}': {str(e)}"
+    Returns:
+
+        True if the event is a VOD event (having the Start time in the past), False otherwise
+    """
+    # The API caller sends the Start time in UTC format
+    start_utc_time = datetime.strptime(event["Start"], "%Y-%m-%dT%H:%M:%SZ")
+    logger.info(f"start_utc_time={start_utc_time}")
+
+    event["BootstrapTimeInMinutes"] = (
+        event["BootstrapTimeInMinutes"] if "BootstrapTimeInMinutes" in event else 0
+    )
+    event["Id"] = str(uuid.uuid4())
+    event["Status"] = "Queued"
+    event["Created"] = cur_utc_time.strftime("%Y-%m-%dT%H:%M:%SZ")
+    event["HlsMasterManifest"] = {}
+    event["EdlLocation"] = {}
+    event["PaginationPartition"] = "PAGINATION_PARTITION"
+    event["StartFilter"] = event["Start"]
+    event["StartBucket"] = get_start_bucket(event["Start"])
+
+    event["GenerateOrigClips"] = (
+        True if "GenerateOrigClips" not in event else event["GenerateOrigClips"]
+    )
+    event["GenerateOptoClips"] = (
+        True if "GenerateOptoClips" not in event else event["GenerateOptoClips"]
+    )
+    event["GenerateOrigThumbNails"] = (
+        True
+        if "GenerateOrigThumbNails" not in event
+        else event["GenerateOrigThumbNails"]
+    )
+    event["GenerateOptoThumbNails"] = (
+        True
+        if "GenerateOptoThumbNails" not in event
+        else event["GenerateOptoThumbNails"]
+    )
+
+    event["TimecodeSource"] = (
+        "NOT_EMBEDDED" if "TimecodeSource" not in event else event["TimecodeSource"]
+    )
+    event["StopMediaLiveChannel"] = (
+        event["StopMediaLiveChannel"] if "StopMediaLiveChannel" in event else False
+    )
+
+    # Check if the event start time is in the past
+    is_vod_event = cur_utc_time >= start_utc_time
+
+    # These are required to be passed to EventBridge for Event Life Cycle Management
+    if is_vod_event:
+        event["vod_schedule_id"] = f"mre-vod-end-{str(uuid.uuid4())}"
+    else:
+        event["live_start_schedule_id"] = f"mre-live-{str(uuid.uuid4())}-event-start"
+        event["live_end_schedule_id"] = f"mre-live-{str(uuid.uuid4())}-event-end"
+
+    return is_vod_event
+
+
+def setup_event_chunk_source(event, name, program):
+    # MediaLive
+    if "Channel" in event and event["Channel"]:
+        last_known_medialive_config, source_hls_manifest_location = (
+            helpers.add_or_update_medialive_output_group(
+                name, program, event["Profile"], event["Channel"]
             )
-            raise ChaliceViewError(
-                f"Error creating Schedules for event '{name}' in program '{program}': {str(e)}"
+        )
+        event["LastKnownMediaLiveConfig"] = last_known_medialive_config
+        event["SourceHlsMasterManifest"] = source_hls_manifest_location
+
+        # Add or Update the CW Alarm for the MediaLive channel
+        # helpers.create_cloudwatch_alarm_for_channel(event["Channel"])
+
+    # Harvester
+    if "SourceVideoAuth" in event:
+        response = sm_client.create_secret(
+            Name=f"/MRE/Event/{event['Id']}/SourceVideoAuth",
+            SecretString=json.dumps(event["SourceVideoAuth"]),
+            Tags=[
+                {"Key": "Project", "Value": "MRE"},
+                {"Key": "Program", "Value": program},
+                {"Key": "Event", "Value": name},
+            ],
+        )
+
+        event["SourceVideoAuthSecretARN"] = response["ARN"]
+        event.pop("SourceVideoAuth", None)
+
+    # S3 bucket source
+    if "SourceVideoBucket" in event and event["SourceVideoBucket"]:
+        helpers.create_s3_bucket_trigger(event["SourceVideoBucket"])
+
+
+def restore_medialive_channel(event):
+    if "LastKnownMediaLiveConfig" in event:
+        medialive_client.update_channel(
+            ChannelId=event["Channel"],
+            Destinations=event["LastKnownMediaLiveConfig"]["Destinations"],
+            EncoderSettings=event["LastKnownMediaLiveConfig"]["EncoderSettings"],
+        )
+
+
+def get_event_metadata_items(event):
+    items = []
+
+    # Map the MediaLive channel to the event so that the event life cycle functions
+    # can get the event of a channel without describing the channel
+    if "Channel" in event and event["Channel"]:
+        items.append(
+            {
+                "pk": f"CHANNEL#{event['Channel']}",
+                "data": {"Program": event["Program"], "Event": event["Name"]},
+            }
+        )
+
+    # If we have variables in the event, persist in the metadata table
+    if "Variables" in event and event["Variables"]:
+        items.append(
+            {"pk": f"EVENT#{event['Program']}#{event['Name']}", "data": event["Variables"]}
+        )
+
+    return items
+
+
+def create_event_schedules(event, name, program, is_vod_event, rate_limiter=None):
+    """
+    Create the EventBridge schedules of a new event and, for VOD events, start the MediaLive channel
+    and publish VOD_EVENT_START to EventBridge.
+
+    :param rate_limiter: (optional) RateLimiter to acquire before each EventBridge Scheduler call
+    """
+    stop_channel = (
+        event["StopMediaLiveChannel"] if "StopMediaLiveChannel" in event else False
+    )
+
+    # HANDLE VOD EVENTS
+    if is_vod_event:
+
+        # Attempting to Start MediaLive Channel
+        start_medialive_channel(event, name, program)
+
+        # Create a EB Schedule for Ending this VOD Event
+        cur_utc_time = datetime.utcnow()
+        event_start_time = cur_utc_time.strftime("%Y-%m-%dT%H:%M:%S")
+        schedule = Schedule(
+            schedule_name=event["vod_schedule_id"],
+            event_name=name,
+            program_name=program,
+            event_start_time=event_start_time,
+            is_vod_event=True,
+            bootstrap_time_in_mins=event["BootstrapTimeInMinutes"],
+            event_duration_in_mins=event["DurationMinutes"],
+            resource_arn=EB_EVENT_BUS_ARN,
+            execution_role=EB_SCHEDULE_ROLE_ARN,
+            input_payload="",
+            stop_channel=stop_channel,
+        )
+
+        if rate_limiter:
+            rate_limiter.acquire()
+
+        # Schedule with a Message Status of VOD_EVENT_END
+        EventScheduler().create_schedule_event_bridge_target(
+            schedule, get_chunk_source_details(event)
+        )
+        logger.info(f"Created Schedule for VOD event {name}")
+
+    else:
+        eventScheduler = EventScheduler()
+        # HANDLE LIVE EVENTS
+        event_start_time_utc = datetime.strptime(
+            event["Start"], "%Y-%m-%dT%H:%M:%SZ"
+        )
+
+        # Create two EB Schedules. One for Starting the Live Event and another to End it
+        for schedule_name, schedule_name_prefix in [
+            (event["live_start_schedule_id"], "event-start"),
+            (event["live_end_schedule_id"], "event-end"),
+        ]:
+            schedule = Schedule(
+                schedule_name=schedule_name,
+                event_name=name,
+                program_name=program,
+                event_start_time=event_start_time_utc,
+                is_vod_event=False,
+                bootstrap_time_in_mins=event["BootstrapTimeInMinutes"],
+                event_duration_in_mins=event["DurationMinutes"],
+                resource_arn=EB_EVENT_BUS_ARN,
+                execution_role=EB_SCHEDULE_ROLE_ARN,
+                input_payload="",
+                schedule_name_prefix=schedule_name_prefix,
+                stop_channel=stop_channel,
             )
 
-        return {}
+            if rate_limiter:
+                rate_limiter.acquire()
+
+            eventScheduler.create_schedule_event_bridge_target(
+                schedule, get_chunk_source_details(event)
+            )
+
+        logger.info(f"Created Schedules for LIVE event {name}")
+
+    # Publishing message VOD_EVENT_START to Event Bridge.
+    # LIVE_EVENT_START events are sent via the Event Start EB Schedule when it gets triggered.
+    if is_vod_event:
+        put_event_start_to_event_bus(is_vod_event, name, program, event)
 
 
 def start_medialive_channel(event, name, program):
@@ -472,6 +509,401 @@ def put_event_start_to_event_bus(is_vod, event_name, program_name, event):
     )
 
 
+@app.route("/event/batch", cors=True, methods=["POST"], authorizer=authorizer)
+def create_events_batch():
+    """
+    Creates multiple events in MRE in a single request.
+
+    Each event is validated and created in the same way as the "POST /event" API. All the events are
+    validated in one pass (with a single lookup of the referenced profiles and of the events that
+    already exist), have their chunk sources (MediaLive channel, S3 bucket trigger) set up concurrently,
+    are written to DynamoDB in batches and have their EventBridge schedules created concurrently.
+
+    Body:
+
+    .. code-block:: python
+
+        {
+            "Events": [
+                {
+                    "Name": string,
+                    "Program": string,
+                    ...
+                },
+                ...
+            ]
+        }
+
+    Parameters:
+
+        - Events: [REQUIRED] List of up to 100 events, each in the format of the "POST /event" API body.
+
+    Returns:
+
+        Result of each event in the order of the request
+
+        .. code-block:: python
+
+            {
+                "Items": [
+                    {
+                        "Name": string,
+                        "Program": string,
+                        "Status": integer,
+                        "Error": string
+                    },
+                    ...
+                ]
+            }
+
+        Status is 201 for the events created and 400, 404, 409 or 500 (along with the Error) for the
+        events that were not.
+
+    Raises:
+        400 - BadRequestError
+        500 - ChaliceViewError
+    """
+    try:
+        try:
+            body = json.loads(app.current_request.raw_body.decode(), parse_float=Decimal)
+
+        except ValueError as e:
+            raise BadRequestError(f"Invalid JSON in the request body: {str(e)}")
+
+        events = body.get("Events") if isinstance(body, dict) else None
+
+        if not isinstance(events, list) or not events:
+            raise BadRequestError("Events must be a non-empty list of events")
+
+        if len(events) > MAX_BATCH_EVENTS:
+            raise BadRequestError(f"Cannot create more than {MAX_BATCH_EVENTS} events in a batch")
+
+        results = [
+            {
+                "Name": event.get("Name") if isinstance(event, dict) else None,
+                "Program": event.get("Program") if isinstance(event, dict) else None,
+                "Status": 201,
+            }
+            for event in events
+        ]
+
+        indexes = validate_batch_events(events, results)
+
+        cur_utc_time = datetime.utcnow()
+        is_vod_events = {}
+
+        # MediaLive channels, secrets and S3 triggers are set up concurrently, except for the events
+        # sharing a channel or a bucket which are set up one after the other
+        medialive_rate_limiter = RateLimiter(EVENT_MEDIALIVE_MAX_TPS)
+        chunk_source_locks = {
+            resource: threading.Lock()
+            for index in indexes
+            for resource in get_chunk_source_resources(events[index])
+        }
+
+        def prepare_event(index):
+            event = events[index]
+
+            with ExitStack() as stack:
+                for resource in sorted(get_chunk_source_resources(event)):
+                    stack.enter_context(chunk_source_locks[resource])
+
+                try:
+                    is_vod_events[index] = init_new_event(event, cur_utc_time)
+
+                    if "Channel" in event and event["Channel"]:
+                        medialive_rate_limiter.acquire()
+
+                    setup_event_chunk_source(event, event["Name"], event["Program"])
+
+                except Exception as e:
+                    logger.info(
+                        f"Unable to set up the chunk source of the event '{event['Name']}' in program '{event['Program']}': {str(e)}"
+                    )
+                    set_batch_result_error(results[index], e)
+                    restore_batch_medialive_channel(event, results[index])
+
+                    return False
+
+            return True
+
+        with ThreadPoolExecutor(max_workers=EVENT_BATCH_MAX_WORKERS) as executor:
+            prepared_indexes = [
+                index
+                for index, is_prepared in zip(indexes, executor.map(prepare_event, indexes))
+                if is_prepared
+            ]
+
+        logger.info(f"Creating {len(prepared_indexes)} events in batch")
+
+        try:
+            written_event_keys, error = write_batch_events([events[index] for index in prepared_indexes])
+
+        except Exception as e:
+            logger.info(f"Unable to write the events in batch: {str(e)}")
+            written_event_keys, error = set(), e
+
+        # Only the events that were not written are reported as failed. The others carry on with their schedules.
+        created_indexes = []
+
+        for index in prepared_indexes:
+            if (events[index]["Name"], events[index]["Program"]) in written_event_keys:
+                created_indexes.append(index)
+            else:
+                set_batch_result_error(results[index], error)
+                restore_batch_medialive_channel(events[index], results[index])
+
+        prepared_indexes = created_indexes
+
+        try:
+            write_batch_event_metadata([events[index] for index in prepared_indexes])
+
+        except Exception as e:
+            logger.info(f"Unable to write the metadata of the events in batch: {str(e)}")
+
+            # The events exist at this point and so, carry on with their schedules
+            for index in prepared_indexes:
+                results[index]["Status"] = 500
+                results[index]["Error"] = f"Creation of event '{events[index]['Name']}' in program '{events[index]['Program']}' is successful but unable to store its metadata: {str(e)}"
+
+        rate_limiter = RateLimiter(EVENT_SCHEDULER_MAX_TPS)
+
+        def create_schedules(index):
+            event = events[index]
+
+            try:
+                create_event_schedules(
+                    event, event["Name"], event["Program"], is_vod_events[index], rate_limiter
+                )
+
+            except Exception as e:
+                logger.info(
+                    f"Error creating Schedules for event '{event['Name']}' in program '{event['Program']}': {str(e)}"
+                )
+                results[index]["Status"] = 500
+                results[index]["Error"] = f"Error creating Schedules for event '{event['Name']}' in program '{event['Program']}': {str(e)}"
+
+        with ThreadPoolExecutor(max_workers=EVENT_BATCH_MAX_WORKERS) as executor:
+            list(executor.map(create_schedules, prepared_indexes))
+
+    except BadRequestError as e:
+        logger.info(f"Got chalice BadRequestError: {str(e)}")
+        raise
+
+    except Exception as e:
+        logger.info(f"Unable to create the events in batch: {str(e)}")
+        raise ChaliceViewError(f"Unable to create the events in batch: {str(e)}")
+
+    else:
+        logger.info(
+            f"Created {sum(1 for result in results if result['Status'] == 201)} of {len(results)} events in batch"
+        )
+
+        return {"Items": results}
+
+
+def get_chunk_source_resources(event):
+    """
+    Get the MediaLive channel and S3 bucket (if any) that setting up the chunk source of an event modifies.
+    """
+    resources = []
+
+    if "Channel" in event and event["Channel"]:
+        resources.append(("Channel", event["Channel"]))
+
+    if "SourceVideoBucket" in event and event["SourceVideoBucket"]:
+        resources.append(("SourceVideoBucket", event["SourceVideoBucket"]))
+
+    return resources
+
+
+def restore_batch_medialive_channel(event, result):
+    """
+    Restore the MediaLive channel of an event that could not be created in a batch. A failure to restore
+    it is recorded against that event only instead of failing the rest of the batch.
+    """
+    try:
+        restore_medialive_channel(event)
+
+    except Exception as e:
+        logger.info(
+            f"Unable to restore the MediaLive channel of the event '{event['Name']}' in program '{event['Program']}': {str(e)}"
+        )
+        result["Error"] = f"{result['Error']}. Unable to restore the MediaLive channel '{event['Channel']}': {str(e)}"
+
+
+def set_batch_result_error(result, error):
+    if isinstance(error, ValidationError):
+        result["Status"] = 400
+        result["Error"] = error.message
+    elif isinstance(error, SchemaValidationError):
+        result["Status"] = 400
+        result["Error"] = f"ValidationError: {str(error.validation_message)}"
+    elif isinstance(error, BadRequestError):
+        result["Status"] = 400
+        result["Error"] = str(error)
+    elif isinstance(error, NotFoundError):
+        result["Status"] = 404
+        result["Error"] = str(error)
+    elif isinstance(error, ConflictError):
+        result["Status"] = 409
+        result["Error"] = str(error)
+    else:
+        result["Status"] = 500
+        result["Error"] = str(error)
+
+
+def validate_batch_events(events, results):
+    """
+    Validate a batch of new events, recording the error of each invalid event in its result.
+
+    Returns:
+
+        Indexes of the valid events
+    """
+    indexes = []
+    event_keys = set()
+
+    for index, event in enumerate(events):
+        try:
+            if not isinstance(event, dict):
+                raise BadRequestError("Event must be an object")
+
+            validate_new_event(event)
+
+            if (event["Name"], event["Program"]) in event_keys:
+                raise ConflictError(
+                    f"Event '{event['Name']}' in program '{event['Program']}' is repeated in the batch"
+                )
+
+            event_keys.add((event["Name"], event["Program"]))
+
+        except Exception as e:
+            set_batch_result_error(results[index], e)
+
+        else:
+            indexes.append(index)
+
+    existing_profiles = get_existing_keys(
+        helpers.PROFILE_TABLE_NAME,
+        [{"Name": profile} for profile in {events[index]["Profile"] for index in indexes}],
+    )
+
+    existing_events = get_existing_keys(
+        EVENT_TABLE_NAME,
+        [{"Name": name, "Program": program} for name, program in event_keys],
+    )
+
+    valid_indexes = []
+
+    for index in indexes:
+        event = events[index]
+
+        if (event["Profile"],) not in existing_profiles:
+            set_batch_result_error(
+                results[index], NotFoundError(f"Profile '{event['Profile']}' not found")
+            )
+        elif (event["Name"], event["Program"]) in existing_events:
+            set_batch_result_error(
+                results[index],
+                ConflictError(f"Event '{event['Name']}' in program '{event['Program']}' already exists"),
+            )
+        else:
+            valid_indexes.append(index)
+
+    return valid_indexes
+
+
+def get_existing_keys(table_name, keys):
+    """
+    Get the keys (as tuples of the key attribute values) that exist in the table using BatchGetItem.
+    """
+    existing_keys = set()
+
+    if not keys:
+        return existing_keys
+
+    key_names = list(keys[0].keys())
+
+    # BatchGetItem accepts up to 100 keys per request
+    for start in range(0, len(keys), 100):
+        request_items = {
+            table_name: {
+                "Keys": keys[start : start + 100],
+                "ProjectionExpression": ", ".join([f"#k{i}" for i in range(len(key_names))]),
+                "ExpressionAttributeNames": {f"#k{i}": key_name for i, key_name in enumerate(key_names)},
+                "ConsistentRead": True,
+            }
+        }
+
+        while request_items:
+            response = ddb_resource.batch_get_item(RequestItems=request_items)
+
+            for item in response["Responses"].get(table_name, []):
+                existing_keys.add(tuple(item[key_name] for key_name in key_names))
+
+            request_items = response.get("UnprocessedKeys")
+
+    return existing_keys
+
+
+def write_batch_events(events):
+    """
+    Write a batch of new events along with their programs using BatchWriteItem.
+
+    The event items are flushed in groups of 25, so a failure can leave some of them written. In that
+    case, the events written are looked up so that only the others are reported as failed. The metadata
+    is written afterwards (see write_batch_event_metadata) only for the events written.
+
+    Returns:
+
+        Tuple of the keys (Name, Program) of the events written and the error that prevented the
+        others from being written (None if all of them were written)
+    """
+    event_keys = [(event["Name"], event["Program"]) for event in events]
+
+    if not events:
+        return set(), None
+
+    program_table = ddb_resource.Table(PROGRAM_TABLE_NAME)
+    event_table = ddb_resource.Table(EVENT_TABLE_NAME)
+
+    with program_table.batch_writer(overwrite_by_pkeys=["Name"]) as batch:
+        for program in {event["Program"] for event in events}:
+            batch.put_item(Item={"Name": program})
+
+    error = None
+
+    try:
+        with event_table.batch_writer() as batch:
+            for event in events:
+                batch.put_item(Item=replace_floats(event))
+
+    except Exception as e:
+        logger.info(f"Unable to write all the events in batch: {str(e)}")
+        error = e
+
+        written_event_keys = get_existing_keys(
+            EVENT_TABLE_NAME,
+            [{"Name": name, "Program": program} for name, program in event_keys],
+        )
+
+    else:
+        written_event_keys = set(event_keys)
+
+    return written_event_keys, error
+
+
+def write_batch_event_metadata(events):
+    """
+    Write the metadata (channel mapping and variables) of a batch of new events using BatchWriteItem.
+    """
+    with metadata_table.batch_writer(overwrite_by_pkeys=["pk"]) as batch:
+        for event in events:
+            for item in get_event_metadata_items(event):
+                batch.put_item(Item=item)
+
+
 # List events
 def list_events(path_params):
     """
@@ -884,6 +1316,9 @@ def get_event(name, program):
     """
     Get an event by name and program.
 
+    The response carries an ETag header. Requests with a matching If-None-Match header get a 304 (Not Modified)
+    response without a body.
+
     Returns:
 
         .. code-block:: python
@@ -952,7 +1387,90 @@ def get_event(name, program):
         )
 
     else:
-        return replace_decimals(response["Item"])
+        return get_conditional_response(
+            app.current_request, replace_decimals(response["Item"])
+        )
+
+
+@app.route(
+    "/event/medialive/channel/{channel_id}",
+    cors=True,
+    methods=["GET"],
+    authorizer=authorizer,
+)
+def get_event_by_channel(channel_id):
+    """
+    Get the event that the MediaLive channel was last configured for.
+
+    The response carries an ETag header. Requests with a matching If-None-Match header get a 304 (Not Modified)
+    response without a body.
+
+    Returns:
+
+        Event in the same format as the "GET /event/{name}/program/{program}" API
+
+    Raises:
+        404 - NotFoundError
+        500 - ChaliceViewError
+    """
+    try:
+        channel_id = urllib.parse.unquote(channel_id)
+
+        logger.info(f"Getting the Event of the MediaLive channel '{channel_id}'")
+
+        response = metadata_table.get_item(
+            Key={"pk": f"CHANNEL#{channel_id}"},
+            ConsistentRead=True,
+        )
+
+        if "Item" not in response:
+            raise NotFoundError(f"No Event found for the MediaLive channel '{channel_id}'")
+
+        name = response["Item"]["data"]["Event"]
+        program = response["Item"]["data"]["Program"]
+
+        event_table = ddb_resource.Table(EVENT_TABLE_NAME)
+
+        response = event_table.get_item(
+            Key={"Name": name, "Program": program}, ConsistentRead=True
+        )
+
+        if "Item" not in response:
+            raise NotFoundError(f"Event '{name}' in Program '{program}' not found")
+
+    except NotFoundError as e:
+        logger.info(f"Got chalice NotFoundError: {str(e)}")
+        raise
+
+    except Exception as e:
+        logger.info(f"Unable to get the Event of the MediaLive channel '{channel_id}': {str(e)}")
+        raise ChaliceViewError(
+            f"Unable to get the Event of the MediaLive channel '{channel_id}': {str(e)}"
+        )
+
+    else:
+        return get_conditional_response(
+            app.current_request, replace_decimals(response["Item"])
+        )
+
+
+def delete_channel_mapping(channel_id, name, program):
+    # Remove the channel mapping only if the channel has not been configured for another event since
+    try:
+        metadata_table.delete_item(
+            Key={"pk": f"CHANNEL#{channel_id}"},
+            ConditionExpression="#data.#Event = :Event AND #data.#Program = :Program",
+            ExpressionAttributeNames={
+                "#data": "data",
+                "#Event": "Event",
+                "#Program": "Program",
+            },
+            ExpressionAttributeValues={":Event": name, ":Program": program},
+        )
+
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            raise
 
 
 @app.route(
@@ -1091,7 +1609,7 @@ def update_event(name, program):
 
         update_expression = "SET #Description = :Description, #Profile = :Profile, #ContentGroup = :ContentGroup, #Start = :Start, \
         #DurationMinutes = :DurationMinutes, #Archive = :Archive, #GenerateOrigClips = :GenerateOrigClips, #GenerateOptoClips = :GenerateOptoClips, \
-         #TimecodeSource = :TimecodeSource, #StartFilter = :StartFilter, #GenerateOrigThumbNails = :GenerateOrigThumbNails, #GenerateOptoThumbNails = :GenerateOptoThumbNails"
+         #TimecodeSource = :TimecodeSource, #StartFilter = :StartFilter, #StartBucket = :StartBucket, #GenerateOrigThumbNails = :GenerateOrigThumbNails, #GenerateOptoThumbNails = :GenerateOptoThumbNails"
 
         expression_attribute_names = {
             "#Description": "Description",
@@ -1106,6 +1624,7 @@ def update_event(name, program):
             "#GenerateOptoThumbNails": "GenerateOptoThumbNails",
             "#TimecodeSource": "TimecodeSource",
             "#StartFilter": "StartFilter",
+            "#StartBucket": "StartBucket",
         }
 
         expression_attribute_values = {
@@ -1183,6 +1702,9 @@ def update_event(name, program):
             ":StartFilter": (
                 event["Start"] if "Start" in event else response["Item"]["Start"]
             ),
+            ":StartBucket": get_start_bucket(
+                event["Start"] if "Start" in event else response["Item"]["Start"]
+            ),
         }
 
         # For MediaLive Channels, Update the Bootstrap time
@@ -1551,6 +2073,9 @@ def delete_event(name, program):
 
         response = metadata_table.delete_item(Key={"pk": f"EVENT#{program}#{name}"})
 
+        if channel_id:
+            delete_channel_mapping(channel_id, name, program)
+
         # Send a message to the Event Deletion SQS Queue to trigger the deletion of processing data in DynamoDB for the Event
         helpers.notify_event_deletion_queue(name, program, profile)
 
@@ -2139,7 +2664,10 @@ def update_edl_for_event():
 @app.route("/event/all/external", cors=True, methods=["GET"], authorizer=authorizer)
 def list_events_external():
     """
-    List all the events for integrating with external systems.
+    List all the events for integrating with external systems (latest first).
+
+    Optionally, the events can be paginated by passing the "limit" and "LastEvaluatedKey" query parameters
+    and projected by passing the "ProjectionExpression" query parameter.
 
     Returns:
 
@@ -2153,23 +2681,30 @@ def list_events_external():
             ]
 
     Raises:
+        400 - BadRequestError
         500 - ChaliceViewError
     """
     try:
         logger.info("Listing all the events")
 
-        event_table = ddb_resource.Table(EVENT_TABLE_NAME)
+        limit, exclusive_start_key, projection = get_page_params(
+            app.current_request.query_params
+        )
 
-        response = event_table.scan(ConsistentRead=True)
+        if projection and "LastKnownMediaLiveConfig" not in projection:
+            projection.append("LastKnownMediaLiveConfig")
 
-        events = response["Items"]
-
-        while "LastEvaluatedKey" in response:
-            response = event_table.scan(
-                ExclusiveStartKey=response["LastEvaluatedKey"], ConsistentRead=True
-            )
+        event_table = ddb_resource.Table(EVENT_TABLE_NAME)
 
-            events.extend(response["Items"])
+        events, last_evaluated_key = list_items(
+            event_table,
+            limit=limit,
+            exclusive_start_key=exclusive_start_key,
+            projection=projection,
+            IndexName=EVENT_PAGINATION_INDEX,
+            KeyConditionExpression=Key("PaginationPartition").eq("PAGINATION_PARTITION"),
+            ScanIndexForward=False,  # descending
+        )
 
         all_events = []
         for event in events:
@@ -2177,12 +2712,15 @@ def list_events_external():
                 event.pop("LastKnownMediaLiveConfig")
                 all_events.append(event)
 
+    except BadRequestError:
+        raise
+
     except Exception as e:
         logger.info(f"Unable to list all the events: {str(e)}")
         raise ChaliceViewError(f"Unable to list all the events: {str(e)}")
 
     else:
-        return replace_decimals(all_events)
+        return replace_decimals(get_page_response(all_events, last_evaluated_key, limit))
 
 
 @app.route("/event/future/all", cors=True, methods=["GET"], authorizer=authorizer)
@@ -2190,6 +2728,8 @@ def list_future_events():
     """
     List all the events scheduled in the future in the next 1 Hr.
 
+    Optionally, the events can be paginated by passing the "limit" and "LastEvaluatedKey" query parameters.
+
     Returns:
 
         .. code-block:: python
@@ -2201,44 +2741,42 @@ def list_future_events():
                 ...
             ]
 
+        With the "limit" query parameter:
+
+        .. code-block:: python
+
+            {
+                "Items": [
+                    {
+                        Event
+                    }
+                    ...
+                ],
+                "LastEvaluatedKey": string
+            }
+
     Raises:
+        400 - BadRequestError
         500 - ChaliceViewError
     """
     try:
-
-        event_table = ddb_resource.Table(EVENT_TABLE_NAME)
         cur_utc_time = datetime.utcnow()
 
         # Look for Events scheduled in the next 1 Hr
         future_time_one_hr_away = cur_utc_time + timedelta(hours=1)
 
-        filter_expression = Attr("Start").between(
+        return list_events_by_start(
             cur_utc_time.strftime("%Y-%m-%dT%H:%M:%SZ"),
             future_time_one_hr_away.strftime("%Y-%m-%dT%H:%M:%SZ"),
         )
 
-        response = event_table.scan(
-            FilterExpression=filter_expression,
-            ConsistentRead=True,
-            ProjectionExpression="Profile, #status, #program, #created, FrameRate, #eventId, #start, #eventname",
-            ExpressionAttributeNames={
-                "#status": "Status",
-                "#created": "Created",
-                "#program": "Program",
-                "#eventId": "Id",
-                "#start": "Start",
-                "#eventname": "Name",
-            },
-        )
+    except BadRequestError:
+        raise
 
-        future_events = response["Items"]
     except Exception as e:
         logger.info(f"Unable to list future events: {str(e)}")
         raise ChaliceViewError(f"Unable to list future events: {str(e)}")
 
-    else:
-        return replace_decimals(future_events)
-
 
 @app.route(
     "/event/range/{fromDate}/{toDate}",
@@ -2248,7 +2786,9 @@ def list_future_events():
 )
 def list_range_based_events(fromDate, toDate):
     """
-    List all the events based on Date Range which is in UTC format
+    List all the events based on Date Range which is in UTC format. The range can span up to 366 days.
+
+    Optionally, the events can be paginated by passing the "limit" and "LastEvaluatedKey" query parameters.
 
     Returns:
 
@@ -2261,40 +2801,63 @@ def list_range_based_events(fromDate, toDate):
                 ...
             ]
 
+        With the "limit" query parameter:
+
+        .. code-block:: python
+
+            {
+                "Items": [
+                    {
+                        Event
+                    }
+                    ...
+                ],
+                "LastEvaluatedKey": string
+            }
+
     Raises:
+        400 - BadRequestError
         500 - ChaliceViewError
     """
     try:
 
         validate_path_parameters({"FromDate": fromDate, "ToDate": toDate})
 
-        event_table = ddb_resource.Table(EVENT_TABLE_NAME)
-        filter_expression = Attr("Start").between(fromDate, toDate)
-
-        response = event_table.scan(
-            FilterExpression=filter_expression,
-            ConsistentRead=True,
-            ProjectionExpression="Profile, #status, #program, #created, FrameRate, #eventId, #start, #eventname",
-            ExpressionAttributeNames={
-                "#status": "Status",
-                "#created": "Created",
-                "#program": "Program",
-                "#eventId": "Id",
-                "#start": "Start",
-                "#eventname": "Name",
-            },
-        )
-        future_events = response["Items"]
+        return list_events_by_start(fromDate, toDate)
 
     except SchemaValidationError as e:
         logger.info(f"ValidationError: {e.validation_message}")
         raise BadRequestError(f"ValidationError: {str(e.validation_message)}")
+    except BadRequestError:
+        raise
     except Exception as e:
         logger.info(f"Unable to list range based events: {str(e)}")
         raise ChaliceViewError(f"Unable to list range based events: {str(e)}")
 
-    else:
-        return replace_decimals(future_events)
+
+def list_events_by_start(from_start, to_start):
+    """
+    List the events starting between the given times from the StartBucket GSI, paginated when the
+    "limit" query parameter is passed.
+    """
+    limit, cursor, _ = get_page_params(app.current_request.query_params)
+
+    if cursor and not all(isinstance(cursor.get(key), str) for key in ["Start", "Name", "Program"]):
+        raise BadRequestError("Invalid LastEvaluatedKey")
+
+    try:
+        events, cursor = query_events_by_start(
+            from_start,
+            to_start,
+            ["Profile", "Status", "Created", "FrameRate", "Id"],
+            limit=limit,
+            cursor=cursor,
+        )
+
+    except ValueError as e:
+        raise BadRequestError(str(e))
+
+    return replace_decimals(get_page_response(events, cursor, limit))
 
 
 @app.route(
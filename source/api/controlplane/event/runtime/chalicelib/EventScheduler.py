@@ -34,6 +34,7 @@ class EventScheduler():
 
             scheduler_client.update_schedule(Name=schedule_name,
                                         ScheduleExpression=f'at({scheduled_time})',
+                                        ActionAfterCompletion='DELETE',
                                         FlexibleTimeWindow={
                                             'Mode': 'OFF'
                                         },
@@ -47,6 +48,16 @@ class EventScheduler():
                                         "Input":json.dumps(schedule_payload)
                                         })
 
+        except scheduler_client.exceptions.ResourceNotFoundException:
+            # The Scheduler deletes a schedule once it has fired (ActionAfterCompletion is DELETE).
+            # Create it again unless the new schedule time is in the past as well.
+            if datetime.strptime(scheduled_time, "%Y-%m-%dT%H:%M:%S") <= datetime.utcnow():
+                print(f"Schedule {schedule_name} has already fired and the new schedule time {scheduled_time} is in the past. Skipping it.")
+                return
+
+            print(f"Schedule {schedule_name} was not found as it has already fired. Creating it again for {scheduled_time}.")
+            self.create_schedule_event_bridge_target(schedule, chunk_source_details)
+
         except Exception as e:
             print(f"Error while getting the Schedule {schedule_name} : {str(e)}")
             raise
@@ -95,6 +106,7 @@ class EventScheduler():
 
         scheduler_client.create_schedule(Name=schedule_name,
                                         ScheduleExpression=f'at({scheduled_time})',
+                                        ActionAfterCompletion='DELETE',
                                         FlexibleTimeWindow={
                                             'Mode': 'OFF'
                                         },
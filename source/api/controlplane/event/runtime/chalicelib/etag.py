@@ -0,0 +1,44 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+##############################################################################
+#
+# PURPOSE:
+# Conditional GET support (ETag / If-None-Match) for the MRE Control plane
+# APIs so that the clients holding a cached copy of an entity can revalidate
+# it without transferring it again.
+#
+# NOTE: This module is shared by the Control plane APIs. Keep all the copies
+# of it (in the chalicelib of each API) in sync.
+#
+##############################################################################
+
+import hashlib
+import json
+
+from chalice import Response
+
+
+def get_etag(body):
+    """
+    Get a strong ETag of the response body (JSON serializable after replace_decimals).
+    """
+    digest = hashlib.sha256(
+        json.dumps(body, sort_keys=True, separators=(",", ":")).encode()
+    ).hexdigest()
+
+    return f'"{digest[:32]}"'
+
+
+def get_conditional_response(request, body):
+    """
+    Return 304 Not Modified when the If-None-Match request header matches the ETag of the
+    response body. Otherwise, return the body along with its ETag.
+    """
+    etag = get_etag(body)
+    if_none_match = (request.headers or {}).get("if-none-match")
+
+    if if_none_match and etag in [value.strip() for value in if_none_match.split(",")]:
+        return Response(body="", status_code=304, headers={"ETag": etag})
+
+    return Response(body=body, status_code=200, headers={"ETag": etag})
@@ -0,0 +1,165 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+##############################################################################
+#
+# PURPOSE:
+# Query the events by their Start time using the StartBucket GSI of the Event
+# table.
+#
+# Every event carries a "StartBucket" attribute holding the UTC day of its
+# Start time (YYYY-MM-DD). A time range is served by querying each day bucket
+# in the range concurrently and merging the results in the order of
+# (Start, Name, Program), which also makes up the pagination cursor. As
+# each day is a Query, the range is capped at START_BUCKET_MAX_RANGE_DAYS.
+#
+##############################################################################
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import boto3
+from boto3.dynamodb.types import TypeDeserializer
+
+EVENT_TABLE_NAME = os.environ["EVENT_TABLE_NAME"]
+EVENT_START_BUCKET_INDEX = os.environ["EVENT_START_BUCKET_INDEX"]
+START_BUCKET_QUERY_MAX_WORKERS = int(os.getenv("START_BUCKET_QUERY_MAX_WORKERS", "8"))
+START_BUCKET_MAX_RANGE_DAYS = int(os.getenv("START_BUCKET_MAX_RANGE_DAYS", "366"))
+
+START_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+START_BUCKET_FORMAT = "%Y-%m-%d"
+
+# Unlike the resource, the low-level client is safe to share across threads
+ddb_client = boto3.client("dynamodb")
+deserializer = TypeDeserializer()
+executor = ThreadPoolExecutor(max_workers=START_BUCKET_QUERY_MAX_WORKERS)
+
+
+def get_start_bucket(start):
+    """
+    Get the StartBucket of an event from its Start time (in the format YYYY-MM-DDTHH:MM:SSZ).
+    """
+    return datetime.strptime(start, START_FORMAT).strftime(START_BUCKET_FORMAT)
+
+
+def get_start_buckets(from_start, to_start):
+    bucket = datetime.strptime(from_start[:10], START_BUCKET_FORMAT)
+    last_bucket = datetime.strptime(to_start[:10], START_BUCKET_FORMAT)
+    buckets = []
+
+    while bucket <= last_bucket:
+        buckets.append(bucket.strftime(START_BUCKET_FORMAT))
+        bucket += timedelta(days=1)
+
+    return buckets
+
+
+def get_sort_key(event):
+    return (event["Start"], event["Name"], event["Program"])
+
+
+def query_start_bucket(bucket, from_start, to_start, projection_attributes):
+    query = {
+        "TableName": EVENT_TABLE_NAME,
+        "IndexName": EVENT_START_BUCKET_INDEX,
+        "KeyConditionExpression": "#StartBucket = :StartBucket AND #Start BETWEEN :FromStart AND :ToStart",
+        "ProjectionExpression": ", ".join(
+            [f"#{attribute}" for attribute in projection_attributes]
+        ),
+        "ExpressionAttributeNames": {
+            "#StartBucket": "StartBucket",
+            **{f"#{attribute}": attribute for attribute in projection_attributes},
+        },
+        "ExpressionAttributeValues": {
+            ":StartBucket": {"S": bucket},
+            ":FromStart": {"S": from_start},
+            ":ToStart": {"S": to_start},
+        },
+    }
+
+    response = ddb_client.query(**query)
+    items = response["Items"]
+
+    while "LastEvaluatedKey" in response:
+        query["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+        response = ddb_client.query(**query)
+        items.extend(response["Items"])
+
+    return [
+        {key: deserializer.deserialize(value) for key, value in item.items()}
+        for item in items
+    ]
+
+
+def query_events_by_start(from_start, to_start, projection_attributes, limit=None, cursor=None):
+    """
+    Get the events having the Start time between from_start and to_start (both inclusive)
+    sorted by Start time.
+
+    The day buckets in the range are queried concurrently, in batches of
+    START_BUCKET_QUERY_MAX_WORKERS, until enough events are found to fill the page.
+
+    :param projection_attributes: Attributes to return. Start, Name and Program are always included.
+    :param limit: Maximum number of events to return. All the events in the range are returned when None.
+    :param cursor: Cursor returned with the previous page of events
+
+    Returns:
+
+        Tuple of the list of events and the cursor of the next page (None when there are no more events)
+
+    Raises:
+
+        ValueError when the range spans more than START_BUCKET_MAX_RANGE_DAYS days
+    """
+    range_days = (
+        datetime.strptime(to_start[:10], START_BUCKET_FORMAT)
+        - datetime.strptime(from_start[:10], START_BUCKET_FORMAT)
+    ).days + 1
+
+    if range_days > START_BUCKET_MAX_RANGE_DAYS:
+        raise ValueError(f"The time range must not span more than {START_BUCKET_MAX_RANGE_DAYS} days")
+
+    projection_attributes = list(
+        dict.fromkeys(["Start", "Name", "Program", *projection_attributes])
+    )
+
+    if cursor:
+        from_start = max(from_start, cursor["Start"])
+        cursor_sort_key = get_sort_key(cursor)
+
+    buckets = get_start_buckets(from_start, to_start) if from_start <= to_start else []
+    events = []
+    index = 0
+
+    while index < len(buckets):
+        batch = buckets[index : index + START_BUCKET_QUERY_MAX_WORKERS]
+        index += len(batch)
+
+        for bucket_events in executor.map(
+            lambda bucket: query_start_bucket(bucket, from_start, to_start, projection_attributes),
+            batch,
+        ):
+            events.extend(
+                event
+                for event in bucket_events
+                if not cursor or get_sort_key(event) > cursor_sort_key
+            )
+
+        # Buckets are in chronological order, so later buckets cannot precede the events found so far
+        if limit and len(events) >= limit:
+            break
+
+    events.sort(key=get_sort_key)
+
+    if not limit or (len(events) <= limit and index >= len(buckets)):
+        return events, None
+
+    events = events[:limit]
+    last_event = events[-1]
+
+    return events, {
+        "Start": last_event["Start"],
+        "Name": last_event["Name"],
+        "Program": last_event["Program"],
+    }
@@ -18,6 +18,8 @@ from chalice import (BadRequestError, Chalice, ChaliceViewError, IAMAuthorizer,
                      NotFoundError)
 from chalicelib import (DecimalEncoder, generate_plugin_state_definition,
                         load_api_schema, replace_decimals)
+from chalicelib import catalog
+from chalicelib.etag import get_conditional_response
 from aws_lambda_powertools import Logger
 
 app = Chalice(app_name="aws-mre-controlplane-plugin-api")
@@ -55,20 +57,16 @@ def inject_request_context(event, get_response):
 # region local function
 # return plugins that have circular dependency
 # otherwise return None
-def find_circular_dependency(plugin_name, dependent_plugins):
+def find_circular_dependency(plugin_name, dependent_plugins, dependency_graph):
     response = None
 
     for dependent_plugin in dependent_plugins:
-        # get full dependent plugins tree of each of the dependent plugins of the list
-        all_dependencies = get_plugin_dependency_tree(dependent_plugin)
-
-        if all_dependencies:
-            all_dependent_plugin_names = [plugin["Name"] for plugin in all_dependencies]
-            if plugin_name in all_dependent_plugin_names:
-                logger.info(
-                    f"Found circular plugin between '{plugin_name}' and '{dependent_plugin}"
-                )
-                response = (dependent_plugin, plugin_name)
+        # check the full dependent plugins tree of each of the dependent plugins of the list
+        if catalog.is_reachable(dependency_graph, [dependent_plugin], plugin_name):
+            logger.info(
+                f"Found circular plugin between '{plugin_name}' and '{dependent_plugin}"
+            )
+            response = (dependent_plugin, plugin_name)
 
     return response
 
@@ -165,23 +163,19 @@ def register_plugin():
                 )
 
             else:
-                model_table = ddb_resource.Table(MODEL_TABLE_NAME)
+                # Load all the model endpoints of the plugin in one request
+                models = catalog.get_models(plugin["ModelEndpoints"])
 
                 for model_endpoint in plugin["ModelEndpoints"]:
                     model_name = model_endpoint["Name"]
                     model_version = model_endpoint["Version"]
 
-                    response = model_table.get_item(
-                        Key={"Name": model_name, "Version": model_version},
-                        ConsistentRead=True,
-                    )
-
-                    if "Item" not in response:
+                    if (model_name, model_version) not in models:
                         raise NotFoundError(
                             f"Model endpoint '{model_name}' with version '{model_version}' not found"
                         )
 
-                    elif not response["Item"]["Enabled"]:
+                    elif not models[(model_name, model_version)]["Enabled"]:
                         raise BadRequestError(
                             f"Model endpoint '{model_name}' with version '{model_version}' is disabled in the system"
                         )
@@ -198,20 +192,20 @@ def register_plugin():
                         f"Plugin '{d_plugin}' cannot be a dependent of itself"
                     )
 
-                response = plugin_table.get_item(
-                    Key={"Name": d_plugin, "Version": "v0"}, ConsistentRead=True
-                )
+            # Load the whole dependency tree of the DependentPlugins (one request per dependency level)
+            dependency_graph = catalog.get_dependency_graph(dependent_plugins)
 
-                if "Item" not in response:
+            for d_plugin in dependent_plugins:
+                if d_plugin not in dependency_graph:
                     raise NotFoundError(f"Dependent plugin '{d_plugin}' not found")
 
-                elif not response["Item"]["Enabled"]:
+                elif not dependency_graph[d_plugin]["Enabled"]:
                     raise BadRequestError(
                         f"Dependent plugin '{d_plugin}' is disabled in the system"
                     )
 
             circular_dependency_plugin_names = find_circular_dependency(
-                name, dependent_plugins
+                name, dependent_plugins, dependency_graph
             )
 
             if circular_dependency_plugin_names:
@@ -877,6 +871,9 @@ def get_plugin_by_name(name):
 
     Each plugin has version "v0" which holds a copy of the latest plugin revision.
 
+    The response carries an ETag header. Requests with a matching If-None-Match header get a 304 (Not Modified)
+    response without a body.
+
     Returns:
 
         .. code-block:: python
@@ -951,7 +948,9 @@ def get_plugin_by_name(name):
         )
 
     else:
-        return replace_decimals(response["Item"])
+        return get_conditional_response(
+            app.current_request, replace_decimals(response["Item"])
+        )
 
 
 @app.route(
@@ -1553,27 +1552,37 @@ def get_plugin_dependency_tree(name):
         while len(memoized_dependent_plugins) > 0:
             new_memoized_dependent_plugins = {}
 
+            # get all the newly discovered dependent plugins of this level in one request
+            level_plugins = catalog.get_plugins(
+                dependent_plugin
+                for dependency_list in memoized_dependent_plugins.values()
+                for dependent_plugin in dependency_list
+                if dependent_plugin not in plugins_searched
+            )
+
             for parent_name, dependency_list in memoized_dependent_plugins.items():
                 for dependent_plugin in dependency_list:
                     # find dependencies of discovered dependent plugin
                     if dependent_plugin not in plugins_searched:
-                        response = plugin_table.get_item(
-                            Key={"Name": dependent_plugin, "Version": "v0"},
-                            ConsistentRead=True,
-                        )
+                        if dependent_plugin not in level_plugins:
+                            raise NotFoundError(
+                                f"Dependent plugin '{dependent_plugin}' not found"
+                            )
+
+                        dependent_plugin_item = level_plugins[dependent_plugin]
 
                         plugin_dependencies_result.append(
                             {
                                 "Name": dependent_plugin,
-                                "pluginData": response["Item"],
+                                "pluginData": dependent_plugin_item,
                                 "DependentFor": [parent_name],
                             }
                         )
 
-                        plugins_searched.append(response["Item"]["Name"])
+                        plugins_searched.append(dependent_plugin_item["Name"])
                         # add new discovered dependencies
-                        new_memoized_dependent_plugins[response["Item"]["Name"]] = (
-                            response["Item"]["DependentPlugins"]
+                        new_memoized_dependent_plugins[dependent_plugin_item["Name"]] = (
+                            dependent_plugin_item["DependentPlugins"]
                         )
 
                     else:
@@ -0,0 +1,144 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+##############################################################################
+#
+# PURPOSE:
+# Load snapshots of the plugin and model catalog with DynamoDB BatchGetItem
+# instead of one GetItem per plugin or model.
+#
+# A dependency graph is loaded one level at a time, so a plugin with N levels
+# of dependent plugins takes N BatchGetItem requests (as long as a level has
+# no more than 100 plugins) regardless of the number of plugins in it.
+#
+##############################################################################
+
+import os
+
+import boto3
+
+MODEL_TABLE_NAME = os.environ["MODEL_TABLE_NAME"]
+PLUGIN_TABLE_NAME = os.environ["PLUGIN_TABLE_NAME"]
+
+# Maximum number of keys in a DynamoDB BatchGetItem request
+BATCH_GET_MAX_KEYS = 100
+
+ddb_resource = boto3.resource("dynamodb")
+
+
+def batch_get_items(table_name, keys):
+    """
+    Get the items of the given keys (in any order), skipping the keys that do not exist.
+    """
+    items = []
+
+    for index in range(0, len(keys), BATCH_GET_MAX_KEYS):
+        request_items = {
+            table_name: {
+                "Keys": keys[index : index + BATCH_GET_MAX_KEYS],
+                "ConsistentRead": True,
+            }
+        }
+
+        while request_items:
+            response = ddb_resource.batch_get_item(RequestItems=request_items)
+            items.extend(response["Responses"].get(table_name, []))
+            request_items = response.get("UnprocessedKeys", {})
+
+    return items
+
+
+def get_plugins(names):
+    """
+    Get the latest version (v0) of the given plugins.
+
+    Returns:
+
+        Dictionary of plugin items keyed by plugin name. Plugins not found are left out.
+    """
+    names = list(dict.fromkeys(names))
+
+    return {
+        item["Name"]: item
+        for item in batch_get_items(
+            PLUGIN_TABLE_NAME, [{"Name": name, "Version": "v0"} for name in names]
+        )
+    }
+
+
+def get_models(model_endpoints):
+    """
+    Get the given model endpoint versions.
+
+    :param model_endpoints: List of dicts having the Name and Version of a model endpoint
+
+    Returns:
+
+        Dictionary of model items keyed by (Name, Version). Models not found are left out.
+    """
+    keys = []
+
+    for model_endpoint in model_endpoints:
+        key = {"Name": model_endpoint["Name"], "Version": model_endpoint["Version"]}
+
+        if key not in keys:
+            keys.append(key)
+
+    return {
+        (item["Name"], item["Version"]): item
+        for item in batch_get_items(MODEL_TABLE_NAME, keys)
+    }
+
+
+def get_dependency_graph(names):
+    """
+    Get the given plugins along with all the plugins they depend on, directly or transitively,
+    loading one dependency level per BatchGetItem request.
+
+    Returns:
+
+        Dictionary of plugin items keyed by plugin name. Plugins not found are left out.
+    """
+    graph = {}
+    requested = set()
+    level = list(dict.fromkeys(names))
+
+    while level:
+        requested.update(level)
+        graph.update(get_plugins(level))
+
+        level = list(
+            dict.fromkeys(
+                d_plugin
+                for name in level
+                if name in graph
+                for d_plugin in graph[name].get("DependentPlugins", [])
+                if d_plugin not in requested
+            )
+        )
+
+    return graph
+
+
+def is_reachable(graph, from_names, to_name):
+    """
+    Check if to_name is one of the plugins from_names depend on, directly or transitively.
+    """
+    visited = set()
+    pending = list(from_names)
+
+    while pending:
+        name = pending.pop()
+
+        if name in visited or name not in graph:
+            continue
+
+        visited.add(name)
+
+        for d_plugin in graph[name].get("DependentPlugins", []):
+            if d_plugin == to_name:
+                return True
+
+            pending.append(d_plugin)
+
+    return False
@@ -7,6 +7,10 @@
 # Check the completion status of a Classifier/Optimizer plugin in the prior 
 # AWS Step Function workflow executions
 #
+# When invoked with a task token (callback mode), register the token with the
+# Control plane instead. The workflow execution is then resumed as soon as all
+# the prior executions of the plugin are complete.
+#
 ##############################################################################
 
 import os
@@ -42,6 +46,16 @@ def lambda_handler(event, context):
     try:
         controlplane = ControlPlane()
         
+        if "TaskToken" in event["MultiChunk"]:
+            response = controlplane.register_task_token(p_event, program, filename, multi_chunk_plugin_name, event["MultiChunk"]["TaskToken"])
+            
+            if response["IsCompleted"]:
+                print(f"All the prior workflow executions for '{multi_chunk_plugin_name}' plugin are complete. Resuming the workflow execution.")
+            else:
+                print(f"Registered the task token to resume the workflow execution once all the prior workflow executions for '{multi_chunk_plugin_name}' plugin are complete.")
+            
+            return response
+        
         executions = controlplane.list_incomplete_executions(p_event, program, filename, multi_chunk_plugin_name)
         
         if len(executions) > 0:
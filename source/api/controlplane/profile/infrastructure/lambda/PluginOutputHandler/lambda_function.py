@@ -6,6 +6,10 @@
 # PURPOSE:
 # Handle the output of a plugin based on its execution status
 #
+# The output of several plugins of the same chunk can be passed as a list
+# (for example, the aggregated result of a Parallel state) in which case
+# their execution status is updated in a single Control plane request.
+#
 ##############################################################################
 
 import os
@@ -25,24 +29,32 @@ def lambda_handler(event, context):
     key = event["Input"]["Media"]["S3Key"]
     filename = os.path.split(key)[-1]
     
-    output_plugin_name = event["Output"]["PluginName"]
-    output_plugin_class = event["Output"]["PluginClass"]
-    output_plugin_status = event["Output"]["Status"]
+    outputs = event["Output"] if isinstance(event["Output"], list) else [event["Output"]]
+    
+    output_plugin_names = [output["PluginName"] for output in outputs]
     
-    print(f"Handling the output of plugin '{output_plugin_name}' of class '{output_plugin_class}' for program '{program}' and event '{p_event}'")
+    print(f"Handling the output of plugin(s) '{output_plugin_names}' for program '{program}' and event '{p_event}'")
     
     try:
         controlplane = ControlPlane()
         
-        controlplane.put_plugin_execution_status(p_event, program, filename, output_plugin_name, output_plugin_status)
+        if len(outputs) == 1:
+            controlplane.put_plugin_execution_status(p_event, program, filename, outputs[0]["PluginName"], outputs[0]["Status"])
+        else:
+            controlplane.put_plugin_execution_statuses(
+                p_event,
+                program,
+                filename,
+                {output["PluginName"]: output["Status"] for output in outputs}
+            )
         
-        if output_plugin_status == Status.PLUGIN_ERROR:
-            if output_plugin_class in ["Classifier", "Optimizer"]:
-                # Stop the current step function invocation and set the status of the Event to Error
-                pass
+        for output in outputs:
+            if output["Status"] == Status.PLUGIN_ERROR:
+                if output["PluginClass"] in ["Classifier", "Optimizer"]:
+                    # Stop the current step function invocation and set the status of the Event to Error
+                    pass
     
     except Exception as e:
-        print(f"Encountered an exception while handling the output of plugin '{output_plugin_name}' of class '{output_plugin_class}' for program '{program}' and event '{p_event}': {str(e)}")
+        print(f"Encountered an exception while handling the output of plugin(s) '{output_plugin_names}' for program '{program}' and event '{p_event}': {str(e)}")
         print(traceback.format_exc())
         raise MREExecutionError(e)
-    
\ No newline at end of file
@@ -11,6 +11,7 @@
 
 import os
 import traceback
+from fractions import Fraction
 from datetime import date, datetime, time, timedelta
 from dateutil import parser
 
@@ -31,7 +32,7 @@ def get_first_pts(p_event, program, mre_event, frame_rate, first_key_frame):
 
     else:
         print(f"First pts timecode for event '{p_event}' in program '{program}' not found. Initializing from the first key frame.")
-        first_pts = first_key_frame["pkt_pts_time"]
+        first_pts = get_frame_value(first_key_frame, "pkt_pts_time", "pts_time")
 
         print(f"Storing the first pts timecode and frame rate for event '{p_event}' in program '{program}' in DynamoDB")
         controlplane.store_first_pts(p_event, program, first_pts)
@@ -116,25 +117,38 @@ def get_relative_frame_time_from_timecode(frame_timecode, frame_rate, event_star
     return relative_frame_time
 
 
-def probe_video(media_path, select_streams, show_frames=False):
-    if select_streams == "v:0":
-        if show_frames:
-            probe = ffmpeg.probe(media_path, select_streams=select_streams, show_frames=None, skip_frame="nokey")
-            result = probe["frames"]
+def parse_frame_rate(frame_rate):
+    # ffprobe reports frame rates as fractions (for example, "30000/1001") and "0/0" when unknown
+    try:
+        return float(Fraction(frame_rate))
 
-        else:
-            probe = ffmpeg.probe(media_path, select_streams=select_streams)
-            result = probe["streams"][0]
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+
+
+def get_frame_value(frame, key, fallback_key):
+    # Newer versions of ffprobe have dropped the "pkt_" prefix from some of the frame entries
+    return frame[key] if key in frame else frame[fallback_key]
+
+
+def probe_video(media_path):
+    """
+    Probe the video stream, container format and all the key frames of the HLS video segment in a single ffprobe pass.
+    Only the key frames are decoded (skip_frame=nokey).
 
-    elif select_streams == "a":
-        probe = ffmpeg.probe(media_path, select_streams=select_streams)
-        result = []
+    Returns:
 
-        if "streams" in probe:
-            for stream in probe["streams"]:
-                result.append(stream['index'])
+        Tuple of the video stream and the list of key frames
+    """
+    probe = ffmpeg.probe(media_path, select_streams="v:0", show_frames=None, skip_frame="nokey")
 
-    return result
+    return probe["streams"][0], probe["frames"]
+
+
+def probe_audio_tracks(media_path):
+    probe = ffmpeg.probe(media_path, select_streams="a")
+
+    return [stream["index"] for stream in probe.get("streams", [])]
 
 
 def lambda_handler(event, context):
@@ -164,28 +178,25 @@ def lambda_handler(event, context):
         # Download the HLS video segment from S3
         media_path = dataplane.download_media()
 
-        # Get ffprobe video stream output
-        video_stream = probe_video(media_path, select_streams="v:0")
+        print("Probing the video stream and extracting all the key frames from the video segment")
+
+        # Get ffprobe video stream and key frame output
+        video_stream, key_frames = probe_video(media_path)
 
         print("Getting start_time, duration, frame_rate from the video segment")
 
         # HLS video segment metadata
         start_pts_time = float(video_stream["start_time"])
         duration = round(float(video_stream["duration"]), 3)
-        frame_rate = round(eval(video_stream["avg_frame_rate"]))
+        frame_rate = round(parse_frame_rate(video_stream["avg_frame_rate"]) or parse_frame_rate(video_stream["r_frame_rate"]))
 
         if not audio_tracks:
             print("Getting the list of audio tracks present in the video segment")
-            audio_tracks = probe_video(media_path, select_streams="a")
+            audio_tracks = probe_audio_tracks(media_path)
 
             # Store the audio tracks information in the Control Plane
             controlplane.store_audio_tracks(p_event, program, audio_tracks)
 
-        print("Extracting all the key frames from the video segment")
-
-        # Get ffprobe frame output
-        key_frames = probe_video(media_path, select_streams="v:0", show_frames=True)
-
         # Get all the required MRE event metadata
         mre_event = controlplane.get_event(p_event, program)
         first_pts = get_first_pts(p_event, program, mre_event, frame_rate, key_frames[0])
@@ -212,7 +223,7 @@ def lambda_handler(event, context):
                     start_pts_time = pkt_pts_time
 
             else: # Fallback to relative frame time
-                pkt_pts_time = float(frame["pkt_pts_time"])
+                pkt_pts_time = float(get_frame_value(frame, "pkt_pts_time", "pts_time"))
                 frame_time = round(pkt_pts_time - first_pts, 3)
 
             if index == 0: # Calculate offset used in restarting the frame number for each new HLS video segment
@@ -226,7 +237,7 @@ def lambda_handler(event, context):
                 "FrameTime": frame_time,
                 "KeyFrame": frame["key_frame"],
                 "PictType": frame["pict_type"],
-                "DurationTime": float(frame["pkt_duration_time"])
+                "DurationTime": float(get_frame_value(frame, "pkt_duration_time", "duration_time"))
             }
 
             # Replace existing key frame in the list
@@ -3,9 +3,10 @@
 import os
 import sys
 
-from aws_cdk import CfnOutput, Duration, Fn, Stack
+from aws_cdk import CfnOutput, Duration, Fn, RemovalPolicy, Stack
 from aws_cdk import aws_iam as iam
 from aws_cdk import aws_lambda as _lambda
+from aws_cdk import aws_logs as logs
 from cdk_nag import NagSuppressions
 from chalice.cdk import Chalice
 
@@ -66,6 +67,8 @@ class ChaliceApp(Stack):
         self.create_multi_chunker_helper_lambda()
         self.create_plugin_output_handler_lambda()
         self.create_workflow_error_handler_lambda()
+        ## Create the log group of the nested Express State Machines
+        self.create_express_sfn_log_group()
         ## Create SF role (uses Lambda ARNs)
         self.create_sfn_role()
         self.create_chalice_role()
@@ -275,6 +278,32 @@ class ChaliceApp(Stack):
 
         ### END: MultiChunkHelper LAMBDA ###
 
+    def create_express_sfn_log_group(self):
+        self.express_sfn_log_group = logs.LogGroup(
+            self,
+            "ExpressStateMachineLogGroup",
+            log_group_name="/aws/vendedlogs/states/aws-mre-featurers-express",
+            retention=logs.RetentionDays.ONE_MONTH,
+            removal_policy=RemovalPolicy.DESTROY,
+        )
+
+    def get_sfn_log_delivery_policy(self):
+        # CloudWatch Logs delivery APIs do not support resource-level permissions
+        return iam.PolicyStatement(
+            effect=iam.Effect.ALLOW,
+            actions=[
+                "logs:CreateLogDelivery",
+                "logs:GetLogDelivery",
+                "logs:UpdateLogDelivery",
+                "logs:DeleteLogDelivery",
+                "logs:ListLogDeliveries",
+                "logs:PutResourcePolicy",
+                "logs:DescribeResourcePolicies",
+                "logs:DescribeLogGroups",
+            ],
+            resources=["*"],
+        )
+
     def create_sfn_role(self):
 
         # Step Function IAM Role
@@ -327,6 +356,34 @@ class ChaliceApp(Stack):
                 },
                 resources=[
                     f"arn:aws:states:{Stack.of(self).region}:{Stack.of(self).account}:stateMachine:aws-mre-*-state-machine",
+                    f"arn:aws:states:{Stack.of(self).region}:{Stack.of(self).account}:stateMachine:aws-mre-*-featurers-express",
+                ],
+            )
+        )
+
+        # Step Function IAM Role: Nested Express State Machine (startExecution.sync) permissions
+        # (including the Express State Machines created before the "-featurers-express" naming)
+        self.sfn_role.add_to_policy(
+            iam.PolicyStatement(
+                effect=iam.Effect.ALLOW,
+                actions=["states:DescribeExecution", "states:StopExecution"],
+                resources=[
+                    f"arn:aws:states:{Stack.of(self).region}:{Stack.of(self).account}:execution:aws-mre-*-featurers-state-machine:*",
+                    f"arn:aws:states:{Stack.of(self).region}:{Stack.of(self).account}:express:aws-mre-*-featurers-state-machine:*",
+                    f"arn:aws:states:{Stack.of(self).region}:{Stack.of(self).account}:execution:aws-mre-*-featurers-express:*",
+                    f"arn:aws:states:{Stack.of(self).region}:{Stack.of(self).account}:express:aws-mre-*-featurers-express:*",
+                ],
+            )
+        )
+
+        # Step Function IAM Role: Express State Machine logging permissions
+        self.sfn_role.add_to_policy(self.get_sfn_log_delivery_policy())
+        self.sfn_role.add_to_policy(
+            iam.PolicyStatement(
+                effect=iam.Effect.ALLOW,
+                actions=["events:PutTargets", "events:PutRule", "events:DescribeRule"],
+                resources=[
+                    f"arn:aws:events:{Stack.of(self).region}:{Stack.of(self).account}:rule/StepFunctionsGetEventsForStepFunctionsExecutionRule"
                 ],
             )
         )
@@ -468,11 +525,16 @@ class ChaliceApp(Stack):
                     "Null": {"aws:ResourceTag/Profile": "false"},
                 },
                 resources=[
-                    f"arn:aws:states:{Stack.of(self).region}:{Stack.of(self).account}:stateMachine:aws-mre-*-state-machine"
+                    f"arn:aws:states:{Stack.of(self).region}:{Stack.of(self).account}:stateMachine:aws-mre-*-state-machine",
+                    f"arn:aws:states:{Stack.of(self).region}:{Stack.of(self).account}:stateMachine:aws-mre-*-featurers-express",
                 ],
             )
         )
 
+        # Chalice IAM Role: Express State Machine logging permissions (required to create or update
+        # a State Machine having a logging configuration)
+        self.chalice_role.add_to_policy(self.get_sfn_log_delivery_policy())
+
         # Chalice IAM Role: Step Function PassRole permissions
         self.chalice_role.add_to_policy(
             iam.PolicyStatement(
@@ -484,6 +546,7 @@ class ChaliceApp(Stack):
 
         environment_variables = {
             "SFN_ROLE_ARN": self.sfn_role.role_arn,
+            "EXPRESS_SFN_LOG_GROUP_ARN": self.express_sfn_log_group.log_group_arn,
             "CONTENT_GROUP_TABLE_NAME": self.content_group_table_name,
             "PROFILE_TABLE_NAME": self.profile_table_name,
             "PROBE_VIDEO_LAMBDA_ARN": self.probe_video_lambda.function_arn,
@@ -565,9 +628,19 @@ class ChaliceApp(Stack):
                     "reason": "Step Functions state machine access required for workflow execution",
                     "appliesTo": [
                         "Resource::arn:aws:states:<AWS::Region>:<AWS::AccountId>:stateMachine:aws-mre-*-state-machine",
-                        "Resource::arn:aws:states:<AWS::Region>:<AWS::AccountId>:stateMachine:mreEventClipGeneratorStateMachine*"
+                        "Resource::arn:aws:states:<AWS::Region>:<AWS::AccountId>:stateMachine:mreEventClipGeneratorStateMachine*",
+                        "Resource::arn:aws:states:<AWS::Region>:<AWS::AccountId>:execution:aws-mre-*-featurers-state-machine:*",
+                        "Resource::arn:aws:states:<AWS::Region>:<AWS::AccountId>:express:aws-mre-*-featurers-state-machine:*",
+                        "Resource::arn:aws:states:<AWS::Region>:<AWS::AccountId>:stateMachine:aws-mre-*-featurers-express",
+                        "Resource::arn:aws:states:<AWS::Region>:<AWS::AccountId>:execution:aws-mre-*-featurers-express:*",
+                        "Resource::arn:aws:states:<AWS::Region>:<AWS::AccountId>:express:aws-mre-*-featurers-express:*",
                     ],
                 },
+                {
+                    "id": "AwsSolutions-IAM5",
+                    "reason": "CloudWatch Logs delivery APIs used by the Express State Machine logging do not support resource-level permissions",
+                    "appliesTo": ["Resource::*"],
+                },
                 {
                     "id": "AwsSolutions-L1",
                     "reason": "MRE internal lambda functions do not require the latest runtime version as their dependencies have been tested only on Python 3.11",
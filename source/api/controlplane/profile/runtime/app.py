@@ -21,6 +21,7 @@ from chalicelib import DecimalEncoder, load_api_schema
 from chalicelib import profile_creation_helper as profile_creation_helper
 from chalicelib import profile_state_dfn_helper as state_definition_helper
 from chalicelib import replace_decimals
+from chalicelib.etag import get_conditional_response
 from aws_lambda_powertools import Logger
 
 app = Chalice(app_name="aws-mre-controlplane-profile-api")
@@ -36,6 +37,7 @@ sfn_client = boto3.client("stepfunctions")
 ddb_resource = boto3.resource("dynamodb")
 
 SFN_ROLE_ARN = os.environ["SFN_ROLE_ARN"]
+EXPRESS_SFN_LOG_GROUP_ARN = os.environ["EXPRESS_SFN_LOG_GROUP_ARN"]
 CONTENT_GROUP_TABLE_NAME = os.environ["CONTENT_GROUP_TABLE_NAME"]
 PROFILE_TABLE_NAME = os.environ["PROFILE_TABLE_NAME"]
 
@@ -185,7 +187,8 @@ def create_profile():
                 },
                 ...
             ],
-            "Variables": object
+            "Variables": object,
+            "UseExpressWorkflow": boolean
         }
 
     Parameters:
@@ -201,6 +204,7 @@ def create_profile():
         - Optimizer:The Dict which represents a Optimizer Plugin. Refer to the Plugin API for details on Plugin Parameters.
         - Labeler:The Dict which represents a Labeler Plugin. Refer to the Plugin API for details on Plugin Parameters.
         - Variables: Context Variables (key/value pairs) used to share data across plugin exections
+        - UseExpressWorkflow: Run the Featurer plugins not needed for Replay in a nested Express workflow (Default: False)
 
     Returns:
 
@@ -233,7 +237,7 @@ def create_profile():
                 )
 
         profile_copy = copy.deepcopy(profile)
-        state_definition, plugin_definitions = (
+        state_definition, plugin_definitions, express_state_definition = (
             state_definition_helper.profile_state_definition_helper(name, profile_copy)
         )
         profile["Id"] = str(uuid.uuid4())
@@ -241,6 +245,16 @@ def create_profile():
         profile["LastModified"] = profile["Created"]
         profile["Enabled"] = True
 
+        if express_state_definition:
+            profile["ExpressStateMachineArn"] = create_express_state_machine(
+                name, express_state_definition
+            )
+
+            state_definition = state_definition.replace(
+                state_definition_helper.EXPRESS_STATE_MACHINE_ARN_PLACEHOLDER,
+                profile["ExpressStateMachineArn"],
+            )
+
         sfn_name = f"aws-mre-{''.join(name.split())}-state-machine"
 
         logger.info(f"Creating the StepFunction State Machine '{sfn_name}'")
@@ -315,6 +329,11 @@ def create_profile():
         if "StateMachineArn" in profile:
             sfn_client.delete_state_machine(stateMachineArn=profile["StateMachineArn"])
 
+        if "ExpressStateMachineArn" in profile:
+            sfn_client.delete_state_machine(
+                stateMachineArn=profile["ExpressStateMachineArn"]
+            )
+
         logger.info(f"Unable to create the processing profile: {str(e)}")
         raise ChaliceViewError(f"Unable to create the processing profile: {str(e)}")
 
@@ -463,6 +482,8 @@ def list_profiles():
                         ...
                     ],
                     "StateMachineArn": string,
+                    "UseExpressWorkflow": boolean,
+                    "ExpressStateMachineArn": string,
                     "Enabled": boolean,
                     "Id": uuid,
                     "Created": timestamp,
@@ -651,6 +672,8 @@ def list_profiles_by_contentgroup(content_group):
                         ...
                     ],
                     "StateMachineArn": string,
+                    "UseExpressWorkflow": boolean,
+                    "ExpressStateMachineArn": string,
                     "Enabled": boolean,
                     "Id": uuid,
                     "Created": timestamp,
@@ -719,6 +742,9 @@ def get_profile(name):
     """
     Get a processing profile by name.
 
+    The response carries an ETag header. Requests with a matching If-None-Match header get a 304 (Not Modified)
+    response without a body.
+
     Returns:
 
         .. code-block:: python
@@ -847,6 +873,8 @@ def get_profile(name):
                     ...
                 ],
                 "StateMachineArn": string,
+                "UseExpressWorkflow": boolean,
+                "ExpressStateMachineArn": string,
                 "Enabled": boolean,
                 "Id": uuid,
                 "Created": timestamp,
@@ -886,7 +914,9 @@ def get_profile(name):
         )
 
     else:
-        return replace_decimals(response["Item"])
+        return get_conditional_response(
+            app.current_request, replace_decimals(response["Item"])
+        )
 
 
 @app.route("/profile/{name}", cors=True, methods=["PUT"], authorizer=authorizer)
@@ -1012,7 +1042,8 @@ def update_profile(name):
                 },
                 ...
             ],
-            "Variables": object
+            "Variables": object,
+            "UseExpressWorkflow": boolean
         }
 
     Returns:
@@ -1106,8 +1137,17 @@ def update_profile(name):
             if "Labeler" in profile
             else (response["Item"]["Labeler"] if "Labeler" in response["Item"] else {})
         )
+        profile["UseExpressWorkflow"] = (
+            profile["UseExpressWorkflow"]
+            if "UseExpressWorkflow" in profile
+            else (
+                response["Item"]["UseExpressWorkflow"]
+                if "UseExpressWorkflow" in response["Item"]
+                else False
+            )
+        )
 
-        state_definition, plugin_definitions = (
+        state_definition, plugin_definitions, express_state_definition = (
             state_definition_helper.profile_state_definition_helper(
                 name, replace_decimals(profile)
             )
@@ -1167,6 +1207,35 @@ def update_profile(name):
                         ] = plugin_definitions[d_plugin["Name"]]["Latest"]
         # === End of enrichment ===
 
+        # Create or update the Express State Machine before the Step Function State Machine referring to it
+        express_state_machine_arn = (
+            response["Item"]["ExpressStateMachineArn"]
+            if "ExpressStateMachineArn" in response["Item"]
+            else None
+        )
+
+        if express_state_definition:
+            if express_state_machine_arn:
+                logger.info(
+                    f"Updating the StepFunction Express State Machine '{express_state_machine_arn}'"
+                )
+
+                sfn_client.update_state_machine(
+                    stateMachineArn=express_state_machine_arn,
+                    definition=express_state_definition,
+                    loggingConfiguration=get_express_logging_configuration(),
+                )
+
+            else:
+                express_state_machine_arn = create_express_state_machine(
+                    name, express_state_definition
+                )
+
+            state_definition = state_definition.replace(
+                state_definition_helper.EXPRESS_STATE_MACHINE_ARN_PLACEHOLDER,
+                express_state_machine_arn,
+            )
+
         # Update the Step Function State Machine
         state_machine_arn = response["Item"]["StateMachineArn"]
 
@@ -1176,6 +1245,15 @@ def update_profile(name):
             stateMachineArn=state_machine_arn, definition=state_definition
         )
 
+        # Delete the Express State Machine no longer referred to by the Step Function State Machine
+        if not express_state_definition and express_state_machine_arn:
+            logger.info(
+                f"Deleting the StepFunction Express State Machine '{express_state_machine_arn}'"
+            )
+
+            sfn_client.delete_state_machine(stateMachineArn=express_state_machine_arn)
+            express_state_machine_arn = None
+
         if "ContentGroups" in profile and profile["ContentGroups"]:
             logger.info(
                 "Adding all the Content Group values passed in the request to the 'ContentGroup' DynamoDB table"
@@ -1192,7 +1270,12 @@ def update_profile(name):
 
         profile_table.update_item(
             Key={"Name": name},
-            UpdateExpression="SET #Description = :Description, #ContentGroups = :ContentGroups, #ChunkSize = :ChunkSize, #MaxSegmentLengthSeconds = :MaxSegmentLengthSeconds, #ProcessingFrameRate = :ProcessingFrameRate, #Classifier = :Classifier, #Optimizer = :Optimizer, #Featurers = :Featurers, #Labeler = :Labeler, #LastModified = :LastModified",
+            UpdateExpression="SET #Description = :Description, #ContentGroups = :ContentGroups, #ChunkSize = :ChunkSize, #MaxSegmentLengthSeconds = :MaxSegmentLengthSeconds, #ProcessingFrameRate = :ProcessingFrameRate, #Classifier = :Classifier, #Optimizer = :Optimizer, #Featurers = :Featurers, #Labeler = :Labeler, #UseExpressWorkflow = :UseExpressWorkflow, #LastModified = :LastModified"
+            + (
+                ", #ExpressStateMachineArn = :ExpressStateMachineArn"
+                if express_state_machine_arn
+                else " REMOVE #ExpressStateMachineArn"
+            ),
             ExpressionAttributeNames={
                 "#Description": "Description",
                 "#ContentGroups": "ContentGroups",
@@ -1203,6 +1286,8 @@ def update_profile(name):
                 "#Optimizer": "Optimizer",
                 "#Featurers": "Featurers",
                 "#Labeler": "Labeler",
+                "#UseExpressWorkflow": "UseExpressWorkflow",
+                "#ExpressStateMachineArn": "ExpressStateMachineArn",
                 "#LastModified": "LastModified",
             },
             ExpressionAttributeValues={
@@ -1215,7 +1300,13 @@ def update_profile(name):
                 ":Optimizer": profile["Optimizer"],
                 ":Featurers": profile["Featurers"],
                 ":Labeler": profile["Labeler"],
+                ":UseExpressWorkflow": profile["UseExpressWorkflow"],
                 ":LastModified": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+                **(
+                    {":ExpressStateMachineArn": express_state_machine_arn}
+                    if express_state_machine_arn
+                    else {}
+                ),
             },
         )
 
@@ -1376,6 +1467,15 @@ def delete_profile(name):
 
         sfn_client.delete_state_machine(stateMachineArn=state_machine_arn)
 
+        if "ExpressStateMachineArn" in response["Attributes"]:
+            express_state_machine_arn = response["Attributes"]["ExpressStateMachineArn"]
+
+            logger.info(
+                f"Deleting the StepFunction Express State Machine '{express_state_machine_arn}'"
+            )
+
+            sfn_client.delete_state_machine(stateMachineArn=express_state_machine_arn)
+
         response = metadata_table.delete_item(Key={"pk": f"PROFILE#{name}"})
 
     except SchemaValidationError as e:
@@ -1450,5 +1550,49 @@ def get_profile_metadata(name):
     else:
         return replace_decimals(response["Item"]["data"])
     
+def create_express_state_machine(name, express_state_definition):
+    """
+    Create the Express State Machine run as a nested execution of the profile's Step Function State Machine.
+
+    Returns:
+
+        ARN of the Express State Machine
+    """
+    # Unlike the "-state-machine" suffix of the Step Function State Machines, so that the name cannot
+    # collide with the State Machine of another profile
+    sfn_name = f"aws-mre-{''.join(name.split())}-featurers-express"
+
+    logger.info(f"Creating the StepFunction Express State Machine '{sfn_name}'")
+
+    response = sfn_client.create_state_machine(
+        name=sfn_name,
+        definition=express_state_definition,
+        roleArn=SFN_ROLE_ARN,
+        type="EXPRESS",
+        tags=[
+            {"key": "Project", "value": "MRE"},
+            {"key": "Profile", "value": name},
+        ],
+        loggingConfiguration=get_express_logging_configuration(),
+        tracingConfiguration={"enabled": True},
+    )
+
+    return response["stateMachineArn"]
+
+
+def get_express_logging_configuration():
+    """
+    Get the logging configuration of the Express State Machines. Unlike Standard workflows, the execution
+    history of Express workflows is only available in CloudWatch Logs.
+    """
+    return {
+        "level": "ERROR",
+        "includeExecutionData": True,
+        "destinations": [
+            {"cloudWatchLogsLogGroup": {"logGroupArn": EXPRESS_SFN_LOG_GROUP_ARN}}
+        ],
+    }
+
+
 def validate_path_parameters(params: dict):
     validate(event=params, schema=API_SCHEMA["profile_path_validation"])
@@ -1,31 +1,3 @@
-import os
-
-import boto3
-
-PLUGIN_TABLE_NAME = os.environ["PLUGIN_TABLE_NAME"]
-
-ddb_resource = boto3.resource("dynamodb")
-
-
-def get_plugin_configuration_ddb(plugin: dict) -> dict:
-    if "Configuration" in plugin:
-        return plugin["Configuration"]
-    try:
-        plugin_table = ddb_resource.Table(PLUGIN_TABLE_NAME)
-        get_key = {"Name": plugin["Name"], "Version": "v0"}
-        plugin_response = plugin_table.get_item(Key=get_key)
-        if "Item" in plugin_response:  # Limit query to 1; make sure we have just 1 item
-            default_plugin = plugin_response["Item"]
-            if "Configuration" in default_plugin:
-                return default_plugin["Configuration"]
-            return {}
-        raise Exception("Plugin does not exist")
-    except Exception as e:
-        print(e)
-        raise Exception("Unable to get default plugin configuration") from e
-
-
-# TO DO Refactor logic to remove additional DB call and use config from plugin definitions
 def get_plugin_configuration(plugin: dict, plugin_definitions: dict) -> dict:
     if "Configuration" in plugin and plugin["Configuration"]:
         return plugin["Configuration"]
@@ -51,7 +23,6 @@ def get_plugin_version(plugin: dict, plugin_definitions: dict) -> dict:
         raise Exception("Unable to get default plugin configuration") from e
 
 
-# TO DO Refactor logic to remove additional DB call and use config from plugin definitions
 def enrich_plugin_from_plugin_definitions(parent_obj: dict, plugin_definitions: dict):
     parent_obj["Version"] = get_plugin_version(parent_obj, plugin_definitions)
     parent_obj["Configuration"] = get_plugin_configuration(
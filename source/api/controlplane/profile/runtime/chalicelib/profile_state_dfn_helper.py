@@ -6,6 +6,7 @@ import json
 import random
 import boto3
 import string
+from functools import lru_cache
 from chalice import BadRequestError, NotFoundError, ConflictError
 from . import DecimalEncoder
 
@@ -18,6 +19,39 @@ PROMPT_CATALOG_TABLE_NAME = os.environ.get("PROMPT_CATALOG_TABLE_NAME", "")
 PLUGIN_TABLE_NAME = os.environ["PLUGIN_TABLE_NAME"]
 CLIP_GENERATION_STATE_MACHINE_ARN = os.environ["CLIP_GENERATION_STATE_MACHINE_ARN"]
 
+# Replaced with the ARN of the Express state machine once it is created
+EXPRESS_STATE_MACHINE_ARN_PLACEHOLDER = "%%EXPRESS_STATE_MACHINE_ARN%%"
+
+# Maximum number of keys in a DynamoDB BatchGetItem request
+BATCH_GET_MAX_KEYS = 100
+
+# Attributes retrieved from each of the tables loaded by get_profile_catalog
+CATALOG_PROJECTIONS = {
+    PLUGIN_TABLE_NAME: {
+        "ProjectionExpression": "#Name, #Class, #ExecutionType, #SupportedMediaType, #StateDefinition, #DependentPlugins, #Enabled, #Latest, #Configuration",
+        "ExpressionAttributeNames": {
+            "#Name": "Name",
+            "#Class": "Class",
+            "#ExecutionType": "ExecutionType",
+            "#SupportedMediaType": "SupportedMediaType",
+            "#StateDefinition": "StateDefinition",
+            "#DependentPlugins": "DependentPlugins",
+            "#Enabled": "Enabled",
+            "#Latest": "Latest",
+            "#Configuration": "Configuration",
+        },
+    },
+    MODEL_TABLE_NAME: {
+        "ProjectionExpression": "#Name, #Version, #Endpoint, #Enabled",
+        "ExpressionAttributeNames": {
+            "#Name": "Name",
+            "#Version": "Version",
+            "#Endpoint": "Endpoint",
+            "#Enabled": "Enabled",
+        },
+    },
+}
+
 ddb_resource = boto3.resource("dynamodb")
 
 
@@ -30,7 +64,7 @@ def get_multi_level_d_plugins(
     plugin_class={},
     shortened_plugin_class={},
     d_plugins_list=[],
-    batch_get_keys=[],
+    model_endpoints={},
 ):
     print(
         f"Collecting dependent plugins for level '{level}' with parent plugin(s) '{p_plugins}'"
@@ -52,8 +86,8 @@ def get_multi_level_d_plugins(
             if "ModelEndpoint" in d_plugin and isinstance(
                 d_plugin["ModelEndpoint"], dict
             ):
-                d_plugin_obj["ModelEndpoint"] = get_model_endpoint_from_ddb(
-                    d_plugin["ModelEndpoint"]
+                d_plugin_obj["ModelEndpoint"] = get_model_endpoint(
+                    d_plugin["ModelEndpoint"], model_endpoints
                 )
 
             if d_plugin["Name"] not in d_plugins_def_dict:
@@ -70,7 +104,6 @@ def get_multi_level_d_plugins(
 
             if d_plugin["Name"] not in d_plugins_list:
                 d_plugins_list.append(d_plugin["Name"])
-                batch_get_keys.append({"Name": d_plugin["Name"], "Version": "v0"})
 
         is_contains = any(item in d_plugin["DependentFor"] for item in p_plugins)
 
@@ -109,7 +142,9 @@ def get_multi_level_d_plugins(
 def profile_state_definition_helper(name, profile):
     plugins_list = []
     d_plugins_list = []
-    batch_get_keys = []
+
+    # Load all the plugins and models referred to by the profile upfront instead of one at a time
+    plugin_items, model_endpoints = get_profile_catalog(profile)
 
     internal_lambda_arns = {
         "ProbeVideo": PROBE_VIDEO_LAMBDA_ARN,
@@ -125,12 +160,16 @@ def profile_state_definition_helper(name, profile):
         "ProcessingFrameRate": profile["ProcessingFrameRate"],
     }
 
+    use_express_workflow = (
+        profile["UseExpressWorkflow"] if "UseExpressWorkflow" in profile else False
+    )
+
     # Classifier
     classifier = profile["Classifier"]
 
     if "ModelEndpoint" in classifier and isinstance(classifier["ModelEndpoint"], dict):
-        classifier["ModelEndpoint"] = get_model_endpoint_from_ddb(
-            classifier["ModelEndpoint"]
+        classifier["ModelEndpoint"] = get_model_endpoint(
+            classifier["ModelEndpoint"], model_endpoints
         )
 
     shortened_classifier = {
@@ -141,7 +180,6 @@ def profile_state_definition_helper(name, profile):
         "DependentPlugins": [],
     }
     plugins_list.append(classifier["Name"])
-    batch_get_keys.append({"Name": classifier["Name"], "Version": "v0"})
 
     if "DependentPlugins" in classifier:
         classifier["DependentPlugins"] = get_multi_level_d_plugins(
@@ -153,7 +191,7 @@ def profile_state_definition_helper(name, profile):
             classifier,
             shortened_classifier,
             d_plugins_list,
-            batch_get_keys,
+            model_endpoints,
         )
 
     shortened_profile["Classifier"] = shortened_classifier
@@ -166,8 +204,8 @@ def profile_state_definition_helper(name, profile):
         if "ModelEndpoint" in optimizer and isinstance(
             optimizer["ModelEndpoint"], dict
         ):
-            optimizer["ModelEndpoint"] = get_model_endpoint_from_ddb(
-                optimizer["ModelEndpoint"]
+            optimizer["ModelEndpoint"] = get_model_endpoint(
+                optimizer["ModelEndpoint"], model_endpoints
             )
 
         shortened_optimizer = {
@@ -178,7 +216,6 @@ def profile_state_definition_helper(name, profile):
             "DependentPlugins": [],
         }
         plugins_list.append(optimizer["Name"])
-        batch_get_keys.append({"Name": optimizer["Name"], "Version": "v0"})
 
         if "DependentPlugins" in optimizer:
             optimizer["DependentPlugins"] = get_multi_level_d_plugins(
@@ -190,7 +227,7 @@ def profile_state_definition_helper(name, profile):
                 optimizer,
                 shortened_optimizer,
                 d_plugins_list,
-                batch_get_keys,
+                model_endpoints,
             )
 
         shortened_profile["Optimizer"] = shortened_optimizer
@@ -201,8 +238,8 @@ def profile_state_definition_helper(name, profile):
         labeler = profile["Labeler"]
 
         if "ModelEndpoint" in labeler and isinstance(labeler["ModelEndpoint"], dict):
-            labeler["ModelEndpoint"] = get_model_endpoint_from_ddb(
-                labeler["ModelEndpoint"]
+            labeler["ModelEndpoint"] = get_model_endpoint(
+                labeler["ModelEndpoint"], model_endpoints
             )
 
         shortened_labeler = {
@@ -213,7 +250,6 @@ def profile_state_definition_helper(name, profile):
             "DependentPlugins": [],
         }
         plugins_list.append(labeler["Name"])
-        batch_get_keys.append({"Name": labeler["Name"], "Version": "v0"})
 
         if "DependentPlugins" in labeler:
             labeler["DependentPlugins"] = get_multi_level_d_plugins(
@@ -225,7 +261,7 @@ def profile_state_definition_helper(name, profile):
                 labeler,
                 shortened_labeler,
                 d_plugins_list,
-                batch_get_keys,
+                model_endpoints,
             )
 
         shortened_profile["Labeler"] = shortened_labeler
@@ -246,8 +282,8 @@ def profile_state_definition_helper(name, profile):
             if "ModelEndpoint" in featurer and isinstance(
                 featurer["ModelEndpoint"], dict
             ):
-                featurers[index]["ModelEndpoint"] = get_model_endpoint_from_ddb(
-                    featurer["ModelEndpoint"]
+                featurers[index]["ModelEndpoint"] = get_model_endpoint(
+                    featurer["ModelEndpoint"], model_endpoints
                 )
 
             shortened_featurer = {
@@ -259,9 +295,6 @@ def profile_state_definition_helper(name, profile):
             }
             plugins_list.append(featurer["Name"])
 
-            if featurer["Name"] not in d_plugins_list:
-                batch_get_keys.append({"Name": featurer["Name"], "Version": "v0"})
-
             if "DependentPlugins" in featurer:
                 featurer["DependentPlugins"] = get_multi_level_d_plugins(
                     1,
@@ -272,45 +305,14 @@ def profile_state_definition_helper(name, profile):
                     featurer,
                     shortened_featurer,
                     d_plugins_list,
-                    batch_get_keys,
+                    model_endpoints,
                 )
 
             shortened_profile["Featurers"].append(shortened_featurer)
 
-    # Retrieve the state machine definition of all the plugins present in the request
-    response = ddb_resource.batch_get_item(
-        RequestItems={
-            PLUGIN_TABLE_NAME: {
-                "Keys": batch_get_keys,
-                "ConsistentRead": True,
-                "ProjectionExpression": "#Name, #Class, #ExecutionType, #SupportedMediaType, #StateDefinition, #DependentPlugins, #Enabled, #Latest, #Configuration",
-                "ExpressionAttributeNames": {
-                    "#Name": "Name",
-                    "#Class": "Class",
-                    "#ExecutionType": "ExecutionType",
-                    "#SupportedMediaType": "SupportedMediaType",
-                    "#StateDefinition": "StateDefinition",
-                    "#DependentPlugins": "DependentPlugins",
-                    "#Enabled": "Enabled",
-                    "#Latest": "Latest",
-                    "#Configuration": "Configuration",
-                },
-            }
-        }
-    )
-
-    responses = response["Responses"][PLUGIN_TABLE_NAME]
-
-    while "UnprocessedKeys" in responses:
-        response = ddb_resource.batch_get_item(
-            RequestItems=responses["UnprocessedKeys"]
-        )
-
-        responses.extend(response["Responses"][PLUGIN_TABLE_NAME])
-
     plugin_definitions = {}
 
-    for item in responses:
+    for item in plugin_items:
         plugin_definitions[item["Name"]] = {
             "Class": item["Class"],
             "ExecutionType": item["ExecutionType"],
@@ -422,45 +424,124 @@ def profile_state_definition_helper(name, profile):
                     plugin_definitions[d_plugin["Name"]],
                 )
 
+    state_definition, express_state_definition = generate_profile_state_definition(
+        name,
+        classifier,
+        optimizer,
+        labeler,
+        featurers,
+        plugin_definitions,
+        shortened_profile,
+        internal_lambda_arns,
+        use_express_workflow,
+    )
+
     return (
-        json.dumps(
-            generate_profile_state_definition(
-                name,
-                classifier,
-                optimizer,
-                labeler,
-                featurers,
-                plugin_definitions,
-                shortened_profile,
-                internal_lambda_arns,
-            ),
-            cls=DecimalEncoder,
-        ),
+        json.dumps(state_definition, cls=DecimalEncoder),
         plugin_definitions,
+        (
+            json.dumps(express_state_definition, cls=DecimalEncoder)
+            if express_state_definition
+            else None
+        ),
     )
 
 
-def get_model_endpoint_from_ddb(model):
-    model_name = model["Name"]
-    model_version = model["Version"]
+def get_profile_plugins(profile):
+    """
+    Get the Classifier, Optimizer, Labeler and Featurer plugins of a profile along with their dependent plugins.
+    """
+    plugins = []
 
-    model_table = ddb_resource.Table(MODEL_TABLE_NAME)
+    for plugin_class in ["Classifier", "Optimizer", "Labeler"]:
+        if plugin_class in profile and profile[plugin_class]:
+            plugins.append(profile[plugin_class])
 
-    response = model_table.get_item(
-        Key={"Name": model_name, "Version": model_version}, ConsistentRead=True
-    )
+    if "Featurers" in profile and profile["Featurers"]:
+        plugins.extend(profile["Featurers"])
 
-    if "Item" not in response:
+    for plugin in list(plugins):
+        if "DependentPlugins" in plugin:
+            plugins.extend(plugin["DependentPlugins"])
+
+    return plugins
+
+
+def get_profile_catalog(profile):
+    """
+    Retrieve the latest version of all the plugins and the model endpoints referred to by a profile
+    using as few DynamoDB BatchGetItem requests as possible (across both the tables).
+
+    Returns:
+
+        Tuple of the list of plugin items and the dictionary of model endpoint items keyed by (Name, Version)
+    """
+    plugin_keys = []
+    model_keys = []
+
+    for plugin in get_profile_plugins(profile):
+        plugin_key = {"Name": plugin["Name"], "Version": "v0"}
+
+        if plugin_key not in plugin_keys:
+            plugin_keys.append(plugin_key)
+
+        if "ModelEndpoint" in plugin and isinstance(plugin["ModelEndpoint"], dict):
+            model_key = {
+                "Name": plugin["ModelEndpoint"]["Name"],
+                "Version": plugin["ModelEndpoint"]["Version"],
+            }
+
+            if model_key not in model_keys:
+                model_keys.append(model_key)
+
+    keys = [(PLUGIN_TABLE_NAME, key) for key in plugin_keys] + [
+        (MODEL_TABLE_NAME, key) for key in model_keys
+    ]
+
+    plugin_items = []
+    model_endpoints = {}
+
+    for index in range(0, len(keys), BATCH_GET_MAX_KEYS):
+        request_items = {}
+
+        for table_name, key in keys[index : index + BATCH_GET_MAX_KEYS]:
+            if table_name not in request_items:
+                request_items[table_name] = {
+                    "Keys": [],
+                    "ConsistentRead": True,
+                    **CATALOG_PROJECTIONS[table_name],
+                }
+
+            request_items[table_name]["Keys"].append(key)
+
+        while request_items:
+            response = ddb_resource.batch_get_item(RequestItems=request_items)
+
+            plugin_items.extend(response["Responses"].get(PLUGIN_TABLE_NAME, []))
+
+            for item in response["Responses"].get(MODEL_TABLE_NAME, []):
+                model_endpoints[(item["Name"], item["Version"])] = item
+
+            request_items = response.get("UnprocessedKeys", {})
+
+    return plugin_items, model_endpoints
+
+
+def get_model_endpoint(model, model_endpoints):
+    model_name = model["Name"]
+    model_version = model["Version"]
+
+    if (model_name, model_version) not in model_endpoints:
         raise NotFoundError(
             f"Model endpoint '{model_name}' with version '{model_version}' not found"
         )
 
-    elif not response["Item"]["Enabled"]:
+    elif not model_endpoints[(model_name, model_version)]["Enabled"]:
         raise BadRequestError(
             f"Model endpoint '{model_name}' with version '{model_version}' is disabled in the system"
         )
 
-    return response["Item"]["Endpoint"]
+    return model_endpoints[(model_name, model_version)]["Endpoint"]
 
 
 def generate_profile_state_definition(
@@ -472,9 +553,27 @@ def generate_profile_state_definition(
     plugin_definitions,
     shortened_profile,
     internal_lambda_arns,
+    use_express_workflow=False,
 ):
+    """
+    Generate the state machine definition of a profile.
+
+    When use_express_workflow is True, the Featurer plugins not needed for Replay are moved to a separate
+    Express state machine definition that is run synchronously as a nested execution of the Standard state
+    machine. The Standard definition then refers to the Express state machine by EXPRESS_STATE_MACHINE_ARN_PLACEHOLDER.
+
+    Returns:
+
+        Tuple of the Standard state machine definition and the Express state machine definition
+        (None if there is nothing to run in an Express workflow)
+    """
     print(f"Generating state machine definition for profile '{profile_name}'")
 
+    # Serialized once here instead of for every plugin included in the profile
+    shortened_profile_json = json.dumps(shortened_profile, cls=DecimalEncoder)
+
+    express_state_definition = None
+
     main_branch_list = []
     classifier_labeler_optimizer_branch_list = []
 
@@ -510,7 +609,7 @@ def generate_profile_state_definition(
         classifier,
         "Classifier",
         plugin_definitions[classifier_plugin_name],
-        shortened_profile,
+        shortened_profile_json,
     )
 
     # Remove the 'End' key and add the 'Next' key in the state definition
@@ -547,6 +646,51 @@ def generate_profile_state_definition(
         "Next": "CheckMultiChunkStatus",
     }
 
+    # Wait until the MultiChunkHelper resumes the execution (using the task token) once all the
+    # prior executions of the Classifier are complete and then check their status again.
+    # Timing out falls back to checking the status again in case the execution is never resumed.
+    multi_chunk_wait_task = {
+        "Type": "Task",
+        "Resource": "arn:aws:states:::lambda:invoke.waitForTaskToken",
+        "Parameters": {
+            "FunctionName": internal_lambda_arns["MultiChunkHelper"],
+            "Payload": {
+                "Event.$": "$.Event",
+                "Input.$": "$.Input",
+                "Profile": shortened_profile,
+                "MultiChunk": {
+                    "PluginClass": "Classifier",
+                    "WaitFactor": 5,
+                    "TaskToken.$": "$$.Task.Token",
+                },
+            },
+        },
+        "ResultPath": None,
+        "TimeoutSeconds": int(shortened_profile["ChunkSize"]),
+        "Retry": [
+            {
+                "ErrorEquals": [
+                    "Lambda.ServiceException",
+                    "Lambda.AWSLambdaException",
+                    "Lambda.SdkClientException",
+                    "Lambda.Unknown",
+                    "MREExecutionError",
+                ],
+                "IntervalSeconds": 2,
+                "MaxAttempts": 6,
+                "BackoffRate": 2,
+            }
+        ],
+        "Catch": [
+            {
+                "ErrorEquals": ["States.Timeout"],
+                "ResultPath": None,
+                "Next": "MultiChunkHelper",
+            }
+        ],
+        "Next": "MultiChunkHelper",
+    }
+
     plugin_output_handler_task = {
         "Type": "Task",
         "Resource": "arn:aws:states:::lambda:invoke",
@@ -589,7 +733,7 @@ def generate_profile_state_definition(
                 classifier["DependentPlugins"],
                 "Featurer",
                 plugin_definitions,
-                shortened_profile,
+                shortened_profile_json,
             )
         )
 
@@ -603,7 +747,7 @@ def generate_profile_state_definition(
                 labeler["DependentPlugins"],
                 "Featurer",
                 plugin_definitions,
-                shortened_profile,
+                shortened_profile_json,
             )
         )
 
@@ -614,7 +758,7 @@ def generate_profile_state_definition(
         )
         d_plugins_branch_list.extend(
             get_featurers_state_definition_branch_list(
-                featurers_for_replay, "Featurer", plugin_definitions, shortened_profile
+                featurers_for_replay, "Featurer", plugin_definitions, shortened_profile_json
             )
         )
 
@@ -639,16 +783,12 @@ def generate_profile_state_definition(
                         {
                             "Variable": "$.MultiChunk.IsCompleted",
                             "BooleanEquals": False,
-                            "Next": "Wait",
+                            "Next": "WaitForPriorChunks",
                         }
                     ],
                     "Default": classifier_plugin_name,
                 },
-                "Wait": {
-                    "Type": "Wait",
-                    "SecondsPath": "$.MultiChunk.WaitSeconds",
-                    "Next": "MultiChunkHelper",
-                },
+                "WaitForPriorChunks": multi_chunk_wait_task,
                 classifier_plugin_name: classifier_plugin_definition,
                 "PluginOutputHandler": plugin_output_handler_task,
                 "GenerateOriginalClips": {
@@ -681,16 +821,12 @@ def generate_profile_state_definition(
                         {
                             "Variable": "$.MultiChunk.IsCompleted",
                             "BooleanEquals": False,
-                            "Next": "Wait",
+                            "Next": "WaitForPriorChunks",
                         }
                     ],
                     "Default": classifier_plugin_name,
                 },
-                "Wait": {
-                    "Type": "Wait",
-                    "SecondsPath": "$.MultiChunk.WaitSeconds",
-                    "Next": "MultiChunkHelper",
-                },
+                "WaitForPriorChunks": multi_chunk_wait_task,
                 classifier_plugin_name: classifier_plugin_definition,
                 "PluginOutputHandler": plugin_output_handler_task,
                 "GenerateOriginalClips": {
@@ -721,7 +857,7 @@ def generate_profile_state_definition(
             labeler,
             "Labeler",
             plugin_definitions[labeler_plugin_name],
-            shortened_profile,
+            shortened_profile_json,
         )
 
         # Remove the 'End' key and add the 'Next' key in the GenerateOriginalClips state definition
@@ -751,7 +887,7 @@ def generate_profile_state_definition(
             optimizer,
             "Optimizer",
             plugin_definitions[optimizer_plugin_name],
-            shortened_profile,
+            shortened_profile_json,
         )
         is_audio_media_type = (
             True
@@ -774,7 +910,7 @@ def generate_profile_state_definition(
                 optimizer["DependentPlugins"],
                 "Featurer",
                 plugin_definitions,
-                shortened_profile,
+                shortened_profile_json,
             )
 
             optimizer_d_branch = {
@@ -923,7 +1059,7 @@ def generate_profile_state_definition(
         )
 
         featurers_branch_list = get_featurers_state_definition_branch_list(
-            featurers_not_for_replay, "Featurer", plugin_definitions, shortened_profile
+            featurers_not_for_replay, "Featurer", plugin_definitions, shortened_profile_json
         )
 
         featurers_branch = {
@@ -937,6 +1073,49 @@ def generate_profile_state_definition(
             },
         }
 
+        # The Featurers not needed for Replay neither wait on the other chunks nor feed the rest of the
+        # workflow which makes them a fit for the faster (and cheaper per state transition) Express workflow
+        if use_express_workflow:
+            print(
+                "Moving the Featurer plugins not required for Replay to a nested Express workflow."
+            )
+
+            express_state_definition = {
+                "Comment": f"AWS MRE Featurers Pipeline for profile {profile_name}",
+                **featurers_branch,
+            }
+
+            featurers_branch = {
+                "StartAt": "FeaturersExpressTask",
+                "States": {
+                    "FeaturersExpressTask": {
+                        "Type": "Task",
+                        "Resource": "arn:aws:states:::states:startExecution.sync:2",
+                        "Parameters": {
+                            "StateMachineArn": EXPRESS_STATE_MACHINE_ARN_PLACEHOLDER,
+                            "Input": {
+                                "Event.$": "$.Event",
+                                "Input.$": "$.Input",
+                                "AWS_STEP_FUNCTIONS_STARTED_BY_EXECUTION_ID.$": "$$.Execution.Id",
+                            },
+                        },
+                        "ResultPath": None,
+                        "Retry": [
+                            {
+                                "ErrorEquals": [
+                                    "StepFunctions.ExecutionLimitExceeded",
+                                    "StepFunctions.SdkClientException",
+                                ],
+                                "IntervalSeconds": 2,
+                                "MaxAttempts": 6,
+                                "BackoffRate": 2,
+                            }
+                        ],
+                        "End": True,
+                    }
+                },
+            }
+
         main_branch_list.append(featurers_branch)
 
     else:
@@ -1025,11 +1204,11 @@ def generate_profile_state_definition(
         },
     }
 
-    return main_state_definition
+    return main_state_definition, express_state_definition
 
 
 def get_plugin_state_definition(
-    plugin, expected_class, plugin_definition, shortened_profile
+    plugin, expected_class, plugin_definition, shortened_profile_json
 ):
     plugin_class = plugin_definition["Class"]
     plugin_execution_type = plugin_definition["ExecutionType"]
@@ -1047,21 +1226,40 @@ def get_plugin_state_definition(
             f"A valid 'ModelEndpoint' is required for plugin '{plugin_name}' as it belongs to the 'SyncModel' execution type"
         )
 
-    plugin_state_definition = plugin_state_definition.replace(
-        "%%PLUGIN_MODEL_ENDPOINT%%", model_endpoint
+    plugin_state_definition = render_plugin_state_definition(
+        plugin_state_definition,
+        model_endpoint,
+        json.dumps(configuration, cls=DecimalEncoder),
+    )
+
+    # The shortened profile is substituted outside the cache as it differs between profiles.
+    # A fresh copy is returned every time as the callers modify the definition.
+    return json.loads(
+        plugin_state_definition.replace('"%%SHORTENED_PROFILE%%"', shortened_profile_json)
     )
+
+
+@lru_cache(maxsize=512)
+def render_plugin_state_definition(
+    plugin_state_definition, model_endpoint, configuration_json
+):
+    """
+    Substitute the plugin specific placeholders in the state definition of a plugin. Memoized by the
+    state definition (plugin version), model endpoint and configuration so that a plugin used with the
+    same configuration is rendered only once per container, across profiles and profile saves.
+    """
     plugin_state_definition = plugin_state_definition.replace(
-        '"%%PLUGIN_CONFIGURATION%%"', json.dumps(configuration, cls=DecimalEncoder)
+        "%%PLUGIN_MODEL_ENDPOINT%%", model_endpoint
     )
     plugin_state_definition = plugin_state_definition.replace(
-        '"%%SHORTENED_PROFILE%%"', json.dumps(shortened_profile, cls=DecimalEncoder)
+        '"%%PLUGIN_CONFIGURATION%%"', configuration_json
     )
 
-    return json.loads(plugin_state_definition)
+    return plugin_state_definition
 
 
 def get_multi_level_state_definition_branch_list(
-    d_levels_list, expected_class, plugin_definitions, shortened_profile
+    d_levels_list, expected_class, plugin_definitions, shortened_profile_json
 ):
     multi_level_branch_list = []
     multi_level_random_string = "_" + "".join(
@@ -1082,7 +1280,7 @@ def get_multi_level_state_definition_branch_list(
                 plugin,
                 expected_class,
                 plugin_definitions[plugin_name],
-                shortened_profile,
+                shortened_profile_json,
             )
             plugin_supported_media_type = plugin_definitions[plugin_name][
                 "SupportedMediaType"
@@ -1179,14 +1377,14 @@ def get_multi_level_state_definition_branch_list(
 
 
 def get_featurers_state_definition_branch_list(
-    plugins_list, expected_class, plugin_definitions, shortened_profile
+    plugins_list, expected_class, plugin_definitions, shortened_profile_json
 ):
     branch_list = []
 
     for plugin in plugins_list:
         plugin_name = plugin["Name"]
         plugin_definition = get_plugin_state_definition(
-            plugin, expected_class, plugin_definitions[plugin_name], shortened_profile
+            plugin, expected_class, plugin_definitions[plugin_name], shortened_profile_json
         )
         plugin_supported_media_type = plugin_definitions[plugin_name][
             "SupportedMediaType"
@@ -1205,7 +1403,7 @@ def get_featurers_state_definition_branch_list(
                 plugin["DependentPlugins"],
                 "Featurer",
                 plugin_definitions,
-                shortened_profile,
+                shortened_profile_json,
             )
 
             if plugin_supported_media_type == "Video":
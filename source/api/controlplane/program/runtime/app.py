@@ -9,6 +9,7 @@ from aws_lambda_powertools.utilities.validation import (SchemaValidationError,
                                                         validate)
 from chalice import BadRequestError, Chalice, ChaliceViewError, IAMAuthorizer
 from chalicelib import load_api_schema
+from chalicelib.listing import get_page_params, get_page_response, list_items
 from aws_lambda_powertools import Logger
 
 app = Chalice(app_name="aws-mre-controlplane-program-api")
@@ -77,6 +78,9 @@ def list_programs():
     """
     List all the programs stored in the system.
 
+    Optionally, the programs can be paginated by passing the "limit" and "LastEvaluatedKey" query parameters
+    and projected by passing the "ProjectionExpression" query parameter.
+
     Returns:
 
         .. code-block:: python
@@ -89,23 +93,28 @@ def list_programs():
             ]
 
     Raises:
+        400 - BadRequestError
         500 - ChaliceViewError
     """
     try:
         logger.info(f"Listing all the programs")
 
-        program_table = ddb_resource.Table(PROGRAM_TABLE_NAME)
-
-        response = program_table.scan(ConsistentRead=True)
+        limit, exclusive_start_key, projection = get_page_params(
+            app.current_request.query_params
+        )
 
-        programs = response["Items"]
+        program_table = ddb_resource.Table(PROGRAM_TABLE_NAME)
 
-        while "LastEvaluatedKey" in response:
-            response = program_table.scan(
-                ExclusiveStartKey=response["LastEvaluatedKey"], ConsistentRead=True
-            )
+        programs, last_evaluated_key = list_items(
+            program_table,
+            limit=limit,
+            exclusive_start_key=exclusive_start_key,
+            projection=projection,
+            ConsistentRead=True,
+        )
 
-            programs.extend(response["Items"])
+    except BadRequestError:
+        raise
 
     except Exception as e:
         logger.info(f"Unable to list all the programs stored in the system: {str(e)}")
@@ -114,7 +123,7 @@ def list_programs():
         )
 
     else:
-        return programs
+        return get_page_response(programs, last_evaluated_key, limit)
 
 
 @app.route("/program/{program}", cors=True, methods=["DELETE"], authorizer=authorizer)
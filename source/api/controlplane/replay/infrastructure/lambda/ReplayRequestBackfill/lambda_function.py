@@ -0,0 +1,158 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+##############################################################################
+#
+# PURPOSE:
+# Custom Resource handler that sets the GSI attributes of the replay requests
+# created before the GSIs were added to the ReplayRequest table:
+#   - PaginationPartition of every replay request. Without it, the replay
+#     request is missing from the replay listings served by the Pagination GSI.
+#   - CatchupPartition of the active (neither Complete nor Error) Catchup
+#     replay requests. Without it, segment notifications no longer update
+#     the Catchup replays in progress at the time of the upgrade.
+#
+# The ReplayRequest table is scanned in parallel segments and only the replay
+# requests missing an attribute are updated, so running it again is a no-op.
+#
+##############################################################################
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+from botocore.client import ClientError
+
+BACKFILL_TOTAL_SEGMENTS = int(os.getenv("BACKFILL_TOTAL_SEGMENTS", "8"))
+
+PAGINATION_PARTITION = "PAGINATION_PARTITION"
+
+# Unlike the resource, the low-level client is safe to share across threads
+ddb_client = boto3.client("dynamodb")
+
+
+def on_event(event, context):
+    print(event)
+    request_type = event["RequestType"]
+
+    if request_type in ["Create", "Update"]:
+        backfill_replay_requests(event["ResourceProperties"]["table_name"])
+
+    elif request_type != "Delete":
+        raise Exception(f"Invalid request type: {request_type}")
+
+    return {"PhysicalResourceId": "ReplayRequestBackfill"}
+
+
+def backfill_replay_requests(table_name):
+    with ThreadPoolExecutor(max_workers=BACKFILL_TOTAL_SEGMENTS) as executor:
+        updated_counts = list(
+            executor.map(
+                lambda segment: backfill_segment(table_name, segment),
+                range(BACKFILL_TOTAL_SEGMENTS),
+            )
+        )
+
+    print(f"Backfilled {sum(updated_counts)} replay requests in table '{table_name}'")
+
+
+def backfill_segment(table_name, segment):
+    scan = {
+        "TableName": table_name,
+        "Segment": segment,
+        "TotalSegments": BACKFILL_TOTAL_SEGMENTS,
+        "FilterExpression": "attribute_not_exists(#PaginationPartition) OR "
+        "(#Catchup = :True AND NOT #Status IN (:Complete, :Error) AND attribute_not_exists(#CatchupPartition))",
+        "ProjectionExpression": "#PK, #ReplayId, #Catchup, #Status, #PaginationPartition, #CatchupPartition",
+        "ExpressionAttributeNames": {
+            "#PK": "PK",
+            "#ReplayId": "ReplayId",
+            "#Catchup": "Catchup",
+            "#Status": "Status",
+            "#PaginationPartition": "PaginationPartition",
+            "#CatchupPartition": "CatchupPartition",
+        },
+        "ExpressionAttributeValues": {
+            ":True": {"BOOL": True},
+            ":Complete": {"S": "Complete"},
+            ":Error": {"S": "Error"},
+        },
+    }
+
+    updated_count = 0
+
+    while True:
+        response = ddb_client.scan(**scan)
+
+        for item in response["Items"]:
+            if "PaginationPartition" not in item and update_pagination_partition(table_name, item):
+                updated_count += 1
+
+            if is_active_catchup(item) and "CatchupPartition" not in item and update_catchup_partition(table_name, item):
+                updated_count += 1
+
+        if "LastEvaluatedKey" not in response:
+            return updated_count
+
+        scan["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def is_active_catchup(item):
+    return (
+        item.get("Catchup", {}).get("BOOL", False)
+        and item.get("Status", {}).get("S") not in ["Complete", "Error"]
+    )
+
+
+def update_pagination_partition(table_name, item):
+    return update_replay_request(
+        table_name,
+        item,
+        UpdateExpression="SET #PaginationPartition = :PaginationPartition",
+        # Skip the replay requests deleted since the scan
+        ConditionExpression="attribute_exists(#PK)",
+        ExpressionAttributeNames={
+            "#PK": "PK",
+            "#PaginationPartition": "PaginationPartition",
+        },
+        ExpressionAttributeValues={":PaginationPartition": {"S": PAGINATION_PARTITION}},
+    )
+
+
+def update_catchup_partition(table_name, item):
+    # The CatchupPartition of a replay request is its PK (program#event)
+    return update_replay_request(
+        table_name,
+        item,
+        UpdateExpression="SET #CatchupPartition = :CatchupPartition",
+        # Skip the replay requests deleted or finished since the scan as finished
+        # replay requests must not be in the sparse Catchup GSI
+        ConditionExpression="attribute_exists(#PK) AND NOT #Status IN (:Complete, :Error)",
+        ExpressionAttributeNames={
+            "#PK": "PK",
+            "#Status": "Status",
+            "#CatchupPartition": "CatchupPartition",
+        },
+        ExpressionAttributeValues={
+            ":CatchupPartition": item["PK"],
+            ":Complete": {"S": "Complete"},
+            ":Error": {"S": "Error"},
+        },
+    )
+
+
+def update_replay_request(table_name, item, **kwargs):
+    try:
+        ddb_client.update_item(
+            TableName=table_name,
+            Key={"PK": item["PK"], "ReplayId": item["ReplayId"]},
+            **kwargs,
+        )
+
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+            return False
+
+        raise
+
+    return True
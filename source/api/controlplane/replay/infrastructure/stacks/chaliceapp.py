@@ -4,9 +4,11 @@
 import os
 import sys
 
-from aws_cdk import CfnOutput, Fn, RemovalPolicy, Stack
+from aws_cdk import CfnOutput, CustomResource, Duration, Fn, RemovalPolicy, Stack
 from aws_cdk import aws_dynamodb as ddb
 from aws_cdk import aws_iam as iam
+from aws_cdk import aws_lambda as _lambda
+from aws_cdk import custom_resources as cr
 from aws_cdk import aws_secretsmanager as secret_mgr
 from aws_cdk import aws_ssm as ssm
 from cdk_nag import NagSuppressions
@@ -15,7 +17,7 @@ from chalice.cdk import Chalice
 # Ask Python interpreter to search for modules in the topmost folder. This is required to access the shared.infrastructure.helpers module
 sys.path.append("../../../../")
 
-from shared.infrastructure.helpers import common, api_logging_construct
+from shared.infrastructure.helpers import common, api_logging_construct, constants
 
 RUNTIME_SOURCE_DIR = os.path.join(
     os.path.dirname(os.path.dirname(__file__)), os.pardir, "runtime"
@@ -50,6 +52,7 @@ class ChaliceApp(Stack):
         self.powertools_layer = common.MreCdkCommon.get_powertools_layer_from_arn(self)
 
         self.create_chalice_role()
+        self.create_replay_request_backfill()
 
         # Enable API Gateway logging through Custom Resources
         api_logging_construct.ApiGatewayLogging(
@@ -61,6 +64,75 @@ class ChaliceApp(Stack):
             burst_limit = 15 # up to 15 concurrent requests
         )
 
+    def create_replay_request_backfill(self):
+        # Role: ReplayRequestBackfillRole
+        self.replay_request_backfill_role = iam.Role(
+            self,
+            "ReplayRequestBackfillRole",
+            assumed_by=iam.ServicePrincipal(service="lambda.amazonaws.com"),
+            description="Role used by the MRE ReplayRequest Backfill Custom Resource Lambda function",
+        )
+
+        # ReplayRequestBackfillRole: CloudWatch Logs permissions
+        self.replay_request_backfill_role.add_to_policy(
+            iam.PolicyStatement(
+                effect=iam.Effect.ALLOW,
+                actions=["logs:CreateLogStream", "logs:PutLogEvents"],
+                resources=[
+                    f"arn:aws:logs:{Stack.of(self).region}:{Stack.of(self).account}:log-group:/aws/lambda/{Stack.of(self).stack_name}-*",
+                ],
+            )
+        )
+
+        self.replay_request_backfill_role.add_to_policy(
+            iam.PolicyStatement(
+                effect=iam.Effect.ALLOW,
+                actions=["logs:CreateLogGroup"],
+                resources=[
+                    f"arn:aws:logs:{Stack.of(self).region}:{Stack.of(self).account}:log-group*"
+                ],
+            )
+        )
+
+        # ReplayRequestBackfillRole: DynamoDB permissions
+        self.replay_request_backfill_role.add_to_policy(
+            iam.PolicyStatement(
+                effect=iam.Effect.ALLOW,
+                actions=["dynamodb:Scan", "dynamodb:UpdateItem"],
+                resources=[self.replayrequest_table.table_arn],
+            )
+        )
+
+        # Function: ReplayRequestBackfill
+        self.replay_request_backfill_lambda = _lambda.Function(
+            self,
+            "ReplayRequestBackfill",
+            description="Set the GSI attributes of the replay requests created before the GSIs were added to the ReplayRequest table",
+            runtime=_lambda.Runtime.PYTHON_3_11,
+            code=_lambda.Code.from_asset("lambda/ReplayRequestBackfill"),
+            handler="lambda_function.on_event",
+            role=self.replay_request_backfill_role,
+            memory_size=256,
+            timeout=Duration.minutes(15),
+        )
+
+        self.replay_request_backfill_provider = cr.Provider(
+            self,
+            "ReplayRequestBackfillProvider",
+            on_event_handler=self.replay_request_backfill_lambda,
+        )
+
+        # Runs once, when the Pagination and Catchup GSIs are introduced. It waits for the Chalice app so
+        # that the replay requests created after the scan already carry the GSI attributes.
+        self.replay_request_backfill_cr = CustomResource(
+            self,
+            "ReplayRequestBackfillCR",
+            service_token=self.replay_request_backfill_provider.service_token,
+            properties={"table_name": self.replayrequest_table.table_name},
+        )
+
+        self.replay_request_backfill_cr.node.add_dependency(self.chalice)
+
     def create_transitions_config_table(self):
         # Transitions Config Table
         self.transitions_config_table = ddb.Table(
@@ -112,6 +184,18 @@ class ChaliceApp(Stack):
             point_in_time_recovery=True  # Enables point-in-time recovery
         )
 
+        # ReplayRequest Table: Pagination GSI to list all the replay requests by the Created time
+        self.replayrequest_table.add_global_secondary_index(
+            index_name=constants.REPLAY_REQUEST_PAGINATION_INDEX,
+            partition_key=ddb.Attribute(
+                name="PaginationPartition", type=ddb.AttributeType.STRING
+            ),
+            sort_key=ddb.Attribute(name="Created", type=ddb.AttributeType.STRING),
+        )
+
+        # The sparse Catchup GSI (REPLAY_REQUEST_CATCHUP_INDEX) of the ReplayRequest table is created by the
+        # Data plane stack via Custom Resource as CloudFormation can create only one GSI per table update
+
         CfnOutput(
             self,
             "mre-replayrequest-table-arn",
@@ -166,10 +250,12 @@ class ChaliceApp(Stack):
                 ],
                 resources=[
                     self.replayrequest_table.table_arn,
+                    f"{self.replayrequest_table.table_arn}/index/*",
                     self.transitions_config_table.table_arn,
                     self.plugin_table_arn,
                     self.profile_table_arn,
                     self.event_table_arn,
+                    f"{self.event_table_arn}/index/*",
                 ],
             )
         )
@@ -259,7 +345,10 @@ class ChaliceApp(Stack):
                     "PLUGIN_TABLE_NAME": self.plugin_table_name,
                     "PROFILE_TABLE_NAME": self.profile_table_name,
                     "EVENT_TABLE_NAME": self.event_table_name,
+                    "EVENT_CONTENT_GROUP_INDEX": constants.EVENT_CONTENT_GROUP_INDEX,
                     "REPLAY_REQUEST_TABLE_NAME": self.replayrequest_table.table_name,
+                    "REPLAY_REQUEST_PAGINATION_INDEX": constants.REPLAY_REQUEST_PAGINATION_INDEX,
+                    "REPLAY_REQUEST_CATCHUP_INDEX": constants.REPLAY_REQUEST_CATCHUP_INDEX,
                     "EB_EVENT_BUS_NAME": self.event_bus.event_bus_name,
                     "HLS_HS256_API_AUTH_SECRET_KEY_NAME": "mre_hsa_api_auth_secret",
                     "CLOUDFRONT_COOKIE_PRIVATE_KEY_NAME": "mre_cloudfront_cookie_private_key",
@@ -313,6 +402,11 @@ class ChaliceApp(Stack):
                     "reason": "Chalice role policy requires wildcard permissions for MRE secrets",
                     "appliesTo": ["Resource::arn:aws:secretsmanager:*:*:secret:/MRE*"],
                 },
+                {
+                    "id": "AwsSolutions-IAM5",
+                    "reason": "DynamoDB GSI access pattern requires index wildcards",
+                    "appliesTo": [{"regex": "/^Resource::.*/index/\\*$/"}],
+                },
                 {
                     "id": "AwsSolutions-SMG4",
                     "reason": "By default no Secrets are created although the keys are created. Customers have to define these if the feature is being used.",
@@ -352,7 +446,10 @@ class ChaliceApp(Stack):
                 {
                     "id": "AwsSolutions-IAM5",
                     "reason": "Custom resource provider needs to invoke the target Lambda function.",
-                    "appliesTo": ["Resource::<ReplayApiEnableLoggingHandler11C33B7B.Arn>:*"]
+                    "appliesTo": [
+                        "Resource::<ReplayApiEnableLoggingHandler11C33B7B.Arn>:*",
+                        {"regex": "/^Resource::<ReplayRequestBackfill[0-9A-F]+\\.Arn>:\\*$/"},
+                    ]
                 }
             ],
         )
@@ -6,6 +6,7 @@ import json
 import os
 import urllib.parse
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from decimal import Decimal
 
@@ -16,13 +17,15 @@ from aws_lambda_powertools.utilities.validation import (SchemaValidationError,
 from aws_lambda_powertools import Logger
 from boto3.dynamodb.conditions import Attr, Key
 from datetime import datetime, timedelta, timezone
-from boto3.dynamodb.types import TypeSerializer
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
 from botocore.client import ClientError
 from botocore.config import Config
 from botocore.signers import CloudFrontSigner
 from chalice import (BadRequestError, Chalice, ChaliceViewError, ConflictError,
                      IAMAuthorizer, NotFoundError)
 from chalicelib import load_api_schema, replace_decimals
+from chalicelib.listing import (encode_cursor, get_page_params,
+                                get_page_response, list_items)
 import calendar
 
 app = Chalice(app_name="aws-mre-controlplane-replay-api")
@@ -41,6 +44,9 @@ HLS_STREAM_CLOUDFRONT_DISTRO = os.environ["HLS_STREAM_CLOUDFRONT_DISTRO"]
 PLUGIN_TABLE_NAME = os.environ["PLUGIN_TABLE_NAME"]
 PROFILE_TABLE_NAME = os.environ["PROFILE_TABLE_NAME"]
 EVENT_TABLE_NAME = os.environ["EVENT_TABLE_NAME"]
+EVENT_CONTENT_GROUP_INDEX = os.environ["EVENT_CONTENT_GROUP_INDEX"]
+REPLAY_REQUEST_PAGINATION_INDEX = os.environ["REPLAY_REQUEST_PAGINATION_INDEX"]
+REPLAY_REQUEST_CATCHUP_INDEX = os.environ["REPLAY_REQUEST_CATCHUP_INDEX"]
 TRANSITION_CLIP_S3_BUCKET = os.environ["TRANSITION_CLIP_S3_BUCKET"]
 TRANSITIONS_CONFIG_TABLE_NAME = os.environ["TRANSITIONS_CONFIG_TABLE_NAME"]
 MEDIA_OUTPUT_BUCKET_NAME = os.environ["MEDIA_OUTPUT_BUCKET_NAME"]
@@ -50,6 +56,7 @@ HLS_STREAMING_SIGNED_URL_EXPIRATION_HRS = os.environ[
 
 authorizer = IAMAuthorizer()
 serializer = TypeSerializer()
+deserializer = TypeDeserializer()
 
 ddb_resource = boto3.resource("dynamodb")
 eb_client = boto3.client("events")
@@ -58,6 +65,14 @@ sm_client = boto3.client("secretsmanager")
 
 API_SCHEMA = load_api_schema()
 
+# Maximum number of keys in a DynamoDB BatchGetItem request
+BATCH_GET_MAX_KEYS = 100
+REPLAY_QUERY_MAX_WORKERS = int(os.getenv("REPLAY_QUERY_MAX_WORKERS", "10"))
+
+# Unlike the resource, the low-level client is safe to share across threads
+ddb_client = boto3.client("dynamodb")
+replay_query_executor = ThreadPoolExecutor(max_workers=REPLAY_QUERY_MAX_WORKERS)
+
 # Create middleware to inject request context
 @app.middleware('all')
 def inject_request_context(event, get_response):
@@ -176,6 +191,7 @@ def add_replay():
             )
 
         model["PK"] = f"{model['Program']}#{model['Event']}"
+        model["PaginationPartition"] = "PAGINATION_PARTITION"
         model["ReplayId"] = str(uuid.uuid4())
 
         model["Created"] = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
@@ -202,6 +218,10 @@ def add_replay():
             else model["IncludeLikedSegments"]
         )
 
+        # Only the Catchup replay requests are added to the sparse Catchup GSI queried on every segment
+        if model.get("Catchup"):
+            model["CatchupPartition"] = model["PK"]
+
         # Default ToleranceMaxLimitInSecs to 30 Secs if its not a part of Payload
         if "DurationbasedSummarization" in model:
             if "ToleranceMaxLimitInSecs" not in model["DurationbasedSummarization"]:
@@ -263,32 +283,43 @@ def add_replay():
 @app.route("/replay/all", cors=True, methods=["GET"], authorizer=authorizer)
 def get_all_replays():
     """
-    Gets all the replay requests
+    Gets all the replay requests sorted by the Created time (latest first)
+
+    Optionally, the replay requests can be paginated by passing the "limit" and "LastEvaluatedKey" query parameters.
 
     Returns:
 
-        All Replay requests
+        .. code-block:: python
+
+            {
+                "Items": [
+                    {
+                        Replay
+                    }
+                    ...
+                ],
+                "LastEvaluatedKey": string
+            }
 
     Raises:
+        400 - BadRequestError
         500 - ChaliceViewError
     """
     replays = []
     replay_request_table = ddb_resource.Table(REPLAY_REQUEST_TABLE_NAME)
 
-    response = replay_request_table.scan()
-    replayInfo = response["Items"]
-
-    projection_expression = "PK, Requester, DurationbasedSummarization, ClipfeaturebasedSummarization, SpecifiedTimestamps, AudioTrack, Catchup, #st, MediaTailorChannel, ReplayId, Description, EdlLocation, HlsLocation, UxLabel, TransitionName, TransitionOverride, Created"
-    expression_attribute_names = {"#st": "Status"}
-    while "LastEvaluatedKey" in response:
-        response = replay_request_table.scan(
-            ProjectionExpression=projection_expression,
-            ExpressionAttributeNames=expression_attribute_names,
-            ExclusiveStartKey=response["LastEvaluatedKey"],
-        )
-        replayInfo.extend(response["Items"])
-
-    sorted_replayInfo = sorted(replayInfo, key=lambda x: x["Created"], reverse=True)
+    limit, exclusive_start_key, _ = get_page_params(app.current_request.query_params)
+
+    sorted_replayInfo, last_evaluated_key = list_items(
+        replay_request_table,
+        limit=limit,
+        exclusive_start_key=exclusive_start_key,
+        IndexName=REPLAY_REQUEST_PAGINATION_INDEX,
+        KeyConditionExpression=Key("PaginationPartition").eq("PAGINATION_PARTITION"),
+        ScanIndexForward=False,  # Latest first
+        ProjectionExpression="PK, Requester, DurationbasedSummarization, ClipfeaturebasedSummarization, SpecifiedTimestamps, AudioTrack, Catchup, #st, MediaTailorChannel, ReplayId, Description, EdlLocation, HlsLocation, UxLabel, TransitionName, TransitionOverride, Created",
+        ExpressionAttributeNames={"#st": "Status"},
+    )
 
     for item in sorted_replayInfo:
         replays.append(
@@ -330,7 +361,10 @@ def get_all_replays():
             }
         )
 
-    return {"Items": replace_decimals(replays)}
+    return {
+        "Items": replace_decimals(replays),
+        "LastEvaluatedKey": encode_cursor(last_evaluated_key),
+    }
 
 @app.route(
     "/replay/program/{program}/event/{event}/all",
@@ -423,11 +457,33 @@ def listreplay_by_content_group(contentGrp):
     """
     Get all the replay requests based on Content Group
 
+    The events of the Content Group are queried from the ContentGroup GSI of the Event table (latest first)
+    and only those having a profile that includes the Content Group are considered.
+
+    Optionally, the replay requests can be paginated by passing the "limit" and "LastEvaluatedKey" query
+    parameters. A page holds all the replay requests of whole events and so, can have more than "limit"
+    replay requests.
+
     Returns:
 
-        Replay requests based on Content Group
+        Replay requests based on Content Group sorted by the Created time (latest first)
+
+        With the "limit" query parameter:
+
+        .. code-block:: python
+
+            {
+                "Items": [
+                    {
+                        Replay
+                    }
+                    ...
+                ],
+                "LastEvaluatedKey": string
+            }
 
     Raises:
+        400 - BadRequestError
         404 - NotFoundError
         500 - ChaliceViewError
     """
@@ -438,80 +494,62 @@ def listreplay_by_content_group(contentGrp):
 
         validate_path_parameters({"ContentGroup": contentGroup})
 
+        limit, exclusive_start_key, _ = get_page_params(app.current_request.query_params)
+
         event_table = ddb_resource.Table(EVENT_TABLE_NAME)
-        event_response = event_table.scan()
 
-        profile_table = ddb_resource.Table(PROFILE_TABLE_NAME)
-        profileresponse = profile_table.scan()
+        query = {
+            "IndexName": EVENT_CONTENT_GROUP_INDEX,
+            "KeyConditionExpression": Key("ContentGroup").eq(contentGroup),
+            "ScanIndexForward": False,  # Latest events first
+            "ProjectionExpression": "#Name, #Program, #Profile",
+            "ExpressionAttributeNames": {
+                "#Name": "Name",
+                "#Program": "Program",
+                "#Profile": "Profile",
+            },
+        }
 
-        for event in event_response["Items"]:
-            profile = event["Profile"]
+        # Read at most "limit" events at a time as each of them has zero or more replay requests
+        if limit is not None:
+            query["Limit"] = limit
 
-            profile_obj = None
-            for profileItem in profileresponse["Items"]:
-                if profileItem["Name"] == profile:
-                    profile_obj = profileItem
-                    break
+        if exclusive_start_key:
+            query["ExclusiveStartKey"] = exclusive_start_key
 
-            if profile_obj is None:
-                continue
+        # Cache of the profile content groups across the pages of events
+        profile_content_groups = {}
 
-            if "ContentGroups" in profile_obj:
+        while True:
+            event_response = event_table.query(**query)
+            events = event_response["Items"]
 
-                # If the Profile has the Content Group, return the replays associated with the
-                # Program and Event
-                if contentGroup in profile_obj["ContentGroups"]:
+            get_profile_content_groups(
+                [event["Profile"] for event in events], profile_content_groups
+            )
 
-                    replay_table = ddb_resource.Table(REPLAY_REQUEST_TABLE_NAME)
-                    replayresponse = replay_table.query(
-                        KeyConditionExpression=Key("PK").eq(
-                            f"{event['Program']}#{event['Name']}"
-                        ),
-                        ConsistentRead=True,
-                    )
+            # If the Profile has the Content Group, return the replays associated with the
+            # Program and Event
+            events = [
+                event
+                for event in events
+                if contentGroup in profile_content_groups.get(event["Profile"], [])
+            ]
 
-                    for item in replayresponse["Items"]:
-                        replays.append(
-                            {
-                                "Program": event["Program"],
-                                "Event": event["Name"],
-                                "Duration": (
-                                    item["DurationbasedSummarization"]["Duration"]
-                                    if "DurationbasedSummarization" in item
-                                    else "N/A"
-                                ),
-                                "Requester": item["Requester"],
-                                "AudioTrack": (
-                                    item["AudioTrack"] if "AudioTrack" in item else ""
-                                ),
-                                "CatchUp": item["Catchup"],
-                                "Status": item["Status"],
-                                "DTC": True if "MediaTailorChannel" in item else False,
-                                "UxLabel": item["UxLabel"] if "UxLabel" in item else "",
-                                "ReplayId": item["ReplayId"],
-                                "Created": item["Created"],
-                                "EdlLocation": (
-                                    item["EdlLocation"]
-                                    if "EdlLocation" in item
-                                    else "-"
-                                ),
-                                "HlsLocation": (
-                                    item["HlsLocation"]
-                                    if "HlsLocation" in item
-                                    else "-"
-                                ),
-                                "TransitionName": (
-                                    item["TransitionName"]
-                                    if "TransitionName" in item
-                                    else ""
-                                ),
-                                "TransitionOverride": (
-                                    item["TransitionOverride"]
-                                    if "TransitionOverride" in item
-                                    else ""
-                                ),
-                            }
-                        )
+            for event, event_replays in zip(
+                events, replay_query_executor.map(get_event_replay_requests, events)
+            ):
+                replays.extend(
+                    format_content_group_replay(event, item) for item in event_replays
+                )
+
+            if "LastEvaluatedKey" not in event_response:
+                break
+
+            query["ExclusiveStartKey"] = event_response["LastEvaluatedKey"]
+
+            if limit is not None and len(replays) >= limit:
+                break
 
         sorted_replayInfo = sorted(replays, key=lambda x: x["Created"], reverse=True)
 
@@ -519,11 +557,120 @@ def listreplay_by_content_group(contentGrp):
         logger.info(f"ValidationError: {e.validation_message}")
         raise BadRequestError(f"ValidationError: {str(e.validation_message)}")
 
+    except BadRequestError:
+        raise
+
     except Exception as e:
         logger.info(f"Unable to get replays for Program and Event: {str(e)}")
         raise ChaliceViewError(f"Unable to get replays for Program and Event: {str(e)}")
 
-    return replace_decimals(sorted_replayInfo)
+    return replace_decimals(
+        get_page_response(sorted_replayInfo, event_response.get("LastEvaluatedKey"), limit)
+    )
+
+
+def get_profile_content_groups(profiles, profile_content_groups):
+    """
+    Look up the ContentGroups of the given profiles using BatchGetItem and add them to the
+    profile_content_groups dictionary (profile name to list of content groups).
+    Profiles already present in the dictionary are not looked up again.
+    """
+    keys = [
+        {"Name": profile}
+        for profile in dict.fromkeys(profiles)
+        if profile not in profile_content_groups
+    ]
+
+    for index in range(0, len(keys), BATCH_GET_MAX_KEYS):
+        request_items = {
+            PROFILE_TABLE_NAME: {
+                "Keys": keys[index : index + BATCH_GET_MAX_KEYS],
+                "ProjectionExpression": "#Name, #ContentGroups",
+                "ExpressionAttributeNames": {
+                    "#Name": "Name",
+                    "#ContentGroups": "ContentGroups",
+                },
+            }
+        }
+
+        while request_items:
+            response = ddb_resource.batch_get_item(RequestItems=request_items)
+
+            for item in response["Responses"].get(PROFILE_TABLE_NAME, []):
+                profile_content_groups[item["Name"]] = item.get("ContentGroups", [])
+
+            request_items = response.get("UnprocessedKeys", {})
+
+    # Profiles not found in the table
+    for key in keys:
+        profile_content_groups.setdefault(key["Name"], [])
+
+
+def get_event_replay_requests(event):
+    query = {
+        "TableName": REPLAY_REQUEST_TABLE_NAME,
+        "KeyConditionExpression": "#PK = :PK",
+        "ExpressionAttributeNames": {"#PK": "PK"},
+        "ExpressionAttributeValues": {
+            ":PK": {"S": f"{event['Program']}#{event['Name']}"}
+        },
+        "ConsistentRead": True,
+    }
+
+    response = ddb_client.query(**query)
+    items = response["Items"]
+
+    while "LastEvaluatedKey" in response:
+        query["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+        response = ddb_client.query(**query)
+        items.extend(response["Items"])
+
+    return [
+        {key: deserializer.deserialize(value) for key, value in item.items()}
+        for item in items
+    ]
+
+
+def format_content_group_replay(event, item):
+    return {
+        "Program": event["Program"],
+        "Event": event["Name"],
+        "Duration": (
+            item["DurationbasedSummarization"]["Duration"]
+            if "DurationbasedSummarization" in item
+            else "N/A"
+        ),
+        "Requester": item["Requester"],
+        "AudioTrack": (
+            item["AudioTrack"] if "AudioTrack" in item else ""
+        ),
+        "CatchUp": item["Catchup"],
+        "Status": item["Status"],
+        "DTC": True if "MediaTailorChannel" in item else False,
+        "UxLabel": item["UxLabel"] if "UxLabel" in item else "",
+        "ReplayId": item["ReplayId"],
+        "Created": item["Created"],
+        "EdlLocation": (
+            item["EdlLocation"]
+            if "EdlLocation" in item
+            else "-"
+        ),
+        "HlsLocation": (
+            item["HlsLocation"]
+            if "HlsLocation" in item
+            else "-"
+        ),
+        "TransitionName": (
+            item["TransitionName"]
+            if "TransitionName" in item
+            else ""
+        ),
+        "TransitionOverride": (
+            item["TransitionOverride"]
+            if "TransitionOverride" in item
+            else ""
+        ),
+    }
 
 @app.route(
     "/replay/program/{program}/event/{event}/replayid/{id}",
@@ -823,12 +970,20 @@ def update_replay_request_status(program, event, id, replaystatus):
             }
         )
 
+        update_expression = "SET #Status = :status"
+        expression_attribute_names = {"#Status": "Status"}
+
+        # Finished replay requests drop out of the sparse Catchup GSI
+        if replaystatus in ["Complete", "Error"]:
+            update_expression += " REMOVE #CatchupPartition"
+            expression_attribute_names["#CatchupPartition"] = "CatchupPartition"
+
         replay_request_table = ddb_resource.Table(REPLAY_REQUEST_TABLE_NAME)
 
         replay_request_table.update_item(
             Key={"PK": f"{program}#{eventname}", "ReplayId": replay_id},
-            UpdateExpression="SET #Status = :status",
-            ExpressionAttributeNames={"#Status": "Status"},
+            UpdateExpression=update_expression,
+            ExpressionAttributeNames=expression_attribute_names,
             ExpressionAttributeValues={":status": replaystatus},
         )
 
@@ -1021,23 +1176,116 @@ def get_all_replays_for_segment_end(event, program):
 
         replay_request_table = ddb_resource.Table(REPLAY_REQUEST_TABLE_NAME)
 
-        response = replay_request_table.query(
+        items, _ = list_items(
+            replay_request_table,
             KeyConditionExpression=Key("PK").eq(f"{program}#{eventname}"),
             FilterExpression=Attr("Status").ne("Complete") & Attr("Status").ne("Error"),
             ConsistentRead=True,
         )
 
-        if "Items" not in response:
-            raise NotFoundError(
-                f"No Replay Requests found for program '{program}' and {eventname}"
+        return replace_decimals(items)
+
+    except SchemaValidationError as e:
+        logger.info(f"ValidationError: {e.validation_message}")
+        raise BadRequestError(f"ValidationError: {str(e.validation_message)}")
+
+@app.route(
+    "/replay/program/{program}/event/{event}/segmentend/catchup",
+    cors=True,
+    methods=["GET"],
+    authorizer=authorizer,
+)
+def get_all_catchup_replays_for_segment_end(event, program):
+    """
+    Get all Queued,InProgress Catchup Replay Requests for the Program/Event from the sparse Catchup GSI.
+    Pass the "audioTrack" query parameter to get only the Replay Requests of an AudioTrack.
+
+    The GSI is eventually consistent. A Replay Request created or finished moments ago may be missed or
+    returned once, which is fine as a Catchup replay is regenerated from all the segments so far on every segment.
+
+    Until the GSI is created (by the Data plane stack) and active, the Replay Requests of the Program/Event are
+    queried and filtered instead.
+
+    Returns:
+
+        Catchup Replay Requests based on Event and Program
+
+    Raises:
+        400 - BadRequestError
+        500 - ChaliceViewError
+    """
+    try:
+        eventname = urllib.parse.unquote(event)
+        program = urllib.parse.unquote(program)
+        query_params = app.current_request.query_params or {}
+
+        validate_path_parameters({"Event": event, "Program": program})
+
+        query = {
+            "IndexName": REPLAY_REQUEST_CATCHUP_INDEX,
+            "KeyConditionExpression": Key("CatchupPartition").eq(f"{program}#{eventname}"),
+        }
+
+        audio_track_filter = None
+
+        if "audioTrack" in query_params:
+            try:
+                audio_track = int(query_params["audioTrack"])
+
+            except ValueError:
+                raise BadRequestError("audioTrack must be an integer")
+
+            audio_track_filter = Attr("AudioTrack").eq(audio_track)
+            query["FilterExpression"] = audio_track_filter
+
+        replay_request_table = ddb_resource.Table(REPLAY_REQUEST_TABLE_NAME)
+
+        try:
+            items, _ = list_items(replay_request_table, **query)
+
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ValidationException":
+                raise
+
+            logger.info(
+                f"Catchup GSI is not available yet ({str(e)}). Querying the Replay Requests of program '{program}' and {eventname} instead."
             )
 
-        return replace_decimals(response["Items"])
+            filter_expression = (
+                Attr("Catchup").eq(True)
+                & Attr("Status").ne("Complete")
+                & Attr("Status").ne("Error")
+            )
+
+            if audio_track_filter is not None:
+                filter_expression &= audio_track_filter
+
+            items, _ = list_items(
+                replay_request_table,
+                KeyConditionExpression=Key("PK").eq(f"{program}#{eventname}"),
+                FilterExpression=filter_expression,
+                ConsistentRead=True,
+            )
 
     except SchemaValidationError as e:
         logger.info(f"ValidationError: {e.validation_message}")
         raise BadRequestError(f"ValidationError: {str(e.validation_message)}")
 
+    except BadRequestError as e:
+        logger.info(f"Got chalice BadRequestError: {str(e)}")
+        raise
+
+    except Exception as e:
+        logger.info(
+            f"Unable to get the Catchup Replay Requests for program '{program}' and {eventname}: {str(e)}"
+        )
+        raise ChaliceViewError(
+            f"Unable to get the Catchup Replay Requests for program '{program}' and {eventname}: {str(e)}"
+        )
+
+    else:
+        return replace_decimals(items)
+
 @app.route(
     "/replay/program/{program}/event/{event}/features",
     cors=True,
@@ -1915,18 +2163,22 @@ def list_all_transitions_config():
     try:
         logger.info("Listing all the programs")
 
-        transitions_config_table = ddb_resource.Table(TRANSITIONS_CONFIG_TABLE_NAME)
-
-        response = transitions_config_table.scan(ConsistentRead=True)
+        limit, exclusive_start_key, projection = get_page_params(
+            app.current_request.query_params
+        )
 
-        trans_config = response["Items"]
+        transitions_config_table = ddb_resource.Table(TRANSITIONS_CONFIG_TABLE_NAME)
 
-        while "LastEvaluatedKey" in response:
-            response = transitions_config_table.scan(
-                ExclusiveStartKey=response["LastEvaluatedKey"], ConsistentRead=True
-            )
+        trans_config, last_evaluated_key = list_items(
+            transitions_config_table,
+            limit=limit,
+            exclusive_start_key=exclusive_start_key,
+            projection=projection,
+            ConsistentRead=True,
+        )
 
-            trans_config.extend(response["Items"])
+    except BadRequestError:
+        raise
 
     except Exception as e:
         logger.info(
@@ -1937,7 +2189,7 @@ def list_all_transitions_config():
         )
 
     else:
-        return trans_config
+        return get_page_response(trans_config, last_evaluated_key, limit)
 
 def get_media_presigned_url(key, bucket, is_hls=False):
     """
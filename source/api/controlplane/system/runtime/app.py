@@ -13,6 +13,7 @@ from aws_lambda_powertools.utilities.validation import (SchemaValidationError,
 from chalice import (BadRequestError, Chalice, ChaliceViewError, ConflictError,
                      IAMAuthorizer, NotFoundError)
 from chalicelib import DecimalEncoder, load_api_schema, replace_decimals
+from chalicelib.listing import get_page_params, get_page_response, list_items
 from aws_lambda_powertools import Logger
 
 app = Chalice(app_name='aws-mre-controlplane-system-api')
@@ -312,6 +313,9 @@ def list_system_configurations():
     """
     List all the system configuration parameters
 
+    Optionally, the parameters can be paginated by passing the "limit" and "LastEvaluatedKey" query parameters
+    and projected by passing the "ProjectionExpression" query parameter.
+
     Returns:
 
         .. code-block:: python
@@ -324,33 +328,33 @@ def list_system_configurations():
             ]
 
     Raises:
+        400 - BadRequestError
         500 - ChaliceViewError
     """
     try:
         logger.info("Listing all the system configuration parameters")
 
+        limit, exclusive_start_key, projection = get_page_params(app.current_request.query_params)
+
         system_table = ddb_resource.Table(SYSTEM_TABLE_NAME)
 
-        response = system_table.scan(
+        configs, last_evaluated_key = list_items(
+            system_table,
+            limit=limit,
+            exclusive_start_key=exclusive_start_key,
+            projection=projection,
             ConsistentRead=True
         )
 
-        configs = response["Items"]
-
-        while "LastEvaluatedKey" in response:
-            response = system_table.scan(
-                ExclusiveStartKey=response["LastEvaluatedKey"],
-                ConsistentRead=True
-            )
-
-            configs.extend(response["Items"])
+    except BadRequestError:
+        raise
 
     except Exception as e:
         logger.info(f"Unable to list the system configuration parameters: {str(e)}")
         raise ChaliceViewError(f"Unable to list the system configuration parameters: {str(e)}")
 
     else:
-        return replace_decimals(configs)
+        return replace_decimals(get_page_response(configs, last_evaluated_key, limit))
 
 def get_bucket_region(bucket_name: str) -> bool:
     resp = s3_client.get_bucket_location(Bucket=bucket_name)
@@ -0,0 +1,134 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+##############################################################################
+#
+# PURPOSE:
+# Custom Resource handler that moves the workflow execution items recorded
+# before the WorkflowExecution table was sharded (having the partition key
+# "<program>#<event>") into the shard of their chunk number. Without it, the
+# events in progress during the upgrade lose track of their prior executions.
+#
+# Each legacy item is copied to its shard (keeping the attributes already
+# written there since the upgrade), the shard is recorded in the event item
+# and the legacy item is given a "ttl" so that DynamoDB expires it. The
+# legacy items are the only execution items without a "ttl", so running it
+# again is a no-op.
+#
+##############################################################################
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+from botocore.client import ClientError
+
+BACKFILL_TOTAL_SEGMENTS = int(os.getenv("BACKFILL_TOTAL_SEGMENTS", "8"))
+
+# Must match the sharding of the Workflow API
+CHUNKS_PER_SHARD = int(os.getenv("WORKFLOW_EXECUTION_CHUNKS_PER_SHARD", "1800"))
+EXECUTION_TTL_SECS = int(os.getenv("WORKFLOW_EXECUTION_TTL_HOURS", "168")) * 3600
+
+EVENT_CHUNK_NUMBER = -1
+
+# Unlike the resource, the low-level client is safe to share across threads
+ddb_client = boto3.client("dynamodb")
+
+
+def on_event(event, context):
+    print(event)
+    request_type = event["RequestType"]
+
+    if request_type in ["Create", "Update"]:
+        backfill_shards(event["ResourceProperties"]["table_name"])
+
+    elif request_type != "Delete":
+        raise Exception(f"Invalid request type: {request_type}")
+
+    return {"PhysicalResourceId": "WorkflowExecutionShardBackfill"}
+
+
+def backfill_shards(table_name):
+    with ThreadPoolExecutor(max_workers=BACKFILL_TOTAL_SEGMENTS) as executor:
+        moved_counts = list(
+            executor.map(
+                lambda segment: backfill_segment(table_name, segment),
+                range(BACKFILL_TOTAL_SEGMENTS),
+            )
+        )
+
+    print(f"Moved {sum(moved_counts)} workflow executions into their shard in table '{table_name}'")
+
+
+def backfill_segment(table_name, segment):
+    scan = {
+        "TableName": table_name,
+        "Segment": segment,
+        "TotalSegments": BACKFILL_TOTAL_SEGMENTS,
+        "FilterExpression": "attribute_not_exists(#ttl) AND #ChunkNumber > :EventChunkNumber",
+        "ExpressionAttributeNames": {"#ttl": "ttl", "#ChunkNumber": "ChunkNumber"},
+        "ExpressionAttributeValues": {":EventChunkNumber": {"N": str(EVENT_CHUNK_NUMBER)}},
+    }
+
+    moved_count = 0
+
+    while True:
+        response = ddb_client.scan(**scan)
+
+        for item in response["Items"]:
+            move_execution(table_name, item)
+            moved_count += 1
+
+        if "LastEvaluatedKey" not in response:
+            return moved_count
+
+        scan["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def move_execution(table_name, item):
+    legacy_key = {"PK": item["PK"], "ChunkNumber": item["ChunkNumber"]}
+    shard = int(item["ChunkNumber"]["N"]) // CHUNKS_PER_SHARD
+    ttl = {"N": str(int(time.time()) + EXECUTION_TTL_SECS)}
+
+    attributes = [name for name in item if name not in legacy_key]
+    expression_attribute_names = {"#ttl": "ttl"}
+    expression_attribute_values = {":ttl": ttl}
+    assignments = []
+
+    # The attributes written to the shard since the upgrade are more recent than the legacy ones
+    for index, name in enumerate(attributes):
+        expression_attribute_names[f"#Attr{index}"] = name
+        expression_attribute_values[f":Attr{index}"] = item[name]
+        assignments.append(f"#Attr{index} = if_not_exists(#Attr{index}, :Attr{index})")
+
+    ddb_client.update_item(
+        TableName=table_name,
+        Key={"PK": {"S": f"{item['PK']['S']}#{shard}"}, "ChunkNumber": item["ChunkNumber"]},
+        UpdateExpression=f"SET {', '.join(assignments + ['#ttl = :ttl'])}",
+        ExpressionAttributeNames=expression_attribute_names,
+        ExpressionAttributeValues=expression_attribute_values,
+    )
+
+    ddb_client.update_item(
+        TableName=table_name,
+        Key={"PK": item["PK"], "ChunkNumber": {"N": str(EVENT_CHUNK_NUMBER)}},
+        UpdateExpression="ADD #Shards :Shard",
+        ExpressionAttributeNames={"#Shards": "Shards"},
+        ExpressionAttributeValues={":Shard": {"NS": [str(shard)]}},
+    )
+
+    try:
+        ddb_client.update_item(
+            TableName=table_name,
+            Key=legacy_key,
+            UpdateExpression="SET #ttl = :ttl",
+            # Skip the executions deleted along with their event since the scan
+            ConditionExpression="attribute_exists(#PK)",
+            ExpressionAttributeNames={"#PK": "PK", "#ttl": "ttl"},
+            ExpressionAttributeValues={":ttl": ttl},
+        )
+
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            raise
@@ -3,8 +3,10 @@
 import os
 import sys
 
-from aws_cdk import CfnOutput, Fn, Stack
+from aws_cdk import CfnOutput, CustomResource, Duration, Fn, Stack
 from aws_cdk import aws_iam as iam
+from aws_cdk import aws_lambda as _lambda
+from aws_cdk import custom_resources as cr
 from cdk_nag import NagSuppressions
 from chalice.cdk import Chalice
 
@@ -30,6 +32,8 @@ class ChaliceApp(Stack):
         
         self.create_chalice_role()
 
+        self.create_shard_backfill()
+
         # Enable API Gateway logging through Custom Resources
         api_logging_construct.ApiGatewayLogging(
             self, 
@@ -40,6 +44,79 @@ class ChaliceApp(Stack):
             burst_limit = 15 # up to 15 concurrent requests
         )
 
+    def create_shard_backfill(self):
+        # Role: WorkflowExecutionShardBackfillRole
+        self.shard_backfill_role = iam.Role(
+            self,
+            "WorkflowExecutionShardBackfillRole",
+            assumed_by=iam.ServicePrincipal(service="lambda.amazonaws.com"),
+            description="Role used by the MRE WorkflowExecution Shard Backfill Custom Resource Lambda function",
+        )
+
+        # WorkflowExecutionShardBackfillRole: CloudWatch Logs permissions
+        self.shard_backfill_role.add_to_policy(
+            iam.PolicyStatement(
+                effect=iam.Effect.ALLOW,
+                actions=["logs:CreateLogStream", "logs:PutLogEvents"],
+                resources=[
+                    f"arn:aws:logs:{Stack.of(self).region}:{Stack.of(self).account}:log-group:/aws/lambda/{Stack.of(self).stack_name}-*",
+                ],
+            )
+        )
+
+        self.shard_backfill_role.add_to_policy(
+            iam.PolicyStatement(
+                effect=iam.Effect.ALLOW,
+                actions=["logs:CreateLogGroup"],
+                resources=[
+                    f"arn:aws:logs:{Stack.of(self).region}:{Stack.of(self).account}:log-group:*"
+                ],
+            )
+        )
+
+        # WorkflowExecutionShardBackfillRole: DynamoDB permissions
+        self.shard_backfill_role.add_to_policy(
+            iam.PolicyStatement(
+                effect=iam.Effect.ALLOW,
+                actions=["dynamodb:Scan", "dynamodb:UpdateItem"],
+                resources=[self.workflow_exec_table_arn],
+            )
+        )
+
+        # Function: WorkflowExecutionShardBackfill
+        self.shard_backfill_lambda = _lambda.Function(
+            self,
+            "WorkflowExecutionShardBackfill",
+            description="Move the workflow executions recorded before the WorkflowExecution table was sharded into their shard",
+            runtime=_lambda.Runtime.PYTHON_3_11,
+            code=_lambda.Code.from_asset("lambda/WorkflowExecutionShardBackfill"),
+            handler="lambda_function.on_event",
+            role=self.shard_backfill_role,
+            memory_size=256,
+            timeout=Duration.minutes(15),
+            environment={
+                "WORKFLOW_EXECUTION_CHUNKS_PER_SHARD": "1800",
+                "WORKFLOW_EXECUTION_TTL_HOURS": "168",
+            },
+        )
+
+        self.shard_backfill_provider = cr.Provider(
+            self,
+            "WorkflowExecutionShardBackfillProvider",
+            on_event_handler=self.shard_backfill_lambda,
+        )
+
+        # Runs once, when the WorkflowExecution table is sharded. It waits for the Chalice app
+        # so that the executions recorded after the scan are already written to their shard.
+        self.shard_backfill_cr = CustomResource(
+            self,
+            "WorkflowExecutionShardBackfillCR",
+            service_token=self.shard_backfill_provider.service_token,
+            properties={"table_name": self.workflow_exec_table_name},
+        )
+
+        self.shard_backfill_cr.node.add_dependency(self.chalice)
+
     def create_chalice_role(self):
 
         # Chalice IAM Role
@@ -95,13 +172,25 @@ class ChaliceApp(Stack):
             )
         )
 
+        # Chalice IAM Role: Step Functions permissions to resume the workflow executions waiting for prior chunks
+        self.chalice_role.add_to_policy(
+            iam.PolicyStatement(
+                effect=iam.Effect.ALLOW,
+                actions=["states:SendTaskSuccess"],
+                resources=["*"],
+            )
+        )
+
         self.chalice = Chalice(
             self,
             "ChaliceApp",
             source_dir=RUNTIME_SOURCE_DIR,
             stage_config={
                 "environment_variables": {
-                    "WORKFLOW_EXECUTION_TABLE_NAME": self.workflow_exec_table_name
+                    "WORKFLOW_EXECUTION_TABLE_NAME": self.workflow_exec_table_name,
+                    "WORKFLOW_EXECUTION_CHUNKS_PER_SHARD": "1800",
+                    "WORKFLOW_EXECUTION_TTL_HOURS": "168",
+                    "WORKFLOW_EXECUTION_STALE_MINUTES": "30",
                 },
                 "tags": {"Project": "MRE"},
                 "manage_iam_role": False,
@@ -140,6 +229,11 @@ class ChaliceApp(Stack):
                     "reason": "API Gateway permissions require access to all APIs to find the one created by Chalice. This only runs during deployment.",
                     "appliesTo": ["Resource::*"]
                 },
+                {
+                    "id": "AwsSolutions-IAM5",
+                    "reason": "Step Functions task tokens are not scoped to a resource, so SendTaskSuccess requires a wildcard resource.",
+                    "appliesTo": ["Resource::*"]
+                },
                 {
                     "id": "AwsSolutions-IAM4",
                     "reason": "AWS Lambda Basic Execution Role is required for Lambda function logging and is appropriately scoped.",
@@ -148,7 +242,10 @@ class ChaliceApp(Stack):
                 {
                     "id": "AwsSolutions-IAM5",
                     "reason": "Custom resource provider needs to invoke the target Lambda function.",
-                    "appliesTo": ["Resource::<WorkflowApiEnableLoggingHandlerDBE9A39D.Arn>:*"]
+                    "appliesTo": [
+                        "Resource::<WorkflowApiEnableLoggingHandlerDBE9A39D.Arn>:*",
+                        {"regex": "/^Resource::<WorkflowExecutionShardBackfill[0-9A-F]+\\.Arn>:\\*$/"},
+                    ]
                 }
             ],
         )
@@ -8,10 +8,21 @@ import urllib.parse
 import boto3
 from aws_lambda_powertools.utilities.validation import (SchemaValidationError,
                                                         validate)
-from boto3.dynamodb.conditions import Attr, Key
+from boto3.dynamodb.conditions import Attr
 from boto3.dynamodb.types import TypeSerializer
+from botocore.client import ClientError
 from chalice import BadRequestError, Chalice, ChaliceViewError, IAMAuthorizer
 from chalicelib import load_api_schema, replace_decimals
+from chalicelib.shard import (get_execution_key, get_execution_ttl,
+                              is_stale_execution, query_executions,
+                              register_shard)
+from chalicelib.task_token import (put_task_token,
+                                   resume_waiting_executions,
+                                   send_task_success)
+from chalicelib.watermark import (INCOMPLETE_STATUSES, advance_watermark,
+                                  get_first_unverified_chunk_number,
+                                  get_watermark, record_completion,
+                                  reset_watermark)
 from aws_lambda_powertools import Logger
 
 app = Chalice(app_name="aws-mre-controlplane-workflow-api")
@@ -22,6 +33,7 @@ authorizer = IAMAuthorizer()
 serializer = TypeSerializer()
 
 ddb_resource = boto3.resource("dynamodb")
+sfn_client = boto3.client("stepfunctions")
 
 API_SCHEMA = load_api_schema()
 
@@ -80,14 +92,16 @@ def record_execution_details():
         workflow_exec_table_name = ddb_resource.Table(WORKFLOW_EXECUTION_TABLE_NAME)
 
         item = {
-            "PK": f"{program}#{event}",
-            "ChunkNumber": chunk_num,
+            **get_execution_key(program, event, chunk_num),
             "ExecutionId": execution["ExecutionId"],
             "Filename": execution["Filename"],
+            "ttl": get_execution_ttl(),
         }
 
         workflow_exec_table_name.put_item(Item=item)
 
+        register_shard(workflow_exec_table_name, program, event, chunk_num)
+
     except SchemaValidationError as e:
         logger.info(f"ValidationError: {e.validation_message}")
         raise BadRequestError(f"ValidationError: {str(e.validation_message)}")
@@ -149,15 +163,7 @@ def put_plugin_execution_status(program, event, chunk_num, plugin_name, status):
 
         workflow_exec_table_name = ddb_resource.Table(WORKFLOW_EXECUTION_TABLE_NAME)
 
-        workflow_exec_table_name.update_item(
-            Key={
-                "PK": f"{program}#{event}",
-                "ChunkNumber": chunk_num,
-            },
-            UpdateExpression=f"SET #Plugin = :Status",
-            ExpressionAttributeNames={"#Plugin": plugin_name},
-            ExpressionAttributeValues={":Status": status},
-        )
+        update_plugin_execution_statuses(workflow_exec_table_name, program, event, chunk_num, {plugin_name: status})
 
     except SchemaValidationError as e:
         logger.info(f"ValidationError: {e.validation_message}")
@@ -179,6 +185,82 @@ def put_plugin_execution_status(program, event, chunk_num, plugin_name, status):
         return {}
 
 
+@app.route(
+    "/workflow/execution/program/{program}/event/{event}/chunk/{chunk_num}/status",
+    cors=True,
+    methods=["PUT"],
+    authorizer=authorizer,
+)
+def put_plugin_execution_statuses(program, event, chunk_num):
+    """
+    Update the execution status of one or more plugins included as a part of an AWS Step Function workflow
+    in a single write.
+
+    Body:
+
+    .. code-block:: python
+
+        {
+            "Plugins": {
+                "<plugin name>": "Waiting|In Progress|Complete|Error",
+                ...
+            }
+        }
+
+    Returns:
+
+        None
+
+    Raises:
+        400 - BadRequestError
+        500 - ChaliceViewError
+    """
+
+    try:
+        program = urllib.parse.unquote(program)
+        event = urllib.parse.unquote(event)
+        chunk_num = int(urllib.parse.unquote(chunk_num))
+
+        validate_path_parameters(
+            {
+                "Program": program,
+                "Event": event,
+                "ChunkNumber": chunk_num,
+            }
+        )
+
+        request = json.loads(app.current_request.raw_body.decode())
+
+        validate(event=request, schema=API_SCHEMA["workflow_plugin_execution_status"])
+
+        logger.info(
+            f"Updating the execution status of plugins '{list(request['Plugins'])}' for chunk '{chunk_num}' in program '{program}' and event '{event}'"
+        )
+
+        workflow_exec_table_name = ddb_resource.Table(WORKFLOW_EXECUTION_TABLE_NAME)
+
+        update_plugin_execution_statuses(workflow_exec_table_name, program, event, chunk_num, request["Plugins"])
+
+    except SchemaValidationError as e:
+        logger.info(f"ValidationError: {e.validation_message}")
+        raise BadRequestError(f"ValidationError: {str(e.validation_message)}")
+
+    except Exception as e:
+        logger.info(
+            f"Unable to update the status of plugins for chunk '{chunk_num}' in program '{program}' and event '{event}': {str(e)}"
+        )
+        raise ChaliceViewError(
+            f"Unable to update the status of plugins for chunk '{chunk_num}' in program '{program}' and event '{event}': {str(e)}"
+        )
+
+    else:
+        logger.info(
+            f"Successfully updated the status of plugins for chunk '{chunk_num}' in program '{program}' and event '{event}'"
+        )
+
+        return {}
+
+
 @app.route(
     "/workflow/execution/program/{program}/event/{event}/chunk/{chunk_num}/plugin/{plugin_name}/status",
     cors=True,
@@ -219,7 +301,7 @@ def get_plugin_execution_status(program, event, chunk_num, plugin_name):
         workflow_exec_table_name = ddb_resource.Table(WORKFLOW_EXECUTION_TABLE_NAME)
 
         response = workflow_exec_table_name.get_item(
-            Key={"PK": f"{program}#{event}", "ChunkNumber": chunk_num},
+            Key=get_execution_key(program, event, chunk_num),
             ProjectionExpression="#Plugin",
             ExpressionAttributeNames={"#Plugin": plugin_name},
         )
@@ -256,6 +338,9 @@ def list_incomplete_plugin_executions(program, event, chunk_num, plugin_name):
     List all the plugin executions that are either yet to start or currently in progress in any workflow
     execution prior to the given chunk number for a given program and event.
 
+    Only the workflow executions after the completion watermark of the plugin are queried. When all of them
+    are complete, this is a single GetItem.
+
     Returns:
 
         .. code-block:: python
@@ -293,29 +378,7 @@ def list_incomplete_plugin_executions(program, event, chunk_num, plugin_name):
 
         workflow_exec_table_name = ddb_resource.Table(WORKFLOW_EXECUTION_TABLE_NAME)
 
-        response = workflow_exec_table_name.query(
-            KeyConditionExpression=Key("PK").eq(f"{program}#{event}")
-            & Key("ChunkNumber").lt(chunk_num),
-            FilterExpression=Attr(plugin_name).not_exists()
-            | Attr(plugin_name).is_in(["Waiting", "In Progress"]),
-            ProjectionExpression="PK, ChunkNumber",
-            ConsistentRead=True,
-        )
-
-        executions = response["Items"]
-
-        while "LastEvaluatedKey" in response:
-            response = workflow_exec_table_name.query(
-                ExclusiveStartKey=response["LastEvaluatedKey"],
-                KeyConditionExpression=Key("PK").eq(f"{program}#{event}")
-                & Key("ChunkNumber").lt(chunk_num),
-                FilterExpression=Attr(plugin_name).not_exists()
-                | Attr(plugin_name).is_in(["Waiting", "In Progress"]),
-                ProjectionExpression="PK, ChunkNumber",
-                ConsistentRead=True,
-            )
-
-            executions.extend(response["Items"])
+        executions = get_incomplete_executions(workflow_exec_table_name, program, event, chunk_num, plugin_name)
 
     except SchemaValidationError as e:
         logger.info(f"ValidationError: {e.validation_message}")
@@ -333,5 +396,221 @@ def list_incomplete_plugin_executions(program, event, chunk_num, plugin_name):
         return replace_decimals(executions)
 
 
+@app.route(
+    "/workflow/execution/program/{program}/event/{event}/chunk/{chunk_num}/plugin/{plugin_name}/tasktoken",
+    cors=True,
+    methods=["PUT"],
+    authorizer=authorizer,
+)
+def register_plugin_execution_task_token(program, event, chunk_num, plugin_name):
+    """
+    Register the task token of an AWS Step Function workflow execution waiting for all the prior executions
+    of a plugin to complete. The workflow execution is resumed (via SendTaskSuccess) as soon as the last of
+    them completes or immediately if they are already complete.
+
+    Body:
+
+    .. code-block:: python
+
+        {
+            "TaskToken": string
+        }
+
+    Returns:
+
+        .. code-block:: python
+
+            {
+                "IsCompleted": boolean
+            }
+
+    Raises:
+        400 - BadRequestError
+        500 - ChaliceViewError
+    """
+
+    try:
+        program = urllib.parse.unquote(program)
+        event = urllib.parse.unquote(event)
+        chunk_num = int(urllib.parse.unquote(chunk_num))
+        plugin_name = urllib.parse.unquote(plugin_name)
+
+        validate_path_parameters(
+            {
+                "Program": program,
+                "Event": event,
+                "ChunkNumber": chunk_num,
+                "PluginName": plugin_name,
+            }
+        )
+
+        request = json.loads(app.current_request.raw_body.decode())
+
+        validate(event=request, schema=API_SCHEMA["workflow_task_token"])
+
+        logger.info(
+            f"Registering the task token of chunk '{chunk_num}' waiting for the prior '{plugin_name}' plugin executions in program '{program}' and event '{event}'"
+        )
+
+        workflow_exec_table_name = ddb_resource.Table(WORKFLOW_EXECUTION_TABLE_NAME)
+
+        put_task_token(workflow_exec_table_name, program, event, chunk_num, plugin_name, request["TaskToken"])
+
+        # Check again after registering the token as the prior executions could have completed
+        # since the last check, in which case there is nobody left to resume this execution
+        executions = get_incomplete_executions(workflow_exec_table_name, program, event, chunk_num, plugin_name)
+        is_completed = len(executions) == 0
+
+        if is_completed:
+            send_task_success(sfn_client, request["TaskToken"], {"ChunkNumber": chunk_num})
+
+    except SchemaValidationError as e:
+        logger.info(f"ValidationError: {e.validation_message}")
+        raise BadRequestError(f"ValidationError: {str(e.validation_message)}")
+
+    except Exception as e:
+        logger.info(
+            f"Unable to register the task token of '{plugin_name}' plugin for chunk '{chunk_num}' in program '{program}' and event '{event}': {str(e)}"
+        )
+        raise ChaliceViewError(
+            f"Unable to register the task token of '{plugin_name}' plugin for chunk '{chunk_num}' in program '{program}' and event '{event}': {str(e)}"
+        )
+
+    else:
+        return {"IsCompleted": is_completed}
+
+
+def update_plugin_execution_statuses(workflow_exec_table_name, program, event, chunk_num, statuses):
+    """
+    Set the execution status of all the given plugins in one UpdateItem. The write is skipped when
+    every plugin already has the given status (for example, "Waiting" rewritten on each multi-chunk check).
+
+    :param statuses: Dictionary of plugin name to execution status
+    """
+    expression_attribute_names = {"#ttl": "ttl"}
+    expression_attribute_values = {":ttl": get_execution_ttl()}
+    assignments = []
+
+    for index, (plugin_name, status) in enumerate(statuses.items()):
+        expression_attribute_names[f"#Plugin{index}"] = plugin_name
+        expression_attribute_values[f":Status{index}"] = status
+        assignments.append(f"#Plugin{index} = :Status{index}")
+
+    try:
+        response = workflow_exec_table_name.update_item(
+            Key=get_execution_key(program, event, chunk_num),
+            UpdateExpression=f"SET {', '.join(assignments)}, #ttl = :ttl",
+            ConditionExpression=f"NOT ({' AND '.join(assignments)})",
+            ExpressionAttributeNames=expression_attribute_names,
+            ExpressionAttributeValues=expression_attribute_values,
+            ReturnValues="UPDATED_OLD",
+        )
+
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            raise
+
+        logger.info(
+            f"Skipping the status update for chunk '{chunk_num}' in program '{program}' and event '{event}' as it is unchanged"
+        )
+
+    else:
+        prior_statuses = response.get("Attributes", {})
+
+        # A plugin going back from a terminal status to an incomplete one means that the chunk is being
+        # processed again, in which case the watermark must not stay past it
+        for plugin_name, status in statuses.items():
+            prior_status = prior_statuses.get(plugin_name)
+
+            if status in INCOMPLETE_STATUSES and prior_status is not None and prior_status not in INCOMPLETE_STATUSES:
+                logger.info(
+                    f"Resetting the '{plugin_name}' plugin watermark of program '{program}' and event '{event}' as chunk '{chunk_num}' is reprocessed"
+                )
+                reset_watermark(workflow_exec_table_name, program, event, plugin_name, chunk_num)
+
+    # Completion is recorded even when the status is unchanged as the write could be a retry
+    # of a request that failed after storing the status
+    for plugin_name, status in statuses.items():
+        if status in INCOMPLETE_STATUSES:
+            continue
+
+        watermark = record_completion(workflow_exec_table_name, program, event, chunk_num, plugin_name)
+        first_chunk_num = get_first_unverified_chunk_number(watermark)
+
+        # Resume the next workflow execution if it is waiting for this plugin to complete. Only the chunk
+        # following this one can be newly unblocked unless the watermark has moved past this chunk.
+        resume_waiting_executions(
+            workflow_exec_table_name,
+            sfn_client,
+            program,
+            event,
+            plugin_name,
+            first_chunk_num,
+            max(first_chunk_num, chunk_num + 1),
+        )
+
+
+def get_incomplete_executions(workflow_exec_table_name, program, event, chunk_num, plugin_name):
+    """
+    Get the executions prior to the given chunk number in which the plugin is yet to complete.
+    """
+    watermark = get_watermark(workflow_exec_table_name, program, event, plugin_name)
+    first_chunk_num = get_first_unverified_chunk_number(watermark)
+
+    if first_chunk_num >= chunk_num:
+        return []
+
+    executions = query_executions(
+        workflow_exec_table_name,
+        program,
+        event,
+        first_chunk_num,
+        chunk_num - 1,
+        ProjectionExpression="PK, ChunkNumber, #Plugin, #ttl",
+        ExpressionAttributeNames={"#Plugin": plugin_name, "#ttl": "ttl"},
+        ConsistentRead=True,
+    )
+
+    incomplete_executions = []
+    last_complete_chunk_num = first_chunk_num - 1
+    is_contiguous = True
+
+    for execution in executions:
+        execution_chunk_num = int(execution["ChunkNumber"])
+        is_complete = plugin_name in execution and execution[plugin_name] not in INCOMPLETE_STATUSES
+        is_stale = is_stale_execution(execution)
+
+        # An incomplete execution that has not been updated for a while belongs to a failed or timed out
+        # workflow execution and would otherwise block the executions following it indefinitely. Waiting
+        # executions are excluded as their unchanged status is not rewritten on each check.
+        is_abandoned = not is_complete and execution.get(plugin_name) != "Waiting" and is_stale
+
+        if is_abandoned:
+            logger.info(
+                f"Skipping the stale '{plugin_name}' plugin execution of chunk '{execution_chunk_num}' in program '{program}' and event '{event}'"
+            )
+
+        elif not is_complete:
+            incomplete_executions.append({"PK": execution["PK"], "ChunkNumber": execution["ChunkNumber"]})
+
+        # The watermark only moves over the chunks having a recorded execution in which the plugin is
+        # complete (or abandoned). A chunk yet to be recorded (its workflow execution is yet to start) stops
+        # it as well unless an execution following it is already stale, in which case the workflow execution
+        # of the missing chunk is taken as never having started.
+        is_next = execution_chunk_num == last_complete_chunk_num + 1 or is_stale
+
+        if is_contiguous and (is_complete or is_abandoned) and is_next:
+            last_complete_chunk_num = execution_chunk_num
+        else:
+            is_contiguous = False
+
+    # Move the watermark up to the first incomplete or missing execution so that the next
+    # check skips the executions verified here
+    if last_complete_chunk_num >= first_chunk_num:
+        advance_watermark(workflow_exec_table_name, program, event, plugin_name, last_complete_chunk_num)
+
+    return incomplete_executions
+
+
 def validate_path_parameters(params: dict):
     validate(event=params, schema=API_SCHEMA["workflow_path_validation"])
@@ -0,0 +1,131 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+##############################################################################
+#
+# PURPOSE:
+# Spread the AWS Step Function workflow executions of an event over multiple
+# WorkflowExecution table partitions.
+#
+# Executions are bucketed by chunk number into shards of CHUNKS_PER_SHARD
+# chunks each, having the partition key "<program>#<event>#<shard>". This
+# keeps the partitions of a long-running (24/7) event bounded in size and
+# the recent executions, that are read and written the most, away from the
+# old ones. Every execution item carries a "ttl" attribute refreshed on each
+# write so that the shards of long-completed chunks are expired by DynamoDB.
+#
+# The shards in use by an event are recorded in the event item (having
+# ChunkNumber -1 and partition key "<program>#<event>") along with the
+# plugin completion watermarks for the cleanup process. The executions
+# recorded before the sharding are moved into their shard at deployment
+# (see the WorkflowExecutionShardBackfill custom resource).
+#
+# As the "ttl" is refreshed on each write, it also tells when an execution
+# was last updated. An execution left untouched for longer than
+# STALE_EXECUTION_SECS is considered abandoned (its workflow execution has
+# failed or timed out) when checking the prior executions of a plugin.
+#
+##############################################################################
+
+import os
+import time
+
+from boto3.dynamodb.conditions import Key
+from chalicelib.watermark import get_watermark_key
+
+# 1800 chunks is an hour of 2 second chunks
+CHUNKS_PER_SHARD = int(os.getenv("WORKFLOW_EXECUTION_CHUNKS_PER_SHARD", "1800"))
+EXECUTION_TTL_SECS = int(os.getenv("WORKFLOW_EXECUTION_TTL_HOURS", "168")) * 3600
+STALE_EXECUTION_SECS = int(os.getenv("WORKFLOW_EXECUTION_STALE_MINUTES", "30")) * 60
+
+
+def get_shard(chunk_num):
+    return chunk_num // CHUNKS_PER_SHARD
+
+
+def get_shard_pk(program, event, shard):
+    return f"{program}#{event}#{shard}"
+
+
+def get_execution_key(program, event, chunk_num):
+    return {
+        "PK": get_shard_pk(program, event, get_shard(chunk_num)),
+        "ChunkNumber": chunk_num,
+    }
+
+
+def get_execution_ttl():
+    return int(time.time()) + EXECUTION_TTL_SECS
+
+
+def is_stale_execution(execution):
+    """
+    Check if the given execution has not been updated for longer than STALE_EXECUTION_SECS.
+    Executions recorded without a "ttl" are never considered stale.
+    """
+    if "ttl" not in execution:
+        return False
+
+    last_updated = int(execution["ttl"]) - EXECUTION_TTL_SECS
+
+    return time.time() - last_updated > STALE_EXECUTION_SECS
+
+
+def register_shard(table, program, event, chunk_num):
+    """
+    Record the shard of the given chunk in the event item so that the cleanup process
+    can find all the shards of the event without a scan.
+    """
+    table.update_item(
+        Key=get_watermark_key(program, event),
+        UpdateExpression="ADD #Shards :Shard",
+        ExpressionAttributeNames={"#Shards": "Shards"},
+        ExpressionAttributeValues={":Shard": {get_shard(chunk_num)}},
+    )
+
+
+def query_executions(table, program, event, first_chunk_num, last_chunk_num=None, **kwargs):
+    """
+    Query the executions of an event from first_chunk_num to last_chunk_num (both inclusive)
+    across all the shards in between, in the order of chunk number.
+
+    Without last_chunk_num, the shards are read one after the other until a shard past the
+    first one has no executions. Being a generator, the shards are only read as far as the
+    caller iterates.
+
+    :param kwargs: Additional Query parameters (FilterExpression, ProjectionExpression, ...)
+    """
+    first_shard = get_shard(first_chunk_num)
+    last_shard = None if last_chunk_num is None else get_shard(last_chunk_num)
+    shard = first_shard
+
+    while last_shard is None or shard <= last_shard:
+        key_condition = Key("PK").eq(get_shard_pk(program, event, shard))
+        shard_first_chunk_num = max(first_chunk_num, shard * CHUNKS_PER_SHARD)
+
+        if last_shard is None:
+            key_condition &= Key("ChunkNumber").gte(shard_first_chunk_num)
+        else:
+            key_condition &= Key("ChunkNumber").between(
+                shard_first_chunk_num,
+                min(last_chunk_num, (shard + 1) * CHUNKS_PER_SHARD - 1),
+            )
+
+        query = {"KeyConditionExpression": key_condition, **kwargs}
+
+        response = table.query(**query)
+        scanned_count = response["ScannedCount"]
+
+        yield from response["Items"]
+
+        while "LastEvaluatedKey" in response:
+            query["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+            response = table.query(**query)
+            scanned_count += response["ScannedCount"]
+
+            yield from response["Items"]
+
+        if last_shard is None and scanned_count == 0 and shard > first_shard:
+            return
+
+        shard += 1
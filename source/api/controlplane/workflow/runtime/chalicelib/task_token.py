@@ -0,0 +1,122 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+##############################################################################
+#
+# PURPOSE:
+# Resume the AWS Step Function workflow executions waiting (with a task token)
+# for the prior executions of a plugin to complete, as soon as they do.
+#
+# The task token is stored in the WorkflowExecution table item of the waiting
+# chunk under the "TaskToken#<plugin name>" attribute.
+#
+##############################################################################
+
+import json
+
+from botocore.client import ClientError
+from chalicelib.shard import (get_execution_key, get_execution_ttl,
+                              query_executions)
+from chalicelib.watermark import INCOMPLETE_STATUSES
+from aws_lambda_powertools import Logger
+
+logger = Logger(service="aws-mre-controlplane-workflow-api")
+
+
+def get_task_token_attribute(plugin_name):
+    return f"TaskToken#{plugin_name}"
+
+
+def put_task_token(table, program, event, chunk_num, plugin_name, task_token):
+    table.update_item(
+        Key=get_execution_key(program, event, chunk_num),
+        UpdateExpression="SET #TaskToken = :TaskToken, #ttl = :ttl",
+        ExpressionAttributeNames={
+            "#TaskToken": get_task_token_attribute(plugin_name),
+            "#ttl": "ttl",
+        },
+        ExpressionAttributeValues={
+            ":TaskToken": task_token,
+            ":ttl": get_execution_ttl(),
+        },
+    )
+
+
+def remove_task_token(table, program, event, chunk_num, plugin_name, task_token):
+    try:
+        table.update_item(
+            Key=get_execution_key(program, event, chunk_num),
+            UpdateExpression="REMOVE #TaskToken",
+            # Keep the token if the execution has registered a new one in the meantime
+            ConditionExpression="#TaskToken = :TaskToken",
+            ExpressionAttributeNames={"#TaskToken": get_task_token_attribute(plugin_name)},
+            ExpressionAttributeValues={":TaskToken": task_token},
+        )
+
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            raise
+
+
+def send_task_success(sfn_client, task_token, output):
+    """
+    Resume a waiting execution. The execution may have already been resumed, timed out or stopped
+    which is not an error here as it re-checks the execution status of the prior chunks anyway.
+
+    Returns:
+
+        True if the execution was resumed
+    """
+    try:
+        sfn_client.send_task_success(taskToken=task_token, output=json.dumps(output))
+
+    except ClientError as e:
+        if e.response["Error"]["Code"] in ["TaskDoesNotExist", "TaskTimedOut", "InvalidToken"]:
+            logger.info(f"Skipping the task token as it is no longer valid: {e.response['Error']['Code']}")
+            return False
+
+        raise
+
+    return True
+
+
+def resume_waiting_executions(table, sfn_client, program, event, plugin_name, first_chunk_num, last_chunk_num):
+    """
+    Resume the execution waiting for the plugin that has all the prior executions complete.
+
+    All the executions before first_chunk_num (typically one past the completion watermark) are
+    known to be complete, so only the executions from it up to last_chunk_num (typically one past
+    the chunk that has just completed) are looked at. The first one among them yet to complete is
+    the only one that can be unblocked. An execution waiting beyond last_chunk_num re-checks the
+    prior executions when its wait times out.
+    """
+    task_token_attribute = get_task_token_attribute(plugin_name)
+
+    executions = query_executions(
+        table,
+        program,
+        event,
+        first_chunk_num,
+        last_chunk_num,
+        ProjectionExpression="#ChunkNumber, #Plugin, #TaskToken",
+        ExpressionAttributeNames={
+            "#ChunkNumber": "ChunkNumber",
+            "#Plugin": plugin_name,
+            "#TaskToken": task_token_attribute,
+        },
+        ConsistentRead=True,
+    )
+
+    for item in executions:
+        chunk_num = int(item["ChunkNumber"])
+
+        if task_token_attribute in item:
+            logger.info(
+                f"Resuming the workflow execution of chunk '{chunk_num}' waiting for the prior '{plugin_name}' plugin executions in program '{program}' and event '{event}'"
+            )
+
+            send_task_success(sfn_client, item[task_token_attribute], {"ChunkNumber": chunk_num})
+            remove_task_token(table, program, event, chunk_num, plugin_name, item[task_token_attribute])
+
+        if plugin_name not in item or item[plugin_name] in INCOMPLETE_STATUSES:
+            return
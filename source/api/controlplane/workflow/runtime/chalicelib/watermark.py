@@ -0,0 +1,246 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+##############################################################################
+#
+# PURPOSE:
+# Track the contiguous completion of a plugin across the AWS Step Function
+# workflow executions of an event.
+#
+# The watermark of a plugin is the chunk number up to which every recorded
+# workflow execution has the plugin in a terminal status (Complete, Error).
+# Chunks completing out of order are held in a small "pending" set until the
+# watermark catches up with them. The set is capped at MAX_PENDING_CHUNKS;
+# chunks beyond it are verified from the execution items instead when the
+# prior executions are next checked.
+#
+# The watermark is established (at INITIAL_WATERMARK) by the first completion
+# of the plugin as HLS segment (chunk) numbers start at 1. When a chunk at or
+# below the watermark is processed again, the watermark is moved back to the
+# chunk preceding it.
+#
+# The watermarks of all the plugins of an event are stored as top-level
+# attributes of a single item in the WorkflowExecution table (having
+# ChunkNumber -1) so that they are deleted along with the event.
+#
+##############################################################################
+
+from botocore.client import ClientError
+
+WATERMARK_CHUNK_NUMBER = -1
+INITIAL_WATERMARK = 0
+MAX_PENDING_CHUNKS = 100
+INCOMPLETE_STATUSES = ["Waiting", "In Progress"]
+
+
+def get_watermark_key(program, event):
+    return {"PK": f"{program}#{event}", "ChunkNumber": WATERMARK_CHUNK_NUMBER}
+
+
+def get_watermark_attribute_names(plugin_name):
+    return {
+        "#Watermark": f"Watermark#{plugin_name}",
+        "#Pending": f"Pending#{plugin_name}",
+    }
+
+
+def is_conditional_check_failed(error):
+    return error.response["Error"]["Code"] == "ConditionalCheckFailedException"
+
+
+def get_first_unverified_chunk_number(watermark):
+    return (INITIAL_WATERMARK if watermark is None else watermark) + 1
+
+
+def parse_watermark(attributes, plugin_name):
+    attribute_names = get_watermark_attribute_names(plugin_name)
+    watermark = attributes.get(attribute_names["#Watermark"])
+    pending = attributes.get(attribute_names["#Pending"], set())
+
+    return (
+        int(watermark) if watermark is not None else None,
+        {int(chunk_num) for chunk_num in pending},
+    )
+
+
+def get_watermark(table, program, event, plugin_name):
+    """
+    Get the chunk number up to which all the recorded executions of the plugin are complete.
+
+    Returns:
+
+        Watermark chunk number or None if it is yet to be established
+    """
+    response = table.get_item(
+        Key=get_watermark_key(program, event),
+        ProjectionExpression="#Watermark",
+        ExpressionAttributeNames={"#Watermark": f"Watermark#{plugin_name}"},
+        ConsistentRead=True,
+    )
+
+    watermark, _ = parse_watermark(response.get("Item", {}), plugin_name)
+
+    return watermark
+
+
+def drain_pending(table, program, event, plugin_name, attributes):
+    """
+    Move the watermark over the pending chunks that have become contiguous with it
+    and drop the pending chunks already covered by it.
+
+    Returns:
+
+        Watermark chunk number after draining or None if it is yet to be established
+    """
+    watermark, pending = parse_watermark(attributes, plugin_name)
+
+    while watermark is not None:
+        completed = {chunk_num for chunk_num in pending if chunk_num <= watermark + 1}
+
+        if not completed:
+            break
+
+        new_watermark = watermark + 1 if watermark + 1 in completed else watermark
+
+        try:
+            response = table.update_item(
+                Key=get_watermark_key(program, event),
+                UpdateExpression="SET #Watermark = :NewWatermark DELETE #Pending :Completed",
+                ConditionExpression="#Watermark = :Watermark",
+                ExpressionAttributeNames=get_watermark_attribute_names(plugin_name),
+                ExpressionAttributeValues={
+                    ":NewWatermark": new_watermark,
+                    ":Watermark": watermark,
+                    ":Completed": completed,
+                },
+                ReturnValues="ALL_NEW",
+            )
+
+        except ClientError as e:
+            # The watermark was moved concurrently and will be drained by that update
+            if is_conditional_check_failed(e):
+                break
+
+            raise
+
+        watermark, pending = parse_watermark(response["Attributes"], plugin_name)
+
+    return watermark
+
+
+def record_completion(table, program, event, chunk_num, plugin_name):
+    """
+    Record that the plugin has reached a terminal status in the execution of the given chunk.
+
+    Returns:
+
+        Watermark chunk number after recording
+    """
+    attribute_names = get_watermark_attribute_names(plugin_name)
+
+    try:
+        # Advance the watermark when this is the next chunk in sequence
+        response = table.update_item(
+            Key=get_watermark_key(program, event),
+            UpdateExpression="SET #Watermark = :ChunkNumber",
+            ConditionExpression="#Watermark = :PrevChunkNumber",
+            ExpressionAttributeNames={"#Watermark": attribute_names["#Watermark"]},
+            ExpressionAttributeValues={
+                ":ChunkNumber": chunk_num,
+                ":PrevChunkNumber": chunk_num - 1,
+            },
+            ReturnValues="ALL_NEW",
+        )
+
+    except ClientError as e:
+        if not is_conditional_check_failed(e):
+            raise
+
+        # Completed out of order (or the watermark is yet to be established, in which case it is
+        # established here so that the pending chunks are drained from the first chunk onwards)
+        try:
+            response = table.update_item(
+                Key=get_watermark_key(program, event),
+                UpdateExpression="SET #Watermark = if_not_exists(#Watermark, :InitialWatermark) ADD #Pending :ChunkNumbers",
+                ConditionExpression="attribute_not_exists(#Pending) OR size(#Pending) < :MaxPendingChunks",
+                ExpressionAttributeNames=attribute_names,
+                ExpressionAttributeValues={
+                    ":InitialWatermark": INITIAL_WATERMARK,
+                    ":ChunkNumbers": {chunk_num},
+                    ":MaxPendingChunks": MAX_PENDING_CHUNKS,
+                },
+                ReturnValues="ALL_NEW",
+            )
+
+        except ClientError as e:
+            if not is_conditional_check_failed(e):
+                raise
+
+            # The pending set is full. The completion of this chunk is picked up from its execution
+            # item when the prior executions are next checked (see get_incomplete_executions).
+            response = table.update_item(
+                Key=get_watermark_key(program, event),
+                UpdateExpression="SET #Watermark = if_not_exists(#Watermark, :InitialWatermark)",
+                ExpressionAttributeNames={"#Watermark": attribute_names["#Watermark"]},
+                ExpressionAttributeValues={":InitialWatermark": INITIAL_WATERMARK},
+                ReturnValues="ALL_NEW",
+            )
+
+    return drain_pending(table, program, event, plugin_name, response["Attributes"])
+
+
+def advance_watermark(table, program, event, plugin_name, chunk_num):
+    """
+    Move the watermark forward to the given chunk number. The caller must have verified that
+    every chunk up to it has a recorded execution in which the plugin is complete.
+    """
+    try:
+        response = table.update_item(
+            Key=get_watermark_key(program, event),
+            UpdateExpression="SET #Watermark = :ChunkNumber",
+            ConditionExpression="attribute_not_exists(#Watermark) OR #Watermark < :ChunkNumber",
+            ExpressionAttributeNames={"#Watermark": f"Watermark#{plugin_name}"},
+            ExpressionAttributeValues={":ChunkNumber": chunk_num},
+            ReturnValues="ALL_NEW",
+        )
+
+    except ClientError as e:
+        if is_conditional_check_failed(e):
+            return
+
+        raise
+
+    drain_pending(table, program, event, plugin_name, response["Attributes"])
+
+
+def reset_watermark(table, program, event, plugin_name, chunk_num):
+    """
+    Move the watermark back to the chunk preceding the given one when the plugin is executed again
+    for a chunk it has already completed (for example, when the event is reprocessed).
+    """
+    attribute_names = get_watermark_attribute_names(plugin_name)
+
+    try:
+        table.update_item(
+            Key=get_watermark_key(program, event),
+            UpdateExpression="SET #Watermark = :PrevChunkNumber DELETE #Pending :ChunkNumbers",
+            ConditionExpression="#Watermark >= :ChunkNumber",
+            ExpressionAttributeNames=attribute_names,
+            ExpressionAttributeValues={
+                ":PrevChunkNumber": chunk_num - 1,
+                ":ChunkNumber": chunk_num,
+                ":ChunkNumbers": {chunk_num},
+            },
+        )
+
+    except ClientError as e:
+        if not is_conditional_check_failed(e):
+            raise
+
+        # The watermark is yet to reach the chunk but its completion may still be pending
+        table.update_item(
+            Key=get_watermark_key(program, event),
+            UpdateExpression="DELETE #Pending :ChunkNumbers",
+            ExpressionAttributeNames={"#Pending": attribute_names["#Pending"]},
+            ExpressionAttributeValues={":ChunkNumbers": {chunk_num}},
+        )
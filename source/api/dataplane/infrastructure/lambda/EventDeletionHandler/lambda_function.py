@@ -20,6 +20,9 @@ WORKFLOW_EXECUTION_TABLE_NAME = os.environ["WORKFLOW_EXECUTION_TABLE_ARN"].split
 REPLAY_REQUEST_TABLE_NAME = os.environ["REPLAY_REQUEST_TABLE_NAME"]
 REPLAY_RESULT_TABLE_NAME = os.environ["REPLAY_RESULT_TABLE_NAME"]
 REPLAY_RESULT_PROGRAM_EVENT_INDEX = os.environ["REPLAY_RESULT_PROGRAM_EVENT_INDEX"]
+SEGMENT_SUMMARY_TABLE_NAME = os.environ["SEGMENT_SUMMARY_TABLE_NAME"]
+SEGMENT_SUMMARY_PROGRAM_EVENT_INDEX = os.environ["SEGMENT_SUMMARY_PROGRAM_EVENT_INDEX"]
+EVENT_PROGRESS_TABLE_NAME = os.environ["EVENT_PROGRESS_TABLE_NAME"]
 SEGMENT_CACHE_BUCKET = os.environ["SEGMENT_CACHE_BUCKET"]
 
 BACKOFF_TIME_SECS = 0.2
@@ -81,10 +84,13 @@ def batch_delete(items, retry_count=0):
             time.sleep((2 ** retry_count) * BACKOFF_TIME_SECS)
             return batch_delete(response["UnprocessedItems"], retry_count + 1)
 
-def delete_ddb_items(event, program, table_name, keys, index_name=None, retry_count=0):
+def delete_ddb_items(event, program, table_name, keys, index_name=None, retry_count=0, partition_key=None):
     try:
         ddb_table = ddb_resource.Table(table_name)
 
+        if not partition_key:
+            partition_key = f"{program}#{event}"
+
         # Query and delete items in the table
         if index_name:
             if "ReplayResults" in table_name: # Applies only to the ReplayResults table
@@ -97,7 +103,7 @@ def delete_ddb_items(event, program, table_name, keys, index_name=None, retry_co
                     }
                 )
 
-            else: # Applies only to the PluginResult and Frame tables
+            else: # Applies only to the PluginResult, SegmentSummary and Frame tables
                 response = ddb_table.query(
                     IndexName=index_name,
                     KeyConditionExpression=Key("ProgramEvent").eq(f"{program}#{event}"),
@@ -110,7 +116,7 @@ def delete_ddb_items(event, program, table_name, keys, index_name=None, retry_co
 
         else:
             response = ddb_table.query(
-                KeyConditionExpression=Key(keys[0]).eq(f"{program}#{event}"),
+                KeyConditionExpression=Key(keys[0]).eq(partition_key),
                 ProjectionExpression=f"#{keys[0]}, #{keys[1]}",
                 ExpressionAttributeNames={
                     f"#{keys[0]}": keys[0],
@@ -156,7 +162,7 @@ def delete_ddb_items(event, program, table_name, keys, index_name=None, retry_co
             else:
                 response = ddb_table.query(
                     ExclusiveStartKey=response["LastEvaluatedKey"],
-                    KeyConditionExpression=Key(keys[0]).eq(f"{program}#{event}"),
+                    KeyConditionExpression=Key(keys[0]).eq(partition_key),
                     ProjectionExpression=f"#{keys[0]}, #{keys[1]}",
                     ExpressionAttributeNames={
                         f"#{keys[0]}": keys[0],
@@ -182,7 +188,7 @@ def delete_ddb_items(event, program, table_name, keys, index_name=None, retry_co
             raise Exception("Exceeded the maximum number of allowed retries when retrying the Query operation")
 
         time.sleep((2 ** retry_count) * BACKOFF_TIME_SECS)
-        return delete_ddb_items(event, program, table_name, keys, index_name, retry_count + 1)
+        return delete_ddb_items(event, program, table_name, keys, index_name, retry_count + 1, partition_key)
 
     except Exception:
         print(f"Encountered an unknown exception when querying and deleting the items from '{table_name}' for Event '{event}' and Program '{program}'")
@@ -191,6 +197,23 @@ def delete_ddb_items(event, program, table_name, keys, index_name=None, retry_co
     else:
         print(f"Successfully deleted all the items in '{table_name}' table for Event '{event}' and Program '{program}'")
 
+def delete_workflow_execution_items(event, program):
+    # Workflow executions are sharded by chunk number with the shards recorded in the event item
+    response = ddb_resource.Table(WORKFLOW_EXECUTION_TABLE_NAME).get_item(
+        Key={"PK": f"{program}#{event}", "ChunkNumber": -1},
+        ProjectionExpression="Shards",
+        ConsistentRead=True
+    )
+
+    shards = sorted(int(shard) for shard in response.get("Item", {}).get("Shards", set()))
+
+    for shard in shards:
+        print(f"Deleting the workflow executions in shard '{shard}'")
+        delete_ddb_items(event, program, WORKFLOW_EXECUTION_TABLE_NAME, ["PK", "ChunkNumber"], retry_count=0, partition_key=f"{program}#{event}#{shard}")
+
+    # Finally delete the event item (watermarks and shards)
+    delete_ddb_items(event, program, WORKFLOW_EXECUTION_TABLE_NAME, ["PK", "ChunkNumber"], retry_count=0)
+
 def batch_delete_objects(obj_collection, retry_count=0):
     try:
         response = obj_collection.delete()
@@ -266,6 +289,12 @@ def lambda_handler(event, context):
             print(f"Deleting all the items in '{PLUGIN_RESULT_TABLE_NAME}' table for Event '{p_event}' and Program '{program}'")
             delete_ddb_items(p_event, program, PLUGIN_RESULT_TABLE_NAME, ["PK", "Start"], index_name=PLUGIN_RESULT_PROGRAM_EVENT_INDEX, retry_count=0)
 
+            print(f"Deleting all the items in '{SEGMENT_SUMMARY_TABLE_NAME}' table for Event '{p_event}' and Program '{program}'")
+            delete_ddb_items(p_event, program, SEGMENT_SUMMARY_TABLE_NAME, ["PK", "Start"], index_name=SEGMENT_SUMMARY_PROGRAM_EVENT_INDEX, retry_count=0)
+
+            print(f"Deleting the progress item in '{EVENT_PROGRESS_TABLE_NAME}' table for Event '{p_event}' and Program '{program}'")
+            ddb_resource.Table(EVENT_PROGRESS_TABLE_NAME).delete_item(Key={"PK": f"{program}#{p_event}"})
+
             print(f"Deleting all the items in '{FRAME_TABLE_NAME}' table for Event '{p_event}' and Program '{program}'")
             delete_ddb_items(p_event, program, FRAME_TABLE_NAME, ["Id", "FrameNumber"], index_name=FRAME_PROGRAM_EVENT_INDEX, retry_count=0)
 
@@ -273,7 +302,7 @@ def lambda_handler(event, context):
             delete_ddb_items(p_event, program, CHUNK_TABLE_NAME, ["PK", "Start"], retry_count=0)
 
             print(f"Deleting all the items in '{WORKFLOW_EXECUTION_TABLE_NAME}' table for Event '{p_event}' and Program '{program}'")
-            delete_ddb_items(p_event, program, WORKFLOW_EXECUTION_TABLE_NAME, ["PK", "ChunkNumber"], retry_count=0)
+            delete_workflow_execution_items(p_event, program)
 
             print(f"Deleting all the items in '{REPLAY_REQUEST_TABLE_NAME}' table for Event '{p_event}' and Program '{program}'")
             delete_ddb_items(p_event, program, REPLAY_REQUEST_TABLE_NAME, ["PK", "ReplayId"], retry_count=0)
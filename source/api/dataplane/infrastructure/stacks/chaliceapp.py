@@ -39,6 +39,7 @@ CLIP_PREVIEW_FEEDBACK_PROGRAM_EVENT_CLASSIFIER_START_INDEX = (
 PROGRAM_EVENT_LABEL_INDEX = "ProgramEvent_Label-index"
 NON_OPT_SEG_INDEX = "NonOptoSegments-index"
 REPLAY_RESULT_PROGRAM_EVENT_INDEX = "Program_Event-index"
+SEGMENT_SUMMARY_PROGRAM_EVENT_INDEX = "ProgramEvent-index"
 AOSS_KNN_INDEX_NAME = "mre-knn-index"
 AOSS_EVENT_INDEX_NAME = "mre-event-summary-index"
 AOSS_PROGRAM_INDEX_NAME = "mre-program-summary-index"
@@ -46,7 +47,7 @@ AOSS_PROGRAM_INDEX_NAME = "mre-program-summary-index"
 # Ask Python interpreter to search for modules in the topmost folder. This is required to access the shared.infrastructure.helpers module
 sys.path.append("../../../")
 
-from shared.infrastructure.helpers import common, api_logging_construct
+from shared.infrastructure.helpers import common, api_logging_construct, constants
 from shared.infrastructure.helpers.genai import is_generative_ai_enabled
 
 RUNTIME_SOURCE_DIR = os.path.join(
@@ -355,6 +356,38 @@ class ChaliceApp(Stack):
             ),
         )
 
+        # SegmentSummary Table
+        self.segment_summary_table = ddb.Table(
+            self,
+            "SegmentSummary",
+            partition_key=ddb.Attribute(name="PK", type=ddb.AttributeType.STRING),
+            sort_key=ddb.Attribute(name="Start", type=ddb.AttributeType.NUMBER),
+            billing_mode=ddb.BillingMode.PAY_PER_REQUEST,
+            removal_policy=RemovalPolicy.DESTROY,
+            encryption=ddb.TableEncryption.AWS_MANAGED,  # Enables server-side encryption with AWS managed key
+            point_in_time_recovery=True  # Enables point-in-time recovery
+        )
+
+        # SegmentSummary Table: ProgramEvent GSI
+        self.segment_summary_table.add_global_secondary_index(
+            index_name=SEGMENT_SUMMARY_PROGRAM_EVENT_INDEX,
+            partition_key=ddb.Attribute(
+                name="ProgramEvent", type=ddb.AttributeType.STRING
+            ),
+            projection_type=ddb.ProjectionType.KEYS_ONLY,
+        )
+
+        # EventProgress Table
+        self.event_progress_table = ddb.Table(
+            self,
+            "EventProgress",
+            partition_key=ddb.Attribute(name="PK", type=ddb.AttributeType.STRING),
+            billing_mode=ddb.BillingMode.PAY_PER_REQUEST,
+            removal_policy=RemovalPolicy.DESTROY,
+            encryption=ddb.TableEncryption.AWS_MANAGED,  # Enables server-side encryption with AWS managed key
+            point_in_time_recovery=True  # Enables point-in-time recovery
+        )
+
         # ReplayResults Table
         self.replay_results_table = ddb.Table(
             self,
@@ -399,6 +432,41 @@ class ChaliceApp(Stack):
         # Get the ReplayRequest table name from CfnOutput
         self.replay_request_table_name = Fn.import_value("mre-replayrequest-table-name")
 
+        # GSI Custom Resource Handler Lambda IAM Roles: ReplayRequest table permissions
+        self.gsi_handler_lambda_role.add_to_policy(
+            iam.PolicyStatement(
+                effect=iam.Effect.ALLOW,
+                actions=["dynamodb:DescribeTable", "dynamodb:UpdateTable"],
+                resources=[self.replay_request_table_arn],
+            )
+        )
+
+        self.gsi_is_complete_handler_lambda_role.add_to_policy(
+            iam.PolicyStatement(
+                effect=iam.Effect.ALLOW,
+                actions=["dynamodb:DescribeTable"],
+                resources=[self.replay_request_table_arn],
+            )
+        )
+
+        # ReplayRequest Table: Sparse GSI holding only the active (Queued/In Progress) Catchup replay requests.
+        # Created via Custom Resource (instead of the Replay stack) as CloudFormation can create only one GSI
+        # per table update and the Replay stack adds the Pagination GSI in the same release.
+        self.replay_request_catchup_gsi_cr = CustomResource(
+            self,
+            "ReplayRequest_Catchup_GSI_CR",
+            service_token=self.gsi_cr_provider.service_token,
+            removal_policy=RemovalPolicy.DESTROY,
+            properties={
+                "table_name": self.replay_request_table_name,
+                "index_name": constants.REPLAY_REQUEST_CATCHUP_INDEX,
+                "partition_key": {"Name": "CatchupPartition", "Type": "S"},
+                "sort_key": {"Name": "ReplayId", "Type": "S"},
+            },
+        )
+
+        self.replay_request_catchup_gsi_cr.node.add_dependency(self.pk_chunknumber_gsi_cr)
+
         # Chalice IAM Role
         self.chalice_role = iam.Role(
             self,
@@ -434,6 +502,9 @@ class ChaliceApp(Stack):
                     f"{self.plugin_result_table.table_arn}/index/*",
                     self.clip_preview_feedback_table.table_arn,
                     f"{self.clip_preview_feedback_table.table_arn}/index/*",
+                    self.segment_summary_table.table_arn,
+                    f"{self.segment_summary_table.table_arn}/index/*",
+                    self.event_progress_table.table_arn,
                     self.job_tracking_table.table_arn,
                     f"{self.job_tracking_table.table_arn}/index/*",
                 ],
@@ -527,6 +598,9 @@ class ChaliceApp(Stack):
                     self.replay_request_table_arn,
                     self.replay_results_table.table_arn,
                     f"{self.replay_results_table.table_arn}/index/*",
+                    self.segment_summary_table.table_arn,
+                    f"{self.segment_summary_table.table_arn}/index/*",
+                    self.event_progress_table.table_arn,
                 ],
             )
         )
@@ -578,6 +652,9 @@ class ChaliceApp(Stack):
                 "REPLAY_REQUEST_TABLE_NAME": self.replay_request_table_name,
                 "REPLAY_RESULT_TABLE_NAME": self.replay_results_table.table_name,
                 "REPLAY_RESULT_PROGRAM_EVENT_INDEX": REPLAY_RESULT_PROGRAM_EVENT_INDEX,
+                "SEGMENT_SUMMARY_TABLE_NAME": self.segment_summary_table.table_name,
+                "SEGMENT_SUMMARY_PROGRAM_EVENT_INDEX": SEGMENT_SUMMARY_PROGRAM_EVENT_INDEX,
+                "EVENT_PROGRESS_TABLE_NAME": self.event_progress_table.table_name,
             },
         )
 
@@ -910,6 +987,8 @@ class ChaliceApp(Stack):
                 "CHUNK_STARTPTS_INDEX": CHUNK_STARTPTS_INDEX,
                 "PLUGIN_RESULT_TABLE_NAME": self.plugin_result_table.table_name,
                 "CLIP_PREVIEW_FEEDBACK_TABLE_NAME": self.clip_preview_feedback_table.table_name,
+                "SEGMENT_SUMMARY_TABLE_NAME": self.segment_summary_table.table_name,
+                "EVENT_PROGRESS_TABLE_NAME": self.event_progress_table.table_name,
                 "EB_EVENT_BUS_NAME": self.eb_event_bus_name,
                 "REPLAY_RESULT_TABLE_NAME": self.replay_results_table.table_name,
                 "PROGRAM_EVENT_INDEX": PROGRAM_EVENT_INDEX,
@@ -922,6 +1001,7 @@ class ChaliceApp(Stack):
                 "NON_OPTO_SEGMENTS_INDEX": NON_OPT_SEG_INDEX,
                 "PARTITION_KEY_CHUNK_NUMBER_INDEX": PARTITION_KEY_CHUNK_NUMBER_INDEX,
                 "MAX_DETECTOR_QUERY_WINDOW_SECS": "60",
+                "PLUGIN_RESULT_UPDATE_MAX_WORKERS": "10",
                 "AOSS_KNN_INDEX_NAME": AOSS_KNN_INDEX_NAME,
                 "AOSS_EVENT_INDEX_NAME": AOSS_EVENT_INDEX_NAME,
                 "AOSS_PROGRAM_INDEX_NAME": AOSS_PROGRAM_INDEX_NAME,
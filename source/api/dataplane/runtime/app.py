@@ -16,10 +16,13 @@ from chalicelib.replay import replay_api
 from chalicelib.segment import segment_api
 from chalicelib.workflow import workflow_api
 from chalicelib.chunk import chunk_api
+from chalicelib.progress import progress_api
+from chalicelib.encoding import GZIP_CONTENT_TYPE
 from aws_lambda_powertools import Logger
 
 logger = Logger(service="aws-mre-dataplane-api")
 app = Chalice(app_name='aws-mre-dataplane-api')
+app.api.binary_types.append(GZIP_CONTENT_TYPE)
 
 # Create middleware to inject request context
 @app.middleware('all')
@@ -40,6 +43,7 @@ app.register_blueprint(replay_api)
 app.register_blueprint(segment_api)
 app.register_blueprint(workflow_api)
 app.register_blueprint(chunk_api)
+app.register_blueprint(progress_api)
 
 API_VERSION = '1.0.0'
 authorizer = IAMAuthorizer()
@@ -28,4 +28,4 @@ def replace_decimals(obj):
         return int(obj) if obj % 1 == 0 else float(obj)
     else:
         return obj
-        
\ No newline at end of file
+
@@ -7,8 +7,8 @@ import urllib.parse
 import boto3
 from boto3.dynamodb.conditions import Key
 from chalice import ChaliceViewError, NotFoundError
-from chalicelib import replace_decimals
 from aws_lambda_powertools import Logger
+from chalicelib.segment_summary import get_opto_lengths, get_segment_summaries
 
 # get the AWS_REGION env var, but fall back to getting the REGION env var if not set
 aws_region = os.environ.get("AWS_REGION", os.environ.get("REGION", "us-east-1"))
@@ -124,6 +124,42 @@ def populate_segment_data_matching(segment_response_data, tracknumber):
 
     return result
 
+def populate_segment_data_from_summary(summary, tracknumber):
+    """
+    Build the Segment Metadata of the given track from the pre-computed segment summary.
+    Only the signed URLs, being short-lived, are generated per request.
+    """
+    tracknumber = str(tracknumber)
+
+    optoClipLocation = summary.get("OptimizedClipLocation", {}).get(tracknumber)
+    origClipLocation = summary.get("OriginalClipLocation", {}).get(tracknumber)
+    origThumbnailLocation = summary.get("OriginalThumbnailLocation")
+    optoThumbnailLocation = summary.get("OptimizedThumbnailLocation")
+
+    label = ""
+    if "Label" in summary:
+        label = summary["Label"]
+        if str(label) == "":
+            label = "<no label plugin configured>"
+
+    optoLengths = get_opto_lengths(summary.get("OptoStart", {}), summary.get("OptoEnd", {}))
+
+    return {
+        "OriginalClipLocation": create_signed_url(origClipLocation) if origClipLocation else "",
+        "OriginalThumbnailLocation": create_signed_url(origThumbnailLocation) if origThumbnailLocation else "",
+        "OptimizedClipLocation": create_signed_url(optoClipLocation) if optoClipLocation else "",
+        "OptimizedThumbnailLocation": create_signed_url(optoThumbnailLocation) if optoThumbnailLocation else "",
+        "StartTime": summary["Start"],
+        "Label": label,
+        "FeatureCount": "TBD",
+        "OrigLength": summary.get("OrigLength", 0),
+        "OptoLength": optoLengths.get(tracknumber, 0),
+        "OptimizedDurationPerTrack": [{track: length} for track, length in optoLengths.items()],
+        "OptoStartCode": summary.get("OptoStartCode", ""),
+        "OptoEndCode": summary.get("OptoEndCode", ""),
+        "Feedback": summary.get("Feedback", {}).get(tracknumber, {}),
+    }
+
 def get_latest_version(bucket, key):
     try:
         response = s3_client.list_object_versions(
@@ -188,7 +224,15 @@ def get_event_segment_metadata(name, program, classifier, tracknumber):
     classifier = urllib.parse.unquote(classifier)
     tracknumber = urllib.parse.unquote(tracknumber)
     try:
-        # Get Event Segment Details
+        # Get Event Segment Details from the SegmentSummary Table
+        summaries = get_segment_summaries(f"{program}#{name}#{classifier}")
+
+        if summaries is not None:
+            return {
+                "Segments": [populate_segment_data_from_summary(summary, tracknumber) for summary in summaries]
+            }
+
+        # Segments stored before the SegmentSummary Table was introduced
         # From the PluginResult Table, get the Clips Info
         plugin_table = ddb_resource.Table(PLUGIN_RESULT_TABLE_NAME)
         response = plugin_table.query(
@@ -309,4 +353,4 @@ def get_event_segment_metadata(name, program, classifier, tracknumber):
         )
 
     else:
-        return replace_decimals(final_response)
+        return final_response
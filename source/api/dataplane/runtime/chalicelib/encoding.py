@@ -0,0 +1,84 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+##############################################################################
+#
+# PURPOSE:
+# Shared response encoding for the Data plane APIs. DynamoDB Decimals are
+# converted while serializing instead of rebuilding the whole response
+# (as done by replace_decimals) before handing it over to Chalice.
+#
+##############################################################################
+
+import json
+import zlib
+from decimal import Decimal
+
+from chalice import Response
+
+JSON_CONTENT_TYPE = "application/json"
+GZIP_CONTENT_TYPE = "application/gzip"
+
+# wbits value that makes zlib produce a gzip container
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+class DecimalEncoder(json.JSONEncoder):
+    """
+    JSON encoder that serializes a DynamoDB Decimal as an int when it has no fractional part and as a float otherwise.
+    """
+
+    def default(self, obj):
+        if isinstance(obj, Decimal):
+            return int(obj) if obj % 1 == 0 else float(obj)
+
+        return super().default(obj)
+
+
+def dumps(obj):
+    return json.dumps(obj, cls=DecimalEncoder)
+
+
+def json_response(obj, status_code=200):
+    return Response(
+        body=dumps(obj),
+        headers={"Content-Type": JSON_CONTENT_TYPE},
+        status_code=status_code
+    )
+
+
+def is_gzip_accepted(request):
+    return GZIP_CONTENT_TYPE in (request.headers.get("accept") or "")
+
+
+def gzip_json_response(obj, status_code=200):
+    """
+    Serialize and gzip the given object incrementally so that the uncompressed JSON document
+    of a large response is never held in memory as a whole.
+    """
+    compressor = zlib.compressobj(wbits=GZIP_WBITS)
+    chunks = []
+
+    for chunk in DecimalEncoder().iterencode(obj):
+        compressed = compressor.compress(chunk.encode("utf-8"))
+
+        if compressed:
+            chunks.append(compressed)
+
+    chunks.append(compressor.flush())
+
+    return Response(
+        body=b"".join(chunks),
+        headers={"Content-Type": GZIP_CONTENT_TYPE},
+        status_code=status_code
+    )
+
+
+def encoded_response(request, obj):
+    """
+    Encode the given object as gzip-compressed JSON if accepted by the client and as plain JSON otherwise.
+    """
+    if is_gzip_accepted(request):
+        return gzip_json_response(obj)
+
+    return json_response(obj)
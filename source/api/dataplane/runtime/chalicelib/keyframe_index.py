@@ -0,0 +1,150 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+##############################################################################
+#
+# PURPOSE:
+# Pack all the key frames of an HLS Segment (Chunk) into a single compact
+# binary attribute and look up the timecode of a frame from it in memory.
+#
+# Binary layout (zlib compressed):
+#   - Header: version (uint8), key frame count (uint32)
+#   - FrameNumber, FramePtsTime, FrameTime: delta-encoded int64 arrays
+#   - DurationTime: int64 array
+# All the times are stored as fixed-point integers in microseconds.
+#
+##############################################################################
+
+import struct
+import sys
+import zlib
+from array import array
+from bisect import bisect_right
+
+KEY_FRAME_INDEX_VERSION = 1
+HEADER_FORMAT = "<BI"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+TIME_SCALE = 1000000
+INT64_SIZE = 8
+# Arrays are always stored little-endian
+IS_BYTESWAP_REQUIRED = sys.byteorder != "little"
+
+
+def to_fixed_point(value):
+    return int(round(float(value) * TIME_SCALE))
+
+
+def from_fixed_point(value):
+    return value / TIME_SCALE
+
+
+def delta_encode(values):
+    return [value - prev for prev, value in zip([0] + values[:-1], values)]
+
+
+def delta_decode(deltas):
+    values = []
+    total = 0
+
+    for delta in deltas:
+        total += delta
+        values.append(total)
+
+    return values
+
+
+def pack_key_frames(frames):
+    """
+    Pack the given key frames (as stored by the '/metadata/frame' API) into a compact binary representation.
+
+    Returns:
+
+        Compressed bytes holding the FrameNumber, FramePtsTime, FrameTime and DurationTime of every key frame
+    """
+    frames = sorted(frames, key=lambda frame: int(frame["FrameNumber"]))
+
+    columns = (
+        delta_encode([int(frame["FrameNumber"]) for frame in frames]),
+        delta_encode([to_fixed_point(frame["FramePtsTime"]) for frame in frames]),
+        delta_encode([to_fixed_point(frame["FrameTime"]) for frame in frames]),
+        [to_fixed_point(frame["DurationTime"]) for frame in frames]
+    )
+
+    payload = struct.pack(HEADER_FORMAT, KEY_FRAME_INDEX_VERSION, len(frames))
+
+    for column in columns:
+        values = array("q", column)
+
+        if IS_BYTESWAP_REQUIRED:
+            values.byteswap()
+
+        payload += values.tobytes()
+
+    return zlib.compress(payload)
+
+
+def unpack_key_frames(data):
+    """
+    Unpack the binary representation created by pack_key_frames.
+
+    Returns:
+
+        Dictionary of parallel lists sorted by FrameNumber
+
+        .. code-block:: python
+
+            {
+                "FrameNumber": list,
+                "FramePtsTime": list,
+                "FrameTime": list,
+                "DurationTime": list
+            }
+    """
+    payload = zlib.decompress(bytes(data))
+
+    version, count = struct.unpack_from(HEADER_FORMAT, payload)
+
+    if version != KEY_FRAME_INDEX_VERSION:
+        raise ValueError(f"Unsupported key frame index version '{version}'")
+
+    columns = []
+    offset = HEADER_SIZE
+
+    for _ in range(4):
+        values = array("q")
+        values.frombytes(payload[offset:offset + (count * INT64_SIZE)])
+
+        if IS_BYTESWAP_REQUIRED:
+            values.byteswap()
+
+        columns.append(values.tolist())
+        offset += count * INT64_SIZE
+
+    return {
+        "FrameNumber": delta_decode(columns[0]),
+        "FramePtsTime": [from_fixed_point(value) for value in delta_decode(columns[1])],
+        "FrameTime": [from_fixed_point(value) for value in delta_decode(columns[2])],
+        "DurationTime": [from_fixed_point(value) for value in columns[3]]
+    }
+
+
+def find_key_frame(index, frame_number):
+    """
+    Find the key frame at or immediately before the given frame number.
+
+    Returns:
+
+        Dictionary containing FrameNumber, FramePtsTime, FrameTime and DurationTime of the key frame or None if not found
+    """
+    position = bisect_right(index["FrameNumber"], frame_number) - 1
+
+    if position < 0:
+        return None
+
+    return {
+        "FrameNumber": index["FrameNumber"][position],
+        "FramePtsTime": index["FramePtsTime"][position],
+        "FrameTime": index["FrameTime"][position],
+        "DurationTime": index["DurationTime"][position]
+    }
+
@@ -13,6 +13,7 @@ from botocore.client import ClientError
 from boto3.dynamodb.conditions import Key, Attr
 from jsonschema import validate
 from chalicelib import load_api_schema, replace_decimals
+from chalicelib.keyframe_index import find_key_frame, pack_key_frames, unpack_key_frames
 from aws_lambda_powertools import Logger
 
 metadata_api = Blueprint(__name__)
@@ -24,6 +25,9 @@ CHUNK_TABLE_NAME = os.environ['CHUNK_TABLE_NAME']
 CHUNK_STARTPTS_INDEX = os.environ['CHUNK_STARTPTS_INDEX']
 authorizer = IAMAuthorizer()
 
+# FrameNumber of the single item holding the packed key frame index of an HLS Segment (Chunk)
+KEY_FRAME_INDEX_FRAME_NUMBER = -1
+
 ddb_resource = boto3.resource("dynamodb")
 API_SCHEMA = load_api_schema()
 
@@ -32,6 +36,8 @@ def store_frame():
     """
     Store one or more frames in the datastore.
 
+    All the key frames of the file are packed into a single compact item instead of one item per frame.
+
     Body:
 
     .. code-block:: python
@@ -68,14 +74,19 @@ def store_frame():
 
         frame_table = ddb_resource.Table(FRAME_TABLE_NAME)
 
-        with frame_table.batch_writer() as batch:
-            for frame in frames:
-                frame["Id"] = f"{program}#{event}#{filename}"
-                frame["ProgramEvent"] = f"{program}#{event}"
-
-                batch.put_item(
-                    Item=frame
-                )
+        key_frames = [frame for frame in frames if frame["KeyFrame"] == 1]
+
+        frame_table.put_item(
+            Item={
+                "Id": f"{program}#{event}#{filename}",
+                "FrameNumber": KEY_FRAME_INDEX_FRAME_NUMBER,
+                "ProgramEvent": f"{program}#{event}",
+                "ExecutionId": frames[0]["ExecutionId"],
+                "Filename": filename,
+                "KeyFrameCount": len(key_frames),
+                "KeyFrameIndex": pack_key_frames(key_frames)
+            }
+        )
 
     except ClientError as e:
         logger.info(f"Got DynamoDB ClientError: {str(e)}")
@@ -280,22 +291,12 @@ def get_timecode_of_frame(program, event, filename, frame_number):
         else:
             pts = True
 
-        frame_table = ddb_resource.Table(FRAME_TABLE_NAME)
-
-        response = frame_table.query(
-            KeyConditionExpression=Key("Id").eq(f"{program}#{event}#{filename}") & Key("FrameNumber").lte(frame_number),
-            FilterExpression=Attr("KeyFrame").eq(1),
-            ProjectionExpression="FrameNumber, FramePtsTime, FrameTime, DurationTime",
-            ScanIndexForward=False,
-            Limit=1,
-            ConsistentRead=True
-        )
+        key_frame = get_key_frame(program, event, filename, frame_number)
 
-        if "Items" not in response or len(response["Items"]) < 1:
+        if key_frame is None:
             raise NotFoundError(
                 f"Frame '{frame_number}' not found in file '{filename}' for program '{program}' and event '{event}'")
 
-        key_frame = replace_decimals(response["Items"][0])
         key_frame_number = key_frame["FrameNumber"]
         key_frame_time = key_frame["FrameTime"]
         key_frame_pts_time = key_frame["FramePtsTime"]
@@ -324,3 +325,43 @@ def get_timecode_of_frame(program, event, filename, frame_number):
             return frame_pts_time
 
         return frame_time
+
+
+def get_key_frame(program, event, filename, frame_number):
+    """
+    Get the key frame at or immediately before the given frame number from the packed key frame index of the file.
+    Falls back to querying the per-frame items stored prior to the introduction of the key frame index.
+
+    Returns:
+
+        Dictionary containing FrameNumber, FramePtsTime, FrameTime and DurationTime of the key frame or None if not found
+    """
+    frame_table = ddb_resource.Table(FRAME_TABLE_NAME)
+
+    response = frame_table.get_item(
+        Key={
+            "Id": f"{program}#{event}#{filename}",
+            "FrameNumber": KEY_FRAME_INDEX_FRAME_NUMBER
+        },
+        ProjectionExpression="KeyFrameIndex",
+        ConsistentRead=True
+    )
+
+    if "Item" in response:
+        return find_key_frame(unpack_key_frames(response["Item"]["KeyFrameIndex"].value), frame_number)
+
+    logger.info(f"Key frame index not found for file '{filename}'. Falling back to the per-frame items.")
+
+    response = frame_table.query(
+        KeyConditionExpression=Key("Id").eq(f"{program}#{event}#{filename}") & Key("FrameNumber").lte(frame_number),
+        FilterExpression=Attr("KeyFrame").eq(1),
+        ProjectionExpression="FrameNumber, FramePtsTime, FrameTime, DurationTime",
+        ScanIndexForward=False,
+        Limit=1,
+        ConsistentRead=True
+    )
+
+    if "Items" not in response or len(response["Items"]) < 1:
+        return None
+
+    return replace_decimals(response["Items"][0])
@@ -3,15 +3,27 @@
 import io
 import json
 import os
+import time
 import traceback
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
 
 import boto3
 from boto3.dynamodb.conditions import Attr, Key
+from boto3.dynamodb.types import TypeSerializer
 from botocore.client import ClientError
 from chalice import BadRequestError, Blueprint, ChaliceViewError, IAMAuthorizer
-from chalicelib import load_api_schema, replace_decimals
+from chalicelib import load_api_schema
+from chalicelib.encoding import DecimalEncoder, json_response
+from chalicelib.progress import (increment_event_progress,
+                                 update_event_last_chunk_number)
+from chalicelib.segment_summary import (SEGMENT_SUMMARY_TABLE_NAME,
+                                        build_labeler_summary_update,
+                                        build_optimizer_summary_update,
+                                        build_segment_summary,
+                                        mark_summary_complete_if_new,
+                                        put_segment_summaries)
 from jsonschema import ValidationError, validate
 from opensearchpy import AWSV4SignerAuth, OpenSearch, RequestsHttpConnection
 from opensearchpy.helpers.errors import BulkIndexError
@@ -28,12 +40,24 @@ OPENSEARCH_INDEX = os.getenv("AOSS_KNN_INDEX_NAME", "mre_knn_index")
 BEDROCK_EMBEDDINGS_MODEL_ID = os.getenv(
     "BEDROCK_EMBEDDINGS_MODEL_ID", "amazon.titan-embed-text-v2:0"
 )
+PLUGIN_RESULT_UPDATE_MAX_WORKERS = int(os.getenv("PLUGIN_RESULT_UPDATE_MAX_WORKERS", "10"))
+
+# EventBridge accepts a maximum of 10 entries and 256KB per PutEvents call
+EB_PUT_EVENTS_BATCH_SIZE = 10
+EB_PUT_EVENTS_MAX_BATCH_BYTES = 256 * 1024
+EB_PUT_EVENTS_MAX_ATTEMPTS = 3
 
 logger = Logger(service="aws-mre-dataplane-api")
 
 authorizer = IAMAuthorizer()
+serializer = TypeSerializer()
 ddb_resource = boto3.resource("dynamodb")
+ddb_client = boto3.client("dynamodb")
 eb_client = boto3.client("events")
+
+# Reused across warm invocations to apply the Optimizer/Labeler updates with bounded concurrency.
+# Only the low-level client (which is thread-safe) is used from the worker threads.
+update_executor = ThreadPoolExecutor(max_workers=PLUGIN_RESULT_UPDATE_MAX_WORKERS)
 if OPENSEARCH_ENDPOINT:
     credentials = boto3.Session().get_credentials()
     http_auth = AWSV4SignerAuth(
@@ -158,6 +182,10 @@ def store_plugin_result():
         400 - BadRequestError
         500 - ChaliceViewError
     """
+    timings = {"validation": 0, "writes": 0, "events": 0, "indexing": 0}
+    stage_start = time.perf_counter()
+    eb_entries = []
+
     try:
         result = json.loads(plugin_api.current_app.current_request.raw_body.decode(), parse_float=Decimal)
 
@@ -183,6 +211,9 @@ def store_plugin_result():
         if plugin_class == "Optimizer":
             classifier = result["Classifier"]
             opto_audio_track = audio_track if audio_track is not None else "1"
+            update_requests = []
+            summary_requests = []
+            update_items = []
 
             for item in results:
                 is_update_required = False
@@ -235,34 +266,81 @@ def store_plugin_result():
                             expression_attribute_values[":OptoEndDetectorResults"] = item["OptoEndDetectorResults"]
 
                 if is_update_required:
-                    logger.info(
-                        f"Updating existing segment having Start={item['Start']} with the Optimizer plugin result"
-                    )
-
-                    plugin_result_table.update_item(
-                        Key={
-                            "PK": f"{program}#{event}#{classifier}",
-                            "Start": item["Start"]
-                        },
+                    update_request = build_segment_update_request(
+                        f"{program}#{event}#{classifier}",
+                        item["Start"],
                         ## TODO: Modify Update Expression to remove 'NonOptChunkNumber' when it's been optimized
-                        UpdateExpression="REMOVE NonOptoChunkNumber SET " + ", ".join(update_expression),
-                        ExpressionAttributeNames=expression_attribute_names,
-                        ExpressionAttributeValues=expression_attribute_values
+                        "REMOVE NonOptoChunkNumber SET " + ", ".join(update_expression),
+                        expression_attribute_names,
+                        expression_attribute_values
                     )
+                    # The prior OptoEndCode tells apart the first optimization of a segment from a re-optimization
+                    update_request["ReturnValues"] = "UPDATED_OLD"
+                    update_requests.append(update_request)
+                    update_items.append(item)
 
-                    item["Program"] = program
-                    item["Event"] = event
-                    item["ProfileName"] = result["ProfileName"]
-                    item["PluginClass"] = result["PluginClass"]
-                    item["Classifier"] = classifier
-                    item["AudioTrack"] = opto_audio_track
+                    summary_update = build_optimizer_summary_update(item, opto_audio_track)
+
+                    if summary_update:
+                        summary_requests.append(
+                            build_segment_update_request(
+                                f"{program}#{event}#{classifier}",
+                                item["Start"],
+                                summary_update["UpdateExpression"],
+                                summary_update["ExpressionAttributeNames"],
+                                summary_update["ExpressionAttributeValues"],
+                                table_name=SEGMENT_SUMMARY_TABLE_NAME
+                            )
+                        )
+
+            logger.info(f"Updating {len(update_requests)} existing segments with the Optimizer plugin result")
+
+            timings["validation"] = get_elapsed_ms(stage_start)
+            stage_start = time.perf_counter()
+
+            # The segment summaries are updated along with the segments in the same pool of workers
+            updated = update_segments(update_requests + summary_requests)[:len(update_requests)]
+
+            timings["writes"] = get_elapsed_ms(stage_start)
+            stage_start = time.perf_counter()
+
+            segments_optimized = 0
+
+            for item, prior_segment in zip(update_items, updated):
+                if prior_segment is None:
+                    continue
 
-                    # Send the Optimization status to EventBridge
-                    put_events_to_event_bridge(plugin_class, item)
+                # A segment is counted as optimized once its end is optimized for the first time.
+                # Retried, re-posted and re-optimized results find an OptoEndCode already set.
+                prior_opto_end_code = prior_segment.get("OptoEndCode", {}).get("S", "Not Attempted")
+
+                if "OptoEndCode" in item and prior_opto_end_code == "Not Attempted":
+                    segments_optimized += 1
+
+                item["Program"] = program
+                item["Event"] = event
+                item["ProfileName"] = result["ProfileName"]
+                item["PluginClass"] = result["PluginClass"]
+                item["Classifier"] = classifier
+                item["AudioTrack"] = opto_audio_track
+
+                eb_entry = build_segment_status_entry(plugin_class, item)
+
+                if eb_entry:
+                    eb_entries.append(eb_entry)
+
+            # Send the Optimization status to EventBridge
+            put_events_to_event_bridge(eb_entries)
+
+            timings["events"] = get_elapsed_ms(stage_start)
+
+            increment_event_progress(program, event, {"SegmentsOptimized": segments_optimized})
 
         # If the plugin class is Labeler, append the results to existing items in DynamoDB
         elif plugin_class == "Labeler":
             classifier = result["Classifier"]
+            update_requests = []
+            summary_requests = []
 
             for item in results:
                 update_expression = []
@@ -286,31 +364,62 @@ def store_plugin_result():
                                 expression_attribute_names[f"#OutAttr{index}"] = output_attribute
                                 expression_attribute_values[f":OutAttr{index}"] = item[output_attribute]
 
-                    logger.info(
-                        f"Updating existing segment having Start={item['Start']} with the Labeler plugin result"
+                    update_requests.append(
+                        build_segment_update_request(
+                            f"{program}#{event}#{classifier}",
+                            item["Start"],
+                            "SET " + ", ".join(update_expression),
+                            expression_attribute_names,
+                            expression_attribute_values
+                        )
                     )
 
-                    plugin_result_table.update_item(
-                        Key={
-                            "PK": f"{program}#{event}#{classifier}",
-                            "Start": item["Start"]
-                        },
-                        UpdateExpression="SET " + ", ".join(update_expression),
-                        ExpressionAttributeNames=expression_attribute_names,
-                        ExpressionAttributeValues=expression_attribute_values
-                    )
+                    summary_update = build_labeler_summary_update(item)
+
+                    if summary_update:
+                        summary_requests.append(
+                            build_segment_update_request(
+                                f"{program}#{event}#{classifier}",
+                                item["Start"],
+                                summary_update["UpdateExpression"],
+                                summary_update["ExpressionAttributeNames"],
+                                summary_update["ExpressionAttributeValues"],
+                                table_name=SEGMENT_SUMMARY_TABLE_NAME
+                            )
+                        )
+
+            logger.info(f"Updating {len(update_requests)} existing segments with the Labeler plugin result")
+
+            timings["validation"] = get_elapsed_ms(stage_start)
+            stage_start = time.perf_counter()
+
+            update_segments(update_requests + summary_requests)
+
+            timings["writes"] = get_elapsed_ms(stage_start)
 
         else:
+            timings["validation"] = get_elapsed_ms(stage_start)
+            stage_start = time.perf_counter()
+
             # Index the results into OpenSearch for enabling GenAI search
             if plugin_class == "Classifier" and OPENSEARCH_ENDPOINT:
                 add_to_opensearch_index(program, event, plugin_name, results)
 
-            with plugin_result_table.batch_writer() as batch:
-                if audio_track is not None:
-                    pk = f"{program}#{event}#{plugin_name}#{audio_track}"
-                else:
-                    pk = f"{program}#{event}#{plugin_name}"
+            timings["indexing"] = get_elapsed_ms(stage_start)
+            stage_start = time.perf_counter()
 
+            summaries = []
+            complete_segments = []
+
+            if audio_track is not None:
+                pk = f"{program}#{event}#{plugin_name}#{audio_track}"
+            else:
+                pk = f"{program}#{event}#{plugin_name}"
+
+            if plugin_class == "Classifier":
+                mark_summary_complete_if_new(pk, f"{program}#{event}")
+
+            with plugin_result_table.batch_writer() as batch:
                 for item in results:
                     
                     item["PK"] = pk
@@ -355,13 +464,34 @@ def store_plugin_result():
                     if audio_track is not None:
                         item["AudioTrack"] = audio_track
 
-                    batch.put_item(
-                        Item=item
-                    )
+                    # Complete segments are put individually after the batch to find out if they are newly classified
+                    if plugin_class == "Classifier" and item["End"] != item["Start"]:
+                        complete_segments.append(item)
+                    else:
+                        batch.put_item(
+                            Item=item
+                        )
 
-                    # Send the Segmentation status to EventBridge
                     if plugin_class == "Classifier":
-                        put_events_to_event_bridge(plugin_class, item)
+                        eb_entries.append(build_segment_status_entry(plugin_class, item))
+                        summaries.append(build_segment_summary(item))
+
+            segments_classified = sum(put_complete_segments(complete_segments))
+
+            put_segment_summaries(summaries)
+
+            timings["writes"] = get_elapsed_ms(stage_start)
+            stage_start = time.perf_counter()
+
+            # Send the Segmentation status to EventBridge
+            put_events_to_event_bridge(eb_entries)
+
+            timings["events"] = get_elapsed_ms(stage_start)
+
+            if plugin_class == "Classifier":
+                # Only the segments stored as complete (having an End) for the first time are counted as classified
+                increment_event_progress(program, event, {"SegmentsClassified": segments_classified})
+                update_event_last_chunk_number(program, event, result["ChunkNumber"])
 
     except ValidationError as e:
         logger.info(f"Got jsonschema ValidationError: {str(e)}")
@@ -388,6 +518,7 @@ def store_plugin_result():
             f"Unable to store the result of program '{program}', event '{event}', plugin '{plugin_name}' in the DynamoDB table '{PLUGIN_RESULT_TABLE_NAME}': {str(e)}")
 
     else:
+        logger.info(f"Stored the plugin result in {sum(timings.values())} ms. Breakdown (ms): {timings}")
         return {}
 
 @plugin_api.route('/plugin/dependentplugins/output', cors=True, methods=['POST'], authorizer=authorizer)
@@ -486,61 +617,200 @@ def get_dependent_plugins_output():
             f"Unable to get the output of one or more dependent plugins for program '{program}', event '{event}' and chunk number '{chunk_number}': {str(e)}")
 
     else:
-        return replace_decimals(output)
+        return json_response(output)
+
+
+def get_elapsed_ms(stage_start):
+    return round((time.perf_counter() - stage_start) * 1000)
+
 
+def build_segment_update_request(pk, start, update_expression, expression_attribute_names, expression_attribute_values,
+                                 table_name=PLUGIN_RESULT_TABLE_NAME):
+    return {
+        "TableName": table_name,
+        "Key": {
+            "PK": serializer.serialize(pk),
+            "Start": serializer.serialize(start)
+        },
+        # Only update segments previously stored by the Classifier
+        "ConditionExpression": "attribute_exists(PK)",
+        "UpdateExpression": update_expression,
+        "ExpressionAttributeNames": expression_attribute_names,
+        "ExpressionAttributeValues": {k: serializer.serialize(v) for k, v in expression_attribute_values.items()}
+    }
 
-def put_events_to_event_bridge(plugin_class, segment):
+
+def update_segment(update_request):
     try:
-        segment = replace_decimals(segment)
+        response = ddb_client.update_item(**update_request)
 
-        if plugin_class == "Classifier":
-            segment_start = segment["Start"]
-            segment_end = segment["End"] if "End" in segment else None
-            detail_type = "Segmentation Status"
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+            logger.info(
+                f"Skipping the update of segment having Start={update_request['Key']['Start']} as it does not exist in the DynamoDB table '{update_request['TableName']}'"
+            )
+            return None
 
-            if segment_end is None or segment_start == segment_end:
-                state = "SEGMENT_START"
-            else:
-                state = "SEGMENT_END"
+        raise
 
-        elif plugin_class == "Optimizer":
-            detail_type = "Optimization Status"
+    return response.get("Attributes", {})
 
-            if "OptoEnd" in segment and segment["OptoEnd"]:
-                state = "OPTIMIZED_SEGMENT_END"
-            elif "OptoStart" in segment and segment["OptoStart"]:
-                state = "OPTIMIZED_SEGMENT_START"
 
-        logger.info(
-            f"Sending an event for '{detail_type}' to EventBridge with state '{state}' for the segment '{segment}'"
-        )
+def update_segments(update_requests):
+    """
+    Apply the given segment update requests concurrently using a bounded pool of workers.
 
-        detail = {
-            "State": state,
-            "Segment": segment
-        }
+    Returns:
 
-        response = eb_client.put_events(
-            Entries=[
-                {
-                    "Source": "awsmre",
-                    "DetailType": detail_type,
-                    "Detail": json.dumps(detail),
-                    "EventBusName": EB_EVENT_BUS_NAME
-                }
-            ]
-        )
+        List (in the same order as the update requests) of the attributes returned by each update as per its
+        ReturnValues, or None for the segments that were not updated
+    """
+    if len(update_requests) <= 1:
+        return [update_segment(update_request) for update_request in update_requests]
 
-        if response["FailedEntryCount"] > 0:
-            logger.info(
-                f"Failed to send an event for '{detail_type}' to EventBridge with state '{state}' for the segment '{segment}'. More details below:"
-            )
-            logger.info(response["Entries"])
+    return list(update_executor.map(update_segment, update_requests))
 
-    except Exception as e:
-        logger.info(
-            f"Unable to send an event to EventBridge for the segment '{segment}': {str(e)}"
-        )
+
+def put_complete_segment(segment):
+    response = ddb_client.put_item(
+        TableName=PLUGIN_RESULT_TABLE_NAME,
+        Item={k: serializer.serialize(v) for k, v in segment.items()},
+        ReturnValues="ALL_OLD"
+    )
+
+    prior_segment = response.get("Attributes")
+
+    # Retried and re-posted results overwrite a segment that is already complete
+    return not prior_segment or prior_segment.get("End") == prior_segment.get("Start")
+
+
+def put_complete_segments(segments):
+    """
+    Put the given complete segments concurrently using a bounded pool of workers.
+
+    Returns:
+
+        List of booleans (in the same order as the segments) indicating if each segment was not stored as complete before
+    """
+    if len(segments) <= 1:
+        return [put_complete_segment(segment) for segment in segments]
+
+    return list(update_executor.map(put_complete_segment, segments))
+
+
+def build_segment_status_entry(plugin_class, segment):
+    if plugin_class == "Classifier":
+        segment_start = segment["Start"]
+        segment_end = segment["End"] if "End" in segment else None
+        detail_type = "Segmentation Status"
+
+        if segment_end is None or segment_start == segment_end:
+            state = "SEGMENT_START"
+        else:
+            state = "SEGMENT_END"
+
+    elif plugin_class == "Optimizer":
+        detail_type = "Optimization Status"
+
+        if "OptoEnd" in segment and segment["OptoEnd"]:
+            state = "OPTIMIZED_SEGMENT_END"
+        elif "OptoStart" in segment and segment["OptoStart"]:
+            state = "OPTIMIZED_SEGMENT_START"
+        else:
+            logger.info(f"Not sending an event for '{detail_type}' to EventBridge for the segment '{segment}'")
+            return None
+
+    detail = {
+        "State": state,
+        "Segment": segment
+    }
+
+    return {
+        "Source": "awsmre",
+        "DetailType": detail_type,
+        "Detail": json.dumps(detail, cls=DecimalEncoder),
+        "EventBusName": EB_EVENT_BUS_NAME
+    }
+
+
+def get_event_entry_size(entry):
+    """
+    Calculate the size of a PutEvents entry as accounted by EventBridge.
+    """
+    size = 14 if "Time" in entry else 0
+
+    for attribute in ["Source", "DetailType", "Detail"]:
+        if attribute in entry:
+            size += len(entry[attribute].encode("utf-8"))
+
+    for resource in entry.get("Resources", []):
+        size += len(resource.encode("utf-8"))
+
+    return size
+
+
+def get_event_batches(entries):
+    """
+    Split the given entries into batches within both the entry count and the request size limits of PutEvents.
+    """
+    batch = []
+    batch_size = 0
+
+    for entry in entries:
+        entry_size = get_event_entry_size(entry)
+
+        if batch and (len(batch) == EB_PUT_EVENTS_BATCH_SIZE or batch_size + entry_size > EB_PUT_EVENTS_MAX_BATCH_BYTES):
+            yield batch
+            batch = []
+            batch_size = 0
+
+        batch.append(entry)
+        batch_size += entry_size
+
+    if batch:
+        yield batch
+
+
+def put_events_to_event_bridge(entries):
+    """
+    Send the given entries to EventBridge in batches of up to 10 entries (and 256KB) per PutEvents call,
+    retrying only the entries that failed in a batch.
+    """
+    for batch in get_event_batches(entries):
+        if len(batch) == 1 and get_event_entry_size(batch[0]) > EB_PUT_EVENTS_MAX_BATCH_BYTES:
+            logger.info(f"Skipping a segment status event exceeding the EventBridge size limit: {batch[0]['Detail'][:1024]}")
+            continue
+
+        for attempt in range(1, EB_PUT_EVENTS_MAX_ATTEMPTS + 1):
+            try:
+                logger.info(f"Sending {len(batch)} segment status events to EventBridge (attempt {attempt})")
+
+                response = eb_client.put_events(Entries=batch)
+
+            except Exception as e:
+                logger.info(f"Unable to send {len(batch)} segment status events to EventBridge: {str(e)}")
+
+            else:
+                if response["FailedEntryCount"] == 0:
+                    break
+
+                # Response entries are in the same order as the request entries
+                failed = [
+                    (entry, result) for entry, result in zip(batch, response["Entries"]) if "ErrorCode" in result
+                ]
+
+                logger.info(
+                    f"Failed to send {len(failed)} segment status events to EventBridge. More details below:"
+                )
+                logger.info([result for _, result in failed])
+
+                batch = [entry for entry, _ in failed]
+
+            if attempt < EB_PUT_EVENTS_MAX_ATTEMPTS:
+                time.sleep(0.1 * (2 ** attempt))
+
+        else:
+            logger.info(f"Giving up sending {len(batch)} segment status events to EventBridge: {batch}")
 
 
 @plugin_api.route('/replay/feature/program/{program}/event/{event}/outputattribute/{pluginattribute}/plugin/{pluginname}',
@@ -685,7 +955,7 @@ def get_segments_for_event(program, event, classifier):
 
         segments.extend(response["Items"])
     
-    return replace_decimals(segments)
+    return json_response(segments)
 
 
 @plugin_api.route(
@@ -782,4 +1052,4 @@ def get_plugins_output_filtered_by_attributes(program, event, start, end):
         raise ChaliceViewError(f"Unable to get plugin output attributes: {str(e)}")
 
     else:
-        return replace_decimals(output)
+        return json_response(output)
@@ -0,0 +1,194 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+##############################################################################
+#
+# PURPOSE:
+# Maintain a per-event "progress" item holding the counters polled by the
+# console. The counters are incremented atomically (DynamoDB ADD) whenever
+# the Classifier and Optimizer results, segment caching, Clip Generation and
+# replay results are stored so that the progress of an event is served by a
+# single GetItem irrespective of the length of the event.
+#
+# Progress item:
+#   - PK: program#event
+#   - SegmentsClassified, SegmentsOptimized, SegmentsCached, ClipsGenerated,
+#     ReplaysUpdated: Counters
+#   - LastChunkNumber: Highest chunk number having a stored Classifier result
+#   - LastUpdated: Time of the last counter update
+#
+# A segment is counted as classified (optimized) only when it is stored as
+# complete (optimized) for the first time so that retried, re-posted and
+# re-optimized plugin results do not inflate the counters.
+#
+# The counters are informational. A failure to update them is logged and
+# never fails the storage of the result being counted.
+#
+##############################################################################
+
+import json
+import os
+import urllib.parse
+from datetime import datetime
+
+import boto3
+from botocore.client import ClientError
+from chalice import BadRequestError, Blueprint, ChaliceViewError, IAMAuthorizer
+from chalicelib import load_api_schema
+from chalicelib.encoding import json_response
+from jsonschema import ValidationError, validate
+from aws_lambda_powertools import Logger
+
+EVENT_PROGRESS_TABLE_NAME = os.environ["EVENT_PROGRESS_TABLE_NAME"]
+
+PROGRESS_COUNTERS = [
+    "SegmentsClassified",
+    "SegmentsOptimized",
+    "SegmentsCached",
+    "ClipsGenerated",
+    "ReplaysUpdated"
+]
+
+logger = Logger(service="aws-mre-dataplane-api")
+
+authorizer = IAMAuthorizer()
+ddb_resource = boto3.resource("dynamodb")
+
+API_SCHEMA = load_api_schema()
+
+progress_api = Blueprint(__name__)
+
+
+def increment_event_progress(program, event, counters):
+    """
+    Atomically add the given values to the progress counters of an event.
+
+    :param counters: Dictionary of the counter name and the value to add. Counters with a value of 0 are ignored.
+    """
+    counters = {name: value for name, value in counters.items() if value}
+
+    if not counters:
+        return
+
+    try:
+        ddb_resource.Table(EVENT_PROGRESS_TABLE_NAME).update_item(
+            Key={"PK": f"{program}#{event}"},
+            UpdateExpression="ADD " + ", ".join([f"#{name} :{name}" for name in counters]) + " SET #LastUpdated = :LastUpdated",
+            ExpressionAttributeNames={
+                "#LastUpdated": "LastUpdated",
+                **{f"#{name}": name for name in counters}
+            },
+            ExpressionAttributeValues={
+                ":LastUpdated": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+                **{f":{name}": value for name, value in counters.items()}
+            }
+        )
+
+    except Exception as e:
+        logger.info(f"Unable to update the progress counters {counters} of program '{program}' and event '{event}': {str(e)}")
+
+
+def update_event_last_chunk_number(program, event, chunk_number):
+    """
+    Set the LastChunkNumber of an event unless a higher chunk number has already been recorded.
+    """
+    try:
+        ddb_resource.Table(EVENT_PROGRESS_TABLE_NAME).update_item(
+            Key={"PK": f"{program}#{event}"},
+            UpdateExpression="SET #LastChunkNumber = :LastChunkNumber",
+            ConditionExpression="attribute_not_exists(#LastChunkNumber) OR #LastChunkNumber < :LastChunkNumber",
+            ExpressionAttributeNames={"#LastChunkNumber": "LastChunkNumber"},
+            ExpressionAttributeValues={":LastChunkNumber": chunk_number}
+        )
+
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            logger.info(f"Unable to update the LastChunkNumber of program '{program}' and event '{event}': {str(e)}")
+
+    except Exception as e:
+        logger.info(f"Unable to update the LastChunkNumber of program '{program}' and event '{event}': {str(e)}")
+
+
+@progress_api.route('/event/progress', cors=True, methods=['POST'], authorizer=authorizer)
+def store_event_progress():
+    """
+    Increment one or more progress counters of an event. Used by the MRE components which do not store
+    their results through the Data plane (for example, Segment Caching).
+
+    Body:
+
+    .. code-block:: python
+
+        {
+            "Program": string,
+            "Event": string,
+            "Counters": {
+                "SegmentsCached": integer,
+                ...
+            }
+        }
+
+    Returns:
+
+        None
+
+    Raises:
+        400 - BadRequestError
+    """
+    try:
+        progress = json.loads(progress_api.current_app.current_request.raw_body.decode())
+
+        validate(instance=progress, schema=API_SCHEMA["store_event_progress"])
+
+    except ValidationError as e:
+        logger.info(f"Got jsonschema ValidationError: {str(e)}")
+        raise BadRequestError(e.message)
+
+    increment_event_progress(progress["Program"], progress["Event"], progress["Counters"])
+
+    return {}
+
+
+@progress_api.route('/event/{name}/program/{program}/progress', cors=True, methods=['GET'], authorizer=authorizer)
+def get_event_progress(name, program):
+    """
+    Get the progress counters of an event.
+
+    Returns:
+
+        .. code-block:: python
+
+            {
+                "SegmentsClassified": integer,
+                "SegmentsOptimized": integer,
+                "SegmentsCached": integer,
+                "ClipsGenerated": integer,
+                "ReplaysUpdated": integer,
+                "LastChunkNumber": integer,
+                "LastUpdated": timestamp
+            }
+
+        Counters are 0 and LastChunkNumber is null until the event processing begins.
+
+    Raises:
+        500 - ChaliceViewError
+    """
+    try:
+        name = urllib.parse.unquote(name)
+        program = urllib.parse.unquote(program)
+
+        response = ddb_resource.Table(EVENT_PROGRESS_TABLE_NAME).get_item(
+            Key={"PK": f"{program}#{name}"}
+        )
+
+    except Exception as e:
+        logger.info(f"Unable to get the progress of program '{program}' and event '{name}': {str(e)}")
+        raise ChaliceViewError(f"Unable to get the progress of program '{program}' and event '{name}': {str(e)}")
+
+    item = response.get("Item", {})
+
+    progress = {counter: item.get(counter, 0) for counter in PROGRESS_COUNTERS}
+    progress["LastChunkNumber"] = item.get("LastChunkNumber")
+    progress["LastUpdated"] = item.get("LastUpdated")
+
+    return json_response(progress)
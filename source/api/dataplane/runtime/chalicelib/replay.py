@@ -13,8 +13,10 @@ import boto3
 from boto3.dynamodb.conditions import Attr, Key
 from chalice import Blueprint, ChaliceViewError, IAMAuthorizer
 from chalicelib import load_api_schema
+from chalicelib.encoding import json_response
 from chalicelib.common import (get_event_segment_metadata,
                                populate_segment_data_matching)
+from chalicelib.progress import increment_event_progress
 from aws_lambda_powertools import Logger
 
 PLUGIN_RESULT_TABLE_NAME = os.environ['PLUGIN_RESULT_TABLE_NAME']
@@ -155,7 +157,7 @@ def get_matching_replay_segments(name, program, classifier, tracknumber, replayI
                         replay_clips.append(segment)
                         break
 
-    return replay_clips
+    return json_response(replay_clips)
 
 
 @replay_api.route('/event/{name}/program/{program}/replay/{replayId}/segments', cors=True, methods=['GET'],
@@ -367,6 +369,8 @@ def update_replay_results():
             logger.info(f'POSSIBLE RACE CONDITION!! Got lastSegmentStartTime={str(lastSegmentStartTime)} ')
             return False
 
+        increment_event_progress(program, event, {"ReplaysUpdated": 1})
+
     return True
 
 
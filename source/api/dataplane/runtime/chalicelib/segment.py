@@ -12,9 +12,15 @@ from botocore.client import ClientError
 from chalice import (BadRequestError, Blueprint, ChaliceViewError,
                      IAMAuthorizer, NotFoundError)
 from chalicelib import load_api_schema, replace_decimals
+from chalicelib.encoding import json_response
 from chalicelib.common import get_event_segment_metadata
+from chalicelib.progress import increment_event_progress
 from chalicelib.segment_helper import (get_clip_metadata,
                                        get_event_segment_metadata_v2)
+from chalicelib.segment_summary import (build_clip_summary_update,
+                                        build_feedback_summary_update,
+                                        get_segment_summaries,
+                                        update_segment_summary)
 from jsonschema import ValidationError, validate
 from aws_lambda_powertools import Logger
 
@@ -77,6 +83,7 @@ def store_clip_result():
         logger.info(f"Number of items to store: {len(results)}")
 
         plugin_result_table = ddb_resource.Table(PLUGIN_RESULT_TABLE_NAME)
+        clips_generated = 0
 
         for item in results:
             is_update_required = False
@@ -135,6 +142,16 @@ def store_clip_result():
                     ExpressionAttributeValues=expression_attribute_values
                 )
 
+                update_segment_summary(
+                    f"{program}#{event}#{classifier}",
+                    item["Start"],
+                    build_clip_summary_update(item, audio_track)
+                )
+
+                clips_generated += 1
+
+        increment_event_progress(program, event, {"ClipsGenerated": clips_generated})
+
     except ValidationError as e:
         logger.info(f"Got jsonschema ValidationError: {str(e)}")
         raise BadRequestError(e.message)
@@ -175,24 +192,16 @@ def get_event_segments_for_edl(name, program, classifier, tracknumber):
     classifier = urllib.parse.unquote(classifier)
     tracknumber = urllib.parse.unquote(tracknumber)
 
-    # Get Event Segment Details
-    # From the PluginResult Table, get the Clips Info
-    plugin_table = ddb_resource.Table(PLUGIN_RESULT_TABLE_NAME)
-    response = plugin_table.query(
-        IndexName=PROGRAM_EVENT_PLUGIN_INDEX,
-        KeyConditionExpression=Key("ProgramEventPluginName").eq(f"{program}#{name}#{classifier}"),
-        ScanIndexForward=True
+    # Get Event Segment Details from the SegmentSummary Table
+    plugin_response = get_segment_summaries(
+        f"{program}#{name}#{classifier}",
+        scan_index_forward=True,
+        attributes=["Start", "End", "OptoStart", "OptoEnd"]
     )
-    plugin_response = response['Items']
 
-    while "LastEvaluatedKey" in response:
-        response = plugin_table.query(
-            IndexName=PROGRAM_EVENT_PLUGIN_INDEX,
-            ExclusiveStartKey=response["LastEvaluatedKey"],
-            KeyConditionExpression=Key("ProgramEventPluginName").eq(f"{program}#{name}#{classifier}"),
-            ScanIndexForward=True
-        )
-        plugin_response.extend(response['Items'])
+    if plugin_response is None:
+        # Segments stored before the SegmentSummary Table was introduced
+        plugin_response = get_event_segments_from_plugin_result(program, name, classifier)
 
     all_segments = []
     for res in plugin_response:
@@ -212,6 +221,27 @@ def get_event_segments_for_edl(name, program, classifier, tracknumber):
 
     return all_segments
 
+def get_event_segments_from_plugin_result(program, name, classifier):
+    # From the PluginResult Table, get the Clips Info
+    plugin_table = ddb_resource.Table(PLUGIN_RESULT_TABLE_NAME)
+    response = plugin_table.query(
+        IndexName=PROGRAM_EVENT_PLUGIN_INDEX,
+        KeyConditionExpression=Key("ProgramEventPluginName").eq(f"{program}#{name}#{classifier}"),
+        ScanIndexForward=True
+    )
+    plugin_response = response['Items']
+
+    while "LastEvaluatedKey" in response:
+        response = plugin_table.query(
+            IndexName=PROGRAM_EVENT_PLUGIN_INDEX,
+            ExclusiveStartKey=response["LastEvaluatedKey"],
+            KeyConditionExpression=Key("ProgramEventPluginName").eq(f"{program}#{name}#{classifier}"),
+            ScanIndexForward=True
+        )
+        plugin_response.extend(response['Items'])
+
+    return plugin_response
+
 @segment_api.route('/event/{name}/program/{program}/profileClassifier/{classifier}/track/{tracknumber}/segments/v2', cors=True,
            methods=['GET'], authorizer=authorizer)
 def get_event_segments_v2(name, program, classifier, tracknumber):
@@ -269,7 +299,7 @@ def get_event_segments(name, program, classifier, tracknumber):
         404 - NotFoundError
         500 - ChaliceViewError
     """
-    return get_event_segment_metadata(name, program, classifier, tracknumber)
+    return json_response(get_event_segment_metadata(name, program, classifier, tracknumber))
 
 
 @segment_api.route('/event/{name}/program/{program}/clipstart/{start}/clipduration/{duration}/track/{tracknumber}/classifier/{classifier}/org/previewinfo',
@@ -380,6 +410,12 @@ def record_clip_preview_feedback():
 
         clip_preview_table.put_item(Item=feedback)
 
+        update_segment_summary(
+            f"{program}#{event}#{classifier}",
+            feedback["Start"],
+            build_feedback_summary_update(feedback, str(audio_track))
+        )
+
         # Push event into Event Bus - Opportunity for a CatchUp replay to Trigger - Include or Exclude Segments explicitly in Replay
         # We need to figure out if the Feedback was provided to a Original Segment or Optimized Segment
         # and send the Segment Payload to the Bus. To do this, we need to get the Segment Details.
@@ -618,10 +654,10 @@ def get_all_event_segments():
         raise ChaliceViewError(f"Unable to get the Event '{name}' in Program '{program}': {str(e)}")
 
     else:
-        return {
-            "Segments": replace_decimals(all_segments),
+        return json_response({
+            "Segments": all_segments,
             "LastStartValue": last_start_value
-        }
+        })
 
 
 
@@ -745,7 +781,7 @@ def get_replay_features_in_segment():
             f"Unable to get the value of all the output attributes stored by the plugin '{plugin_name}' between segment start '{starttime}' and end '{endtime}': {str(e)}")
 
     else:
-        return replace_decimals(replay_features)
+        return json_response(replay_features)
 
 
 @segment_api.route('/event/{name}/program/{program}/classifier/{classifier}/start/{start}/attrName/{attrName}/attrVal/{attrVal}', cors=True, methods=['PUT'], authorizer=authorizer)
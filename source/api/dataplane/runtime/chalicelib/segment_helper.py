@@ -11,7 +11,13 @@ import boto3
 from boto3.dynamodb.conditions import Attr, Key
 from chalice import ChaliceViewError, NotFoundError
 from chalicelib import replace_decimals
-from chalicelib.common import create_signed_url, populate_segment_data_matching
+from chalicelib.encoding import json_response
+from chalicelib.common import (create_signed_url,
+                               populate_segment_data_from_summary,
+                               populate_segment_data_matching)
+from chalicelib.segment_summary import (SEGMENT_SUMMARY_TABLE_NAME,
+                                        SUMMARY_MARKER_START,
+                                        is_summary_complete)
 from aws_lambda_powertools import Logger
 
 
@@ -69,10 +75,6 @@ def get_event_segment_metadata_v2(name, program, classifier, tracknumber, segmen
             if "LastEvaluatedKey" in query_params:
                 last_evaluated_key = query_params.get("LastEvaluatedKey")
 
-        # Get Event Segment Details
-        # From the PluginResult Table, get the Clips Info
-        plugin_table = ddb_resource.Table(PLUGIN_RESULT_TABLE_NAME)
-
         query = {
             'KeyConditionExpression': Key("PK").eq(f"{program}#{name}#{classifier}"),
             'ScanIndexForward': False,
@@ -84,7 +86,20 @@ def get_event_segment_metadata_v2(name, program, classifier, tracknumber, segmen
             last_evaluated_key['Start'] = decimal.Decimal(str(last_evaluated_key['Start']))
             query["ExclusiveStartKey"] = last_evaluated_key
 
-        response = plugin_table.query(**query)
+        if is_summary_complete(f"{program}#{name}#{classifier}"):
+            # Get Event Segment Details from the SegmentSummary Table
+            segment_table = ddb_resource.Table(SEGMENT_SUMMARY_TABLE_NAME)
+            populate_segment_data = populate_segment_data_from_summary
+            query["KeyConditionExpression"] = query["KeyConditionExpression"] & Key("Start").gt(SUMMARY_MARKER_START)
+
+        else:
+            # Segments stored before the SegmentSummary Table was introduced
+            # From the PluginResult Table, get the Clips Info
+            segment_table = ddb_resource.Table(PLUGIN_RESULT_TABLE_NAME)
+            populate_segment_data = populate_segment_data_matching
+
+        response = segment_table.query(**query)
+
         plugin_responses = response['Items']
 
         while "LastEvaluatedKey" in response and (limit - len(plugin_responses) > 0):
@@ -93,13 +108,13 @@ def get_event_segment_metadata_v2(name, program, classifier, tracknumber, segmen
             query["ExclusiveStartKey"] = last_evaluated_key
 
             query["Limit"] = limit - len(plugin_responses)
-            response = plugin_table.query(**query)
+            response = segment_table.query(**query)
             plugin_responses.extend(response["Items"])
 
         clip_info = []
 
         for res in plugin_responses:
-            segment_data = populate_segment_data_matching(res, tracknumber)
+            segment_data = populate_segment_data(res, tracknumber)
             clip_info.append(segment_data)
 
         final_response = {}
@@ -118,10 +133,10 @@ def get_event_segment_metadata_v2(name, program, classifier, tracknumber, segmen
     else:
         ret_val = {
             "LastEvaluatedKey": response["LastEvaluatedKey"] if "LastEvaluatedKey" in response else "",
-            "Items": replace_decimals(final_response)
+            "Items": final_response
         }
 
-        return ret_val
+        return json_response(ret_val)
 
 
 
@@ -229,7 +244,7 @@ def get_clip_metadata(name, program, start, duration, tracknumber, classifier, m
         else:
             finalresults['OriginalClipLocation'] = clip_url
 
-        return replace_decimals(finalresults)
+        return json_response(finalresults)
 
 
 def get_clipinfo_from_plugin_results(name, program, start, duration):
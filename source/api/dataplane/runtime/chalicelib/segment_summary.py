@@ -0,0 +1,329 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+##############################################################################
+#
+# PURPOSE:
+# Maintain a per-event "segment summary" view of the Classifier segments.
+# The view is written through whenever the Classifier, Optimizer, Labeler,
+# Clip Generation and Clip Preview Feedback results are stored so that the
+# segment listing APIs can serve it as-is instead of re-deriving the same
+# data from the PluginResult table on every request.
+#
+# Summary item:
+#   - PK: program#event#classifier, Start: Segment start
+#   - End, OrigLength, Label, OptoStartCode, OptoEndCode
+#   - OptoStart, OptoEnd: Maps keyed by the audio track. The optimized clip
+#     lengths are derived from them when the summary is read since the start
+#     and end of a segment are usually optimized in separate results
+#   - OriginalClipLocation, OptimizedClipLocation: Maps keyed by the audio track
+#   - OriginalThumbnailLocation, OptimizedThumbnailLocation
+#   - Feedback: Map of Clip Preview Feedback keyed by the audio track
+#
+# Marker item:
+#   - PK: program#event#classifier, Start: SUMMARY_MARKER_START
+#   - Written with the first Classifier result of an event. Its presence tells
+#     that the summary holds every segment of the event. Events having segments
+#     stored before the summary view was introduced never get it and are served
+#     from the PluginResult table.
+#
+##############################################################################
+
+import os
+
+import boto3
+from boto3.dynamodb.conditions import Key
+from botocore.client import ClientError
+from aws_lambda_powertools import Logger
+
+SEGMENT_SUMMARY_TABLE_NAME = os.environ["SEGMENT_SUMMARY_TABLE_NAME"]
+PLUGIN_RESULT_TABLE_NAME = os.environ["PLUGIN_RESULT_TABLE_NAME"]
+
+# Segments never start before 0. So, the marker item sorts before all the segments and is
+# excluded from the segment queries by their key condition
+SUMMARY_MARKER_START = -1
+
+# Attributes copied as-is from the Classifier segment when present
+SUMMARY_ATTRIBUTES = [
+    "Label",
+    "OptoStartCode",
+    "OptoEndCode",
+    "OriginalThumbnailLocation",
+    "OptimizedThumbnailLocation"
+]
+
+# Attributes stored as Maps keyed by the audio track
+SUMMARY_TRACK_ATTRIBUTES = [
+    "OptoStart",
+    "OptoEnd",
+    "OriginalClipLocation",
+    "OptimizedClipLocation"
+]
+
+logger = Logger(service="aws-mre-dataplane-api")
+
+ddb_resource = boto3.resource("dynamodb")
+
+# Outcome of mark_summary_complete_if_new by program#event#classifier, reused across warm invocations
+summary_marker_states = {}
+
+
+def get_opto_lengths(opto_start, opto_end):
+    """
+    Calculate the optimized clip duration of each audio track having both OptoStart and OptoEnd.
+    """
+    return {
+        track: opto_end[track] - opto_start[track]
+        for track in opto_start
+        if track in opto_end
+    }
+
+
+def build_segment_summary(segment):
+    """
+    Build the summary item of a Classifier segment as stored in the PluginResult table.
+    """
+    summary = {
+        "PK": segment["PK"],
+        "Start": segment["Start"],
+        "End": segment["End"],
+        "ProgramEvent": segment["ProgramEvent"],
+        "OrigLength": segment["End"] - segment["Start"],
+        "Feedback": {}
+    }
+
+    for attribute in SUMMARY_TRACK_ATTRIBUTES:
+        summary[attribute] = segment.get(attribute, {})
+
+    for attribute in SUMMARY_ATTRIBUTES:
+        if attribute in segment:
+            summary[attribute] = segment[attribute]
+
+    return summary
+
+
+def is_summary_complete(pk):
+    """
+    Check if the summary of the given program#event#classifier holds every segment of the event.
+    """
+    response = ddb_resource.Table(SEGMENT_SUMMARY_TABLE_NAME).get_item(
+        Key={
+            "PK": pk,
+            "Start": SUMMARY_MARKER_START
+        },
+        ProjectionExpression="PK"
+    )
+
+    return "Item" in response
+
+
+def mark_summary_complete_if_new(pk, program_event):
+    """
+    Write the marker item of the given program#event#classifier if no segment has been stored for it yet.
+    Must be called before storing the Classifier results.
+    """
+    if pk in summary_marker_states:
+        return
+
+    if is_summary_complete(pk):
+        summary_marker_states[pk] = True
+        return
+
+    response = ddb_resource.Table(PLUGIN_RESULT_TABLE_NAME).query(
+        KeyConditionExpression=Key("PK").eq(pk),
+        ProjectionExpression="PK",
+        Limit=1
+    )
+
+    if response["Items"]:
+        # Segments stored before the summary view was introduced
+        logger.info(f"Not marking the segment summary of {pk} as complete as it has segments stored before the summary view")
+        summary_marker_states[pk] = False
+        return
+
+    ddb_resource.Table(SEGMENT_SUMMARY_TABLE_NAME).put_item(
+        Item={
+            "PK": pk,
+            "Start": SUMMARY_MARKER_START,
+            # Lets the EventDeletionHandler find the marker through the ProgramEvent GSI
+            "ProgramEvent": program_event
+        }
+    )
+
+    summary_marker_states[pk] = True
+
+
+def put_segment_summaries(summaries):
+    with ddb_resource.Table(SEGMENT_SUMMARY_TABLE_NAME).batch_writer(overwrite_by_pkeys=["PK", "Start"]) as batch:
+        for summary in summaries:
+            batch.put_item(Item=summary)
+
+
+def build_summary_update(assignments, audio_track=None):
+    """
+    Build the UpdateItem parameters that SET the given attributes of a summary item.
+
+    :param assignments: List of (attribute name, value, is_track_attribute) tuples. A track attribute is
+        set in the Map of the attribute under the given audio track.
+
+    Returns:
+
+        Dictionary containing the UpdateExpression, ExpressionAttributeNames and ExpressionAttributeValues
+        or None if there is nothing to update
+    """
+    if not assignments:
+        return None
+
+    update_expression = []
+    expression_attribute_names = {}
+    expression_attribute_values = {}
+
+    for attribute, value, is_track_attribute in assignments:
+        expression_attribute_names[f"#{attribute}"] = attribute
+        expression_attribute_values[f":{attribute}"] = value
+
+        if is_track_attribute:
+            update_expression.append(f"#{attribute}.#AudioTrack = :{attribute}")
+            expression_attribute_names["#AudioTrack"] = audio_track
+        else:
+            update_expression.append(f"#{attribute} = :{attribute}")
+
+    return {
+        "UpdateExpression": "SET " + ", ".join(update_expression),
+        "ExpressionAttributeNames": expression_attribute_names,
+        "ExpressionAttributeValues": expression_attribute_values
+    }
+
+
+def build_optimizer_summary_update(segment, audio_track):
+    assignments = []
+
+    if "OptoStartCode" in segment:
+        assignments.append(("OptoStartCode", segment["OptoStartCode"], False))
+
+        if "OptoStart" in segment:
+            assignments.append(("OptoStart", round(segment["OptoStart"], 3), True))
+
+    if "OptoEndCode" in segment:
+        assignments.append(("OptoEndCode", segment["OptoEndCode"], False))
+
+        if "OptoEnd" in segment:
+            assignments.append(("OptoEnd", round(segment["OptoEnd"], 3), True))
+
+    return build_summary_update(assignments, audio_track)
+
+
+def build_labeler_summary_update(segment):
+    if "LabelCode" not in segment or "Label" not in segment:
+        return None
+
+    return build_summary_update([("Label", segment["Label"], False)])
+
+
+def build_clip_summary_update(clip_result, audio_track):
+    assignments = []
+
+    for clip_type in ["Original", "Optimized"]:
+        if f"{clip_type}ClipStatus" not in clip_result:
+            continue
+
+        if f"{clip_type}ClipLocation" in clip_result:
+            assignments.append((f"{clip_type}ClipLocation", clip_result[f"{clip_type}ClipLocation"], True))
+
+        if f"{clip_type}ThumbnailLocation" in clip_result:
+            assignments.append((f"{clip_type}ThumbnailLocation", clip_result[f"{clip_type}ThumbnailLocation"], False))
+
+    return build_summary_update(assignments, audio_track)
+
+
+def build_feedback_summary_update(feedback, audio_track):
+    clip_feedback = {
+        attribute: feedback[attribute]
+        for attribute in ["OriginalFeedback", "OptimizedFeedback"]
+        if attribute in feedback
+    }
+
+    return build_summary_update([("Feedback", clip_feedback, True)], audio_track)
+
+
+def update_segment_summary(pk, start, summary_update):
+    """
+    Apply the given update to the summary of an existing segment.
+
+    Returns:
+
+        False if the segment has no summary (for example, when stored before the summary view was introduced)
+    """
+    if not summary_update:
+        return False
+
+    try:
+        ddb_resource.Table(SEGMENT_SUMMARY_TABLE_NAME).update_item(
+            Key={
+                "PK": pk,
+                "Start": start
+            },
+            ConditionExpression="attribute_exists(PK)",
+            **summary_update
+        )
+
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+            logger.info(f"Skipping the update of segment summary having PK={pk} and Start={start} as it does not exist")
+            return False
+
+        raise
+
+    return True
+
+
+def query_segment_summaries(pk, limit=None, exclusive_start_key=None, scan_index_forward=False, attributes=None):
+    """
+    Query a single page of the segment summaries stored for the given program#event#classifier.
+
+    Returns:
+
+        DynamoDB Query response
+    """
+    query = {
+        "KeyConditionExpression": Key("PK").eq(pk) & Key("Start").gt(SUMMARY_MARKER_START),
+        "ScanIndexForward": scan_index_forward
+    }
+
+    if limit:
+        query["Limit"] = limit
+
+    if exclusive_start_key:
+        query["ExclusiveStartKey"] = exclusive_start_key
+
+    if attributes:
+        query["ProjectionExpression"] = ", ".join([f"#Proj{index}" for index in range(len(attributes))])
+        query["ExpressionAttributeNames"] = {f"#Proj{index}": attribute for index, attribute in enumerate(attributes)}
+
+    return ddb_resource.Table(SEGMENT_SUMMARY_TABLE_NAME).query(**query)
+
+
+def get_segment_summaries(pk, scan_index_forward=False, attributes=None):
+    """
+    Get all the segment summaries stored for the given program#event#classifier.
+
+    Returns:
+
+        List of the segment summaries or None if the summary does not hold every segment of the event
+    """
+    if not is_summary_complete(pk):
+        return None
+
+    response = query_segment_summaries(pk, scan_index_forward=scan_index_forward, attributes=attributes)
+    summaries = response["Items"]
+
+    while "LastEvaluatedKey" in response:
+        response = query_segment_summaries(
+            pk,
+            exclusive_start_key=response["LastEvaluatedKey"],
+            scan_index_forward=scan_index_forward,
+            attributes=attributes
+        )
+        summaries.extend(response["Items"])
+
+    return summaries
@@ -10,7 +10,8 @@ from chalice import ChaliceViewError, BadRequestError
 from boto3.dynamodb.conditions import Key, Attr
 from jsonschema import validate, ValidationError
 from chalice import Blueprint
-from chalicelib import load_api_schema, replace_decimals
+from chalicelib import load_api_schema
+from chalicelib.encoding import encoded_response, json_response
 import urllib.parse
 from aws_lambda_powertools import Logger
 
@@ -23,6 +24,9 @@ PAGINATION_QUERY_LIMIT = os.getenv('PAGINATION_QUERY_LIMIT')
 NON_OPTO_SEGMENTS_INDEX = os.environ['NON_OPTO_SEGMENTS_INDEX']
 PARTITION_KEY_CHUNK_NUMBER_INDEX = os.environ['PARTITION_KEY_CHUNK_NUMBER_INDEX']
 
+# Attributes always included when a Projection is requested in the segment state APIs
+PROJECTION_KEY_ATTRIBUTES = ["PK", "Start", "End", "PluginName"]
+
 authorizer = IAMAuthorizer()
 
 ddb_resource = boto3.resource("dynamodb")
@@ -170,7 +174,7 @@ def get_segment_state():
             f"Unable to get the state of the segment identified in prior chunks for program '{program}', event '{event}', plugin '{plugin_name}' and chunk number '{chunk_number}': {str(e)}")
 
     else:
-        return replace_decimals(output)
+        return json_response(output)
 
 
 @workflow_api.route('/workflow/labeling/segment/state', cors=True, methods=['POST'], authorizer=authorizer)
@@ -213,6 +217,7 @@ def get_segment_state_for_labeling():
         dependent_plugins = request["DependentPlugins"]
         chunk_number = request["ChunkNumber"]
         last_evaluated_keys = request['LastEvaluatedKeys'] if 'LastEvaluatedKeys' in request else {}
+        projection = request["Projection"] if "Projection" in request else {}
 
         ## If the last evaluated keys include the classifier AND one or more of the dependent plugins- we should just GET the classifier object again
 
@@ -281,7 +286,7 @@ def get_segment_state_for_labeling():
                     f"Getting all the Labeler dependent plugins output between the segment Start '{segment_start}' and End '{segment_end}'")
                 ## last evaluated keys is now pagination w/ out the classifier key
                 dependent_plugins_output = get_labeler_dependent_plugins_output(program, event, dependent_plugins, 
-                segment_start, segment_end, last_evaluated_keys)
+                segment_start, segment_end, last_evaluated_keys, projection)
 
                 output["DependentPluginsOutput"] = dependent_plugins_output
 
@@ -299,7 +304,7 @@ def get_segment_state_for_labeling():
             f"Unable to get the complete, unlabeled segments along with the associated dependent plugins result for program '{program}', event '{event}', classifier '{classifier}' and chunk number '{chunk_number}': {str(e)}")
 
     else:
-        return replace_decimals(output)
+        return encoded_response(workflow_api.current_app.current_request, output)
 
 
 @workflow_api.route('/workflow/optimization/segment/state', cors=True, methods=['POST'], authorizer=authorizer)
@@ -348,6 +353,7 @@ def get_segment_state_for_optimization():
         opto_audio_track = audio_track if audio_track is not None else "1"
         search_win_sec = request["SearchWindowSeconds"]
         last_evaluated_keys = request['LastEvaluatedKeys'] if 'LastEvaluatedKeys' in request else {}
+        projection = request["Projection"] if "Projection" in request else {}
 
         output = {}
 
@@ -404,7 +410,7 @@ def get_segment_state_for_optimization():
             segment_start = segment["Start"]
             segment_end = segment["End"] if "End" in segment else None
 
-            detectors_output = get_detectors_output_for_segment(program, event, detectors, search_win_sec, audio_track, start=segment_start)
+            detectors_output = get_detectors_output_for_segment(program, event, detectors, search_win_sec, audio_track, projection, start=segment_start)
             output["DependentDetectorsOutput"] = detectors_output
 
             # Get the Labeler dependent plugins output for the segment only if it is complete
@@ -412,7 +418,7 @@ def get_segment_state_for_optimization():
                 logger.info(f"Getting all the dependent detectors output around segment End '{segment_end}' within a search window of '{search_win_sec}' seconds")
                 ## last evaluated keys is now pagination w/ out the classifier key
                 output["DependentDetectorsOutput"].extend(get_detectors_output_for_segment(program, event, detectors, search_win_sec, audio_track,
-                                                    end=segment_end))
+                                                    projection, end=segment_end))
 
     except BadRequestError as e:
         logger.info(f"Got chalice BadRequestError: {str(e)}")
@@ -429,10 +435,26 @@ def get_segment_state_for_optimization():
             f"Unable to get the non-optimized segments and dependent detectors output for program '{program}', event '{event}' and chunk number '{chunk_number}': {str(e)}")
 
     else:
-        return replace_decimals(output)
+        return encoded_response(workflow_api.current_app.current_request, output)
+
 
+def get_projection_params(attributes):
+    """
+    Build the DynamoDB ProjectionExpression limiting the plugin result items to the given attributes 
+    (along with the key attributes). Returns an empty dictionary if no attributes are given.
+    """
+    if not attributes:
+        return {}
 
-def get_labeler_dependent_plugins_output(program, event, dependent_plugins, start, end, last_evaluated_keys) -> dict:
+    attributes = list(dict.fromkeys(PROJECTION_KEY_ATTRIBUTES + attributes))
+
+    return {
+        "ProjectionExpression": ", ".join([f"#Proj{index}" for index in range(len(attributes))]),
+        "ExpressionAttributeNames": {f"#Proj{index}": attribute for index, attribute in enumerate(attributes)}
+    }
+
+
+def get_labeler_dependent_plugins_output(program, event, dependent_plugins, start, end, last_evaluated_keys, projection) -> dict:
     if not dependent_plugins:
         logger.info(
             f"Skipping the retrieval of Labeler dependent plugins output as no dependent plugin is present in the request")
@@ -451,7 +473,8 @@ def get_labeler_dependent_plugins_output(program, event, dependent_plugins, star
 
         query_params = {
             "KeyConditionExpression":Key("PK").eq(f"{program}#{event}#{dependent_plugin}") & Key("Start").between(start,end),
-            "ConsistentRead":True
+            "ConsistentRead":True,
+            **get_projection_params(projection.get(dependent_plugin))
         }
 
         if PAGINATION_QUERY_LIMIT:
@@ -470,7 +493,7 @@ def get_labeler_dependent_plugins_output(program, event, dependent_plugins, star
     return dependent_plugins_output
 
 
-def get_detectors_output_for_segment(program, event, detectors, search_win_sec, audio_track, start=None, end=None):
+def get_detectors_output_for_segment(program, event, detectors, search_win_sec, audio_track, projection, start=None, end=None):
     if not detectors:
         logger.info(f"Skipping the retrieval of dependent detectors output as no detector plugin is present in the request")
         return []
@@ -496,16 +519,20 @@ def get_detectors_output_for_segment(program, event, detectors, search_win_sec,
         else:
             pk = f"{program}#{event}#{detector_name}"
 
+        projection_params = get_projection_params(projection.get(detector_name))
+
         if start:
             response = plugin_result_table.query(
                 KeyConditionExpression=Key("PK").eq(pk) & Key("Start").between(start - MAX_DETECTOR_QUERY_WINDOW_SECS, start),
-                FilterExpression=Attr("End").gte(start)
+                FilterExpression=Attr("End").gte(start),
+                **projection_params
             )
 
             if "Items" not in response or len(response["Items"]) < 1:
                 response = plugin_result_table.query(
                     IndexName=PARTITION_KEY_END_INDEX,
-                    KeyConditionExpression=Key("PK").eq(pk) & Key("End").between(start - search_win_sec, start)
+                    KeyConditionExpression=Key("PK").eq(pk) & Key("End").between(start - search_win_sec, start),
+                    **projection_params
                 )
 
                 detector_obj["Start"] = response["Items"]
@@ -516,12 +543,14 @@ def get_detectors_output_for_segment(program, event, detectors, search_win_sec,
         if end:
             response = plugin_result_table.query(
                 KeyConditionExpression=Key("PK").eq(pk) & Key("Start").between(end - MAX_DETECTOR_QUERY_WINDOW_SECS, end),
-                FilterExpression=Attr("End").gte(end)
+                FilterExpression=Attr("End").gte(end),
+                **projection_params
             )
 
             if "Items" not in response or len(response["Items"]) < 1:
                 response = plugin_result_table.query(
-                    KeyConditionExpression=Key("PK").eq(pk) & Key("Start").between(end, end + search_win_sec)
+                    KeyConditionExpression=Key("PK").eq(pk) & Key("Start").between(end, end + search_win_sec),
+                    **projection_params
                 )
 
                 detector_obj["End"] = response["Items"]
@@ -603,7 +632,7 @@ def get_segments_for_clip_generation():
             f"Unable to get the non-optimized and optimized segments for program '{program}' and event '{event}': {str(e)}")
 
     else:
-        return replace_decimals(segments)
+        return json_response(segments)
 
 
 @workflow_api.route('/workflow/engine/clipgen/chunks', cors=True, methods=['POST'], authorizer=authorizer)
@@ -707,4 +736,4 @@ def get_chunks_for_segment():
             f"Unable to get all the chunk metadata for segment Start '{start}' and End '{end}' in program '{program}', event '{event}': {str(e)}")
 
     else:
-        return replace_decimals(final_chunks)
\ No newline at end of file
+        return json_response(final_chunks)
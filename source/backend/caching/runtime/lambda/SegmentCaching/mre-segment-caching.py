@@ -329,6 +329,13 @@ def cache_segment_and_features(replay_featurers_with_output_attr, eb_state, prog
     # Update segment in the Plugin Result table with elapsed hour
     dataPlaneHelper.add_attribute_to_existing_segment(program, event, classifier_name, seg_start, "HourElapsed", hour_elapsed)
 
+    # Count the cached segment in the progress of the event
+    try:
+        dataPlaneHelper.increment_event_progress(program, event, {"SegmentsCached": 1})
+
+    except Exception as e:
+        print(f"Unable to update the progress of the event with the cached segment: {str(e)}")
+
     # Send the caching status to EventBridge
     put_events_to_event_bridge(eb_detail_type, new_eb_state, segment)
 
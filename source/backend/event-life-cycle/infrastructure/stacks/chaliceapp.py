@@ -225,6 +225,7 @@ class ChaliceApp(Stack):
             memory_size=256,
             timeout=Duration.minutes(15),
             environment=self.environment_config,
+            layers=[self.mre_workflow_helper_layer],
         )
 
         ### END: EventCompletionHandler LAMBDA ###
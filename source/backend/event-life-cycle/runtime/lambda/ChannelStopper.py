@@ -16,27 +16,10 @@ import boto3
 medialive_client = boto3.client("medialive")
 
 
-def get_program_event_from_medialive(channel_id):
-    
+def get_channel_state(channel_id):
     response = medialive_client.describe_channel(ChannelId=channel_id)
-    destinations = response["Destinations"]
-    
-    program = ""
-    p_event = ""
-    
-    for destination in destinations:
-        if destination["Id"] == "awsmre":
-            url = destination["Settings"][0]["Url"]
-            if len(url.split("/")) == 7: #BYOB Testing via MediaLive
-                program = url.split("/")[3]
-                p_event = url.split("/")[4]
-                break
-            else:
-                program = url.split("/")[4]
-                p_event = url.split("/")[5]
-                break
-        
-    return (program, p_event, response["State"])
+
+    return response["State"]
 
 def lambda_handler(event, context):
     '''
@@ -46,7 +29,6 @@ def lambda_handler(event, context):
     
     try:
         channel_id = ""
-        channel_state = ""
         
         # If this Lambda gets triggered from EventBridge Rule
         if event["source"] == "awsmre":
@@ -67,7 +49,8 @@ def lambda_handler(event, context):
             
             # Only if we have a Channel Id we Try to Stop it as long as its in a RUNNING state
             if program and p_event and channel_id != "":
-                program, p_event, channel_state = get_program_event_from_medialive(channel_id)
+                # Program and Event come from the schedule payload. Describe the channel only for its state
+                channel_state = get_channel_state(channel_id)
 
                 # Stop the MediaLive channel if its Running
                 if channel_state == "RUNNING":
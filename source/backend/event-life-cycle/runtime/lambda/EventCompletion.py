@@ -41,32 +41,45 @@ def get_program_event_from_medialive(channel_id):
                 p_event = url.split("/")[5]
                 break
         
-    return (program, p_event, response["State"])
+    return (program, p_event)
+
+def get_event_from_channel(channel_id):
+    # The Control plane maps each MediaLive channel to the event it was last configured for.
+    # Channels configured before the mapping existed fall back to parsing the MRE destination of the channel
+    try:
+        event_payload = controlplane.get_event_by_channel(channel_id)
+        return (event_payload["Program"], event_payload["Name"], event_payload)
+
+    except Exception as e:
+        print(f"Unable to get the event mapped to the MediaLive channel '{channel_id}': {str(e)}. Describing the channel instead.")
+
+    program, p_event = get_program_event_from_medialive(channel_id)
+    event_payload = controlplane.get_event(p_event, program) if program and p_event else None
+
+    return (program, p_event, event_payload)
 
 def lambda_handler(event, context):
     print(f"Lambda got the following event:\n{event}")
     
     try:
         channel_id = ""
-        channel_state = ""
         is_vod_event = False
         
         # If the Lambda was triggered when MediaLive channel is Stopped manually by the user
         if event["source"] == "aws.medialive":
             channel_arn = event["detail"]["channel_arn"]
             channel_id = channel_arn.split(":")[-1]
-            program, p_event, channel_state = get_program_event_from_medialive(channel_id)
+            program, p_event, event_payload = get_event_from_channel(channel_id)
             print(f"program={program}")
             print(f"p_event={p_event}")
 
-            # Check if this is a LIVE event
-            event = controlplane.get_event(p_event, program)
+            if event_payload:
+                # Check if this is a LIVE event
+                event_creation_time_utc = datetime.strptime(event_payload["Created"], "%Y-%m-%dT%H:%M:%SZ")
+                event_start_time_utc = datetime.strptime(event_payload["Start"], "%Y-%m-%dT%H:%M:%SZ")
 
-            event_creation_time_utc = datetime.strptime(event["Created"], "%Y-%m-%dT%H:%M:%SZ")
-            event_start_time_utc = datetime.strptime(event["Start"], "%Y-%m-%dT%H:%M:%SZ")
-
-            # Event Start time is more than Event Create time. This is a LIVE event
-            is_vod_event = True if event_start_time_utc < event_creation_time_utc else False
+                # Event Start time is more than Event Create time. This is a LIVE event
+                is_vod_event = True if event_start_time_utc < event_creation_time_utc else False
         
         # If this Lambda gets triggered from EventBridge Schedule via VOD_EVENT_END or LIVE_EVENT_END
         elif event["source"] == "awsmre":
@@ -77,9 +90,11 @@ def lambda_handler(event, context):
             if "ChunkSourceDetail" in event["detail"]:
                 if "ChannelId" in event["detail"]["ChunkSourceDetail"]:
                     channel_id = event["detail"]["ChunkSourceDetail"]["ChannelId"]
-                    program, p_event, channel_state = get_program_event_from_medialive(channel_id)
             else:
                 raise Exception("ChunkSourceDetail was not found. THIS IS A PROBLEM. Check the EventBridge event Payload")
+
+            # The schedule payload already names the event. Fetch it once and reuse it for the rest of the processing
+            event_payload = controlplane.get_event(p_event, program)
            
         print(f"program={program}-p_event={p_event}")
         if program and p_event:
@@ -95,7 +110,7 @@ def lambda_handler(event, context):
             # Send VOD_EVENT_COMPLETE / LIVE_EVENT_COMPLETE to Event Bridge 
             # We send this every time the Lambda gets triggered to let schedules be deleted in the
             # Subscriber Lambda
-            put_event_start_to_event_bus(is_vod_event, p_event, program, event, channel_id)
+            put_event_start_to_event_bus(is_vod_event, p_event, program, event_payload, channel_id)
             print("Published VOD_EVENT_COMPLETE / LIVE_EVENT_COMPLETE to Event Bridge")
             
     except Exception as e:
@@ -103,9 +118,8 @@ def lambda_handler(event, context):
         print(traceback.format_exc())
         raise
 
-def put_event_start_to_event_bus(is_vod, event_name, program_name, event, channel_id):
+def put_event_start_to_event_bus(is_vod, event_name, program_name, event_payload, channel_id):
     
-    event_payload = controlplane.get_event(event_name, program_name)
     payload_detail = {
                 "State": "VOD_EVENT_COMPLETE" if is_vod else "LIVE_EVENT_COMPLETE",
                 "Event": event_name,
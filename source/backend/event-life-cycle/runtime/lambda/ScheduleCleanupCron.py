@@ -4,16 +4,24 @@
 ##############################################################################
 #
 # PURPOSE:
-# Deletes all Past EB schedules whose Start time is at least 1 Day old. This is required to ensure that we cleanup 
+# Deletes all Past EB schedules whose Start time is at least 1 Day old. This is required to ensure that we cleanup
 # Old schedules which get accounted in the Schedule Quota limits (which at the time of writing this is 1 Million / Region / Account)
-# 
+#
+# Schedules are created with ActionAfterCompletion set to DELETE, so the Scheduler deletes them once they fire.
+# This CRON sweeps the schedules left behind by older versions of MRE. Schedules last modified within the
+# retention period cannot have fired more than a day ago and are skipped based on the listing alone. The
+# remaining ones are checked and deleted concurrently under a rate limit to stay within the Scheduler API quotas.
+#
 ##############################################################################
 
+import os
 import traceback
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 
 import boto3
 from botocore.config import Config
+from MediaReplayEngineWorkflowHelper import RateLimiter
 
 boto_config = Config(
                 retries = {
@@ -24,44 +32,95 @@ boto_config = Config(
 
 scheduler_client = boto3.client('scheduler', config=boto_config)
 
+SCHEDULE_RETENTION = timedelta(hours=24)
+SCHEDULE_CLEANUP_MAX_WORKERS = int(os.getenv("SCHEDULE_CLEANUP_MAX_WORKERS", "8"))
+SCHEDULE_CLEANUP_MAX_TPS = float(os.getenv("SCHEDULE_CLEANUP_MAX_TPS", "20"))
+
+# Stop picking up new pages of schedules when the Lambda is about to time out. The next run continues from there.
+MIN_REMAINING_TIME_MILLIS = 60000
+
+
+rate_limiter = RateLimiter(SCHEDULE_CLEANUP_MAX_TPS)
+
+
 def lambda_handler(event, context):
-    response = scheduler_client.list_schedules(
-                    MaxResults=100,
-                    NamePrefix='mre-',
-                    State='ENABLED'
-                )
-    
-    start_deletion_process(response)
-    while "NextToken" in response:
-        response = scheduler_client.list_schedules(
-                    MaxResults=100,
-                    NamePrefix='mre-',
-                    State='ENABLED',
-                    NextToken=response['NextToken']
-                )
-        start_deletion_process(response)
-
-def start_deletion_process(response):
-    if 'Schedules' in response:
-        # We will only Delete Schedules in the Past which are at least 24 Hrs old
-        for schedule in response['Schedules']:
-            # Check if the Schedule's are at least 24 hrs old and the Current DateTime is Greater than the Schedule StartTime
-            schedule_obj = scheduler_client.get_schedule(Name=schedule['Name'])
-            if 'ScheduleExpression' in schedule_obj:
-                sch_exp = schedule_obj['ScheduleExpression']    # Will be in this Format 'at(2023-01-24T04:09:00)'
-                actual_schedule_start_time = f"{sch_exp[3: len(sch_exp)-1]}Z"   #2023-01-24T04:09:00Z
-                actual_schedule_start_time = datetime.strptime(actual_schedule_start_time, "%Y-%m-%dT%H:%M:%SZ")
-                new_schedule_start_time = actual_schedule_start_time +  timedelta(hours=24)
-
-                cur_utc_time = datetime.utcnow()
-                if cur_utc_time > new_schedule_start_time:
-                    scheduler_client.delete_schedule(Name=schedule_obj['Name'])
-                    print(f"Deleted Schedule {schedule_obj['Name']} with startTime = {actual_schedule_start_time}")
+    executor = ThreadPoolExecutor(max_workers=SCHEDULE_CLEANUP_MAX_WORKERS)
+    deleted_count = 0
+
+    list_params = {
+        'MaxResults': 100,
+        'NamePrefix': 'mre-',
+        'State': 'ENABLED'
+    }
+
+    try:
+        while True:
+            rate_limiter.acquire()
+            response = scheduler_client.list_schedules(**list_params)
+
+            deleted_count += sum(executor.map(delete_schedule_if_expired, get_cleanup_candidates(response)))
+
+            if "NextToken" not in response:
+                break
+
+            if context and context.get_remaining_time_in_millis() < MIN_REMAINING_TIME_MILLIS:
+                print("Stopping the cleanup as the Lambda is about to time out. The next run will continue from here.")
+                break
+
+            list_params['NextToken'] = response['NextToken']
+
+    finally:
+        executor.shutdown(wait=True)
+
+    print(f"Deleted {deleted_count} schedule(s)")
+
+def get_cleanup_candidates(response):
+    # A one-time schedule cannot fire before it was last modified. So, the schedules modified within the retention
+    # period are not old enough to be deleted and can be skipped without calling get_schedule
+    cutoff_time = datetime.now(timezone.utc) - SCHEDULE_RETENTION
+
+    return [
+        schedule['Name']
+        for schedule in response.get('Schedules', [])
+        if 'LastModificationDate' not in schedule or schedule['LastModificationDate'] < cutoff_time
+    ]
+
+def delete_schedule_if_expired(schedule_name):
+    try:
+        rate_limiter.acquire()
+        schedule_obj = scheduler_client.get_schedule(Name=schedule_name)
+
+    except scheduler_client.exceptions.ResourceNotFoundException:
+        # Already deleted by the Scheduler after completion
+        return False
+
+    except Exception as e:
+        print(f"Encountered an exception while getting a Schedule {schedule_name} {str(e)}.")
+        print(traceback.format_exc())
+        return False
+
+    sch_exp = schedule_obj.get('ScheduleExpression', '')    # Will be in this Format 'at(2023-01-24T04:09:00)'
+    if not sch_exp.startswith('at('):
+        return False
+
+    # We will only Delete Schedules in the Past which are at least 24 Hrs old
+    actual_schedule_start_time = datetime.strptime(sch_exp[3: len(sch_exp)-1], "%Y-%m-%dT%H:%M:%S")    #2023-01-24T04:09:00
+    new_schedule_start_time = actual_schedule_start_time + SCHEDULE_RETENTION
+
+    if datetime.utcnow() <= new_schedule_start_time:
+        return False
+
+    rate_limiter.acquire()
+    return delete_schedule(schedule_name)
 
 def delete_schedule(schedule_name):
     try:
         scheduler_client.delete_schedule(Name=schedule_name)
         print(f"Deleted schedule_name = {schedule_name}")
+        return True
+    except scheduler_client.exceptions.ResourceNotFoundException:
+        return False
     except Exception as e:
         print(f"Encountered an exception while deleting a Schedule {schedule_name} {str(e)}.")
-        print(traceback.format_exc())
\ No newline at end of file
+        print(traceback.format_exc())
+        return False
@@ -22,30 +22,6 @@ boto_config = Config(
             )
 
 scheduler_client = boto3.client('scheduler', config=boto_config)
-medialive_client = boto3.client("medialive")
-
-def get_program_event_from_medialive(channel_id):
-    response = medialive_client.describe_channel(
-        ChannelId=channel_id
-    )
-    destinations = response["Destinations"]
-    
-    program = ""
-    p_event = ""
-    
-    for destination in destinations:
-        if destination["Id"] == "awsmre":
-            url = destination["Settings"][0]["Url"]
-            if len(url.split("/")) == 7: #BYOB Testing via MediaLive
-                program = url.split("/")[3]
-                p_event = url.split("/")[4]
-                break
-            else:
-                program = url.split("/")[4]
-                p_event = url.split("/")[5]
-                break
-        
-    return (program, p_event, response["State"])
 
 def lambda_handler(event, context):
     print(f"Event payload = {json.dumps(event)}")
@@ -208,8 +208,9 @@ def GetEligibleReplays(event, context):
         "OPTIMIZED_SEGMENT_CLIP_FEEDBACK",
     ]:
 
+        # Segments only create Replay Clips for the Catchup Replay Requests
         replay = ReplayEngine(event)
-        replays = replay._get_all_replays_for_opto_segment_end()
+        replays = replay._get_all_catchup_replays_for_opto_segment_end()
         enhance_replay_with_custom_priorities_engine_data(replays)
 
         if len(replays) == 0:
@@ -223,7 +224,8 @@ def GetEligibleReplays(event, context):
 
         event_name = event["detail"]["Segment"]["Event"]
         program_name = event["detail"]["Segment"]["Program"]
-        replays = controlplane.get_all_replays_for_segment_end(event_name, program_name)
+        # Segments only create Replay Clips for the Catchup Replay Requests
+        replays = controlplane.get_all_catchup_replays_for_segment_end(event_name, program_name)
         enhance_replay_with_custom_priorities_engine_data(replays)
 
         if len(replays) == 0:
@@ -233,14 +235,17 @@ def GetEligibleReplays(event, context):
 
 
 def enhance_replay_with_custom_priorities_engine_data(replay):
+    # Replays sharing a Custom Priorities Engine get it from the controlplane only once
+    custom_priorities_engines = {}
+
     if isinstance(replay, list):
         for replay_item in replay:
-            add_custom_priorities_engine_data(replay_item)
+            add_custom_priorities_engine_data(replay_item, custom_priorities_engines)
     else:
-        add_custom_priorities_engine_data(replay)
+        add_custom_priorities_engine_data(replay, custom_priorities_engines)
 
 
-def add_custom_priorities_engine_data(replay):
+def add_custom_priorities_engine_data(replay, custom_priorities_engines=None):
     if "CustomPrioritiesEngine" in replay["Priorities"]:
         if (
             "CustomPrioritiesEngineName"
@@ -251,11 +256,20 @@ def add_custom_priorities_engine_data(replay):
         name = replay["Priorities"]["CustomPrioritiesEngine"][
             "CustomPrioritiesEngineName"
         ]
-        custom_priorities_engine = controlplane.get_custom_priorities_engine(name)
 
-        logger.info(
-            f"Control plane response for Custom Priorities Engine {name}: {custom_priorities_engine}"
-        )
+        if custom_priorities_engines is not None and name in custom_priorities_engines:
+            custom_priorities_engine = custom_priorities_engines[name]
+
+        else:
+            custom_priorities_engine = controlplane.get_custom_priorities_engine(name)
+
+            logger.info(
+                f"Control plane response for Custom Priorities Engine {name}: {custom_priorities_engine}"
+            )
+
+            if custom_priorities_engines is not None:
+                custom_priorities_engines[name] = custom_priorities_engine
+
         if custom_priorities_engine is None or not custom_priorities_engine["Enabled"]:
             raise (
                 Exception(
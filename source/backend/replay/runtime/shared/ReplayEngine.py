@@ -1473,6 +1473,14 @@ class ReplayEngine:
             self._program, self._event, int(self._audio_track)
         )
 
+    def _get_all_catchup_replays_for_opto_segment_end(self):
+        """
+        Returns all active Catchup Replay Requests for the Program/Event and Audio Track
+        """
+        return self._controlplane.get_all_catchup_replays_for_segment_end(
+            self._event, self._program, int(self._audio_track)
+        )
+
     def _is_catch_up_enabled(self):
         """
         Checks if a Replay Request is for Catch Up or not.
@@ -7,8 +7,10 @@ from aws_cdk import (
     Duration,
     aws_iam as iam,
     aws_lambda as _lambda,
+    aws_lambda_event_sources as _lambda_es,
     aws_s3 as s3,
     aws_s3_notifications as s3n,
+    aws_sqs as sqs,
 )
 from cdk_nag import NagSuppressions
 
@@ -112,15 +114,50 @@ class ChaliceApp(Stack):
             memory_size=128,
             timeout=Duration.minutes(1),
             layers=[self.mre_workflow_helper_layer],
+            environment={
+                "EVENT_CACHE_TTL_SECONDS": "30",
+                "START_EXECUTION_MAX_WORKERS": "10",
+            },
         )
 
-        # S3 Event Source for TriggerMREWorkflow Lambda
+        # SQS Queue used to batch the S3 notifications of the MRE media source bucket
+        # S3 cannot publish to a queue encrypted with the AWS managed KMS key and hence SSE-SQS
+        self.trigger_mre_workflow_dlq = sqs.Queue(
+            self,
+            "TriggerMREWorkflowDLQ",
+            encryption=sqs.QueueEncryption.SQS_MANAGED,
+            enforce_ssl=True,
+        )
+
+        self.trigger_mre_workflow_queue = sqs.Queue(
+            self,
+            "TriggerMREWorkflowQueue",
+            retention_period=Duration.days(1),
+            visibility_timeout=Duration.minutes(6),
+            encryption=sqs.QueueEncryption.SQS_MANAGED,
+            enforce_ssl=True,
+            dead_letter_queue=sqs.DeadLetterQueue(
+                max_receive_count=5, queue=self.trigger_mre_workflow_dlq
+            ),
+        )
+
+        # S3 Event Source for TriggerMREWorkflow Lambda (through the SQS Queue)
         self.mre_media_source_bucket.add_event_notification(
             s3.EventType.OBJECT_CREATED,
-            s3n.LambdaDestination(self.trigger_mre_workflow_lambda),
+            s3n.SqsDestination(self.trigger_mre_workflow_queue),
             s3.NotificationKeyFilter(suffix=".ts"),
         )
 
+        # TriggerMREWorkflow Lambda: SQS Event Source
+        # No batching window so that a chunk is never held back waiting for others
+        self.trigger_mre_workflow_lambda.add_event_source(
+            _lambda_es.SqsEventSource(
+                queue=self.trigger_mre_workflow_queue,
+                batch_size=10,
+                report_batch_item_failures=True,
+            )
+        )
+
         # BYOB permissions to allow S3 buckets to invoke SF
         byob_permission = _lambda.CfnPermission(
             self,
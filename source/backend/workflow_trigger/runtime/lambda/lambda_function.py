@@ -4,36 +4,146 @@
 ##############################################################################
 #
 # PURPOSE:
-# Execute MRE StepFunction workflow for every HLS video segment (.ts) file 
+# Execute MRE StepFunction workflow for every HLS video segment (.ts) file
 # stored in S3
 #
+# The S3 notifications are received either directly from S3 (BYOB) or batched
+# through the MRE workflow trigger SQS queue. Records of a batch are grouped
+# by event so that the event and profile lookups are done once per event and
+# cached across invocations of the same Lambda container.
+#
 ##############################################################################
 
 import json
+import os
+import threading
+import time
 import traceback
 import urllib.parse
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 
 import boto3
 from MediaReplayEngineWorkflowHelper import ControlPlane
 
+# Number of seconds the event and profile details are cached for
+EVENT_CACHE_TTL_SECONDS = int(os.getenv("EVENT_CACHE_TTL_SECONDS", "30"))
+START_EXECUTION_MAX_WORKERS = int(os.getenv("START_EXECUTION_MAX_WORKERS", "10"))
+
 sfn = boto3.client('stepfunctions')
 
+executor = ThreadPoolExecutor(max_workers=START_EXECUTION_MAX_WORKERS)
 
-def lambda_handler(event, context):
-    controlplane = ControlPlane()
-    
-    execution_id = str(uuid.uuid4())
-    
-    s3_bucket = event['Records'][0]['s3']['bucket']['name']
-    s3_key = event['Records'][0]['s3']['object']['key']
-
-    print(f"s3_key={s3_key}")
-    print(f"s3_bucket={s3_bucket}")
-    
-    # UnquotePlus the URL encoded S3 Key
-    s3_key = urllib.parse.unquote_plus(s3_key)
-    
+# (program, event, profile) -> (expiry, event context)
+event_cache = {}
+event_cache_lock = threading.Lock()
+
+
+def get_cached_event_context(program, p_event, profile):
+    with event_cache_lock:
+        cached = event_cache.get((program, p_event, profile))
+
+    if cached and cached[0] > time.time():
+        return cached[1]
+
+    return None
+
+
+def put_cached_event_context(program, p_event, profile, event_context):
+    # Never cache past the scheduled end of the event as its status is about to change to Complete then
+    expiry = min(time.time() + EVENT_CACHE_TTL_SECONDS, event_context["EndTime"])
+
+    if expiry <= time.time():
+        invalidate_cached_event_context(program, p_event, profile)
+        return
+
+    with event_cache_lock:
+        event_cache[(program, p_event, profile)] = (expiry, event_context)
+
+
+def invalidate_cached_event_context(program, p_event, profile):
+    with event_cache_lock:
+        event_cache.pop((program, p_event, profile), None)
+
+
+def get_event_end_time(mre_event):
+    """
+    Get the time (in seconds since the epoch) at which the event is scheduled to end.
+    A VOD event ends at CREATED + BOOTSTRAP + EVENT DURATION and a LIVE event at START + EVENT DURATION.
+    """
+    event_creation_time_utc = datetime.strptime(mre_event["Created"], "%Y-%m-%dT%H:%M:%SZ")
+    event_start_time_utc = datetime.strptime(mre_event["Start"], "%Y-%m-%dT%H:%M:%SZ")
+    duration = timedelta(minutes=int(mre_event["DurationMinutes"]))
+
+    if event_start_time_utc < event_creation_time_utc:
+        event_end_time_utc = event_creation_time_utc + timedelta(minutes=int(mre_event.get("BootstrapTimeInMinutes", 0))) + duration
+    else:
+        event_end_time_utc = event_start_time_utc + duration
+
+    return (event_end_time_utc - datetime(1970, 1, 1)).total_seconds()
+
+
+def get_event_context(controlplane, program, p_event, profile):
+    """
+    Get the event details, event status and StepFunction ARN needed to start the workflow executions of an event.
+    Only the events already "In Progress" are cached as any other status is about to change (or is final).
+    The cache entry expires no later than the scheduled end of the event so that its completion is picked up.
+    """
+    event_context = get_cached_event_context(program, p_event, profile)
+
+    if event_context:
+        return event_context
+
+    print(f"Getting the Event details and StepFunction ARN from the Control plane")
+    mre_event = controlplane.get_event(p_event, program)
+
+    event_context = {
+        "Event": {
+            "Name": p_event,
+            "Program": program,
+            "Start": mre_event["Start"],
+            "GenerateOrigClips": mre_event["GenerateOrigClips"],
+            "GenerateOptoClips": mre_event["GenerateOptoClips"],
+            "GenerateOrigThumbNails": mre_event["GenerateOrigThumbNails"],
+            "GenerateOptoThumbNails": mre_event["GenerateOptoThumbNails"]
+        },
+        "Status": mre_event["Status"],
+        "EndTime": get_event_end_time(mre_event),
+        "StateMachineArn": controlplane.get_profile(profile)["StateMachineArn"]
+    }
+
+    if event_context["Status"] == "In Progress":
+        put_cached_event_context(program, p_event, profile, event_context)
+
+    return event_context
+
+
+def parse_s3_records(event):
+    """
+    Extract the S3 records from either a direct S3 notification or a batch of SQS messages
+    carrying S3 notifications.
+
+    Returns:
+
+        List of (SQS message id, S3 record) tuples. The message id is None for the direct S3 notifications.
+    """
+    s3_records = []
+
+    for record in event.get("Records", []):
+        if record.get("eventSource") == "aws:sqs":
+            body = json.loads(record["body"])
+
+            # Skip the test notification sent by S3 when the queue is configured as the destination
+            for s3_record in body.get("Records", []):
+                s3_records.append((record["messageId"], s3_record))
+        else:
+            s3_records.append((None, record))
+
+    return s3_records
+
+
+def parse_s3_key(s3_key):
     if len(s3_key.split("/")) == 3: #BYOB
         # Get the program, event and profile from the S3 Key
         program = s3_key.split("/")[0]
@@ -44,61 +154,148 @@ def lambda_handler(event, context):
         program = s3_key.split("/")[-4]
         p_event = s3_key.split("/")[-3]
         profile = s3_key.split("/")[-2]
-    
-    try:
-        print(f"Getting the Event details and StepFunction ARN from the Control plane")
-        mre_event = controlplane.get_event(p_event, program)
-        event_start_time = mre_event["Start"]
-        generate_orig_clips = mre_event["GenerateOrigClips"]
-        generate_opto_clips = mre_event["GenerateOptoClips"]
-        generate_orig_thumbnails = mre_event["GenerateOrigThumbNails"]
-        generate_opto_thumbnails = mre_event["GenerateOptoThumbNails"]
-        sfn_arn = controlplane.get_profile(profile)["StateMachineArn"]
-        
-        sfn_input = {
-            "Event": {
-                "Name": p_event,
-                "Program": program,
-                "Start": event_start_time,
-                "GenerateOrigClips": generate_orig_clips,
-                "GenerateOptoClips": generate_opto_clips,
-                "GenerateOrigThumbNails": generate_orig_thumbnails,
-                "GenerateOptoThumbNails": generate_opto_thumbnails
-            },
-            "Input": {
-                "ExecutionId": execution_id,
-                "Media": {
-                    "S3Bucket": s3_bucket,
-                    "S3Key": s3_key
-                }
+
+    return program, p_event, profile
+
+
+def get_execution_id(s3_bucket, s3_key, sequencer):
+    """
+    Derive the StepFunction execution name from the S3 object notification so that a redelivered notification
+    maps to the same execution instead of starting a duplicate one.
+    """
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"s3://{s3_bucket}/{s3_key}?sequencer={sequencer}"))
+
+
+def start_execution(sfn_arn, event_details, s3_bucket, s3_key, sequencer):
+    execution_id = get_execution_id(s3_bucket, s3_key, sequencer)
+
+    sfn_input = {
+        "Event": event_details,
+        "Input": {
+            "ExecutionId": execution_id,
+            "Media": {
+                "S3Bucket": s3_bucket,
+                "S3Key": s3_key
             }
         }
-        
-        print(f"Starting the StepFunction execution of '{sfn_arn}' for bucket '{s3_bucket}' and key '{s3_key}'")
+    }
 
-        
-        event_status = controlplane.get_event_status(p_event, program)
+    print(f"Starting the StepFunction execution '{execution_id}' of '{sfn_arn}' for bucket '{s3_bucket}' and key '{s3_key}'")
 
-        if event_status == "Complete":
-            print(f"Event status is Complete. Not starting StepFunction execution for arriving chunks event '{p_event}' in program '{program}'.")
-            return
-        
+    try:
         sfn.start_execution(
             stateMachineArn=sfn_arn,
             name=execution_id,
             input=json.dumps(sfn_input),
         )
-        
-        print("Successfully started the StepFunction execution")
-        
-        
-        # Update the status of event to "In Progress" if not done already
-        if event_status != "In Progress":
-            print(f"Updating the status of event '{p_event}' in program '{program}' to 'In Progress'")
-            controlplane.put_event_status(p_event, program, "In Progress")
-    
+
+    except sfn.exceptions.ExecutionAlreadyExists:
+        print(f"StepFunction execution '{execution_id}' already exists for bucket '{s3_bucket}' and key '{s3_key}'")
+        return
+
+    print(f"Successfully started the StepFunction execution '{execution_id}'")
+
+
+def process_event_records(controlplane, program, p_event, profile, records):
+    """
+    Start the StepFunction executions of all the records received for an event.
+
+    Returns:
+
+        List of the records that failed to be processed
+    """
+    try:
+        event_context = get_event_context(controlplane, program, p_event, profile)
+
     except Exception as e:
-        print(f"Encountered an exception while starting the step function execution: {str(e)}")
+        print(f"Encountered an exception while getting the details of event '{p_event}' in program '{program}': {str(e)}")
         print(traceback.format_exc())
-        raise Exception(e)
-        
\ No newline at end of file
+        return records
+
+    if event_context["Status"] == "Complete":
+        print(f"Event status is Complete. Not starting StepFunction execution for arriving chunks event '{p_event}' in program '{program}'.")
+        return []
+
+    futures = [
+        (record, executor.submit(
+            start_execution,
+            event_context["StateMachineArn"],
+            event_context["Event"],
+            record["S3Bucket"],
+            record["S3Key"],
+            record["Sequencer"]
+        ))
+        for record in records
+    ]
+
+    failed_records = []
+
+    for record, future in futures:
+        try:
+            future.result()
+
+        except Exception as e:
+            print(f"Encountered an exception while starting the step function execution for key '{record['S3Key']}': {str(e)}")
+            print(traceback.format_exc())
+            failed_records.append(record)
+
+    # Update the status of event to "In Progress" if not done already
+    if event_context["Status"] != "In Progress" and len(failed_records) < len(records):
+        try:
+            print(f"Updating the status of event '{p_event}' in program '{program}' to 'In Progress'")
+            controlplane.put_event_status(p_event, program, "In Progress")
+
+            # Cache the event from here on as its status is now known
+            put_cached_event_context(program, p_event, profile, {**event_context, "Status": "In Progress"})
+
+        except Exception as e:
+            print(f"Encountered an exception while updating the status of event '{p_event}' in program '{program}': {str(e)}")
+            print(traceback.format_exc())
+            invalidate_cached_event_context(program, p_event, profile)
+            return records
+
+    return failed_records
+
+
+def lambda_handler(event, context):
+    controlplane = ControlPlane()
+
+    # (program, event, profile) -> list of records
+    event_records = {}
+
+    for message_id, s3_record in parse_s3_records(event):
+        s3_bucket = s3_record['s3']['bucket']['name']
+        s3_key = s3_record['s3']['object']['key']
+
+        print(f"s3_key={s3_key}")
+        print(f"s3_bucket={s3_bucket}")
+
+        # UnquotePlus the URL encoded S3 Key
+        s3_key = urllib.parse.unquote_plus(s3_key)
+
+        event_records.setdefault(parse_s3_key(s3_key), []).append({
+            "MessageId": message_id,
+            "S3Bucket": s3_bucket,
+            "S3Key": s3_key,
+            "Sequencer": s3_record['s3']['object'].get('sequencer', "")
+        })
+
+    failed_records = []
+
+    for (program, p_event, profile), records in event_records.items():
+        failed_records.extend(process_event_records(controlplane, program, p_event, profile, records))
+
+    if not failed_records:
+        return {"batchItemFailures": []}
+
+    # Direct S3 notifications are retried by failing the invocation
+    if any(record["MessageId"] is None for record in failed_records):
+        raise Exception(f"Failed to start the StepFunction execution for {len(failed_records)} chunk(s)")
+
+    # Only the failed SQS messages are retried
+    return {
+        "batchItemFailures": [
+            {"itemIdentifier": message_id}
+            for message_id in sorted({record["MessageId"] for record in failed_records})
+        ]
+    }
@@ -1,8 +1,14 @@
+import hashlib
 import os
+import threading
+import time
+from collections import OrderedDict
 from chalice import IAMAuthorizer
 from chalice import Chalice, AuthResponse
 from chalice import ChaliceViewError, BadRequestError, NotFoundError, ConflictError
 import requests
+from requests.adapters import HTTPAdapter
+from http.cookiejar import DefaultCookiePolicy
 import boto3
 from chalice import Response
 import json
@@ -16,6 +22,24 @@ sec_client = session.client(service_name="secretsmanager")
 API_AUTH_SECRET_KEY_NAME = os.environ["API_AUTH_SECRET_KEY_NAME"]
 MRE_JWT_ISSUER = os.environ["MRE_JWT_ISSUER"]
 
+# Number of seconds the JWT signing key is kept in memory before it is fetched again from Secrets Manager
+API_AUTH_SECRET_TTL_SECONDS = int(os.getenv("API_AUTH_SECRET_TTL_SECONDS", "300"))
+
+# Fraction of the TTL after which the signing key is refreshed in the background
+API_AUTH_SECRET_REFRESH_AHEAD = 0.8
+
+# Minimum number of seconds between the refreshes forced by a token not matching the cached signing key
+API_AUTH_SECRET_MIN_FORCED_REFRESH_SECONDS = 30
+
+# Number of seconds after a rotation during which the tokens signed with the previous signing key are accepted
+API_AUTH_SECRET_PREVIOUS_GRACE_SECONDS = int(os.getenv("API_AUTH_SECRET_PREVIOUS_GRACE_SECONDS", "3600"))
+
+# Maximum number of verified tokens remembered until they expire
+VERIFIED_TOKEN_CACHE_SIZE = int(os.getenv("VERIFIED_TOKEN_CACHE_SIZE", "1024"))
+
+# Number of seconds API Gateway caches the result of the authorizer for a token
+AUTHORIZER_RESULT_TTL_SECONDS = 300
+
 SERVICE_ROUTER = {
     "PluginUrl": os.environ["PLUGIN_URL"],
     "SystemUrl": os.environ["SYSTEM_URL"],
@@ -31,16 +55,242 @@ SERVICE_ROUTER = {
 }
 
 
+# First path segment of the request -> Controlplane API serving it
+API_ROUTES = {
+    "plugin": SERVICE_ROUTER["PluginUrl"],
+    "system": SERVICE_ROUTER["SystemUrl"],
+    "profile": SERVICE_ROUTER["ProfileUrl"],
+    "model": SERVICE_ROUTER["ModelUrl"],
+    "event": SERVICE_ROUTER["EventUrl"],
+    "contentgroup": SERVICE_ROUTER["ContentGroupUrl"],
+    "program": SERVICE_ROUTER["ProgramUrl"],
+    "workflow": SERVICE_ROUTER["WorkflowUrl"],
+    "replay": SERVICE_ROUTER["ReplayUrl"],
+    "custompriorities": SERVICE_ROUTER["CustomPrioritiesUrl"],
+}
+
+## PromptCatalog is optional so it is routed only when it exists
+if SERVICE_ROUTER["PromptCatalogUrl"]:
+    API_ROUTES["prompt"] = SERVICE_ROUTER["PromptCatalogUrl"]
+
+# Maximum number of keep-alive connections kept open to each Controlplane API
+DESTINATION_POOL_MAXSIZE = int(os.getenv("DESTINATION_POOL_MAXSIZE", "10"))
+
+# Controlplane API url -> requests Session reusing the connections across invocations
+destination_sessions = {}
+
+iam_auth_cache = {"Credentials": None, "Auth": None}
+
+
 def get_iam_auth():
-    return AWS4Auth(
+    """
+    Get the SigV4 auth for the Controlplane APIs. It is built again only when the credentials of the
+    Lambda function change.
+    """
+    credentials = (
         os.environ["AWS_ACCESS_KEY_ID"],
         os.environ["AWS_SECRET_ACCESS_KEY"],
-        os.environ["AWS_REGION"],
-        "execute-api",
-        session_token=os.getenv("AWS_SESSION_TOKEN"),
+        os.getenv("AWS_SESSION_TOKEN"),
     )
 
-@app.authorizer()
+    if iam_auth_cache["Credentials"] != credentials:
+        iam_auth_cache["Auth"] = AWS4Auth(
+            credentials[0],
+            credentials[1],
+            os.environ["AWS_REGION"],
+            "execute-api",
+            session_token=credentials[2],
+        )
+        iam_auth_cache["Credentials"] = credentials
+
+    return iam_auth_cache["Auth"]
+
+
+def get_destination_session(dest_url):
+    """
+    Get the pooled (keep-alive) session of a Controlplane API.
+    """
+    if dest_url not in destination_sessions:
+        session = requests.Session()
+        session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=1, pool_maxsize=DESTINATION_POOL_MAXSIZE),
+        )
+
+        # Do not carry cookies over from one proxied request to another
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+        destination_sessions[dest_url] = session
+
+    return destination_sessions[dest_url]
+
+class SigningKeyCache:
+    """
+    In-memory cache of the JWT signing key (shared secret) stored in Secrets Manager.
+
+    Both the AWSCURRENT and AWSPREVIOUS versions of the secret are kept so that the tokens signed
+    just before a rotation continue to verify. The AWSPREVIOUS version is only accepted for
+    API_AUTH_SECRET_PREVIOUS_GRACE_SECONDS after the AWSCURRENT version was created. The keys are
+    refreshed in the background once they are past API_AUTH_SECRET_REFRESH_AHEAD of their TTL and
+    synchronously once they have expired.
+    """
+
+    def __init__(self, secret_id, ttl_seconds):
+        self.secret_id = secret_id
+        self.ttl_seconds = ttl_seconds
+        self.lock = threading.Lock()
+        self.refresh_in_progress = False
+        self.keys = []
+        self.version_id = None
+        self.fetched_at = 0
+        self.previous_key_expires_at = 0
+
+    def fetch(self):
+        current = sec_client.get_secret_value(
+            SecretId=self.secret_id, VersionStage="AWSCURRENT"
+        )
+        keys = [current["SecretString"]]
+        previous_key_expires_at = current["CreatedDate"].timestamp() + API_AUTH_SECRET_PREVIOUS_GRACE_SECONDS
+
+        if time.time() < previous_key_expires_at:
+            try:
+                previous = sec_client.get_secret_value(
+                    SecretId=self.secret_id, VersionStage="AWSPREVIOUS"
+                )
+                keys.append(previous["SecretString"])
+
+            except sec_client.exceptions.ResourceNotFoundException:
+                # The secret has not been rotated yet
+                pass
+
+        with self.lock:
+            if self.version_id != current["VersionId"]:
+                # Tokens verified with the keys of the previous rotation are verified again
+                verified_tokens.clear()
+
+            self.keys = keys
+            self.version_id = current["VersionId"]
+            self.fetched_at = time.time()
+            self.previous_key_expires_at = previous_key_expires_at
+            self.refresh_in_progress = False
+
+    def refresh_in_background(self):
+        with self.lock:
+            if self.refresh_in_progress:
+                return
+
+            self.refresh_in_progress = True
+
+        def refresh():
+            try:
+                self.fetch()
+            except Exception as e:
+                print(f"Unable to refresh the API auth secret: {str(e)}")
+
+                with self.lock:
+                    self.refresh_in_progress = False
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def get_keys(self, force_refresh=False):
+        with self.lock:
+            keys = self.keys
+            age = time.time() - self.fetched_at
+
+        # Forced refreshes are rate limited so that invalid tokens cannot drive calls to Secrets Manager
+        if force_refresh and age < API_AUTH_SECRET_MIN_FORCED_REFRESH_SECONDS:
+            force_refresh = False
+
+        if force_refresh or not keys or age >= self.ttl_seconds:
+            self.fetch()
+
+        elif age >= self.ttl_seconds * API_AUTH_SECRET_REFRESH_AHEAD:
+            self.refresh_in_background()
+
+        with self.lock:
+            if len(self.keys) > 1 and time.time() >= self.previous_key_expires_at:
+                # The grace period of the previous key is over. Tokens verified with it are verified again
+                self.keys = self.keys[:1]
+                verified_tokens.clear()
+
+            return self.keys
+
+
+class VerifiedTokenCache:
+    """
+    LRU cache of the tokens that passed verification, mapped to their expiration time.
+    Only a hash of the token is kept.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.tokens = OrderedDict()
+
+    @staticmethod
+    def get_key(token):
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def is_verified(self, token):
+        key = self.get_key(token)
+
+        with self.lock:
+            if key not in self.tokens:
+                return False
+
+            if self.tokens[key] <= time.time():
+                del self.tokens[key]
+                return False
+
+            self.tokens.move_to_end(key)
+            return True
+
+    def add(self, token, expires_at):
+        key = self.get_key(token)
+
+        with self.lock:
+            self.tokens[key] = expires_at
+            self.tokens.move_to_end(key)
+
+            while len(self.tokens) > self.max_size:
+                self.tokens.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.tokens.clear()
+
+
+signing_keys = SigningKeyCache(API_AUTH_SECRET_KEY_NAME, API_AUTH_SECRET_TTL_SECONDS)
+verified_tokens = VerifiedTokenCache(VERIFIED_TOKEN_CACHE_SIZE)
+
+
+def verify_token(token, validation_options):
+    """
+    Verify the token signature against the cached signing keys (current first, then previous).
+    The keys are fetched again once if none of them match in case the secret was rotated
+    after they were cached.
+
+    Returns:
+
+        Decoded claims of the token
+    """
+    for force_refresh in [False, True]:
+        for key in signing_keys.get_keys(force_refresh=force_refresh):
+            try:
+                return jwt.decode(
+                    token,
+                    key,
+                    algorithms=["HS512"],
+                    options=validation_options
+                )
+
+            except jwt.InvalidSignatureError:
+                continue
+
+    raise jwt.InvalidSignatureError("Signature verification failed")
+
+
+@app.authorizer(ttl_seconds=AUTHORIZER_RESULT_TTL_SECONDS)
 def token_auth(auth_request):
     """
     Custom Authorizer: Provides API Auth using HS512 (HMAC) based Authentication 
@@ -65,11 +315,6 @@ def token_auth(auth_request):
 
     """
     try:
-        # Get the secret from AWS Secrets Manager
-        get_secret_value_response = sec_client.get_secret_value(
-            SecretId=API_AUTH_SECRET_KEY_NAME
-        )
-
         # Configure validation options
         validation_options = {
             "verify_signature": True,
@@ -82,13 +327,10 @@ def token_auth(auth_request):
 
         # Clean and decode the token
         token = auth_request.token.replace("Bearer", "").strip()
-        
-        jwt.decode(
-            token,
-            get_secret_value_response["SecretString"],
-            algorithms=["HS512"],
-            options=validation_options
-        )
+
+        if not verified_tokens.is_verified(token):
+            claims = verify_token(token, validation_options)
+            verified_tokens.add(token, claims["exp"])
 
         # If successful, return authorized response
         return AuthResponse(routes=[f"/external/*"], principal_id="user")
@@ -259,36 +501,9 @@ def get_api_url_by_route(uri_params):
     """
     Gets API Endpoint Url based on the Uri Params
     """
-    params = uri_params["proxy"].lower()
-    if params.startswith("/plugin") or params.startswith("plugin"):
-        return SERVICE_ROUTER["PluginUrl"]
-    elif params.startswith("/system") or params.startswith("system"):
-        return SERVICE_ROUTER["SystemUrl"]
-    elif params.startswith("/profile") or params.startswith("profile"):
-        return SERVICE_ROUTER["ProfileUrl"]
-    elif params.startswith("/model") or params.startswith("model"):
-        return SERVICE_ROUTER["ModelUrl"]
-    elif params.startswith("/event") or params.startswith("event"):
-        return SERVICE_ROUTER["EventUrl"]
-    elif params.startswith("/contentgroup") or params.startswith("contentgroup"):
-        return SERVICE_ROUTER["ContentGroupUrl"]
-    elif params.startswith("/program") or params.startswith("program"):
-        return SERVICE_ROUTER["ProgramUrl"]
-    elif params.startswith("/workflow") or params.startswith("workflow"):
-        return SERVICE_ROUTER["WorkflowUrl"]
-    elif params.startswith("/replay") or params.startswith("replay"):
-        return SERVICE_ROUTER["ReplayUrl"]
-    elif params.startswith("/custompriorities") or params.startswith(
-        "custompriorities"
-    ):
-        return SERVICE_ROUTER["CustomPrioritiesUrl"]
-    ## PromptCatalog is optional so we double check it exists here also
-    elif (
-        params.startswith("/prompt") or params.startswith("prompt")
-    ) and SERVICE_ROUTER["PromptCatalogUrl"]:
-        return SERVICE_ROUTER["PromptCatalogUrl"]
-    else:
-        return ""
+    route = uri_params["proxy"].lower().lstrip("/").split("/", 1)[0]
+
+    return API_ROUTES.get(route, "")
 
 
 def invoke_destination_api(api_method, uri_params, api_headers=None, api_body=None):
@@ -301,14 +516,25 @@ def invoke_destination_api(api_method, uri_params, api_headers=None, api_body=No
 
         if api_method in ["GET", "DELETE"]:
 
-            res = requests.request(
+            # Pass the conditional GET header through so that the clients can revalidate their cached copy
+            conditional_headers = (
+                {"If-None-Match": api_headers["if-none-match"]}
+                if api_headers and "if-none-match" in api_headers
+                else None
+            )
+
+            res = get_destination_session(dest_url).request(
                 method=api_method,
                 url=f"{dest_url}{uri_params}",
+                headers=conditional_headers,
                 verify=True,
                 params=app.current_request.query_params,
                 auth=get_iam_auth(),
             )
 
+            if res.status_code == 304:
+                return Response(body="", status_code=304, headers={"ETag": res.headers.get("ETag", "")})
+
             if api_headers:
                 if "accept" in api_headers:
                     if "application/octet-stream" in api_headers["accept"]:
@@ -321,7 +547,7 @@ def invoke_destination_api(api_method, uri_params, api_headers=None, api_body=No
                         )
 
         elif api_method in ["PUT", "POST", "PATCH"]:
-            res = requests.request(
+            res = get_destination_session(dest_url).request(
                 method=api_method,
                 url=f"{dest_url}{uri_params}",
                 headers=api_headers,
@@ -360,6 +586,16 @@ def invoke_destination_api(api_method, uri_params, api_headers=None, api_body=No
         print(e)
         raise
     else:
+        if "ETag" in res.headers:
+            return Response(
+                body=res.text,
+                status_code=res.status_code,
+                headers={
+                    "Content-Type": res.headers.get("Content-Type", "application/json"),
+                    "ETag": res.headers["ETag"],
+                },
+            )
+
         return res.content
 
 
@@ -11,6 +11,7 @@
 
 import os
 import re
+import gzip
 import json
 import urllib.parse
 import urllib3
@@ -33,6 +34,8 @@ ssm_client = boto3.client("ssm", region_name=os.environ["AWS_REGION"])
 ## Init dict for caching params
 _PARAM_CACHE = {}
 
+GZIP_CONTENT_TYPE = "application/gzip"
+
 
 def get_dataplane_url():
     return _PARAM_CACHE.get("/MRE/DataPlane/EndpointURL")
@@ -991,17 +994,20 @@ class DataPlane:
                     )
         return api_response
 
-    def get_segment_state_for_labeling(self):
+    def get_segment_state_for_labeling(self, projection=None):
         """
         Method to retrieve one or more complete, unlabeled segments identified in the current/prior chunks and
         all the Labeler dependent plugins output associated with those segments from the Data plane.
 
+        :param projection: (optional) Dictionary of dependent plugin name to the list of output attributes to retrieve
+        for that plugin. All the attributes are retrieved for the dependent plugins not included in the dictionary.
+
         :return: Data plane response
         """
 
         path = "/workflow/labeling/segment/state"
         method = "POST"
-        headers = {"Content-Type": "application/json"}
+        headers = {"Content-Type": "application/json", "Accept": GZIP_CONTENT_TYPE}
 
         body = {
             "Program": self.program,
@@ -1011,6 +1017,9 @@ class DataPlane:
             "ChunkNumber": self.get_chunk_number(self.filename),
         }
 
+        if projection:
+            body["Projection"] = projection
+
         api_response = self.__segment_state_for_labeling_transformation(
             path, method, headers, body
         )
@@ -1020,9 +1029,11 @@ class DataPlane:
     def __segment_state_for_labeling_transformation(self, path, method, headers, body):
         api_response = []
         last_eval_keys = {}
-        results = self.invoke_dataplane_api(
-            path, method, headers=headers, body=json.dumps(body)
-        ).json()
+        results = self.__get_response_json(
+            self.invoke_dataplane_api(
+                path, method, headers=headers, body=json.dumps(body)
+            )
+        )
         print(results)
         if results and "Segment" in results:
             segment = results["Segment"]["Item"]
@@ -1036,9 +1047,11 @@ class DataPlane:
             )
             new_body = {**{"LastEvaluatedKeys": last_eval_keys}, **body}
             while len(last_eval_keys) > 1:
-                results = self.invoke_dataplane_api(
-                    path, method, headers=headers, body=json.dumps(new_body)
-                ).json()
+                results = self.__get_response_json(
+                    self.invoke_dataplane_api(
+                        path, method, headers=headers, body=json.dumps(new_body)
+                    )
+                )
                 process_label_plugin_output(
                     results, last_eval_keys, dependent_plugin_output
                 )
@@ -1047,9 +1060,11 @@ class DataPlane:
                 {"Segment": segment, "DependentPluginsOutput": dependent_plugin_output}
             )
             while "Segment" in results and "LastEvaluatedKey" in results["Segment"]:
-                results = self.invoke_dataplane_api(
-                    path, method, headers=headers, body=json.dumps(new_body)
-                ).json()
+                results = self.__get_response_json(
+                    self.invoke_dataplane_api(
+                        path, method, headers=headers, body=json.dumps(new_body)
+                    )
+                )
                 if results and "Segment" in results:
                     segment = results["Segment"]["Item"]
                     if "LastEvaluatedKey" in results["Segment"]:
@@ -1064,9 +1079,11 @@ class DataPlane:
                     )
                     new_body = {**{"LastEvaluatedKeys": last_eval_keys}, **body}
                     while len(last_eval_keys) > 1:
-                        results = self.invoke_dataplane_api(
-                            path, method, headers=headers, body=json.dumps(new_body)
-                        ).json()
+                        results = self.__get_response_json(
+                            self.invoke_dataplane_api(
+                                path, method, headers=headers, body=json.dumps(new_body)
+                            )
+                        )
                         process_label_plugin_output(
                             results, last_eval_keys, dependent_plugin_output
                         )
@@ -1079,19 +1096,21 @@ class DataPlane:
                     )
         return api_response
 
-    def get_segment_state_for_optimization(self, search_window_sec=0):
+    def get_segment_state_for_optimization(self, search_window_sec=0, projection=None):
         """
         Method to retrieve one or more non-optimized segments identified in the current/prior chunks and all the
         dependent detectors output around the segments for optimization from the Data plane.
 
         :param search_window_sec: Maximum time window to consider when querying for the dependent detectors output
+        :param projection: (optional) Dictionary of dependent detector name to the list of output attributes to retrieve
+        for that detector. All the attributes are retrieved for the detectors not included in the dictionary.
 
         :return: Data plane response
         """
 
         path = "/workflow/optimization/segment/state"
         method = "POST"
-        headers = {"Content-Type": "application/json"}
+        headers = {"Content-Type": "application/json", "Accept": GZIP_CONTENT_TYPE}
 
         detectors = []
 
@@ -1117,6 +1136,9 @@ class DataPlane:
         if self.audio_track:
             body["AudioTrack"] = self.audio_track
 
+        if projection:
+            body["Projection"] = projection
+
         # api_response = self.invoke_dataplane_api(path, method, headers=headers, body=json.dumps(body))
         api_response = self.__segment_state_for_optimization_transformation(
             path, method, headers, body
@@ -1130,9 +1152,11 @@ class DataPlane:
     ):
         api_response = []
         last_eval_keys = {}
-        results = self.invoke_dataplane_api(
-            path, method, headers=headers, body=json.dumps(body)
-        ).json()
+        results = self.__get_response_json(
+            self.invoke_dataplane_api(
+                path, method, headers=headers, body=json.dumps(body)
+            )
+        )
         if results and "Segment" in results:
             segment = results["Segment"]["Item"]
             if "LastEvaluatedKey" in results["Segment"]:
@@ -1150,9 +1174,11 @@ class DataPlane:
             )
             while "Segment" in results and "LastEvaluatedKey" in results["Segment"]:
                 # Add keys to request to add
-                results = self.invoke_dataplane_api(
-                    path, method, headers=headers, body=json.dumps(new_body)
-                ).json()
+                results = self.__get_response_json(
+                    self.invoke_dataplane_api(
+                        path, method, headers=headers, body=json.dumps(new_body)
+                    )
+                )
                 if results and "Segment" in results:
                     segment = results["Segment"]["Item"]
                     if "LastEvaluatedKey" in results["Segment"]:
@@ -1174,6 +1200,13 @@ class DataPlane:
                     )
         return api_response
 
+    def __get_response_json(self, api_response):
+        # Segment state APIs return gzip-compressed JSON when requested using the Accept header
+        if api_response.headers.get("Content-Type") == GZIP_CONTENT_TYPE:
+            return json.loads(gzip.decompress(api_response.content))
+
+        return api_response.json()
+
     def get_segments_for_clip_generation(self):
         """
         Method to retrieve non-optimized and optimized segments for a given program and event from the Data plane.
@@ -1585,6 +1618,32 @@ class DataPlane:
 
         return api_response.json()
 
+    def increment_event_progress(self, program, event, counters):
+        """
+        Method to increment one or more progress counters of an event in the Data plane.
+
+        :param program: Program name
+        :param event: Event name
+        :param counters: Dictionary of the counter name (for example, "SegmentsCached") and the value to add
+
+        :return: Data plane response
+        """
+        path = "/event/progress"
+        method = "POST"
+        headers = {"Content-Type": "application/json"}
+
+        body = {
+            "Program": program,
+            "Event": event,
+            "Counters": counters,
+        }
+
+        api_response = self.invoke_dataplane_api(
+            path, method, headers=headers, body=json.dumps(body)
+        )
+
+        return api_response.json()
+
     def get_replay_segments(self, name, program, replayId):
         """
         Gets Replay selected Segments
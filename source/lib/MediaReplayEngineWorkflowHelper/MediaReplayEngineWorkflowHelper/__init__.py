@@ -11,9 +11,11 @@
 
 import os
 import re
+import copy
 import json
+import threading
 import urllib3
-from time import sleep
+from time import sleep, monotonic
 
 import boto3
 import requests
@@ -24,8 +26,21 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 ## Init dict for caching params
 CP_PARAM_CACHE = {}
 
+## Per-container cache of the Control plane entities (event, profile, plugin, replay request)
+## read by the internal lambda functions. Each entry is keyed by the entity and holds the
+## version (ETag) it was read at. Once the TTL expires, the entry is revalidated with the
+## Control plane using If-None-Match and reused as-is when the entity has not changed.
+CP_ENTITY_CACHE = {}
+CP_ENTITY_CACHE_LOCK = threading.Lock()
+CP_ENTITY_CACHE_TTL_SECS = float(os.getenv("MRE_CONTROLPLANE_CACHE_TTL_SECS", "5"))
+CP_ENTITY_NEGATIVE_CACHE_TTL_SECS = float(os.getenv("MRE_CONTROLPLANE_NEGATIVE_CACHE_TTL_SECS", "2"))
+
 def get_controlplane_url():
-     return CP_PARAM_CACHE.get("CONTROLPLANE_URL")
+    # Looked up on first use so that importing the helpers (such as RateLimiter) does not call SSM
+    if "CONTROLPLANE_URL" not in CP_PARAM_CACHE:
+        get_controlplane_endpoint_url_from_ssm()
+
+    return CP_PARAM_CACHE.get("CONTROLPLANE_URL")
 
 def get_controlplane_endpoint_url_from_ssm():
     ssm_client = boto3.client(
@@ -47,7 +62,30 @@ def get_controlplane_endpoint_url_from_ssm():
 
     CP_PARAM_CACHE["CONTROLPLANE_URL"] = endpoint_url
 
-get_controlplane_endpoint_url_from_ssm()
+class RateLimiter:
+    """
+    Token bucket shared by worker threads to cap the calls per second made to an AWS API
+    """
+    def __init__(self, rate):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = monotonic()
+                self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait_secs = (1 - self.tokens) / self.rate
+
+            sleep(wait_secs)
 
 class ControlPlane:
     """
@@ -135,6 +173,74 @@ class ControlPlane:
             else:
                 return response
 
+    def get_cached_entity(self, key, path):
+        """
+        Method to get an entity from the Control plane through the per-container entity cache.
+
+        A cached entity is returned without invoking the Control plane until its TTL expires.
+        An entity that was not found (HTTP 404) is cached for a shorter TTL and the error is
+        raised again for every read until then.
+
+        :param key: Tuple identifying the entity in the cache
+        :param path: Path to the corresponding API resource
+
+        :return: Copy of the entity
+        """
+
+        with CP_ENTITY_CACHE_LOCK:
+            entry = CP_ENTITY_CACHE.get(key)
+
+        if entry and entry["Expiry"] > monotonic():
+            if "Error" in entry:
+                raise Exception(entry["Error"])
+
+            return copy.deepcopy(entry["Entity"])
+
+        headers = {"If-None-Match": entry["ETag"]} if entry and entry.get("ETag") else None
+
+        try:
+            api_response = self.invoke_controlplane_api(path, "GET", headers=headers)
+
+        except Exception as e:
+            error = e.args[0] if e.args else None
+
+            if isinstance(error, requests.exceptions.HTTPError) and error.response.status_code == 404:
+                with CP_ENTITY_CACHE_LOCK:
+                    CP_ENTITY_CACHE[key] = {
+                        "Expiry": monotonic() + CP_ENTITY_NEGATIVE_CACHE_TTL_SECS,
+                        "Error": error
+                    }
+
+            raise
+
+        if api_response.status_code == 304:
+            print(f"Entity not modified since the last read: {path}")
+            entity = entry["Entity"]
+            etag = entry["ETag"]
+        else:
+            entity = api_response.json()
+            etag = api_response.headers.get("ETag")
+
+        with CP_ENTITY_CACHE_LOCK:
+            CP_ENTITY_CACHE[key] = {
+                "Expiry": monotonic() + CP_ENTITY_CACHE_TTL_SECS,
+                "ETag": etag,
+                "Entity": entity
+            }
+
+        return copy.deepcopy(entity)
+
+    def invalidate_cached_entity(self, key):
+        """
+        Method to remove an entity from the per-container entity cache after it is updated
+        in the Control plane, so that the next read gets the updated entity.
+
+        :param key: Tuple identifying the entity in the cache
+        """
+
+        with CP_ENTITY_CACHE_LOCK:
+            CP_ENTITY_CACHE.pop(key, None)
+
     def store_first_pts(self, event, program, first_pts):
         """
         Method to store the pts timecode of the first frame of the first HLS video segment in the Control plane.
@@ -150,6 +256,7 @@ class ControlPlane:
         method = "PUT"
 
         api_response = self.invoke_controlplane_api(path, method)
+        self.invalidate_cached_entity(("event", program, event))
         
         return api_response.json()
 
@@ -188,6 +295,7 @@ class ControlPlane:
         method = "PUT"
 
         api_response = self.invoke_controlplane_api(path, method)
+        self.invalidate_cached_entity(("event", program, event))
         
         return api_response.json()
 
@@ -206,6 +314,7 @@ class ControlPlane:
         method = "PUT"
 
         api_response = self.invoke_controlplane_api(path, method)
+        self.invalidate_cached_entity(("event", program, event))
 
         return api_response.json()
 
@@ -234,6 +343,7 @@ class ControlPlane:
         }
 
         api_response = self.invoke_controlplane_api(path, method, headers=headers, body=json.dumps(body))
+        self.invalidate_cached_entity(("event", program, event))
 
         return api_response.json()
 
@@ -301,6 +411,34 @@ class ControlPlane:
 
         return api_response.json()
 
+    def put_plugin_execution_statuses(self, event, program, filename, statuses):
+        """
+        Method to update the execution status of one or more plugins in an AWS Step Function workflow in the Control plane
+        using a single request.
+
+        :param event: Event present in the input payload passed to Lambda
+        :param program: Program present in the input payload passed to Lambda
+        :param filename: Filename of the HLS Segment (Chunk) being processed in the workflow execution
+        :param statuses: Dictionary of plugin name to execution status - Waiting, In Progress, Complete, Error
+
+        :return: Control plane response
+        """
+
+        path = f"/workflow/execution/program/{program}/event/{event}/chunk/{self.get_chunk_number(filename)}/status"
+        method = "PUT"
+
+        headers = {
+            "Content-Type": "application/json"
+        }
+
+        body = {
+            "Plugins": statuses
+        }
+
+        api_response = self.invoke_controlplane_api(path, method, headers=headers, body=json.dumps(body))
+
+        return api_response.json()
+
     def get_plugin_execution_status(self, event, program, filename, plugin_name):
         """
         Method to retrieve the execution status of a plugin in an AWS Step Function workflow in the Control plane.
@@ -340,7 +478,36 @@ class ControlPlane:
         method = "GET"
 
         api_response = self.invoke_controlplane_api(path, method)
-            
+
+        return api_response.json()
+
+    def register_task_token(self, event, program, filename, plugin_name, task_token):
+        """
+        Method to register the Step Function task token of the current execution so that it is resumed as soon as all
+        the prior executions of the Classifier/Optimizer are complete.
+
+        :param event: Event present in the input payload passed to Lambda
+        :param program: Program present in the input payload passed to Lambda
+        :param filename: Filename of the HLS Segment (Chunk) being processed in the workflow execution
+        :param plugin_name: Name of either the Classifier or the Optimizer plugin
+        :param task_token: Task token of the current execution waiting for the prior executions
+
+        :return: Control plane response
+        """
+
+        path = f"/workflow/execution/program/{program}/event/{event}/chunk/{self.get_chunk_number(filename)}/plugin/{plugin_name}/tasktoken"
+        method = "PUT"
+
+        headers = {
+            "Content-Type": "application/json"
+        }
+
+        body = {
+            "TaskToken": task_token
+        }
+
+        api_response = self.invoke_controlplane_api(path, method, headers=headers, body=json.dumps(body))
+
         return api_response.json()
 
     def get_profile(self, profile):
@@ -353,11 +520,8 @@ class ControlPlane:
         """
 
         path = f"/profile/{profile}"
-        method = "GET"
 
-        api_response = self.invoke_controlplane_api(path, method)
-            
-        return api_response.json()
+        return self.get_cached_entity(("profile", profile), path)
 
     def put_event_status(self, event, program, status):
         """
@@ -374,6 +538,7 @@ class ControlPlane:
         method = "PUT"
 
         api_response = self.invoke_controlplane_api(path, method)
+        self.invalidate_cached_entity(("event", program, event))
         
         return api_response.json()
 
@@ -410,6 +575,7 @@ class ControlPlane:
         method = "PUT"
 
         api_response = self.invoke_controlplane_api(path, method)
+        self.invalidate_cached_entity(("event", program, event))
             
         return api_response.json()
 
@@ -424,10 +590,23 @@ class ControlPlane:
         """
 
         path = f"/event/{event}/program/{program}"
+
+        return self.get_cached_entity(("event", program, event), path)
+
+    def get_event_by_channel(self, channel_id):
+        """
+        Gets the Event that a MediaLive channel was last configured for
+
+        :param channel_id: Id of the MediaLive channel
+
+        :return: Control plane response
+        """
+
+        path = f"/event/medialive/channel/{channel_id}"
         method = "GET"
 
         api_response = self.invoke_controlplane_api(path, method)
-            
+
         return api_response.json()
 
     def get_replay_request(self, event, program, replay_request_id):
@@ -442,11 +621,8 @@ class ControlPlane:
         """
 
         path = f"/replay/program/{program}/event/{event}/replayid/{replay_request_id}"
-        method = "GET"
 
-        api_response = self.invoke_controlplane_api(path, method)
-            
-        return api_response.json()
+        return self.get_cached_entity(("replay", program, event, replay_request_id), path)
 
     def get_custom_priorities_engine(self, name):
         """
@@ -478,11 +654,8 @@ class ControlPlane:
         """
 
         path = f"/plugin/{plugin_name}"
-        method = "GET"
 
-        api_response = self.invoke_controlplane_api(path, method)
-            
-        return api_response.json()
+        return self.get_cached_entity(("plugin", plugin_name), path)
 
     def update_replay_request_status(self, program, event, id, replaystatus):
         """
@@ -499,6 +672,7 @@ class ControlPlane:
         method = "PUT"
 
         api_response = self.invoke_controlplane_api(path, method)
+        self.invalidate_cached_entity(("replay", program, event, id))
         
         return api_response.json()
 
@@ -527,6 +701,7 @@ class ControlPlane:
         }
 
         self.invoke_controlplane_api(path, method, headers=headers, body=json.dumps(body))
+        self.invalidate_cached_entity(("replay", program, event, id))
 
     
     def get_all_replay_requests_for_event_opto_segment_end(self, program, event, audioTrack):
@@ -580,6 +755,24 @@ class ControlPlane:
         api_response = self.invoke_controlplane_api(path, method)
         return api_response.json()
 
+    def get_all_catchup_replays_for_segment_end(self, event, program, audioTrack=None):
+        """
+        Gets all the active Catchup Replay Requests matching program, event and optionally the AudioTrack
+
+        :param event: Event present in the input payload passed to Lambda
+        :param program: Program present in the input payload passed to Lambda
+        :param audioTrack: (optional) AudioTrack configured within Replay Request
+
+        :return: List of Catchup Replay Requests
+        """
+        path = f"/replay/program/{program}/event/{event}/segmentend/catchup"
+        method = "GET"
+
+        params = None if audioTrack is None else {"audioTrack": audioTrack}
+
+        api_response = self.invoke_controlplane_api(path, method, params=params)
+        return api_response.json()
+
 #--------------- Replay Engine Changes Ends ----------------------------------------------------
 
     
@@ -608,6 +801,7 @@ class ControlPlane:
         }
 
         self.invoke_controlplane_api(path, method, headers=headers, body=json.dumps(body))
+        self.invalidate_cached_entity(("event", program, event))
 
 
     def update_event_edl_location(self, event, program, edl_location, audioTrack):
@@ -633,6 +827,7 @@ class ControlPlane:
         }
 
         self.invoke_controlplane_api(path, method, headers=headers, body=json.dumps(body))
+        self.invalidate_cached_entity(("event", program, event))
 
     def update_replay_request_with_hls_location(self, event, program, id, hls_location, thumbnail):
         """
@@ -658,7 +853,8 @@ class ControlPlane:
         }
 
        
-        self.invoke_controlplane_api(path, method, headers=headers, body=json.dumps(body))  
+        self.invoke_controlplane_api(path, method, headers=headers, body=json.dumps(body))
+        self.invalidate_cached_entity(("replay", program, event, id))
 
 
 
@@ -687,6 +883,7 @@ class ControlPlane:
         }
 
         self.invoke_controlplane_api(path, method, headers=headers, body=json.dumps(body))
+        self.invalidate_cached_entity(("event", program, event))
 
 
     def update_replay_data_export_location(self, event, program, replay_id, location, isBaseEvent="N"):
@@ -715,6 +912,7 @@ class ControlPlane:
         }
 
         self.invoke_controlplane_api(path, method, headers=headers, body=json.dumps(body))
+        self.invalidate_cached_entity(("replay", program, event, replay_id))
 
 
     def update_segments_to_be_ignored(self, event, program, replay_id, segment_cache_file_name):
@@ -742,6 +940,7 @@ class ControlPlane:
         }
 
         self.invoke_controlplane_api(path, method, headers=headers, body=json.dumps(body))
+        self.invalidate_cached_entity(("replay", program, event, replay_id))
 
 
     def get_transitions_config(self, transition_name):
@@ -10,4 +10,7 @@ EVENT_PROGRAMID_INDEX = "ProgramId-index"
 EVENT_CONTENT_GROUP_INDEX = "ContentGroup-index"
 EVENT_PAGINATION_INDEX = "Pagination-index"
 EVENT_PROGRAM_INDEX = "Program-index"
+EVENT_START_BUCKET_INDEX = "StartBucket-index"
 EVENT_BYOB_NAME_INDEX = "SourceVideoBucket-Name-index"
+REPLAY_REQUEST_PAGINATION_INDEX = "Pagination-index"
+REPLAY_REQUEST_CATCHUP_INDEX = "Catchup-index"
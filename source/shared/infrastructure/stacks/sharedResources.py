@@ -643,6 +643,7 @@ def handler(event, context):
             sort_key=ddb.Attribute(name="ChunkNumber", type=ddb.AttributeType.NUMBER),
             billing_mode=ddb.BillingMode.PAY_PER_REQUEST,
             removal_policy=RemovalPolicy.DESTROY,
+            time_to_live_attribute="ttl",
             encryption=ddb.TableEncryption.AWS_MANAGED,  # Enables server-side encryption with AWS managed key
             point_in_time_recovery=True  # Enables point-in-time recovery
         )
@@ -1295,6 +1296,17 @@ def handler(event, context):
             sort_key=ddb.Attribute(name="Start", type=ddb.AttributeType.STRING),
         )
 
+        # Event Table: StartBucket GSI (UTC day of the Start time) for the time range queries
+        self.event_table.add_global_secondary_index(
+            index_name=constants.EVENT_START_BUCKET_INDEX,
+            partition_key=ddb.Attribute(
+                name="StartBucket", type=ddb.AttributeType.STRING
+            ),
+            sort_key=ddb.Attribute(name="Start", type=ddb.AttributeType.STRING),
+            projection_type=ddb.ProjectionType.INCLUDE,
+            non_key_attributes=["Profile", "Status", "Created", "FrameRate", "Id"],
+        )
+
         ## Allow us to query the events for cases where a
         self.event_table.add_global_secondary_index(
             index_name=constants.EVENT_BYOB_NAME_INDEX,
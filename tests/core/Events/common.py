@@ -8,9 +8,13 @@ import time
 import boto3
 import os
 import logging
+from chalice import NotFoundError
+from utils.config_mgr import load_config
 from utils.api_client import call_api, ApiUrlType
 from boto3.dynamodb.conditions import Key, Attr
 
+CURRENT_PATH = os.path.dirname(__file__)
+
 def wait_for_event_completion(event_config):
     count = 1
         # We try for Event Completion in the next 2.5 mins (Event Bootstrap = 3 mins + Some Buffer)
@@ -67,6 +71,18 @@ def get_recorder_table_name() -> str:
 
 
 
+def get_progress_table_name() -> str:
+    client = boto3.client('dynamodb')
+    paginator = client.get_paginator('list_tables')
+
+    for page in paginator.paginate():
+        progress_table = [table for table in page['TableNames'] if "EventProgress" in table]
+        if progress_table:
+            return progress_table[0]
+
+    raise Exception("Event Progress Table Not Found")
+
+
 def get_segment_start_times(route) -> list:
     start_times = []
     response = call_api(path=route, api_method="GET",api_url=ApiUrlType.DATA_PLANE)
@@ -74,4 +90,22 @@ def get_segment_start_times(route) -> list:
     for segment in segment_info['Items']['Segments']:
         start_times.append(segment['StartTime'])
     start_times.sort(key=float)
-    return start_times
\ No newline at end of file
+    return start_times
+
+
+def build_byob_event_config(event_name, program, start_time, source_video_bucket, profile_name="TestSuite-EventTestPassThroughProfile"):
+    event_config = load_config(f"{CURRENT_PATH}/config/EventPassThrough.json")
+    event_config['Name'] = event_name
+    event_config['Program'] = program
+    event_config['Start'] = start_time.strftime('%Y-%m-%dT%H:%M:%SZ')
+    event_config['SourceVideoBucket'] = source_video_bucket
+    event_config['Profile'] = profile_name
+    event_config.pop('Channel')
+    return event_config
+
+
+def delete_event(event_config):
+    try:
+        call_api(path=f"event/{event_config['Name']}/program/{event_config['Program']}", api_method="DELETE")
+    except NotFoundError:
+        pass
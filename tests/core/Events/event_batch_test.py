@@ -0,0 +1,61 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import pytest
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from chalice import NotFoundError
+from utils.api_client import call_api
+from fixtures.media_channel_fixture import get_byob_bucket_names
+from fixtures.event_dependency_data_fixture import create_event_dependent_data
+from common import build_byob_event_config, delete_event
+
+CURRENT_PATH = os.path.dirname(__file__)
+print(f"Current Path: {CURRENT_PATH}")
+
+
+class TestEventBatchGroup():
+
+    @pytest.mark.event_batch
+    def test_event_batch_partial_failure(self, get_byob_bucket_names, create_event_dependent_data):
+        dep_data = create_event_dependent_data
+        byob_bucket = get_byob_bucket_names[0]
+        timestamp = int(datetime.timestamp(datetime.now(timezone.utc)))
+
+        # Future events are only scheduled and never processed by this test
+        start_time = datetime.utcnow() + timedelta(days=1)
+
+        existing_event = build_byob_event_config(f"TestSuite-Batch-Existing-{timestamp}", "Regression", start_time, byob_bucket)
+        created_event = build_byob_event_config(f"TestSuite-Batch-Created-{timestamp}", "Regression", start_time, byob_bucket)
+        missing_profile_event = build_byob_event_config(f"TestSuite-Batch-MissingProfile-{timestamp}", "Regression", start_time, byob_bucket, "TestSuite-Batch-MissingProfile")
+        invalid_event = build_byob_event_config(f"TestSuite-Batch-Invalid-{timestamp}", "Regression", start_time, byob_bucket)
+        invalid_event['DurationMinutes'] = 0
+
+        call_api(path="event", api_method="POST", api_body=json.dumps(existing_event))
+
+        try:
+            batch = [created_event, existing_event, missing_profile_event, invalid_event, created_event]
+            response = call_api(path="event/batch", api_method="POST", api_body=json.dumps({"Events": batch}))
+            assert response.status_code == 200
+
+            # The result of every event is reported in the order of the request
+            results = response.json()["Items"]
+            assert [result["Name"] for result in results] == [event["Name"] for event in batch]
+            assert [result["Status"] for result in results] == [201, 409, 404, 400, 409]
+
+            assert "Error" not in results[0]
+            for result in results[1:]:
+                assert result["Error"]
+
+            # Only the valid event is created. The failed events do not affect it
+            response = call_api(path=f"event/{created_event['Name']}/program/Regression", api_method="GET")
+            assert response.json()["Status"] == "Queued"
+
+            for event in [missing_profile_event, invalid_event]:
+                with pytest.raises(NotFoundError):
+                    call_api(path=f"event/{event['Name']}/program/Regression", api_method="GET")
+
+        finally:
+            delete_event(created_event)
+            delete_event(existing_event)
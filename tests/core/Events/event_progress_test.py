@@ -0,0 +1,136 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import pytest
+import json
+import os
+import boto3
+from datetime import datetime, timedelta, timezone
+from utils.api_client import call_api, ApiUrlType
+from fixtures.media_channel_fixture import get_byob_bucket_names
+from fixtures.event_dependency_data_fixture import create_event_dependent_data
+from common import build_byob_event_config, delete_event, get_progress_table_name
+
+CURRENT_PATH = os.path.dirname(__file__)
+print(f"Current Path: {CURRENT_PATH}")
+
+PROFILE_NAME = "TestSuite-EventTestPassThroughProfile"
+CLASSIFIER = "TestSuite-EventTest-SegmentPassThrough100"
+OPTIMIZER = "TestSuite-EventTest-OptimizePassThrough"
+
+# Complete segments stored by the Classifier in every chunk
+SEGMENTS_PER_CHUNK = 2
+
+
+def store_plugin_result(event_config, plugin_name, plugin_class, chunk_number, results):
+    result = {
+        "Program": event_config['Program'],
+        "Event": event_config['Name'],
+        "ProfileName": PROFILE_NAME,
+        "ChunkSize": 10,
+        "ProcessingFrameRate": 10,
+        "Classifier": CLASSIFIER,
+        "ExecutionId": f"TestSuite-Progress-{chunk_number}",
+        "Filename": f"chunk_{chunk_number}.ts",
+        "ChunkNumber": chunk_number,
+        "PluginName": plugin_name,
+        "PluginClass": plugin_class,
+        "Location": {
+            "S3Bucket": event_config['SourceVideoBucket'],
+            "S3Key": f"{event_config['Program']}/{event_config['Name']}/chunk_{chunk_number}.ts"
+        },
+        "Results": results
+    }
+    call_api(path="plugin/result", api_method="POST", api_body=json.dumps(result), api_url=ApiUrlType.DATA_PLANE)
+
+
+def get_segments(chunk_number):
+    return [
+        {"Start": chunk_number * 10 + 1, "End": chunk_number * 10 + 4},
+        {"Start": chunk_number * 10 + 5, "End": chunk_number * 10 + 9}
+    ]
+
+
+def simulate_event(event_config, chunks):
+    """
+    Store the Classifier and Optimizer results of every chunk of an event, re-posting each of them once
+    as a retried plugin would, and leave a segment open (without an End) in the last chunk.
+    """
+    for chunk_number in range(chunks):
+        results = get_segments(chunk_number)
+
+        if chunk_number == chunks - 1:
+            results.append({"Start": chunk_number * 10 + 9.5})
+
+        for _ in range(2):
+            store_plugin_result(event_config, CLASSIFIER, "Classifier", chunk_number, results)
+
+        opto_results = [
+            {
+                "Start": segment["Start"],
+                "OptoStartCode": "Opto succeeded",
+                "OptoStart": segment["Start"] - 0.5,
+                "OptoEndCode": "Opto succeeded",
+                "OptoEnd": segment["End"] + 0.5
+            }
+            for segment in get_segments(chunk_number)
+        ]
+
+        for _ in range(2):
+            store_plugin_result(event_config, OPTIMIZER, "Optimizer", chunk_number, opto_results)
+
+
+def get_progress_read_capacity(event_config):
+    response = boto3.client('dynamodb').get_item(
+        TableName=get_progress_table_name(),
+        Key={"PK": {"S": f"{event_config['Program']}#{event_config['Name']}"}},
+        ReturnConsumedCapacity="TOTAL"
+    )
+    return response["ConsumedCapacity"]["CapacityUnits"]
+
+
+class TestEventProgressGroup():
+
+    @pytest.mark.event_progress
+    def test_event_progress_counters(self, get_byob_bucket_names, create_event_dependent_data):
+        dep_data = create_event_dependent_data
+        byob_bucket = get_byob_bucket_names[0]
+        timestamp = int(datetime.timestamp(datetime.now(timezone.utc)))
+        start_time = datetime.utcnow() + timedelta(days=1)
+
+        # A short and a long event differing only in the number of chunks processed
+        short_event = build_byob_event_config(f"TestSuite-Progress-Short-{timestamp}", "Regression", start_time, byob_bucket)
+        long_event = build_byob_event_config(f"TestSuite-Progress-Long-{timestamp}", "Regression", start_time, byob_bucket)
+        event_chunks = [(short_event, 2), (long_event, 30)]
+
+        for event_config in [short_event, long_event]:
+            call_api(path="event", api_method="POST", api_body=json.dumps(event_config))
+
+        try:
+            # No counters until the event processing begins
+            response = call_api(path=f"event/{short_event['Name']}/program/Regression/progress", api_method="GET", api_url=ApiUrlType.DATA_PLANE)
+            progress = response.json()
+            assert progress["SegmentsClassified"] == 0
+            assert progress["LastChunkNumber"] is None
+
+            read_capacity = []
+
+            for event_config, chunks in event_chunks:
+                simulate_event(event_config, chunks)
+
+                # Retried results and open segments are not counted
+                response = call_api(path=f"event/{event_config['Name']}/program/Regression/progress", api_method="GET", api_url=ApiUrlType.DATA_PLANE)
+                progress = response.json()
+                assert progress["SegmentsClassified"] == chunks * SEGMENTS_PER_CHUNK
+                assert progress["SegmentsOptimized"] == chunks * SEGMENTS_PER_CHUNK
+                assert progress["LastChunkNumber"] == chunks - 1
+                assert progress["LastUpdated"]
+
+                read_capacity.append(get_progress_read_capacity(event_config))
+
+            # The progress of an event is read at the same cost irrespective of its length
+            assert read_capacity[0] == read_capacity[1]
+
+        finally:
+            for event_config in [short_event, long_event]:
+                delete_event(event_config)
@@ -0,0 +1,79 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import pytest
+import json
+import os
+import urllib.parse
+from datetime import datetime, timedelta, timezone
+from chalice import BadRequestError
+from utils.api_client import call_api
+from fixtures.media_channel_fixture import get_byob_bucket_names
+from fixtures.event_dependency_data_fixture import create_event_dependent_data
+from common import build_byob_event_config, delete_event
+
+CURRENT_PATH = os.path.dirname(__file__)
+print(f"Current Path: {CURRENT_PATH}")
+
+
+def get_range_route(from_time, to_time):
+    return f"event/range/{from_time.strftime('%Y-%m-%dT%H:%M:%SZ')}/{to_time.strftime('%Y-%m-%dT%H:%M:%SZ')}"
+
+
+class TestEventRangeGroup():
+
+    @pytest.mark.event_range
+    def test_event_range_across_midnight(self, get_byob_bucket_names, create_event_dependent_data):
+        dep_data = create_event_dependent_data
+        byob_bucket = get_byob_bucket_names[0]
+        timestamp = int(datetime.timestamp(datetime.now(timezone.utc)))
+
+        # A Program unique to this run keeps the events of other runs on the same days out of the assertions
+        program = f"TestSuite-Range-{timestamp}"
+        midnight = datetime.combine((datetime.utcnow() + timedelta(days=30)).date(), datetime.min.time())
+
+        events = [
+            build_byob_event_config("TestSuite-Range-BeforeMidnight", program, midnight - timedelta(minutes=30), byob_bucket),
+            build_byob_event_config("TestSuite-Range-AfterMidnight", program, midnight + timedelta(minutes=30), byob_bucket),
+            build_byob_event_config("TestSuite-Range-OutOfRange", program, midnight + timedelta(hours=2), byob_bucket)
+        ]
+
+        for event in events:
+            call_api(path="event", api_method="POST", api_body=json.dumps(event))
+
+        try:
+            route = get_range_route(midnight - timedelta(hours=1), midnight + timedelta(hours=1))
+            expected_names = ["TestSuite-Range-BeforeMidnight", "TestSuite-Range-AfterMidnight"]
+
+            # The events of both the day buckets are merged in the order of their Start time
+            response = call_api(path=route, api_method="GET")
+            assert [event["Name"] for event in response.json() if event["Program"] == program] == expected_names
+
+            # Paginated, the range is walked across the day buckets one event at a time
+            names = []
+            last_evaluated_key = ""
+            while True:
+                query = "limit=1"
+                if last_evaluated_key:
+                    query += f"&LastEvaluatedKey={urllib.parse.quote(last_evaluated_key)}"
+
+                page = call_api(path=f"{route}?{query}", api_method="GET").json()
+                assert len(page["Items"]) <= 1
+                names.extend([event["Name"] for event in page["Items"] if event["Program"] == program])
+
+                last_evaluated_key = page["LastEvaluatedKey"]
+                if not last_evaluated_key:
+                    break
+
+            assert names == expected_names
+
+        finally:
+            for event in events:
+                delete_event(event)
+
+    @pytest.mark.event_range
+    def test_event_range_exceeding_max_days(self):
+        from_time = datetime.utcnow()
+
+        with pytest.raises(BadRequestError):
+            call_api(path=get_range_route(from_time, from_time + timedelta(days=400)), api_method="GET")
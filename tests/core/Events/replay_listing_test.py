@@ -0,0 +1,94 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import pytest
+import json
+import os
+import urllib.parse
+from datetime import datetime, timedelta, timezone
+from chalice import BadRequestError
+from utils.api_client import call_api
+from fixtures.media_channel_fixture import get_byob_bucket_names
+from fixtures.event_dependency_data_fixture import create_event_dependent_data
+from common import build_byob_event_config, delete_event
+
+CURRENT_PATH = os.path.dirname(__file__)
+print(f"Current Path: {CURRENT_PATH}")
+
+
+def add_replay(event_config, description):
+    replay_config = {
+        "Program": event_config['Program'],
+        "Event": event_config['Name'],
+        "AudioTrack": 1,
+        "Description": description,
+        "UxLabel": description,
+        "Requester": "TestSuite",
+        "DurationbasedSummarization": {
+            "Duration": 60,
+            "FillToExact": False,
+            "EqualDistribution": False
+        },
+        "Priorities": {
+            "Clips": []
+        },
+        "ClipfeaturebasedSummarization": False,
+        "Catchup": False,
+        "CreateHls": False,
+        "CreateMp4": False
+    }
+    call_api(path="replay", api_method="POST", api_body=json.dumps(replay_config))
+
+
+class TestReplayListingGroup():
+
+    @pytest.mark.replay_listing
+    def test_all_replays_pagination(self, get_byob_bucket_names, create_event_dependent_data):
+        dep_data = create_event_dependent_data
+        byob_bucket = get_byob_bucket_names[0]
+        timestamp = int(datetime.timestamp(datetime.now(timezone.utc)))
+
+        event_config = build_byob_event_config(f"TestSuite-ReplayListing-{timestamp}", "Regression", datetime.utcnow() + timedelta(days=1), byob_bucket)
+        call_api(path="event", api_method="POST", api_body=json.dumps(event_config))
+
+        try:
+            for i in range(3):
+                add_replay(event_config, f"TestSuite Replay Listing {i}")
+
+            event_replay_ids = {
+                replay["ReplayId"]
+                for replay in call_api(path=f"replay/program/Regression/event/{event_config['Name']}/all", api_method="GET").json()
+            }
+            assert len(event_replay_ids) == 3
+
+            # Walk the replays (latest first) two at a time until all the replays of this event are listed
+            replay_ids = []
+            last_evaluated_key = ""
+            while True:
+                query = "limit=2"
+                if last_evaluated_key:
+                    query += f"&LastEvaluatedKey={urllib.parse.quote(last_evaluated_key)}"
+
+                page = call_api(path=f"replay/all?{query}", api_method="GET").json()
+                assert len(page["Items"]) <= 2
+                replay_ids.extend([replay["ReplayId"] for replay in page["Items"]])
+
+                last_evaluated_key = page["LastEvaluatedKey"]
+                if event_replay_ids.issubset(replay_ids) or not last_evaluated_key:
+                    break
+
+            # The replays of this event span more than one page which do not overlap
+            assert event_replay_ids.issubset(replay_ids)
+            assert len(replay_ids) > 2
+            assert len(replay_ids) == len(set(replay_ids))
+
+        finally:
+            for replay in call_api(path=f"replay/program/Regression/event/{event_config['Name']}/all", api_method="GET").json():
+                call_api(path=f"replay/event/{event_config['Name']}/program/Regression/id/{replay['ReplayId']}", api_method="DELETE")
+            delete_event(event_config)
+
+    @pytest.mark.replay_listing
+    @pytest.mark.parametrize("query", ["limit=0", "limit=1001", "limit=abc", "limit=1&LastEvaluatedKey=invalid"])
+    def test_all_replays_invalid_page_params(self, query):
+        with pytest.raises(BadRequestError):
+            call_api(path=f"replay/all?{query}", api_method="GET")
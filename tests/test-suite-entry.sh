@@ -163,6 +163,17 @@ pytest -s -v -m future_event_byob_as_source ./core/Events/event_byob_test.py -n
 # # BYOB FUTURE Events with No Optimizer in Profile
 pytest -s -v -m future_event_byob_as_source_without_optimizer ./core/Events/event_byob_test.py -n 1 --self-contained-html --html=future_event_byob_as_source_without_optimizer.html
 
+# Batch Event Creation
+pytest -s -v -m event_batch ./core/Events/event_batch_test.py -n 1 --self-contained-html --html=event_batch.html
+
+# Events by Start time range
+pytest -s -v -m event_range ./core/Events/event_range_test.py -n 1 --self-contained-html --html=event_range.html
+
+# Event progress counters
+pytest -s -v -m event_progress ./core/Events/event_progress_test.py -n 1 --self-contained-html --html=event_progress.html
+
 ############################################# REPLAY TESTS #######################################################################
+# Paginated listing of all the Replays
+pytest -s -v -m replay_listing ./core/Events/replay_listing_test.py -n 1 --self-contained-html --html=replay_listing.html
 
 deactivate
\ No newline at end of file